@@ -21,8 +21,8 @@ project_root = os.path.dirname(os.path.dirname(current_script_dir))
 sys.path.insert(0, project_root)
 # --- AKHIR PENYESUAIAN PATH ---
 
-# Impor modul lain dari proyek jika diperlukan di masa depan
-# Untuk saat ini, tidak ada impor spesifik yang diperlukan dari proyek
+# Impor modul lain dari proyek
+from PERCEPTION_SYSTEM.snapshot_delta import iter_news_items
 
 class BlackSwanShield:
     """
@@ -48,6 +48,7 @@ class BlackSwanShield:
         Args:
             perception_snapshot (dict): Data gabungan dari PerceptionSystem.
                 Diharapkan berisi kunci seperti 'market_data', 'news', 'onchain'.
+                Jika ada 'delta', pencarian berita kritis hanya pada berita baru.
 
         Returns:
             dict or None: Perintah darurat jika ancaman terdeteksi, None jika tidak.
@@ -87,7 +88,8 @@ class BlackSwanShield:
         # --- Kondisi 2: Sentimen Negatif Massif ---
         # Asumsi: Data sentimen ada di perception_snapshot['news']['aggregate_sentiment']
         # atau bisa dihitung dari analisis berita. Kita gunakan placeholder.
-        news_data = perception_snapshot.get('news', {})
+        # Berita bisa berupa dict bersarang per sumber atau list; ratakan menjadi list item
+        news_data = iter_news_items(perception_snapshot.get('news', {}))
         # Misalnya, kita hitung rata-rata sentimen dari berita terbaru
         sentiment_scores = [item.get('sentiment_score', 0) for item in news_data if isinstance(item, dict)]
         if sentiment_scores:
@@ -114,10 +116,13 @@ class BlackSwanShield:
         # Untuk demonstrasi, kita bisa membuat kondisi 3 terpenuhi berdasarkan kata kunci di berita
         # atau jika tidak ada data on-chain yang spesifik.
         critical_keywords = ["krisis", "crash", "collapse", "regulasi ketat", "larangan"]
+        # Berita lama sudah dipindai pada siklus sebelumnya; cukup pindai berita baru
+        delta = perception_snapshot.get('delta')
+        news_to_scan = news_data if not delta or delta.get('is_initial') else delta['news']['new_items']
         critical_news_found = any(
-            any(keyword in (item.get('title', '') + ' ' + item.get('description', '')) 
+            any(keyword in ((item.get('title') or '') + ' ' + (item.get('description') or ''))
                 for keyword in critical_keywords)
-            for item in news_data if isinstance(item, dict)
+            for item in news_to_scan if isinstance(item, dict)
         )
         if critical_news_found:
             threat_count += 1
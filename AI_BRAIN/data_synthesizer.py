@@ -43,6 +43,14 @@ class DataSynthesizer:
             logging.warning("Tidak ada laporan valid dari Dewan AI untuk disintesis.")
             return None
 
+        # Bobot dinormalisasi ulang atas anggota yang menjawab (dewan bisa mengembalikan
+        # hasil parsial saat batas waktu tercapai), sehingga jumlahnya tetap 1
+        answered_weights = {task_name: self.analyst_weights.get(task_name, 0.1)
+                            for task_name, report in council_reports.items() if self._is_report_valid(report)}
+        answered_total = sum(answered_weights.values())
+        weights = {task_name: weight / answered_total for task_name, weight in answered_weights.items()}
+        coverage = answered_total / sum(self.analyst_weights.get(task_name, 0.1) for task_name in council_reports)
+
         # --- LANGKAH 1: SINTESIS SENTIMEN KESELURUHAN ---
         sentiment_scores = {'BULLISH': 0, 'BEARISH': 0, 'NEUTRAL': 0}
         total_confidence = 0
@@ -51,7 +59,7 @@ class DataSynthesizer:
             if self._is_report_valid(report):
                 sentiment = report.get('Overall Market Sentiment', 'NEUTRAL').upper()
                 confidence = report.get('confidence', 0.5) # Default confidence jika tidak ada
-                weight = self.analyst_weights.get(task_name, 0.1)
+                weight = weights[task_name]
                 
                 if sentiment in sentiment_scores:
                     sentiment_scores[sentiment] += confidence * weight
@@ -79,12 +87,64 @@ class DataSynthesizer:
             'recommended_short': caution_cryptos,
             'summary_risks': market_risks,
             'summary_opportunities': opportunities,
+            'members_answered': sorted(weights),
+            'council_coverage': round(coverage, 4),
             'reason': f"AI Council consensus. Sentiment: {final_sentiment} ({final_confidence:.2%}). Top long candidate: {top_cryptos[0] if top_cryptos else 'N/A'}."
         }
         
         logging.info(f"Sintesis Dewan AI selesai. Sinyal akhir: {final_signal}")
         return final_signal
 
+    def synthesize_article_reports(self, article_reports: dict):
+        """
+        Mensintesis laporan dewan untuk banyak artikel menjadi satu sinyal akhir.
+        Setiap artikel disintesis sendiri, lalu sinyal per artikel digabung
+        dengan voting berbobot confidence.
+        Args:
+            article_reports (dict): {article_id: {task_name: laporan}}.
+        Returns:
+            dict: Sinyal akhir dengan rincian per artikel di 'articles', atau None.
+        """
+        article_signals = {}
+        for article_id, council_reports in (article_reports or {}).items():
+            signal = self.synthesize_council_reports(council_reports)
+            if signal:
+                article_signals[article_id] = signal
+        if not article_signals:
+            logging.warning("Tidak ada artikel dengan laporan dewan yang valid untuk disintesis.")
+            return None
+
+        sentiment_scores = {'BULLISH': 0.0, 'BEARISH': 0.0, 'NEUTRAL': 0.0}
+        for signal in article_signals.values():
+            sentiment_scores[signal['signal']] += signal['confidence']
+        total_score = sum(sentiment_scores.values())
+        if total_score == 0:
+            final_sentiment, final_confidence = 'NEUTRAL', 0.0
+        else:
+            final_sentiment = max(sentiment_scores, key=sentiment_scores.get)
+            final_confidence = sentiment_scores[final_sentiment] / total_score
+
+        def merge(key):
+            counter = Counter()
+            for signal in article_signals.values():
+                counter.update(signal.get(key, []))
+            return [item for item, count in counter.most_common()]
+
+        top_cryptos = merge('recommended_long')
+        final_signal = {
+            'signal': final_sentiment,
+            'confidence': round(final_confidence, 4),
+            'recommended_long': top_cryptos,
+            'recommended_short': merge('recommended_short'),
+            'summary_risks': merge('summary_risks'),
+            'summary_opportunities': merge('summary_opportunities'),
+            'articles': article_signals,
+            'reason': f"AI Council consensus over {len(article_signals)} article(s). Sentiment: {final_sentiment} "
+                      f"({final_confidence:.2%}). Top long candidate: {top_cryptos[0] if top_cryptos else 'N/A'}."
+        }
+        logging.info(f"Sintesis {len(article_signals)} artikel selesai. Sinyal akhir: {final_sentiment} ({final_confidence:.2%}).")
+        return final_signal
+
     def _is_report_valid(self, report: dict):
         """Memeriksa apakah laporan dari AI memiliki format dasar yang benar."""
         return isinstance(report, dict) and 'Overall Market Sentiment' in report
@@ -1,6 +1,19 @@
+import asyncio
+import json
 import logging
 import random
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from AI_BRAIN.model_wrappers.async_streaming_client import AsyncLLMClient, AIOHTTP_AVAILABLE
+from AI_BRAIN.prompt_engineer import (build_single_prompt, build_batch_prompt, split_into_batches,
+                                      parse_batch_response, estimate_tokens)
+from NEURAL_NETWORK.ai_api_manager.account_switcher import AccountSwitcher, KeyReservation
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import QuotaMonitor, mask_key
+from UTILS.llm_response_cache import LLMResponseCache
+from UTILS.latency_histogram import LatencyHistogram
 
 # Impor wrapper hanya ketika diperlukan
 def _import_gemini_wrapper():
@@ -15,11 +28,22 @@ class LLMRouter:
     """
     Mengelola dan mendistribusikan tugas ke seluruh dewan AI secara paralel.
     """
+    # Anggota dewan dan jenis tugas spesifik mereka
+    COUNCIL_TASKS = {
+        "macro_fundamental": "deep_market_analysis",
+        "risk_scenario": "risk_scenario",
+        "sentiment_psychology": "sentiment_psychology",
+        "execution_strategy": "execution_strategy"
+    }
+
     def __init__(self, orchestrator):
         self.orchestrator = orchestrator
         self.secrets = self.orchestrator.secrets
         self.model_inventory = self._load_model_inventory()
-        self.key_indices = {model: 0 for model in self.model_inventory}
+        # Penjadwal kunci sadar kuota (menggantikan indeks round-robin per model)
+        self.quota_monitor = QuotaMonitor()
+        self.quota_monitor.configure(self.orchestrator.config)
+        self.account_switcher = AccountSwitcher(self.model_inventory, self.quota_monitor)
         
         # Impor wrapper hanya ketika diperlukan
         self.wrappers = {
@@ -27,6 +51,53 @@ class LLMRouter:
             "default": _import_openrouter_wrapper()  # Untuk semua model lain via OpenRouter
         }
 
+        llm_config = self.orchestrator.config.get('llm', {})
+        # Pool thread yang hidup selama router hidup (bukan dibuat ulang di setiap panggilan dewan)
+        self.executor = ThreadPoolExecutor(
+            max_workers=llm_config.get('council_max_workers', 8),
+            thread_name_prefix='llm-council'
+        )
+        # Cache instance wrapper per (model, kunci API): konfigurasi klien dan
+        # pembuatan model hanya terjadi sekali per kunci, bukan di setiap permintaan
+        self.max_cached_wrappers = llm_config.get('max_cached_wrappers', 64)
+        self._wrapper_cache = OrderedDict()
+        self._wrapper_lock = threading.Lock()
+
+        # Cache respons persisten: prompt yang sama untuk tugas yang sama tidak dianalisis ulang
+        self.response_cache = LLMResponseCache()
+        self.response_cache.configure(self.orchestrator.config)
+
+        # Jalur async streaming: semua panggilan dewan berjalan sebagai task asyncio di satu
+        # event loop latar belakang (bukan satu thread per panggilan), dibatasi semaphore per provider
+        self.async_client = None
+        self._async_loop = None
+        self._async_thread = None
+        self._async_lock = threading.Lock()
+        if llm_config.get('streaming', True) and AIOHTTP_AVAILABLE:
+            self.async_client = AsyncLLMClient(
+                concurrency_limits=llm_config.get('concurrency', {'default': 8}),
+                timeout_seconds=llm_config.get('stream_timeout_seconds', 60),
+                providers=[model for model, keys in self.model_inventory.items() if keys]
+            )
+
+        # --- Batas waktu dewan & hedged request ---
+        # Dewan mengembalikan hasil parsial saat batas waktu tercapai (0 = tanpa batas)
+        self.council_deadline = llm_config.get('council_deadline_seconds', 45)
+        self.hedge_enabled = llm_config.get('hedge_council', True)
+        # Persentil latensi model yang dipakai sebagai batas hedge (0.95 = p95)
+        self.hedge_percentile = llm_config.get('hedge_percentile', 0.95)
+        self.hedge_initial_delay = llm_config.get('hedge_initial_delay_seconds', 20.0)
+        self.hedge_min_delay = llm_config.get('hedge_min_delay_seconds', 5.0)
+        self.hedge_max_delay = llm_config.get('hedge_max_delay_seconds', 30.0)
+        self.hedge_min_samples = llm_config.get('hedge_min_samples', 10)
+        # Histogram latensi per model (hanya generasi sukses yang tidak berasal dari cache)
+        self.model_latency = defaultdict(lambda: LatencyHistogram(min_latency=0.05, max_latency=120.0))
+
+        # Pool dewan & loop async ditutup oleh orkestrator saat shutdown
+        register_shutdown_hook = getattr(self.orchestrator, 'register_shutdown_hook', None)
+        if register_shutdown_hook:
+            register_shutdown_hook(self.close)
+
     def _load_model_inventory(self):
         """Memuat semua kunci LLM yang tersedia dari secrets.vault."""
         ai_secrets = self.secrets.get('ai_apis', {})
@@ -42,22 +113,20 @@ class LLMRouter:
         return inventory
 
     def _rotate_key(self, model_name: str):
-        """Memutar kunci API untuk satu model dan mengembalikannya."""
-        if model_name in self.model_inventory:
-            keys = self.model_inventory[model_name]
-            if not keys:
-                return None
-            # Dapatkan indeks saat ini, putar, lalu simpan indeks baru
-            current_index = self.key_indices.get(model_name, 0)
-            next_index = (current_index + 1) % len(keys)
-            self.key_indices[model_name] = next_index
-            logging.debug(f"Memutar kunci untuk {model_name} ke indeks {next_index}.")
-            return keys[current_index]  # Kembalikan kunci pada indeks saat ini sebelum diputar
-        return None
+        """
+        Memilih kunci API untuk satu model: kunci dengan sisa kuota terbesar,
+        melewati kunci yang sedang diistirahatkan (429/403). Aman dari banyak thread.
+        Returns:
+            KeyReservation: Kunci API beserta reservasinya, atau None jika tidak ada
+                kunci yang bisa dipakai.
+        """
+        return self.account_switcher.acquire(model_name)
 
     def select_model_for_task(self, task_type: str):
         """
         Memilih model dan kunci API yang paling sesuai berdasarkan jenis tugas.
+        Returns:
+            tuple: (model_name, KeyReservation).
         """
         logging.info(f"Memilih model LLM untuk tugas: {task_type}")
         
@@ -73,60 +142,398 @@ class LLMRouter:
         
         model_choice = task_to_model_map.get(task_type, "openai")  # Default ke OpenAI jika tugas tidak dikenal
 
-        api_key = self._rotate_key(model_choice)
+        reservation = self._rotate_key(model_choice)
         
         # Logika fallback jika model pilihan tidak memiliki kunci API yang valid
-        if not api_key:
+        if not reservation:
             logging.warning(f"Tidak ada kunci API yang tersedia untuk model pilihan: {model_choice}. Mencari alternatif...")
-            available_models = [m for m, k in self.model_inventory.items() if k]
+            available_models = [m for m, k in self.model_inventory.items() if k and m != model_choice]
             if not available_models:
                 raise ValueError("Tidak ada kunci API LLM yang dikonfigurasi di secrets.vault.")
-            
-            model_choice = random.choice(available_models)
-            api_key = self._rotate_key(model_choice)
 
-        logging.info(f"Model terpilih: {model_choice}, menggunakan kunci indeks: {self.key_indices[model_choice]}")
-        return model_choice, api_key
+            # Coba model lain secara acak sampai ada yang kuncinya tidak sedang diistirahatkan
+            random.shuffle(available_models)
+            for model_choice in available_models:
+                reservation = self._rotate_key(model_choice)
+                if reservation:
+                    break
+            else:
+                raise ValueError("Semua kunci API LLM sedang diistirahatkan (rate limit/kuota).")
 
-    def get_council_analysis(self, article_text: str):
+        logging.info(f"Model terpilih: {model_choice}, menggunakan kunci: {mask_key(reservation.api_key)}")
+        return model_choice, reservation
+
+    def get_council_analysis(self, article_text: str, on_field=None, deadline: float = None, max_chars: int = 2000):
         """
         Mengirim tugas analisis ke anggota dewan AI yang relevan secara paralel.
+        Anggota yang belum menjawab dalam batas latensinya mendapat hedge ke model
+        alternatif; saat `deadline` tercapai, hasil parsial dikembalikan.
+        Args:
+            article_text (str): Teks artikel.
+            on_field (callable, optional): Dipanggil dengan (task_name, key, value)
+                setiap kali satu field JSON tingkat atas dari seorang anggota selesai
+                (saat streaming: sebelum respons lengkap diterima).
+            deadline (float, optional): Batas waktu dewan (detik). Default
+                `[llm] council_deadline_seconds`.
+            max_chars (int, optional): Batas karakter teks di prompt; None jika teks
+                sudah dipadatkan pemanggil (misal `compact_report`).
+        Returns:
+            dict: {task_name: laporan, atau None jika anggota tidak menjawab tepat waktu}.
         """
-        # Definisikan anggota dewan dan tugas spesifik mereka
-        council_tasks = {
-            "macro_fundamental": "deep_market_analysis",
-            "risk_scenario": "risk_scenario",
-            "sentiment_psychology": "sentiment_psychology",
-            "execution_strategy": "execution_strategy"
-        }
-        
-        results = {}
-        with ThreadPoolExecutor(max_workers=len(council_tasks)) as executor:
-            future_to_task = {
-                executor.submit(self.run_single_analysis, task_type, article_text): task_name
-                for task_name, task_type in council_tasks.items()
-            }
-            for future in future_to_task:
-                task_name = future_to_task[future]
+        jobs = {}
+        for task_name, task_type in self.COUNCIL_TASKS.items():
+            field_callback = (lambda key, value, name=task_name: on_field(name, key, value)) if on_field else None
+            jobs[task_name] = (task_type, build_single_prompt(task_type, article_text, max_chars), field_callback)
+        results = self._run_council_jobs(jobs, deadline)
+
+        answered = [task_name for task_name, report in results.items() if report is not None]
+        if len(answered) < len(results):
+            logging.warning(f"Dewan AI menjawab sebagian: {answered or 'tidak ada'} "
+                            f"({len(answered)}/{len(results)} anggota).")
+        return results
+
+    def get_council_batch_analysis(self, articles: list, token_budget: int = 6000, max_chars: int = 2000,
+                                   max_articles_per_batch: int = 20, deadline: float = None):
+        """
+        Mode batch: banyak artikel dikemas ke satu prompt per anggota dewan
+        (dibagi sesuai anggaran token), lalu hasilnya dipetakan kembali per artikel.
+        Args:
+            articles (list): [{'id': str, 'text': str}, ...] dengan ID unik.
+            token_budget (int): Perkiraan token maksimum per prompt.
+            max_chars (int): Batas karakter per artikel.
+            max_articles_per_batch (int): Jumlah artikel maksimum per prompt.
+            deadline (float, optional): Batas waktu (detik), sama seperti `get_council_analysis`.
+        Returns:
+            dict: {article_id: {task_name: laporan atau None}}.
+        """
+        results = {str(article['id']): {task_name: None for task_name in self.COUNCIL_TASKS} for article in articles}
+        jobs, job_batches = {}, {}
+        for task_name, task_type in self.COUNCIL_TASKS.items():
+            batches = split_into_batches(task_type, articles, token_budget, max_chars, max_articles_per_batch)
+            for index, batch in enumerate(batches):
+                jobs[(task_name, index)] = (task_type, build_batch_prompt(task_type, batch, max_chars), None)
+                job_batches[(task_name, index)] = batch
+        logging.info(f"Analisis dewan batch: {len(articles)} artikel dalam {len(jobs)} permintaan LLM "
+                     f"(mode per artikel: {len(articles) * len(self.COUNCIL_TASKS)}).")
+
+        for (task_name, index), response in self._run_council_jobs(jobs, deadline).items():
+            batch = job_batches[(task_name, index)]
+            if response is None:
+                logging.error(f"Batch analisis dewan '{task_name}' ({len(batch)} artikel) tidak menghasilkan respons.")
+                continue
+            reports = parse_batch_response(response, [article['id'] for article in batch])
+            for article_id, report in reports.items():
+                results[article_id][task_name] = report
+        return results
+
+    # --- EKSEKUSI DEWAN DENGAN BATAS WAKTU & HEDGING ---
+    def _get_hedge_delay(self, model_name: str):
+        """
+        Batas waktu tunggu sebelum anggota dewan di-hedge ke model lain, yaitu
+        persentil latensi (default p95) model ini, dibatasi min/maks.
+        Sebelum sampel cukup, dipakai `hedge_initial_delay_seconds`.
+        """
+        histogram = self.model_latency.get(model_name)
+        if histogram is None or histogram.count < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        delay = histogram.percentile(self.hedge_percentile)
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    def _select_hedge_model(self, exclude):
+        """
+        Memilih model alternatif dari `model_inventory` untuk hedge: model lain
+        yang punya kunci API, dicoba urut dari median latensi terendah sampai ada
+        yang kuncinya tidak sedang diistirahatkan.
+        Returns:
+            tuple: (model_name, KeyReservation), atau (None, None) jika tidak ada alternatif.
+        """
+        def median_latency(model_name):
+            histogram = self.model_latency.get(model_name)
+            if histogram is None or histogram.count < self.hedge_min_samples:
+                return self.hedge_initial_delay
+            return histogram.percentile(0.5)
+
+        candidates = [m for m, keys in self.model_inventory.items() if keys and m not in exclude]
+        for model_name in sorted(candidates, key=median_latency):
+            reservation = self._rotate_key(model_name)
+            if reservation:
+                return model_name, reservation
+        return None, None
+
+    def _run_council_jobs(self, jobs: dict, deadline: float = None):
+        """
+        Menjalankan sekumpulan generasi dewan secara paralel dengan batas waktu.
+        Job yang belum selesai setelah batas hedge modelnya (atau gagal lebih awal)
+        dikirim sekali lagi ke model alternatif; hasil valid pertama yang dipakai
+        dan permintaan lainnya dibatalkan. Saat `deadline` tercapai, semua yang
+        masih berjalan dibatalkan dan hasilnya None. Reservasi kunci dari
+        permintaan yang dibatalkan sebelum sempat dikirim dikembalikan.
+        Args:
+            jobs (dict): {job_key: (task_type, prompt, on_field)}.
+            deadline (float, optional): Batas waktu (detik); None = konfigurasi, 0 = tanpa batas.
+        Returns:
+            dict: {job_key: hasil atau None}.
+        """
+        deadline = self.council_deadline if deadline is None else deadline
+        started_at = time.monotonic()
+        deadline_at = started_at + deadline if deadline else None
+        results = {job_key: None for job_key in jobs}
+        tried_models = {}
+        hedge_at = {}   # job_key -> waktu hedge (monotonic); dihapus setelah hedge diluncurkan
+        pending = {}    # future -> job_key
+        reservations = {}   # future -> KeyReservation
+
+        def submit(job_key, task_type, prompt, on_field, model_name, reservation):
+            future = self._submit_generation(task_type, prompt, on_field, model_name, reservation)
+            pending[future] = job_key
+            reservations[future] = reservation
+
+        def discard(future):
+            # Tidak berpengaruh jika permintaannya sudah terkirim (reservasi sudah diklaim)
+            self.account_switcher.release(reservations.pop(future))
+
+        for job_key, (task_type, prompt, on_field) in jobs.items():
+            try:
+                model_name, reservation = self.select_model_for_task(task_type)
+            except ValueError as exc:
+                logging.error(f"Tugas dewan '{job_key}' tidak dapat dijadwalkan: {exc}")
+                continue
+            submit(job_key, task_type, prompt, on_field, model_name, reservation)
+            tried_models[job_key] = {model_name}
+            if self.hedge_enabled:
+                hedge_at[job_key] = started_at + self._get_hedge_delay(model_name)
+
+        while pending:
+            now = time.monotonic()
+            if deadline_at is not None and now >= deadline_at:
+                break
+            wake_times = list(hedge_at.values()) + ([deadline_at] if deadline_at is not None else [])
+            wait_timeout = max(0.0, min(wake_times) - now) if wake_times else None
+            done, _ = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                job_key = pending.pop(future)
+                discard(future)
+                if results[job_key] is not None:
+                    continue
                 try:
-                    results[task_name] = future.result()
+                    result = future.result()
                 except Exception as exc:
-                    logging.error(f"Tugas analisis dewan '{task_name}' gagal: {exc}")
-                    results[task_name] = None
+                    logging.error(f"Tugas dewan '{job_key}' gagal: {exc}")
+                    result = None
+                if result is None:
+                    if job_key in hedge_at:
+                        # Gagal sebelum batas hedge: langsung coba model alternatif
+                        hedge_at[job_key] = now
+                    continue
+                results[job_key] = result
+                hedge_at.pop(job_key, None)
+                for other in [f for f, key in pending.items() if key == job_key]:
+                    other.cancel()
+                    del pending[other]
+                    discard(other)
+
+            now = time.monotonic()
+            for job_key in [key for key, at in hedge_at.items() if now >= at]:
+                del hedge_at[job_key]
+                task_type, prompt, on_field = jobs[job_key]
+                model_name, reservation = self._select_hedge_model(tried_models[job_key])
+                if not reservation:
+                    logging.warning(f"Hedge tugas dewan '{job_key}' dilewati: tidak ada model alternatif "
+                                    f"dengan kunci API yang tersedia.")
+                    continue
+                logging.info(f"Hedge tugas dewan '{job_key}': {sorted(tried_models[job_key])} belum menjawab "
+                             f"setelah {now - started_at:.1f}s, mencoba {model_name}.")
+                tried_models[job_key].add(model_name)
+                submit(job_key, task_type, prompt, on_field, model_name, reservation)
+
+        if pending:
+            logging.warning(f"Batas waktu dewan {deadline}s tercapai; {len(set(pending.values()))} tugas dibatalkan.")
+            for future in pending:
+                future.cancel()
+                discard(future)
         return results
 
-    def run_single_analysis(self, task_type: str, article_text: str):
-        """Menjalankan satu tugas analisis pada model AI yang paling sesuai."""
-        model_name, api_key = self.select_model_for_task(task_type)
-        
-        # Di masa depan, kita akan menggunakan prompt_engineer.py di sini
-        prompt = f"Analyze the following article for {task_type}:\n\n{article_text[:2000]}"
-        
+    def _get_wrapper(self, model_name: str, api_key: str):
+        """
+        Mengambil instance wrapper untuk (model, kunci API) dari cache, atau
+        membuatnya sekali jika belum ada. Cache dibatasi (LRU) agar rotasi
+        kunci yang banyak tidak membuat memori tumbuh tanpa batas.
+        """
+        cache_key = (model_name, api_key)
+        with self._wrapper_lock:
+            wrapper = self._wrapper_cache.get(cache_key)
+            if wrapper is not None:
+                self._wrapper_cache.move_to_end(cache_key)
+                return wrapper
+
         WrapperClass = self.wrappers.get(model_name, self.wrappers["default"])
-        
         if model_name == "google":
             wrapper = WrapperClass(api_key)
         else:
             wrapper = WrapperClass(api_key, model_name)
-            
-        return wrapper.generate(prompt)
\ No newline at end of file
+
+        with self._wrapper_lock:
+            # Thread lain mungkin sudah membuat wrapper yang sama; pakai yang pertama
+            wrapper = self._wrapper_cache.setdefault(cache_key, wrapper)
+            self._wrapper_cache.move_to_end(cache_key)
+            while len(self._wrapper_cache) > self.max_cached_wrappers:
+                self._wrapper_cache.popitem(last=False)
+        return wrapper
+
+    def get_quota_stats(self) -> dict:
+        """Penggunaan kuota per kunci API (permintaan/token per menit, error rate, status istirahat)."""
+        return self.account_switcher.get_stats()
+
+    def _report_usage(self, task_type: str, model_name: str, api_key: str, prompt: str, result):
+        """Mencatat hasil permintaan ke penjadwal kunci dan log (perkiraan token prompt + respons)."""
+        prompt_tokens = estimate_tokens(prompt)
+        if result is None:
+            logging.info(f"Panggilan LLM '{task_type}' ({model_name}) gagal: ~{prompt_tokens} token prompt.")
+            self.account_switcher.report_failure(api_key)
+            return
+        response_tokens = estimate_tokens(json.dumps(result, ensure_ascii=False, default=str))
+        logging.info(f"Panggilan LLM '{task_type}' ({model_name}): ~{prompt_tokens} token prompt "
+                     f"+ ~{response_tokens} token respons.")
+        self.account_switcher.report_success(api_key, prompt_tokens + response_tokens)
+
+    def get_cache_stats(self) -> dict:
+        """Statistik cache respons LLM (hits, misses, hit_rate, entries, size_bytes)."""
+        return self.response_cache.get_stats()
+
+    # --- JALUR ASYNC STREAMING ---
+    def _get_async_loop(self):
+        """
+        Mendapatkan event loop milik router yang berjalan di thread latar belakang
+        dan dipakai ulang antar panggilan (sesi HTTP async & semaphore tetap hidup).
+        """
+        with self._async_lock:
+            if self._async_loop is None or self._async_loop.is_closed():
+                self._async_loop = asyncio.new_event_loop()
+                self._async_thread = threading.Thread(
+                    target=self._async_loop.run_forever,
+                    name="LLMRouterLoop",
+                    daemon=True
+                )
+                self._async_thread.start()
+        return self._async_loop
+
+    def _submit_generation(self, task_type: str, prompt: str, on_field=None, model_name: str = None,
+                           reservation: KeyReservation = None):
+        """
+        Menjadwalkan satu generasi dan mengembalikan `concurrent.futures.Future`.
+        Dengan streaming aktif, generasi berjalan sebagai task asyncio;
+        `future.cancel()` membatalkan task dan menutup stream-nya.
+        """
+        if self.async_client:
+            return asyncio.run_coroutine_threadsafe(
+                self._generate_async(task_type, prompt, on_field, model_name, reservation), self._get_async_loop()
+            )
+        return self.executor.submit(self._generate, task_type, prompt, on_field, model_name, reservation)
+
+    def _resolve_model(self, task_type: str, model_name: str = None, reservation: KeyReservation = None):
+        """Model & reservasi kunci yang dipaksakan pemanggil (dewan/hedge), atau pilihan default untuk tugas."""
+        if model_name is None:
+            return self.select_model_for_task(task_type)
+        return model_name, reservation or self._rotate_key(model_name)
+
+    def _claim_key(self, task_type: str, model_name: str, reservation: KeyReservation):
+        """
+        Mengklaim reservasi tepat sebelum permintaan dikirim.
+        Returns:
+            tuple: (boleh_dikirim, api_key); tidak boleh dikirim jika reservasi sudah
+                dilepas pemanggil (tugas dewan dibatalkan sebelum sempat berjalan).
+        """
+        if not self.account_switcher.claim(reservation):
+            logging.debug(f"Permintaan LLM '{task_type}' ({model_name}) dibatalkan sebelum dikirim.")
+            return False, None
+        return True, reservation.api_key if reservation else None
+
+    async def _generate_async(self, task_type: str, prompt: str, on_field=None, model_name: str = None,
+                              reservation: KeyReservation = None):
+        """Versi async streaming dari `_generate` (melalui cache respons yang sama)."""
+        # Pemilihan kunci (lock penjadwal) dan cache SQLite bersifat blocking:
+        # dijalankan di thread pool agar tidak menahan stream lain di event loop
+        # Cache dicek sebelum memilih model: kunci cache tidak bergantung pada model yang terpilih
+        cached = await asyncio.to_thread(self.response_cache.get, task_type, prompt)
+        if cached is not None:
+            logging.debug(f"Respons LLM untuk '{task_type}' diambil dari cache.")
+            # Kunci yang sudah dipesan pemanggil (dewan/hedge) tidak jadi dipakai
+            self.account_switcher.release(reservation)
+            self._emit_fields(cached, on_field)
+            return cached
+        model_name, reservation = await asyncio.to_thread(self._resolve_model, task_type, model_name, reservation)
+        claimed, api_key = self._claim_key(task_type, model_name, reservation)
+        if not claimed:
+            return None
+
+        started_at = time.monotonic()
+        result = await self.async_client.generate(model_name, api_key, prompt, on_field=on_field)
+        if result is not None:
+            self.model_latency[model_name].record(time.monotonic() - started_at)
+        self._report_usage(task_type, model_name, api_key, prompt, result)
+        await asyncio.to_thread(self.response_cache.put, task_type, prompt, result, model_name)
+        return result
+
+    @staticmethod
+    def _emit_fields(result, on_field):
+        """Memanggil `on_field` untuk respons yang tidak di-stream (cache/wrapper sinkron)."""
+        if not on_field:
+            return
+        if isinstance(result, dict):
+            for key, value in result.items():
+                on_field(key, value)
+        elif isinstance(result, list):
+            for index, value in enumerate(result):
+                on_field(index, value)
+
+    def close(self):
+        """Menghentikan pool thread dewan dan loop async, serta mengosongkan cache wrapper. Panggil saat shutdown."""
+        self.executor.shutdown(wait=False)
+        with self._wrapper_lock:
+            self._wrapper_cache.clear()
+        if self._async_loop is not None and not self._async_loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(self.async_client.close(), self._async_loop).result(timeout=5)
+            except Exception as e:
+                logging.warning(f"Gagal menutup sesi LLM async: {e}")
+            self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+
+    def run_single_analysis(self, task_type: str, article_text: str):
+        """Menjalankan satu tugas analisis pada model AI yang paling sesuai."""
+        return self._generate(task_type, build_single_prompt(task_type, article_text))
+
+    def run_batch_analysis(self, task_type: str, articles: list, max_chars: int = 2000):
+        """
+        Menjalankan satu tugas analisis untuk sekumpulan artikel dalam satu prompt.
+        Returns:
+            dict: {article_id: laporan atau None}.
+        """
+        prompt = build_batch_prompt(task_type, articles, max_chars)
+        return parse_batch_response(self._generate(task_type, prompt), [article['id'] for article in articles])
+
+    def _generate(self, task_type: str, prompt: str, on_field=None, model_name: str = None,
+                  reservation: KeyReservation = None):
+        """Mengirim prompt ke model yang sesuai untuk tugas (atau model yang dipaksakan), melalui cache respons."""
+        # Cache dicek sebelum memilih model: kunci cache tidak bergantung pada model yang terpilih
+        cached = self.response_cache.get(task_type, prompt)
+        if cached is not None:
+            logging.debug(f"Respons LLM untuk '{task_type}' diambil dari cache.")
+            # Kunci yang sudah dipesan pemanggil (dewan/hedge) tidak jadi dipakai
+            self.account_switcher.release(reservation)
+            self._emit_fields(cached, on_field)
+            return cached
+        model_name, reservation = self._resolve_model(task_type, model_name, reservation)
+        claimed, api_key = self._claim_key(task_type, model_name, reservation)
+        if not claimed:
+            return None
+
+        wrapper = self._get_wrapper(model_name, api_key)
+        started_at = time.monotonic()
+        result = wrapper.generate(prompt)
+        if result is not None:
+            self.model_latency[model_name].record(time.monotonic() - started_at)
+        self._report_usage(task_type, model_name, api_key, prompt, result)
+        self.response_cache.put(task_type, prompt, result, model_name)
+        self._emit_fields(result, on_field)
+        return result
\ No newline at end of file
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# ==          KLIEN LLM ASYNC STREAMING (SSE) - PROJECT CHIMERA               ==
+# ==============================================================================
+#
+# Lokasi: AI_BRAIN/model_wrappers/async_streaming_client.py
+# Deskripsi: Jalur generasi berbasis asyncio untuk Dewan AI. Respons di-stream
+#            (server-sent events untuk OpenRouter, stream SDK async untuk
+#            Gemini) dan blok JSON di-parse secara inkremental, sehingga
+#            field terstruktur bisa dipakai begitu selesai. Setiap provider
+#            dibatasi semaphore konkurensi, dan permintaan bisa dibatalkan
+#            (task asyncio dibatalkan -> koneksi stream ditutup).
+#
+# ==============================================================================
+
+import asyncio
+import json
+import logging
+
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import report_rate_limit
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logging.warning("aiohttp tidak ditemukan. Klien LLM streaming async akan dinonaktifkan.")
+
+
+class IncrementalJSONParser:
+    """
+    Parser JSON inkremental untuk teks yang datang sepotong-sepotong.
+    Mencari blok JSON pertama (objek atau array; teks/pagar ``` di depannya
+    diabaikan) dan memanggil `on_field(key, value)` setiap kali satu field
+    tingkat atas selesai: pasangan kunci-nilai untuk objek, atau
+    (indeks, elemen) untuk array.
+    """
+
+    def __init__(self, on_field=None):
+        self.on_field = on_field
+        self.buffer = ''
+        self.root = None
+        self.result = None
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start = None
+        self._current_key = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> list:
+        """
+        Menambahkan potongan teks.
+        Returns:
+            list: Field yang baru selesai, [(key, value), ...].
+        """
+        self.buffer += chunk
+        events = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self.done:
+            ch = buffer[self._pos]
+            if self.root is None:
+                if ch in '{[':
+                    self.root = ch
+                    self.result = {} if ch == '{' else []
+                    self._depth = 1
+                    if ch == '[':
+                        self._value_start = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._current_key = json.loads(buffer[self._key_start:self._pos + 1])
+                        self._key_start = None
+            elif ch == '"':
+                self._in_string = True
+                if (self._depth == 1 and self.root == '{'
+                        and self._value_start is None and self._current_key is None):
+                    self._key_start = self._pos
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete(events, self._pos)
+                    self.done = True
+            elif ch == ':' and self._depth == 1 and self.root == '{' and self._value_start is None:
+                self._value_start = self._pos + 1
+            elif ch == ',' and self._depth == 1:
+                self._complete(events, self._pos)
+                if self.root == '[':
+                    self._value_start = self._pos + 1
+            self._pos += 1
+        return events
+
+    def _complete(self, events, end):
+        if self._value_start is None:
+            return
+        text = self.buffer[self._value_start:end].strip()
+        key = self._current_key if self.root == '{' else len(self.result)
+        self._value_start = None
+        self._current_key = None
+        if not text:
+            return
+        try:
+            value = json.loads(text)
+        except ValueError:
+            logging.debug(f"Field JSON stream tidak valid dilewati: {text[:80]}")
+            return
+        if self.root == '{':
+            self.result[key] = value
+        else:
+            self.result.append(value)
+        events.append((key, value))
+        if self.on_field:
+            self.on_field(key, value)
+
+
+def parse_final_json(raw_text: str, parser: IncrementalJSONParser = None):
+    """
+    Mem-parsing teks lengkap seperti wrapper sinkron (membuang pagar ```json).
+    Jika gagal (misal ada teks tambahan di belakang), memakai hasil parser inkremental.
+    """
+    clean_text = (raw_text or '').strip()
+    if clean_text.startswith("```json"):
+        clean_text = clean_text[7:]
+    if clean_text.endswith("```"):
+        clean_text = clean_text[:-3]
+    try:
+        return json.loads(clean_text.strip())
+    except ValueError:
+        if parser is not None and parser.done:
+            return parser.result
+        logging.error("Respons stream LLM tidak berisi JSON yang valid.")
+        return None
+
+
+class AsyncLLMClient:
+    """
+    Klien generasi LLM berbasis asyncio dengan streaming. Harus dipakai dari
+    satu event loop (misal loop latar belakang milik LLMRouter).
+
+        [llm]
+        streaming = true
+        stream_timeout_seconds = 60
+
+        [llm.concurrency]
+        default = 8
+        google = 4
+    """
+
+    OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+    def __init__(self, concurrency_limits: dict = None, timeout_seconds: float = 60, providers=None):
+        """
+        Args:
+            concurrency_limits (dict): Jumlah permintaan paralel maksimum per provider
+                                       (nama model pendek), dengan kunci 'default'.
+            timeout_seconds (float): Batas waktu total satu permintaan stream.
+            providers (list, optional): Provider yang akan dipakai; menentukan ukuran pool koneksi.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp diperlukan untuk klien LLM streaming async.")
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.timeout_seconds = timeout_seconds
+        self.providers = list(providers) if providers is not None else None
+        self._semaphores = {}
+        self._session = None
+
+    # --- 1. SUMBER DAYA (DIBUAT DI DALAM EVENT LOOP) ---
+    def _provider_limit(self, provider: str) -> int:
+        return int(self.concurrency_limits.get(provider, self.concurrency_limits.get('default', 8)))
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self._provider_limit(provider))
+        return self._semaphores[provider]
+
+    def connection_limit(self) -> int:
+        """
+        Ukuran pool koneksi: jumlah slot semaphore semua provider. Provider selain
+        Gemini berbagi host openrouter.ai, jadi pool harus muat semuanya sekaligus;
+        jika lebih kecil, permintaan yang lolos semaphore mengantre koneksi di dalam
+        batas waktu totalnya. 0 (tanpa batas) jika daftar provider tidak diketahui,
+        karena semaphore sudah membatasi paralelisme.
+        """
+        if self.providers is None:
+            return 0
+        return sum(self._provider_limit(provider) for provider in set(self.providers))
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            # Satu sesi untuk seluruh loop: koneksi TLS ke openrouter.ai dipakai ulang
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                connector=aiohttp.TCPConnector(limit=self.connection_limit())
+            )
+        return self._session
+
+    # --- 2. STREAM TEKS ---
+    async def _stream_openrouter(self, model_name: str, api_key: str, prompt: str):
+        from AI_BRAIN.model_wrappers.openrouter_wrapper import OpenRouterWrapper
+        full_model_name = OpenRouterWrapper._get_full_model_name(model_name)
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        body = {"model": full_model_name, "messages": [{"role": "user", "content": prompt}], "stream": True}
+
+        session = await self._get_session()
+        async with session.post(self.OPENROUTER_URL, headers=headers, json=body) as response:
+            response.raise_for_status()
+            async for raw_line in response.content:
+                line = raw_line.decode('utf-8', errors='replace').strip()
+                # Baris kosong dan komentar SSE (": OPENROUTER PROCESSING") diabaikan
+                if not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                if payload == '[DONE]':
+                    break
+                try:
+                    delta = json.loads(payload)['choices'][0].get('delta', {})
+                except (ValueError, KeyError, IndexError):
+                    continue
+                if delta.get('content'):
+                    yield delta['content']
+
+    async def _stream_gemini(self, api_key: str, prompt: str):
+        from AI_BRAIN.model_wrappers.gemini_wrapper import (GEMINI_API_URL, GEMINI_MODEL, gemini_headers,
+                                                            gemini_request_body, gemini_response_text)
+        # REST SSE dengan kunci per permintaan: tidak ada status global klien `genai`
+        url = f"{GEMINI_API_URL}/{GEMINI_MODEL}:streamGenerateContent?alt=sse"
+        session = await self._get_session()
+        async with session.post(url, headers=gemini_headers(api_key), json=gemini_request_body(prompt)) as response:
+            response.raise_for_status()
+            async for raw_line in response.content:
+                line = raw_line.decode('utf-8', errors='replace').strip()
+                if not line.startswith('data:'):
+                    continue
+                try:
+                    text = gemini_response_text(json.loads(line[5:].strip()))
+                except ValueError:
+                    continue
+                if text:
+                    yield text
+
+    async def stream_text(self, model_name: str, api_key: str, prompt: str):
+        """
+        Async generator potongan teks dari model. Membatalkan task pemanggil
+        menutup koneksi stream dan melepaskan slot semaphore.
+        """
+        async with self._semaphore(model_name):
+            if model_name == "google":
+                source = self._stream_gemini(api_key, prompt)
+            else:
+                source = self._stream_openrouter(model_name, api_key, prompt)
+            async for text in source:
+                yield text
+
+    # --- 3. GENERASI DENGAN PARSING JSON INKREMENTAL ---
+    async def generate(self, model_name: str, api_key: str, prompt: str, on_field=None):
+        """
+        Menghasilkan respons JSON dari model secara streaming.
+        Args:
+            model_name (str): Nama model pendek (misal 'google', 'deepseek').
+            api_key (str): Kunci API.
+            prompt (str): Prompt.
+            on_field (callable, optional): Dipanggil dengan (key, value) untuk
+                                           setiap field tingkat atas yang selesai.
+        Returns:
+            dict | list: JSON hasil parsing, atau None jika gagal.
+        """
+        parser = IncrementalJSONParser(on_field)
+
+        async def consume():
+            async for text in self.stream_text(model_name, api_key, prompt):
+                parser.feed(text)
+
+        try:
+            await asyncio.wait_for(consume(), timeout=self.timeout_seconds)
+        except asyncio.CancelledError:
+            logging.debug(f"Stream LLM {model_name} dibatalkan.")
+            raise
+        except Exception as e:
+            # aiohttp.ClientResponseError membawa `status`/`headers`
+            status = getattr(e, 'status', None)
+            if report_rate_limit(api_key, status, getattr(e, 'headers', None)):
+                logging.warning(f"Stream LLM {model_name} ditolak (HTTP {status}): kunci diistirahatkan.")
+            else:
+                logging.error(f"Stream LLM {model_name} gagal: {e}")
+            return parser.result if parser.done else None
+        return parse_final_json(parser.buffer, parser)
+
+    async def close(self):
+        """Menutup sesi HTTP async."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
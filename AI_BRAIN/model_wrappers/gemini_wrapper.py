@@ -9,14 +9,43 @@
 #
 # ==============================================================================
 
-import google.generativeai as genai
+import requests
 import logging
 import json
 
+from UTILS.http_session import get_http_session
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import report_rate_limit
+
+GEMINI_MODEL = 'gemini-pro'
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+
+def gemini_headers(api_key: str) -> dict:
+    """Header REST Gemini. Kunci dikirim per permintaan, tanpa `genai.configure` global."""
+    return {"x-goog-api-key": api_key, "Content-Type": "application/json"}
+
+
+def gemini_request_body(prompt: str) -> dict:
+    return {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+
+
+def gemini_response_text(data: dict) -> str:
+    """Teks dari respons (atau potongan stream) `generateContent`."""
+    candidates = data.get('candidates') or []
+    if not candidates:
+        return ''
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    return ''.join(part.get('text', '') for part in parts)
+
+
 class GeminiWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
     """
     Wrapper untuk menangani permintaan ke Google Gemini Pro API.
+    Instance dibuat sekali per kunci API dan dipakai ulang oleh LLMRouter.
+    Memakai REST API dengan kunci eksplisit di setiap permintaan, sehingga
+    banyak kunci bisa dipakai paralel tanpa status global klien `genai`.
     """
+
     def __init__(self, api_key: str):
         """
         Inisialisasi klien Gemini.
@@ -24,13 +53,13 @@ class GeminiWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
         Args:
             api_key (str): Kunci API untuk Google Gemini.
         """
-        try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
-            logging.info("Wrapper Gemini berhasil diinisialisasi.")
-        except Exception as e:
-            logging.critical(f"Gagal mengkonfigurasi Gemini: {e}", exc_info=True)
+        if not api_key:
+            logging.critical("Gagal mengkonfigurasi Gemini: kunci API kosong.")
             raise ConnectionError("Gagal inisialisasi Gemini Wrapper.")
+        self.api_key = api_key
+        self.url = f"{GEMINI_API_URL}/{GEMINI_MODEL}:generateContent"
+        self.headers = gemini_headers(api_key)
+        logging.info("Wrapper Gemini berhasil diinisialisasi.")
 
     def generate(self, prompt: str):
         """
@@ -42,10 +71,13 @@ class GeminiWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
         Returns:
             dict: Hasil yang sudah di-parse dalam format dictionary, atau None jika gagal.
         """
+        raw_text = None
         try:
             logging.debug("Mengirim permintaan ke Gemini...")
-            response = self.model.generate_content(prompt)
-            raw_text = response.text
+            # Sesi bersama: koneksi TLS ke generativelanguage.googleapis.com dipakai ulang
+            response = get_http_session().post(self.url, headers=self.headers, json=gemini_request_body(prompt), timeout=60)
+            response.raise_for_status()
+            raw_text = gemini_response_text(response.json())
             
             # Membersihkan dan mem-parsing output JSON dari model
             clean_text = raw_text.strip()
@@ -58,6 +90,13 @@ class GeminiWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
             logging.error(f"Gemini tidak mengembalikan JSON yang valid: {e}")
             logging.debug(f"Raw output dari Gemini: {raw_text}")
             return None
+        except requests.exceptions.RequestException as e:
+            response = getattr(e, 'response', None)
+            if response is not None and report_rate_limit(self.api_key, response.status_code, response.headers):
+                logging.warning(f"Gemini menolak permintaan (HTTP {response.status_code}): kunci diistirahatkan.")
+                return None
+            logging.error(f"Error koneksi ke Gemini: {e}")
+            return None
         except Exception as e:
             logging.error(f"Terjadi error saat berkomunikasi dengan Gemini: {e}", exc_info=True)
             return None
\ No newline at end of file
@@ -13,6 +13,9 @@ import requests
 import logging
 import json
 
+from UTILS.http_session import get_http_session
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import report_rate_limit
+
 class OpenRouterWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
     """
     Wrapper untuk menangani permintaan ke berbagai model via OpenRouter.
@@ -35,7 +38,8 @@ class OpenRouterWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
         }
         logging.info(f"Wrapper OpenRouter diinisialisasi untuk model: {self.model_name}")
 
-    def _get_full_model_name(self, short_name: str) -> str:
+    @staticmethod
+    def _get_full_model_name(short_name: str) -> str:
         """Menerjemahkan nama pendek ke nama model lengkap di OpenRouter."""
         model_map = {
             "deepseek": "deepseek/deepseek-chat",
@@ -61,7 +65,8 @@ class OpenRouterWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
         
         try:
             logging.debug(f"Mengirim permintaan ke OpenRouter untuk model {self.model_name}...")
-            response = requests.post(self.API_URL, headers=self.headers, json=body, timeout=60)
+            # Sesi bersama: koneksi TLS ke openrouter.ai dipakai ulang antar panggilan
+            response = get_http_session().post(self.API_URL, headers=self.headers, json=body, timeout=60)
             response.raise_for_status()
             
             data = response.json()
@@ -78,6 +83,10 @@ class OpenRouterWrapper: # <--- PASTIKAN NAMA KELAS PERSIS SEPERTI INI
             logging.debug(f"Raw output dari {self.model_name}: {raw_text}")
             return None
         except requests.exceptions.RequestException as e:
+            response = getattr(e, 'response', None)
+            if response is not None and report_rate_limit(self.api_key, response.status_code, response.headers):
+                logging.warning(f"OpenRouter menolak permintaan {self.model_name} (HTTP {response.status_code}): kunci diistirahatkan.")
+                return None
             logging.error(f"Error koneksi ke OpenRouter: {e}")
             return None
         except Exception as e:
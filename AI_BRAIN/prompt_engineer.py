@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# ==              PROMPT ENGINEER (BATCH & ANGGARAN TOKEN) - PROJECT CHIMERA  ==
+# ==============================================================================
+#
+# Lokasi: AI_BRAIN/prompt_engineer.py
+# Deskripsi: Menyusun prompt untuk Dewan AI. Mendukung mode batch: banyak
+#            artikel dikemas ke satu prompt per anggota dewan dengan ID per
+#            artikel dan format respons berupa array JSON, dibagi menjadi
+#            beberapa batch agar setiap prompt muat dalam anggaran token.
+#            Juga memadatkan laporan multidimensi (QuantumSentientAnalyzer)
+#            menjadi JSON ringkas yang muat dalam anggaran token.
+#
+# ==============================================================================
+
+import json
+import logging
+import math
+
+# Perkiraan kasar rata-rata karakter per token untuk teks campuran Inggris/Indonesia
+CHARS_PER_TOKEN = 4
+
+# Kunci laporan yang dibaca oleh DataSynthesizer
+REPORT_FIELDS = {
+    "Overall Market Sentiment": "BULLISH | BEARISH | NEUTRAL",
+    "confidence": "angka 0-1",
+    "Top Performing Cryptos": ["simbol"],
+    "Cryptos to Watch Cautiously": ["simbol"],
+    "Market Risks": ["teks singkat"],
+    "Opportunities": ["teks singkat"],
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Perkiraan jumlah token sebuah teks (tanpa tokenizer model)."""
+    return max(1, math.ceil(len(text or '') / CHARS_PER_TOKEN))
+
+
+def build_single_prompt(task_type: str, article_text: str, max_chars: int = 2000) -> str:
+    """Prompt satu artikel untuk satu anggota dewan (format lama). `max_chars=None` tanpa pemotongan."""
+    text = article_text if max_chars is None else article_text[:max_chars]
+    return f"Analyze the following article for {task_type}:\n\n{text}"
+
+
+def _batch_header(task_type: str) -> str:
+    return (
+        f"Analyze each of the following news articles for {task_type}.\n"
+        f"Respond ONLY with a JSON array containing exactly one object per article, in any order. "
+        f"Each object must include the article's \"id\" exactly as given, plus these fields: "
+        f"{json.dumps(REPORT_FIELDS)}\n\n"
+    )
+
+
+def _format_article(article: dict, max_chars: int) -> str:
+    return f"### ARTICLE id={article['id']}\n{article['text'][:max_chars]}\n\n"
+
+
+def build_batch_prompt(task_type: str, articles: list, max_chars: int = 2000) -> str:
+    """
+    Prompt batch: beberapa artikel dalam satu permintaan, masing-masing dengan ID.
+    Args:
+        task_type (str): Jenis tugas anggota dewan (misal 'risk_scenario').
+        articles (list): [{'id': str, 'text': str}, ...].
+        max_chars (int): Batas karakter per artikel.
+    """
+    return _batch_header(task_type) + ''.join(_format_article(article, max_chars) for article in articles)
+
+
+def split_into_batches(task_type: str, articles: list, token_budget: int, max_chars: int = 2000,
+                       max_articles_per_batch: int = 20) -> list:
+    """
+    Membagi artikel menjadi batch yang prompt-nya muat dalam `token_budget`.
+    Artikel yang sendirian sudah melebihi anggaran tetap dikirim sebagai batch
+    tunggal (teksnya sudah dipotong `max_chars`).
+    Returns:
+        list: Daftar batch, masing-masing berupa list artikel.
+    """
+    header_tokens = estimate_tokens(_batch_header(task_type))
+    batches, current, current_tokens = [], [], header_tokens
+    for article in articles:
+        article_tokens = estimate_tokens(_format_article(article, max_chars))
+        if current and (current_tokens + article_tokens > token_budget or len(current) >= max_articles_per_batch):
+            batches.append(current)
+            current, current_tokens = [], header_tokens
+        current.append(article)
+        current_tokens += article_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(response, expected_ids) -> dict:
+    """
+    Memetakan respons batch (array JSON) kembali ke artikel berdasarkan ID.
+    Menerima juga bentuk {"results": [...]} atau dict {id: laporan}.
+    Returns:
+        dict: {article_id: laporan atau None jika tidak ada di respons}.
+    """
+    expected_ids = [str(article_id) for article_id in expected_ids]
+    reports = {article_id: None for article_id in expected_ids}
+    if isinstance(response, dict):
+        if isinstance(response.get('results'), list):
+            response = response['results']
+        else:
+            response = [dict(report, id=key) for key, report in response.items() if isinstance(report, dict)]
+    if not isinstance(response, list):
+        return reports
+
+    for report in response:
+        if isinstance(report, dict) and str(report.get('id')) in reports:
+            reports[str(report['id'])] = {k: v for k, v in report.items() if k != 'id'}
+    missing = [article_id for article_id, report in reports.items() if report is None]
+    if missing:
+        logging.warning(f"Respons batch tidak memuat {len(missing)} dari {len(expected_ids)} artikel: {missing[:5]}")
+    return reports
+
+
+# --- KOMPAKSI LAPORAN MULTIDIMENSI ---
+# Teks placeholder (belum ada data nyata) dibuang dari prompt
+PLACEHOLDER_MARKERS = ('data dummy', 'placeholder', 'n/a')
+
+# Singkatan per kata untuk kunci snake_case (kunci tetap terbaca oleh model)
+WORD_ABBREVIATIONS = {
+    'activity': 'act', 'adoption': 'adopt', 'amount': 'amt', 'analysis': 'an', 'calculated': 'calc',
+    'candlestick': 'candle', 'community': 'comm', 'confirmation': 'conf', 'correlation': 'corr',
+    'derivatives': 'deriv', 'development': 'dev', 'distance': 'dist', 'distribution': 'distr',
+    'diversification': 'divers', 'economic': 'econ', 'employment': 'empl', 'exchange': 'exch',
+    'growth': 'grw', 'imbalance': 'imbal', 'index': 'idx', 'indicators': 'ind', 'indices': 'idx',
+    'inflation': 'infl', 'interpretation': 'interp', 'journal': 'jrnl', 'management': 'mgmt',
+    'market': 'mkt', 'mentions': 'ment', 'momentum': 'mom', 'monetary': 'mon', 'narrative': 'narr',
+    'negative': 'neg', 'onchain': 'oc', 'patterns': 'pat', 'policy': 'pol', 'portfolio': 'pf',
+    'position': 'posn', 'positive': 'pos', 'profile': 'prof', 'regulation': 'reg', 'sentiment': 'sent',
+    'signals': 'sig', 'sizing': 'size', 'social': 'soc', 'strength': 'str', 'structure': 'struct',
+    'suggested': 'sugg', 'technology': 'tech', 'tracking': 'trk', 'trading': 'trd', 'volatility': 'vlt',
+    'volume': 'vol',
+}
+
+# Tahap pemadatan bertahap: (pengurangan angka penting, batas karakter teks; 0 = teks dibuang)
+COMPACTION_LEVELS = ((0, None), (1, 120), (1, 48), (2, 0))
+
+
+def abbreviate_key(key) -> str:
+    """Menyingkat kunci snake_case per kata, misal 'momentum_indicators' -> 'mom_ind'."""
+    return '_'.join(WORD_ABBREVIATIONS.get(word, word) for word in str(key).split('_'))
+
+
+def _is_placeholder(text: str, markers) -> bool:
+    lowered = text.strip().lower()
+    return not lowered or any(lowered.startswith(marker) for marker in markers)
+
+
+def _compact_value(value, precision: int, max_string_chars, markers):
+    """Nilai yang dipadatkan, atau None jika nilai harus dibuang."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and value != value:  # NaN
+            return None
+        rounded = float(f"{value:.{precision}g}")
+        return int(rounded) if rounded.is_integer() and abs(rounded) < 1e15 else rounded
+    if isinstance(value, str):
+        if max_string_chars == 0 or _is_placeholder(value, markers):
+            return None
+        return value if max_string_chars is None or len(value) <= max_string_chars else value[:max_string_chars - 3] + '...'
+    if isinstance(value, dict):
+        compact = {}
+        for key, item in value.items():
+            item = _compact_value(item, precision, max_string_chars, markers)
+            if item is not None and item != {} and item != []:
+                compact[abbreviate_key(key)] = item
+        return compact
+    if isinstance(value, (list, tuple)):
+        items = [_compact_value(item, precision, max_string_chars, markers) for item in value]
+        return [item for item in items if item is not None and item != {} and item != []]
+    try:
+        # Skalar numpy dan sejenisnya
+        return _compact_value(value.item(), precision, max_string_chars, markers)
+    except AttributeError:
+        return _compact_value(str(value), precision, max_string_chars, markers)
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def compact_report(sections: dict, token_budget: int, precision: int = 5, markers=PLACEHOLDER_MARKERS):
+    """
+    Menyerialisasi laporan multidimensi menjadi JSON ringkas yang muat dalam
+    anggaran token: kunci disingkat, angka dibulatkan, teks placeholder dibuang.
+    Jika masih terlalu besar, teks dipotong lalu dibuang bertahap, dan terakhir
+    bagian paling belakang (prioritas terendah) dihilangkan.
+    Args:
+        sections (dict): {label: data}, urut dari yang paling penting.
+        token_budget (int): Perkiraan token maksimum untuk hasil.
+        precision (int): Jumlah angka penting pada tahap pertama.
+        markers (iterable): Awalan teks placeholder (huruf kecil).
+    Returns:
+        tuple: (teks JSON, perkiraan token, daftar label bagian yang dibuang).
+    """
+    compact = {}
+    for reduction, max_string_chars in COMPACTION_LEVELS:
+        digits = max(2, precision - reduction)
+        compact = {label: _compact_value(data, digits, max_string_chars, markers)
+                   for label, data in sections.items()}
+        compact = {label: data for label, data in compact.items() if data not in (None, {}, [])}
+        text = _dumps(compact)
+        if estimate_tokens(text) <= token_budget:
+            return text, estimate_tokens(text), []
+
+    dropped = []
+    while len(compact) > 1 and estimate_tokens(_dumps(compact)) > token_budget:
+        label = list(compact)[-1]
+        dropped.append(label)
+        del compact[label]
+    text = _dumps(compact)
+    return text, estimate_tokens(text), dropped
@@ -10,10 +10,14 @@
 #            Dirancang untuk berjalan mandiri di VS Code tanpa file CSV eksternal.
 #
 # ==============================================================================
+import heapq
 import logging
 import random # Untuk simulasi data
+import re
 import time # Untuk simulasi jitter API
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from functools import lru_cache
 
 # --- PENYESUAIAN PATH DINAMIS (SEPATI DARI PINDAH PINDAH PINDAH.txt) ---
 # Ini diasumsikan sudah ditangani di tingkat orkestrator
@@ -574,6 +578,625 @@ INTERNAL_COIN_LIST = unique_coins
 
 # --- AKHIR DATA KOIN INTERNAL ---
 
+# --- PRIORITAS PEMINDAIAN ---
+# Skor tingkat volume perdagangan
+VOLUME_PRIORITY = {'Sangat Tinggi': 0.9, 'Tinggi': 0.75, 'Sedang': 0.6, 'Rendah': 0.4, 'Sangat Rendah': 0.2}
+# Kata kunci katalis yang biasanya menggerakkan volume
+CATALYST_KEYWORDS = ('etf', 'institusional', 'institutional', 'halving', 'upgrade', 'launch', 'listing',
+                     'airdrop', 'partnership', 'adoption', 'burn', 'integration', 'growth')
+
+
+def catalyst_score(catalyst: str) -> float:
+    """
+    Skor potensi katalis 0..1: jumlah katalis yang tercantum (dipisah koma)
+    ditambah kata kunci katalis kuat yang muncul.
+    """
+    if not catalyst:
+        return 0.0
+    text = catalyst.lower()
+    count = len([part for part in catalyst.split(',') if part.strip()])
+    hits = sum(1 for keyword in CATALYST_KEYWORDS if keyword in text)
+    return min(1.0, 0.2 * count + 0.15 * hits)
+
+
+def rank_coins(coins: list, top_n: int = None) -> list:
+    """
+    Mengurutkan koin berdasarkan tingkat volume lalu skor katalis (urutan asli
+    sebagai penentu jika sama). Untuk top_n, dipakai heap (O(N log k)).
+    Returns:
+        list: Koin terurut dari prioritas tertinggi.
+    """
+    keyed = ((VOLUME_PRIORITY.get(coin.get('volume_perdagangan'), 0.5), catalyst_score(coin.get('potensi_katalis')), -index, coin)
+             for index, coin in enumerate(coins))
+    if top_n is None or top_n >= len(coins):
+        ranked = sorted(keyed, key=lambda item: item[:3], reverse=True)
+    else:
+        ranked = heapq.nlargest(top_n, keyed, key=lambda item: item[:3])
+    return [item[3] for item in ranked]
+
+# --- REGISTRI KATEGORI ---
+# Kategori analisis -> spesifikasi analisis: kata kunci pencocokan kategori koin,
+# fokus, metrik, dan sinyal simulasi (seksi, kunci, batas bawah, batas atas,
+# jumlah desimal; None = bilangan bulat). Kategori baru cukup ditambahkan di sini.
+DEFAULT_CATEGORY = 'umum'
+CATEGORY_REGISTRY = {
+    'lapis_1': {
+        'keywords': ('lapis 1', 'layer 1'),
+        'focus': 'Analisis teknologi dasar, skalabilitas, dan adopsi pengembang.',
+        'metrics': ['hashrate', 'active_addresses', 'developer_activity', 'block_time', 'gas_used'],
+        'signals': (
+            ('onchain_signals', 'hashrate', 100000, 500000, 2),
+            ('onchain_signals', 'active_addresses', 10000, 100000, None),
+        ),
+    },
+    'lapis_2': {
+        'keywords': ('lapis 2', 'layer 2'),
+        'focus': 'Analisis throughput, biaya transaksi, dan adopsi aplikasi.',
+        'metrics': ['tps', 'avg_gas_price', 'batch_size', 'sequencer_activity'],
+        'signals': (
+            ('onchain_signals', 'tps', 100, 5000, 2),
+            ('onchain_signals', 'avg_gas_price', 10, 100, 2),
+        ),
+    },
+    'defi': {
+        'keywords': ('defi',),
+        'focus': 'Analisis metrik DeFi seperti TVL, yield, dan aktivitas protokol.',
+        'metrics': ['tvl', 'apy/apr', 'total_debt_issued', 'swap_volume'],
+        'signals': (
+            ('onchain_signals', 'tvl', 1000000, 100000000, 2),
+            ('onchain_signals', 'apy', 1, 20, 2),
+        ),
+    },
+    'ai': {
+        'keywords': ('ai', 'artificial intelligence'),
+        'focus': 'Analisis perkembangan jaringan AI, penggunaan token, dan mitra.',
+        'metrics': ['network_utilization', 'data_processed', 'active_agents', 'model_performance'],
+        'signals': (
+            ('onchain_signals', 'network_utilization', 10, 90, 2),
+            ('onchain_signals', 'active_agents', 100, 10000, None),
+        ),
+    },
+    'memecoin': {
+        'keywords': ('memecoin',),
+        'focus': 'Analisis sentimen media sosial, volume perdagangan, dan tren meme.',
+        'metrics': ['social_volume', 'sentiment_score', 'unique_wallets', 'meme_virality_index'],
+        'signals': (
+            ('sentiment_signals', 'social_volume', 10000, 1000000, None),
+            ('sentiment_signals', 'sentiment_score', -1, 1, 2),
+        ),
+    },
+    'payments': {
+        'keywords': ('payments', 'payment'),
+        'focus': 'Analisis adopsi pembayaran, partnership ritel, dan volume transaksi.',
+        'metrics': ['merchant_count', 'transaction_volume', 'average_tx_value', 'payment_success_rate'],
+        'signals': (
+            ('onchain_signals', 'merchant_count', 1000, 100000, None),
+            ('onchain_signals', 'transaction_volume', 1000000, 100000000, 2),
+        ),
+    },
+    'metaverse': {
+        'keywords': ('metaverse',),
+        'focus': 'Analisis aktivitas pengguna di platform, penjualan NFT, dan investasi.',
+        'metrics': ['daily_active_users', 'nft_sales_volume', 'land_price_index', 'virtual_asset_transactions'],
+        'signals': (
+            ('onchain_signals', 'daily_active_users', 1000, 100000, None),
+            ('onchain_signals', 'nft_sales_volume', 100000, 10000000, 2),
+        ),
+    },
+    'oracle': {
+        'keywords': ('oracle',),
+        'focus': 'Analisis jumlah permintaan data, uptime, dan kepercayaan protokol.',
+        'metrics': ['data_requests', 'uptime_percentage', 'secure_agreements', 'feed_diversity'],
+        'signals': (
+            ('onchain_signals', 'data_requests', 10000, 1000000, None),
+            ('onchain_signals', 'uptime_percentage', 99, 100, 2),
+        ),
+    },
+    'gaming': {
+        'keywords': ('gaming',),
+        'focus': 'Analisis aktivitas pemain, NFT marketplace, dan tokenomics.',
+        'metrics': ['daily_active_users', 'nft_trading_volume', 'token_burn_rate', 'in_game_asset_value'],
+        'signals': (
+            ('onchain_signals', 'daily_active_users', 1000, 100000, None),
+            ('onchain_signals', 'nft_trading_volume', 100000, 10000000, 2),
+        ),
+    },
+    'nft': {
+        'keywords': ('nft',),
+        'focus': 'Analisis volume perdagangan NFT, marketplace activity, dan floor price.',
+        'metrics': ['nft_sales_volume', 'marketplace_activity', 'floor_price', 'unique_collectors'],
+        'signals': (
+            ('onchain_signals', 'nft_sales_volume', 100000, 10000000, 2),
+            ('onchain_signals', 'floor_price', 0.01, 10, 4),
+        ),
+    },
+    'privacy': {
+        'keywords': ('privacy',),
+        'focus': 'Analisis adopsi privasi, network hashrate, dan regulatory sentiment.',
+        'metrics': ['network_hashrate', 'mixing_volume', 'regulatory_news', 'anonymity_set_size'],
+        'signals': (
+            ('onchain_signals', 'network_hashrate', 10000, 1000000, 2),
+            ('sentiment_signals', 'regulatory_sentiment', -1, 1, 2),
+        ),
+    },
+    'staking': {
+        'keywords': ('staking',),
+        'focus': 'Analisis APR, jumlah staking, dan likuiditas token staking.',
+        'metrics': ['staking_apr', 'total_staked', 'liquid_staking_supply', 'validator_distribution'],
+        'signals': (
+            ('onchain_signals', 'staking_apr', 5, 20, 2),
+            ('onchain_signals', 'total_staked', 1000000, 100000000, 2),
+        ),
+    },
+    'infrastructure': {
+        'keywords': ('infrastructure', 'interop', 'interoperability'),
+        'focus': 'Analisis adopsi jaringan, jumlah validator, dan integrasi protokol.',
+        'metrics': ['network_adoption', 'validator_count', 'protocol_integrations', 'cross_chain_tx_volume'],
+        'signals': (
+            ('onchain_signals', 'validator_count', 50, 1000, None),
+            ('onchain_signals', 'cross_chain_tx_volume', 1000000, 50000000, 2),
+        ),
+    },
+    'storage': {
+        'keywords': ('storage',),
+        'focus': 'Analisis kapasitas penyimpanan terpakai, jumlah penyedia, dan permintaan data.',
+        'metrics': ['storage_used', 'storage_providers', 'data_requests', 'retrieval_success_rate'],
+        'signals': (
+            ('onchain_signals', 'storage_used', 1000000, 1000000000, 2),  # TB
+            ('onchain_signals', 'storage_providers', 100, 10000, None),
+        ),
+    },
+    'video': {
+        'keywords': ('video',),
+        'focus': 'Analisis bandwidth yang digunakan, jumlah penonton, dan kemitraan konten.',
+        'metrics': ['bandwidth_used', 'viewer_count', 'content_partnerships', 'stream_quality'],
+        'signals': (
+            ('onchain_signals', 'bandwidth_used', 1000000, 100000000, 2),  # GB
+            ('onchain_signals', 'viewer_count', 10000, 1000000, None),
+        ),
+    },
+    'supply_chain': {
+        'keywords': ('supply chain',),
+        'focus': 'Analisis jumlah produk yang dilacak, mitra korporat, dan volume transaksi.',
+        'metrics': ['products_tracked', 'corporate_partners', 'transaction_volume', 'traceability_accuracy'],
+        'signals': (
+            ('onchain_signals', 'products_tracked', 100000, 10000000, None),
+            ('onchain_signals', 'corporate_partners', 10, 1000, None),
+        ),
+    },
+    'exchange_token': {
+        'keywords': ('exchange token',),
+        'focus': 'Analisis volume perdagangan di exchange, jumlah pengguna aktif, dan program burn.',
+        'metrics': ['exchange_volume', 'active_users', 'tokens_burned', 'fee_discount_usage'],
+        'signals': (
+            ('onchain_signals', 'exchange_volume', 100000000, 1000000000, 2),
+            ('onchain_signals', 'active_users', 100000, 10000000, None),
+        ),
+    },
+    'fan_token': {
+        'keywords': ('fan token',),
+        'focus': 'Analisis engagement fans, hasil pertandingan tim, dan aktivitas di platform klub.',
+        'metrics': ['fan_engagement_score', 'team_performance', 'club_platform_activity', 'token_utilization'],
+        'signals': (
+            ('sentiment_signals', 'fan_engagement_score', 0, 100, 2),
+            ('sentiment_signals', 'team_performance', 0, 100, 2),  # Simulasi
+        ),
+    },
+    'rwa': {
+        'keywords': ('rwa', 'real world assets'),
+        'focus': 'Analisis nilai aset yang di-tokenisasi, regulasi, dan adopsi institusional.',
+        'metrics': ['rwa_value_tokenized', 'regulatory_compliance_score', 'institutional_adoptions', 'asset_diversification'],
+        'signals': (
+            ('macro_geopolitical_signals', 'regulatory_compliance_score', 0, 100, 2),
+            ('onchain_signals', 'rwa_value_tokenized', 10000000, 1000000000, 2),
+        ),
+    },
+    'bitcoin_layer': {
+        'keywords': ('bitcoin layer', 'btc layer'),
+        'focus': 'Analisis keterkaitan dengan Bitcoin, security model, dan adopsi spesifik BTC.',
+        'metrics': ['btc_security_utilization', 'btc_locked_value', 'btc_transaction_finality', 'wrapped_btc_supply'],
+        'signals': (
+            ('onchain_signals', 'btc_locked_value', 10000, 1000000, 2),
+            ('onchain_signals', 'wrapped_btc_supply', 100000, 10000000, 2),
+        ),
+    },
+    'dao': {
+        'keywords': ('dao',),
+        'focus': 'Analisis partisipasi voting, jumlah proposal, dan nilai treasury.',
+        'metrics': ['voting_participation', 'proposals_submitted', 'treasury_value', 'active_proposers'],
+        'signals': (
+            ('onchain_signals', 'voting_participation', 10, 90, 2),  # %
+            ('onchain_signals', 'treasury_value', 1000000, 100000000, 2),
+        ),
+    },
+    'energy': {
+        'keywords': ('energy',),
+        'focus': 'Analisis penggunaan energi terbarukan, efisiensi jaringan, dan dampak lingkungan.',
+        'metrics': ['renewable_energy_usage', 'network_energy_efficiency', 'carbon_footprint', 'green_energy_partnerships'],
+        'signals': (
+            ('onchain_signals', 'renewable_energy_usage', 20, 100, 2),  # %
+            ('macro_geopolitical_signals', 'carbon_footprint', 100, 10000, 2),  # Ton CO2
+        ),
+    },
+    'music': {
+        'keywords': ('music',),
+        'focus': 'Analisis jumlah artis yang bermigrasi, volume penjualan musik NFT, dan engagement penggemar.',
+        'metrics': ['migrating_artists', 'music_nft_sales', 'fan_engagement', 'royalty_distribution'],
+        'signals': (
+            ('onchain_signals', 'music_nft_sales', 10000, 1000000, 2),
+            ('sentiment_signals', 'fan_engagement', 0, 100, 2),
+        ),
+    },
+    'identity': {
+        'keywords': ('identity',),
+        'focus': 'Analisis adopsi identitas terdesentralisasi, jumlah verifikasi, dan integrasi dengan aplikasi.',
+        'metrics': ['did_adoptions', 'verifications_completed', 'app_integrations', 'identity_security_score'],
+        'signals': (
+            ('onchain_signals', 'did_adoptions', 10000, 1000000, None),
+            ('onchain_signals', 'verifications_completed', 100000, 10000000, None),
+        ),
+    },
+    'iot': {
+        'keywords': ('iot', 'internet of things'),
+        'focus': 'Analisis jumlah perangkat yang terhubung, volume data yang diproses, dan use case industri.',
+        'metrics': ['connected_devices', 'data_volume_processed', 'industrial_use_cases', 'device_security_level'],
+        'signals': (
+            ('onchain_signals', 'connected_devices', 100000, 100000000, None),
+            ('onchain_signals', 'data_volume_processed', 1000000, 1000000000, 2),  # GB
+        ),
+    },
+    'telecom': {
+        'keywords': ('telecom',),
+        'focus': 'Analisis kapasitas bandwidth yang disediakan, jumlah pengguna, dan kemitraan operator.',
+        'metrics': ['bandwidth_capacity', 'user_base', 'operator_partnerships', 'data_transaction_fees'],
+        'signals': (
+            ('onchain_signals', 'user_base', 100000, 10000000, None),
+            ('onchain_signals', 'bandwidth_capacity', 1000000, 100000000, 2),  # GB
+        ),
+    },
+    'data': {
+        'keywords': ('data',),
+        'focus': 'Analisis volume data yang dijual/beli, jumlah penyedia data, dan kualitas data.',
+        'metrics': ['data_trading_volume', 'data_providers', 'data_quality_index', 'data_monetization_models'],
+        'signals': (
+            ('onchain_signals', 'data_trading_volume', 1000000, 100000000, 2),
+            ('onchain_signals', 'data_providers', 100, 10000, None),
+        ),
+    },
+    'synthetic_assets': {
+        'keywords': ('synthetic assets',),
+        'focus': 'Analisis total nilai aset sintetis yang diterbitkan, leverage yang digunakan, dan likuiditas pasar.',
+        'metrics': ['synthetic_assets_value', 'average_leverage', 'market_liquidity', 'collateral_types'],
+        'signals': (
+            ('onchain_signals', 'synthetic_assets_value', 10000000, 1000000000, 2),
+            ('onchain_signals', 'average_leverage', 1, 50, 2),
+        ),
+    },
+    'ux': {
+        'keywords': ('ux', 'user experience'),
+        'focus': 'Analisis kemudahan penggunaan, adopsi wallet, dan integrasi dengan platform lain.',
+        'metrics': ['ease_of_use_score', 'wallet_adoptions', 'platform_integrations', 'user_onboarding_rate'],
+        'signals': (
+            ('sentiment_signals', 'ease_of_use_score', 1, 10, 2),
+            ('onchain_signals', 'wallet_adoptions', 10000, 1000000, None),
+        ),
+    },
+    'funding': {
+        'keywords': ('funding', 'public goods'),
+        'focus': 'Analisis jumlah dana yang didistribusikan, proyek yang didanai, dan efektivitas mekanisme funding.',
+        'metrics': ['funds_distributed', 'projects_funded', 'funding_efficiency', 'community_participation'],
+        'signals': (
+            ('onchain_signals', 'funds_distributed', 1000000, 100000000, 2),
+            ('onchain_signals', 'projects_funded', 100, 10000, None),
+        ),
+    },
+    'marketplace': {
+        'keywords': ('marketplace',),
+        'focus': 'Analisis volume transaksi, jumlah penjual/penawar, dan reputasi pengguna.',
+        'metrics': ['transaction_volume', 'sellers/bidders', 'user_reputation_scores', 'dispute_resolution_rate'],
+        'signals': (
+            ('onchain_signals', 'transaction_volume', 100000, 10000000, 2),  # Asumsi key typo di sini, perlu fix jika ada
+            ('onchain_signals', 'sellers/bidders', 1000, 100000, None),
+        ),
+    },
+    'liquidity': {
+        'keywords': ('liquidity',),
+        'focus': 'Analisis depth order book, spread, dan volume perdagangan cross-exchange.',
+        'metrics': ['order_book_depth', 'bid_ask_spread', 'cross_exchange_volume', 'liquidity_provider_count'],
+        'signals': (
+            ('technical_indicators', 'order_book_depth', 1000000, 100000000, 2),
+            ('technical_indicators', 'bid_ask_spread', 0.1, 5, 2),  # Basis points
+        ),
+    },
+    'lending': {
+        'keywords': ('lending',),
+        'focus': 'Analisis total pinjaman yang diberikan, tingkat bunga, dan rasio pinjaman terhadap nilai kolateral.',
+        'metrics': ['total_loans_issued', 'interest_rates', 'ltv_ratios', 'default_rates'],
+        'signals': (
+            ('onchain_signals', 'total_loans_issued', 10000000, 1000000000, 2),
+            ('onchain_signals', 'interest_rates', 1, 20, 2),  # %
+        ),
+    },
+    'dex': {
+        'keywords': ('dex', 'dex aggregator'),
+        'focus': 'Analisis volume swap, jumlah pool likuiditas, dan biaya protokol.',
+        'metrics': ['swap_volume', 'liquidity_pools', 'protocol_fees', 'slippage_rates'],
+        'signals': (
+            ('onchain_signals', 'swap_volume', 10000000, 1000000000, 2),
+            ('onchain_signals', 'liquidity_pools', 100, 10000, None),
+        ),
+    },
+    'perp_dex': {
+        'keywords': ('perp dex', 'perpetual dex'),
+        'focus': 'Analisis volume perdagangan perpetual, funding rates, dan open interest.',
+        'metrics': ['perp_trading_volume', 'funding_rates', 'open_interest', 'liquidation_events'],
+        'signals': (
+            ('derivatives_signals', 'perp_trading_volume', 100000000, 10000000000, 2),
+            ('derivatives_signals', 'funding_rates', -0.1, 0.1, 4),  # %
+            ('derivatives_signals', 'open_interest', 10000000, 1000000000, 2),
+        ),
+    },
+    'stablecoin': {
+        'keywords': ('stablecoin',),
+        'focus': 'Analisis kapitalisasi, mekanisme peg, dan cadangan yang mendukung.',
+        'metrics': ['market_cap', 'peg_mechanism', 'reserves/backing', 'redemption_rate'],
+        'signals': (
+            ('onchain_signals', 'market_cap', 100000000, 10000000000, 2),
+            ('onchain_signals', 'redemption_rate', 0.99, 1.01, 4),
+        ),
+    },
+    'indexing': {
+        'keywords': ('indexing',),
+        'focus': 'Analisis jumlah query yang diproses, jumlah subgraph/dataset yang diindeks, dan uptime layanan.',
+        'metrics': ['queries_processed', 'subgraphs/datasets_indexed', 'service_uptime', 'query_response_time'],
+        'signals': (
+            ('onchain_signals', 'queries_processed', 1000000, 100000000, None),
+            ('onchain_signals', 'subgraphs/datasets_indexed', 1000, 100000, None),
+        ),
+    },
+    'depin': {
+        'keywords': ('depin', 'decentralized physical infrastructure'),
+        'focus': 'Analisis jumlah node/hardware yang berpartisipasi, uptime jaringan, dan nilai token yang dikunci.',
+        'metrics': ['participating_nodes', 'network_uptime', 'token_locked_value', 'resource_provisioned'],
+        'signals': (
+            ('onchain_signals', 'participating_nodes', 1000, 1000000, None),
+            ('onchain_signals', 'network_uptime', 99, 100, 2),  # %
+        ),
+    },
+    'modular': {
+        'keywords': ('modular', 'data availability'),
+        'focus': 'Analisis jumlah rollups/appchains yang terhubung, throughput yang ditangani, dan interoperabilitas.',
+        'metrics': ['connected_rollups/appchains', 'handled_throughput', 'interoperability_score', 'modular_components_used'],
+        'signals': (
+            ('onchain_signals', 'connected_rollups/appchains', 10, 1000, None),
+            ('onchain_signals', 'handled_throughput', 1000, 100000, 2),  # TPS
+        ),
+    },
+    'zero_knowledge': {
+        'keywords': ('zero-knowledge', 'zk'),
+        'focus': 'Analisis jumlah transaksi ZK yang diproses, waktu verifikasi, dan adopsi aplikasi ZK.',
+        'metrics': ['zk_transactions_processed', 'verification_time', 'zk_app_adoptions', 'proof_size'],
+        'signals': (
+            ('onchain_signals', 'zk_transactions_processed', 10000, 10000000, None),
+            ('onchain_signals', 'verification_time', 1, 1000, 2),  # ms
+        ),
+    },
+    'move': {
+        'keywords': ('move',),
+        'focus': 'Analisis adopsi bahasa Move, jumlah modul yang dideploy, dan keamanan kontrak.',
+        'metrics': ['move_adoptions', 'modules_deployed', 'contract_security_audits', 'parallel_execution_efficiency'],
+        'signals': (
+            ('onchain_signals', 'move_adoptions', 1000, 100000, None),
+            ('onchain_signals', 'modules_deployed', 10000, 1000000, None),
+        ),
+    },
+    'enterprise': {
+        'keywords': ('enterprise',),
+        'focus': 'Analisis jumlah kemitraan enterprise, penggunaan dalam solusi B2B, dan regulasi yang sesuai.',
+        'metrics': ['enterprise_partnerships', 'b2b_solution_usage', 'regulatory_compliance', 'enterprise_transaction_volume'],
+        'signals': (
+            ('macro_geopolitical_signals', 'enterprise_partnerships', 10, 1000, None),
+            ('onchain_signals', 'enterprise_transaction_volume', 1000000, 100000000, 2),
+        ),
+    },
+    'platform': {
+        'keywords': ('platform',),
+        'focus': 'Analisis jumlah dApp yang berjalan, aktivitas pengguna di platform, dan ekosistem pengembang.',
+        'metrics': ['dapps_running', 'platform_user_activity', 'developer_ecosystem', 'smart_contract_deployments'],
+        'signals': (
+            ('onchain_signals', 'dapps_running', 100, 10000, None),
+            ('onchain_signals', 'platform_user_activity', 10000, 1000000, None),
+        ),
+    },
+    'dag': {
+        'keywords': ('dag', 'directed acyclic graph'),
+        'focus': 'Analisis throughput transaksi, finality time, dan struktur jaringan DAG.',
+        'metrics': ['transaction_throughput', 'finality_time', 'dag_structure_efficiency', 'confirmation_latency'],
+        'signals': (
+            ('onchain_signals', 'transaction_throughput', 1000, 100000, 2),  # TPS
+            ('onchain_signals', 'finality_time', 1, 60, 2),  # seconds
+        ),
+    },
+    'utxo': {
+        'keywords': ('utxo',),
+        'focus': 'Analisis jumlah transaksi UTXO, ukuran mempool, dan efisiensi penggunaan UTXO set.',
+        'metrics': ['utxo_transactions', 'mempool_size', 'utxo_set_efficiency', 'average_utxos_per_transaction'],
+        'signals': (
+            ('onchain_signals', 'utxo_transactions', 100000, 10000000, None),
+            ('onchain_signals', 'mempool_size', 100, 10000, 2),  # MB
+        ),
+    },
+    'naming_service': {
+        'keywords': ('naming service',),
+        'focus': 'Analisis jumlah nama/domain yang terdaftar, adopsi di dApps, dan keamanan resolver.',
+        'metrics': ['names_registered', 'dapp_adoptions', 'resolver_security', 'renewal_rates'],
+        'signals': (
+            ('onchain_signals', 'names_registered', 100000, 10000000, None),
+            ('onchain_signals', 'dapp_adoptions', 100, 10000, None),
+        ),
+    },
+    'code_collaboration': {
+        'keywords': ('code collaboration',),
+        'focus': 'Analisis jumlah proyek open-source, kontributor aktif, dan kode yang direview.',
+        'metrics': ['open_source_projects', 'active_contributors', 'code_reviewed', 'merge_request_velocity'],
+        'signals': (
+            ('onchain_signals', 'open_source_projects', 100, 10000, None),
+            ('onchain_signals', 'active_contributors', 1000, 100000, None),
+        ),
+    },
+    'socialfi': {
+        'keywords': ('socialfi', 'social finance'),
+        'focus': 'Analisis engagement pengguna, jumlah creator yang bergabung, dan volume transaksi sosial.',
+        'metrics': ['user_engagement', 'creators_joined', 'social_transaction_volume', 'content_monetization'],
+        'signals': (
+            ('sentiment_signals', 'user_engagement', 0, 100, 2),
+            ('onchain_signals', 'creators_joined', 1000, 100000, None),
+        ),
+    },
+    'ed_tech': {
+        'keywords': ('ed-tech', 'education technology'),
+        'focus': 'Analisis jumlah pengguna yang teredukasi, kursus yang diselesaikan, dan adopsi token dalam pembelajaran.',
+        'metrics': ['users_educated', 'courses_completed', 'token_adoptions_in_learning', 'educational_outcomes'],
+        'signals': (
+            ('onchain_signals', 'users_educated', 10000, 1000000, None),
+            ('onchain_signals', 'courses_completed', 1000, 100000, None),
+        ),
+    },
+    'move_to_earn': {
+        'keywords': ('move-to-earn',),
+        'focus': 'Analisis jumlah pengguna aktif, jarak/tempo yang dilacak, dan ekonomi token berbasis aktivitas fisik.',
+        'metrics': ['active_users', 'distance_tracked', 'token_economy_activity', 'fitness_goal_achievements'],
+        'signals': (
+            ('onchain_signals', 'active_users', 10000, 1000000, None),
+            ('onchain_signals', 'distance_tracked', 1000000, 100000000, 2),  # km
+        ),
+    },
+    'cloud': {
+        'keywords': ('cloud', 'decentralized cloud'),
+        'focus': 'Analisis kapasitas penyimpanan komputasi yang disediakan, jumlah node, dan uptime layanan.',
+        'metrics': ['computing_storage_capacity', 'node_count', 'service_uptime', 'resource_allocation_efficiency'],
+        'signals': (
+            ('onchain_signals', 'computing_storage_capacity', 1000000, 1000000000, 2),  # GB
+            ('onchain_signals', 'node_count', 1000, 1000000, None),
+        ),
+    },
+    'yield': {
+        'keywords': ('yield', 'yield aggregator'),
+        'focus': 'Analisis APY yang ditawarkan, strategi yield yang digunakan, dan total aset yang dikelola.',
+        'metrics': ['apy_offered', 'yield_strategies', 'total_assets_managed', 'strategy_diversification'],
+        'signals': (
+            ('onchain_signals', 'apy_offered', 5, 50, 2),  # %
+            ('onchain_signals', 'total_assets_managed', 10000000, 1000000000, 2),
+        ),
+    },
+    'auction': {
+        'keywords': ('auction',),
+        'focus': 'Analisis volume lelang, jumlah peserta, dan efisiensi mekanisme lelang.',
+        'metrics': ['auction_volume', 'participant_count', 'auction_efficiency', 'bid_distribution'],
+        'signals': (
+            ('onchain_signals', 'auction_volume', 1000000, 100000000, 2),
+            ('onchain_signals', 'participant_count', 100, 10000, None),
+        ),
+    },
+    'credentials': {
+        'keywords': ('credentials',),
+        'focus': 'Analisis jumlah kredensial yang diterbitkan, verifikasi yang dilakukan, dan adopsi di berbagai platform.',
+        'metrics': ['credentials_issued', 'verifications_performed', 'platform_adoptions', 'credential_types'],
+        'signals': (
+            ('onchain_signals', 'credentials_issued', 100000, 10000000, None),
+            ('onchain_signals', 'verifications_performed', 1000000, 100000000, None),
+        ),
+    },
+    'wallet': {
+        'keywords': ('wallet',),
+        'focus': 'Analisis jumlah pengguna wallet, volume transaksi, dan fitur keamanan yang diadopsi.',
+        'metrics': ['wallet_users', 'transaction_volume', 'security_features_adopted', 'multi_chain_support'],
+        'signals': (
+            ('onchain_signals', 'wallet_users', 100000, 10000000, None),
+            ('onchain_signals', 'transaction_volume', 10000000, 1000000000, 2),
+        ),
+    },
+    'computation': {
+        'keywords': ('computation',),
+        'focus': 'Analisis permintaan komputasi, jumlah node penyedia, dan waktu pemrosesan.',
+        'metrics': ['compute_demand', 'provider_nodes', 'processing_time', 'computational_efficiency'],
+        'signals': (
+            ('onchain_signals', 'compute_demand', 1000000, 100000000, 2),  # Unit komputasi
+            ('onchain_signals', 'provider_nodes', 100, 10000, None),
+        ),
+    },
+    'middleware': {
+        'keywords': ('middleware',),
+        'focus': 'Analisis throughput pesan yang dirouting, latency, dan keandalan layanan middleware.',
+        'metrics': ['message_throughput', 'routing_latency', 'service_reliability', 'protocol_interoperability'],
+        'signals': (
+            ('onchain_signals', 'message_throughput', 1000, 100000, 2),  # msg/sec
+            ('onchain_signals', 'routing_latency', 10, 1000, 2),  # ms
+        ),
+    },
+    'umum': {
+        'keywords': (),
+        'focus': 'Analisis umum berdasarkan volume dan volatilitas.',
+        'metrics': ['price_correlation', 'volatility_index', 'market_cap_rank', 'liquidity_depth'],
+        'signals': (
+            ('technical_indicators', 'volatility_index', 20, 80, 2),
+            ('technical_indicators', 'price_correlation', -1, 1, 2),
+        ),
+    },
+}
+
+
+def normalize_category(category: str) -> str:
+    """'Lapis 2 / ZK-Rollup' -> 'lapis 2 zk rollup' (huruf kecil, kata dipisah spasi)."""
+    return ' '.join(re.findall(r'[a-z0-9]+', (category or '').lower()))
+
+
+# Kata kunci terkompilasi: frasa terpanjang didahulukan, lalu urutan registri
+_CATEGORY_KEYWORDS = sorted(
+    ((f" {normalize_category(keyword)} ", len(normalize_category(keyword).split()), order, name)
+     for order, (name, spec) in enumerate(CATEGORY_REGISTRY.items()) for keyword in spec['keywords']),
+    key=lambda item: (-item[1], item[2]))
+
+
+@lru_cache(maxsize=None)
+def resolve_category(category: str) -> str:
+    """
+    Mencocokkan kategori koin ke kunci CATEGORY_REGISTRY. Kata kunci dicocokkan
+    sebagai kata utuh (sehingga 'ai' tidak cocok dengan 'chain'); jika beberapa
+    cocok, frasa terpanjang menang ('dex aggregator' mengalahkan 'defi').
+    Returns:
+        str: Kunci registri, atau DEFAULT_CATEGORY jika tidak ada yang cocok.
+    """
+    text = f" {normalize_category(category)} "
+    for keyword, _, _, name in _CATEGORY_KEYWORDS:
+        if keyword in text:
+            return name
+    return DEFAULT_CATEGORY
+
+
+def category_spec(coin: dict) -> tuple:
+    """
+    Kunci dan spesifikasi kategori sebuah koin. Hasil resolusi disimpan di data
+    koin ('kunci_kategori') sehingga hanya dihitung sekali per koin.
+    Returns:
+        tuple: (kunci kategori, spesifikasi dari CATEGORY_REGISTRY).
+    """
+    key = coin.get('kunci_kategori')
+    if key not in CATEGORY_REGISTRY:
+        key = coin['kunci_kategori'] = resolve_category(coin.get('kategori', ''))
+    return key, CATEGORY_REGISTRY[key]
+
+
+def _simulate_value(low, high, digits=None):
+    value = random.uniform(low, high)
+    return int(value) if digits is None else round(value, digits)
+
+
+# Resolusi kategori sekali saat modul dimuat
+for _coin in INTERNAL_COIN_LIST:
+    category_spec(_coin)
+
+
 class CryptoEcosystemScanner:
     """
     Memindai dan menganalisis ekosistem kripto berdasarkan daftar koin internal.
@@ -593,8 +1216,75 @@ class CryptoEcosystemScanner:
         self.intelligence_aggregator = getattr(self.orchestrator.perception_system, 'intelligence_aggregator', None)
         if not self.intelligence_aggregator:
             logging.warning("IntelligenceAggregator tidak ditemukan di PerceptionSystem. Fungsi scraping/pengambilan data eksternal akan terbatas.")
+        # Pool analisis koin paralel yang dibatasi (analisis per koin didominasi I/O)
+        scanner_config = (getattr(self.orchestrator, 'config', None) or {}).get('ecosystem_scanner', {})
+        self.max_workers = scanner_config.get('max_workers', 16)
+        self.default_top_n = scanner_config.get('default_top_n', 50)
         logging.info("Pemindai Ekosistem Kripto vFinal berhasil diinisialisasi.")
 
+    def scan_all(self, perception_snapshot: dict, top_n: int = None, coins: list = None, max_workers: int = None):
+        """
+        Memindai koin secara paralel dan mengalirkan hasilnya begitu tiap koin
+        selesai (urutan selesai, bukan urutan peringkat), sehingga koin pertama
+        bisa dipakai sebelum seluruh daftar selesai. Koin diurutkan dulu menurut
+        prioritas (volume & katalis); paling banyak `max_workers` koin diproses
+        bersamaan. Menghentikan iterasi membatalkan koin yang belum dimulai.
+        Args:
+            perception_snapshot (dict): Snapshot persepsi pasar saat ini.
+            top_n (int, optional): Jumlah koin prioritas teratas. Default: semua koin.
+            coins (list, optional): Daftar koin. Default: INTERNAL_COIN_LIST.
+            max_workers (int, optional): Batas analisis paralel. Default: [ecosystem_scanner] max_workers.
+        Yields:
+            dict: Hasil `_analyze_coin_by_category` ditambah 'rank' (1 = prioritas tertinggi),
+                  atau {'coin_info', 'rank', 'error'} jika analisis koin gagal.
+        """
+        ranked = rank_coins(INTERNAL_COIN_LIST if coins is None else coins, top_n)
+        if not ranked:
+            return
+        max_workers = max(1, min(max_workers or self.max_workers, len(ranked)))
+        logging.info(f"Memindai {len(ranked)} koin prioritas dengan {max_workers} worker paralel...")
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ecosystem-scan')
+        pending = {}
+        queue = iter(enumerate(ranked, start=1))
+        try:
+            # Hanya `max_workers` koin yang diserahkan ke pool sekaligus; koin berikutnya menyusul saat ada yang selesai
+            for rank, coin in queue:
+                pending[executor.submit(self._analyze_coin_by_category, coin, perception_snapshot)] = (rank, coin)
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rank, coin = pending.pop(future)
+                    try:
+                        result = future.result()
+                        result['rank'] = rank
+                    except Exception as e:
+                        logging.error(f"Analisis ekosistem untuk {coin.get('simbol')} gagal: {e}", exc_info=True)
+                        result = {'coin_info': coin, 'rank': rank, 'error': str(e)}
+                    next_coin = next(queue, None)
+                    if next_coin is not None:
+                        pending[executor.submit(self._analyze_coin_by_category, next_coin[1], perception_snapshot)] = next_coin
+                    yield result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def scan_top_coins(self, perception_snapshot: dict, top_n: int = None, max_workers: int = None) -> list:
+        """
+        Memindai `top_n` koin prioritas tertinggi secara paralel.
+        Args:
+            perception_snapshot (dict): Snapshot persepsi pasar saat ini.
+            top_n (int, optional): Jumlah koin. Default: [ecosystem_scanner] default_top_n.
+            max_workers (int, optional): Batas analisis paralel.
+        Returns:
+            list: Hasil analisis, terurut menurut peringkat prioritas.
+        """
+        top_n = self.default_top_n if top_n is None else top_n
+        results = list(self.scan_all(perception_snapshot, top_n=top_n, max_workers=max_workers))
+        results.sort(key=lambda result: result['rank'])
+        return results
+
     def _analyze_coin_by_category(self, coin_data: dict, perception_snapshot: dict):
         """
         Menganalisis koin berdasarkan kategorinya dan potensi katalisnya.
@@ -647,299 +1337,11 @@ class CryptoEcosystemScanner:
             analysis_result['simulated_market_data']['price'] = None
 
         # --- Analisis Berdasarkan Kategori ---
-        category_insights = {}
-        if 'lapis 1' in category or 'layer 1' in category:
-            category_insights['focus'] = 'Analisis teknologi dasar, skalabilitas, dan adopsi pengembang.'
-            category_insights['metrics'] = ['hashrate', 'active_addresses', 'developer_activity', 'block_time', 'gas_used']
-            # Simulasi sinyal on-chain spesifik
-            analysis_result['onchain_signals']['hashrate'] = round(random.uniform(100000, 500000), 2)
-            analysis_result['onchain_signals']['active_addresses'] = int(random.uniform(10000, 100000))
-        elif 'lapis 2' in category or 'layer 2' in category:
-            category_insights['focus'] = 'Analisis throughput, biaya transaksi, dan adopsi aplikasi.'
-            category_insights['metrics'] = ['tps', 'avg_gas_price', 'batch_size', 'sequencer_activity']
-            analysis_result['onchain_signals']['tps'] = round(random.uniform(100, 5000), 2)
-            analysis_result['onchain_signals']['avg_gas_price'] = round(random.uniform(10, 100), 2)
-        elif 'defi' in category:
-            category_insights['focus'] = 'Analisis metrik DeFi seperti TVL, yield, dan aktivitas protokol.'
-            category_insights['metrics'] = ['tvl', 'apy/apr', 'total_debt_issued', 'swap_volume']
-            analysis_result['onchain_signals']['tvl'] = round(random.uniform(1000000, 100000000), 2)
-            analysis_result['onchain_signals']['apy'] = round(random.uniform(1, 20), 2)
-        elif 'ai' in category or 'artificial intelligence' in category:
-            category_insights['focus'] = 'Analisis perkembangan jaringan AI, penggunaan token, dan mitra.'
-            category_insights['metrics'] = ['network_utilization', 'data_processed', 'active_agents', 'model_performance']
-            analysis_result['onchain_signals']['network_utilization'] = round(random.uniform(10, 90), 2)
-            analysis_result['onchain_signals']['active_agents'] = int(random.uniform(100, 10000))
-        elif 'memecoin' in category:
-            category_insights['focus'] = 'Analisis sentimen media sosial, volume perdagangan, dan tren meme.'
-            category_insights['metrics'] = ['social_volume', 'sentiment_score', 'unique_wallets', 'meme_virality_index']
-            analysis_result['sentiment_signals']['social_volume'] = int(random.uniform(10000, 1000000))
-            analysis_result['sentiment_signals']['sentiment_score'] = round(random.uniform(-1, 1), 2)
-        elif 'payments' in category:
-             category_insights['focus'] = 'Analisis adopsi pembayaran, partnership ritel, dan volume transaksi.'
-             category_insights['metrics'] = ['merchant_count', 'transaction_volume', 'average_tx_value', 'payment_success_rate']
-             analysis_result['onchain_signals']['merchant_count'] = int(random.uniform(1000, 100000))
-             analysis_result['onchain_signals']['transaction_volume'] = round(random.uniform(1000000, 100000000), 2)
-        elif 'metaverse' in category:
-             category_insights['focus'] = 'Analisis aktivitas pengguna di platform, penjualan NFT, dan investasi.'
-             category_insights['metrics'] = ['daily_active_users', 'nft_sales_volume', 'land_price_index', 'virtual_asset_transactions']
-             analysis_result['onchain_signals']['daily_active_users'] = int(random.uniform(1000, 100000))
-             analysis_result['onchain_signals']['nft_sales_volume'] = round(random.uniform(100000, 10000000), 2)
-        elif 'oracle' in category:
-             category_insights['focus'] = 'Analisis jumlah permintaan data, uptime, dan kepercayaan protokol.'
-             category_insights['metrics'] = ['data_requests', 'uptime_percentage', 'secure_agreements', 'feed_diversity']
-             analysis_result['onchain_signals']['data_requests'] = int(random.uniform(10000, 1000000))
-             analysis_result['onchain_signals']['uptime_percentage'] = round(random.uniform(99, 100), 2)
-        elif 'gaming' in category:
-             category_insights['focus'] = 'Analisis aktivitas pemain, NFT marketplace, dan tokenomics.'
-             category_insights['metrics'] = ['daily_active_users', 'nft_trading_volume', 'token_burn_rate', 'in_game_asset_value']
-             analysis_result['onchain_signals']['daily_active_users'] = int(random.uniform(1000, 100000))
-             analysis_result['onchain_signals']['nft_trading_volume'] = round(random.uniform(100000, 10000000), 2)
-        elif 'nft' in category:
-             category_insights['focus'] = 'Analisis volume perdagangan NFT, marketplace activity, dan floor price.'
-             category_insights['metrics'] = ['nft_sales_volume', 'marketplace_activity', 'floor_price', 'unique_collectors']
-             analysis_result['onchain_signals']['nft_sales_volume'] = round(random.uniform(100000, 10000000), 2)
-             analysis_result['onchain_signals']['floor_price'] = round(random.uniform(0.01, 10), 4)
-        elif 'privacy' in category:
-             category_insights['focus'] = 'Analisis adopsi privasi, network hashrate, dan regulatory sentiment.'
-             category_insights['metrics'] = ['network_hashrate', 'mixing_volume', 'regulatory_news', 'anonymity_set_size']
-             analysis_result['onchain_signals']['network_hashrate'] = round(random.uniform(10000, 1000000), 2)
-             analysis_result['sentiment_signals']['regulatory_sentiment'] = round(random.uniform(-1, 1), 2)
-        elif 'staking' in category:
-             category_insights['focus'] = 'Analisis APR, jumlah staking, dan likuiditas token staking.'
-             category_insights['metrics'] = ['staking_apr', 'total_staked', 'liquid_staking_supply', 'validator_distribution']
-             analysis_result['onchain_signals']['staking_apr'] = round(random.uniform(5, 20), 2)
-             analysis_result['onchain_signals']['total_staked'] = round(random.uniform(1000000, 100000000), 2)
-        elif 'infrastructure' in category or 'interop' in category or 'interoperability' in category:
-             category_insights['focus'] = 'Analisis adopsi jaringan, jumlah validator, dan integrasi protokol.'
-             category_insights['metrics'] = ['network_adoption', 'validator_count', 'protocol_integrations', 'cross_chain_tx_volume']
-             analysis_result['onchain_signals']['validator_count'] = int(random.uniform(50, 1000))
-             analysis_result['onchain_signals']['cross_chain_tx_volume'] = round(random.uniform(1000000, 50000000), 2)
-        elif 'storage' in category:
-             category_insights['focus'] = 'Analisis kapasitas penyimpanan terpakai, jumlah penyedia, dan permintaan data.'
-             category_insights['metrics'] = ['storage_used', 'storage_providers', 'data_requests', 'retrieval_success_rate']
-             analysis_result['onchain_signals']['storage_used'] = round(random.uniform(1000000, 1000000000), 2) # TB
-             analysis_result['onchain_signals']['storage_providers'] = int(random.uniform(100, 10000))
-        elif 'video' in category:
-             category_insights['focus'] = 'Analisis bandwidth yang digunakan, jumlah penonton, dan kemitraan konten.'
-             category_insights['metrics'] = ['bandwidth_used', 'viewer_count', 'content_partnerships', 'stream_quality']
-             analysis_result['onchain_signals']['bandwidth_used'] = round(random.uniform(1000000, 100000000), 2) # GB
-             analysis_result['onchain_signals']['viewer_count'] = int(random.uniform(10000, 1000000))
-        elif 'supply chain' in category:
-             category_insights['focus'] = 'Analisis jumlah produk yang dilacak, mitra korporat, dan volume transaksi.'
-             category_insights['metrics'] = ['products_tracked', 'corporate_partners', 'transaction_volume', 'traceability_accuracy']
-             analysis_result['onchain_signals']['products_tracked'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['corporate_partners'] = int(random.uniform(10, 1000))
-        elif 'exchange token' in category:
-             category_insights['focus'] = 'Analisis volume perdagangan di exchange, jumlah pengguna aktif, dan program burn.'
-             category_insights['metrics'] = ['exchange_volume', 'active_users', 'tokens_burned', 'fee_discount_usage']
-             analysis_result['onchain_signals']['exchange_volume'] = round(random.uniform(100000000, 1000000000), 2)
-             analysis_result['onchain_signals']['active_users'] = int(random.uniform(100000, 10000000))
-        elif 'fan token' in category:
-             category_insights['focus'] = 'Analisis engagement fans, hasil pertandingan tim, dan aktivitas di platform klub.'
-             category_insights['metrics'] = ['fan_engagement_score', 'team_performance', 'club_platform_activity', 'token_utilization']
-             analysis_result['sentiment_signals']['fan_engagement_score'] = round(random.uniform(0, 100), 2)
-             analysis_result['sentiment_signals']['team_performance'] = round(random.uniform(0, 100), 2) # Simulasi
-        elif 'rwa' in category or 'real world assets' in category:
-             category_insights['focus'] = 'Analisis nilai aset yang di-tokenisasi, regulasi, dan adopsi institusional.'
-             category_insights['metrics'] = ['rwa_value_tokenized', 'regulatory_compliance_score', 'institutional_adoptions', 'asset_diversification']
-             analysis_result['macro_geopolitical_signals']['regulatory_compliance_score'] = round(random.uniform(0, 100), 2)
-             analysis_result['onchain_signals']['rwa_value_tokenized'] = round(random.uniform(10000000, 1000000000), 2)
-        elif 'bitcoin layer' in category or 'btc layer' in category:
-             category_insights['focus'] = 'Analisis keterkaitan dengan Bitcoin, security model, dan adopsi spesifik BTC.'
-             category_insights['metrics'] = ['btc_security_utilization', 'btc_locked_value', 'btc_transaction_finality', 'wrapped_btc_supply']
-             analysis_result['onchain_signals']['btc_locked_value'] = round(random.uniform(10000, 1000000), 2)
-             analysis_result['onchain_signals']['wrapped_btc_supply'] = round(random.uniform(100000, 10000000), 2)
-        elif 'dao' in category:
-             category_insights['focus'] = 'Analisis partisipasi voting, jumlah proposal, dan nilai treasury.'
-             category_insights['metrics'] = ['voting_participation', 'proposals_submitted', 'treasury_value', 'active_proposers']
-             analysis_result['onchain_signals']['voting_participation'] = round(random.uniform(10, 90), 2) # %
-             analysis_result['onchain_signals']['treasury_value'] = round(random.uniform(1000000, 100000000), 2)
-        elif 'energy' in category:
-             category_insights['focus'] = 'Analisis penggunaan energi terbarukan, efisiensi jaringan, dan dampak lingkungan.'
-             category_insights['metrics'] = ['renewable_energy_usage', 'network_energy_efficiency', 'carbon_footprint', 'green_energy_partnerships']
-             analysis_result['onchain_signals']['renewable_energy_usage'] = round(random.uniform(20, 100), 2) # %
-             analysis_result['macro_geopolitical_signals']['carbon_footprint'] = round(random.uniform(100, 10000), 2) # Ton CO2
-        elif 'music' in category:
-             category_insights['focus'] = 'Analisis jumlah artis yang bermigrasi, volume penjualan musik NFT, dan engagement penggemar.'
-             category_insights['metrics'] = ['migrating_artists', 'music_nft_sales', 'fan_engagement', 'royalty_distribution']
-             analysis_result['onchain_signals']['music_nft_sales'] = round(random.uniform(10000, 1000000), 2)
-             analysis_result['sentiment_signals']['fan_engagement'] = round(random.uniform(0, 100), 2)
-        elif 'identity' in category:
-             category_insights['focus'] = 'Analisis adopsi identitas terdesentralisasi, jumlah verifikasi, dan integrasi dengan aplikasi.'
-             category_insights['metrics'] = ['did_adoptions', 'verifications_completed', 'app_integrations', 'identity_security_score']
-             analysis_result['onchain_signals']['did_adoptions'] = int(random.uniform(10000, 1000000))
-             analysis_result['onchain_signals']['verifications_completed'] = int(random.uniform(100000, 10000000))
-        elif 'iot' in category or 'internet of things' in category:
-             category_insights['focus'] = 'Analisis jumlah perangkat yang terhubung, volume data yang diproses, dan use case industri.'
-             category_insights['metrics'] = ['connected_devices', 'data_volume_processed', 'industrial_use_cases', 'device_security_level']
-             analysis_result['onchain_signals']['connected_devices'] = int(random.uniform(100000, 100000000))
-             analysis_result['onchain_signals']['data_volume_processed'] = round(random.uniform(1000000, 1000000000), 2) # GB
-        elif 'telecom' in category:
-             category_insights['focus'] = 'Analisis kapasitas bandwidth yang disediakan, jumlah pengguna, dan kemitraan operator.'
-             category_insights['metrics'] = ['bandwidth_capacity', 'user_base', 'operator_partnerships', 'data_transaction_fees']
-             analysis_result['onchain_signals']['user_base'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['bandwidth_capacity'] = round(random.uniform(1000000, 100000000), 2) # GB
-        elif 'data' in category:
-             category_insights['focus'] = 'Analisis volume data yang dijual/beli, jumlah penyedia data, dan kualitas data.'
-             category_insights['metrics'] = ['data_trading_volume', 'data_providers', 'data_quality_index', 'data_monetization_models']
-             analysis_result['onchain_signals']['data_trading_volume'] = round(random.uniform(1000000, 100000000), 2)
-             analysis_result['onchain_signals']['data_providers'] = int(random.uniform(100, 10000))
-        elif 'synthetic assets' in category:
-             category_insights['focus'] = 'Analisis total nilai aset sintetis yang diterbitkan, leverage yang digunakan, dan likuiditas pasar.'
-             category_insights['metrics'] = ['synthetic_assets_value', 'average_leverage', 'market_liquidity', 'collateral_types']
-             analysis_result['onchain_signals']['synthetic_assets_value'] = round(random.uniform(10000000, 1000000000), 2)
-             analysis_result['onchain_signals']['average_leverage'] = round(random.uniform(1, 50), 2)
-        elif 'ux' in category or 'user experience' in category:
-             category_insights['focus'] = 'Analisis kemudahan penggunaan, adopsi wallet, dan integrasi dengan platform lain.'
-             category_insights['metrics'] = ['ease_of_use_score', 'wallet_adoptions', 'platform_integrations', 'user_onboarding_rate']
-             analysis_result['sentiment_signals']['ease_of_use_score'] = round(random.uniform(1, 10), 2)
-             analysis_result['onchain_signals']['wallet_adoptions'] = int(random.uniform(10000, 1000000))
-        elif 'funding' in category or 'public goods' in category:
-             category_insights['focus'] = 'Analisis jumlah dana yang didistribusikan, proyek yang didanai, dan efektivitas mekanisme funding.'
-             category_insights['metrics'] = ['funds_distributed', 'projects_funded', 'funding_efficiency', 'community_participation']
-             analysis_result['onchain_signals']['funds_distributed'] = round(random.uniform(1000000, 100000000), 2)
-             analysis_result['onchain_signals']['projects_funded'] = int(random.uniform(100, 10000))
-        elif 'marketplace' in category:
-             category_insights['focus'] = 'Analisis volume transaksi, jumlah penjual/penawar, dan reputasi pengguna.'
-             category_insights['metrics'] = ['transaction_volume', 'sellers/bidders', 'user_reputation_scores', 'dispute_resolution_rate']
-             analysis_result['onchain_signals']['transaction_volume'] = round(random.uniform(100000, 10000000), 2) # Asumsi key typo di sini, perlu fix jika ada
-             analysis_result['onchain_signals']['sellers/bidders'] = int(random.uniform(1000, 100000))
-        elif 'liquidity' in category:
-             category_insights['focus'] = 'Analisis depth order book, spread, dan volume perdagangan cross-exchange.'
-             category_insights['metrics'] = ['order_book_depth', 'bid_ask_spread', 'cross_exchange_volume', 'liquidity_provider_count']
-             analysis_result['technical_indicators']['order_book_depth'] = round(random.uniform(1000000, 100000000), 2)
-             analysis_result['technical_indicators']['bid_ask_spread'] = round(random.uniform(0.1, 5), 2) # Basis points
-        elif 'lending' in category:
-             category_insights['focus'] = 'Analisis total pinjaman yang diberikan, tingkat bunga, dan rasio pinjaman terhadap nilai kolateral.'
-             category_insights['metrics'] = ['total_loans_issued', 'interest_rates', 'ltv_ratios', 'default_rates']
-             analysis_result['onchain_signals']['total_loans_issued'] = round(random.uniform(10000000, 1000000000), 2)
-             analysis_result['onchain_signals']['interest_rates'] = round(random.uniform(1, 20), 2) # %
-        elif 'dex' in category or 'dex aggregator' in category:
-             category_insights['focus'] = 'Analisis volume swap, jumlah pool likuiditas, dan biaya protokol.'
-             category_insights['metrics'] = ['swap_volume', 'liquidity_pools', 'protocol_fees', 'slippage_rates']
-             analysis_result['onchain_signals']['swap_volume'] = round(random.uniform(10000000, 1000000000), 2)
-             analysis_result['onchain_signals']['liquidity_pools'] = int(random.uniform(100, 10000))
-        elif 'perp dex' in category or 'perpetual dex' in category:
-             category_insights['focus'] = 'Analisis volume perdagangan perpetual, funding rates, dan open interest.'
-             category_insights['metrics'] = ['perp_trading_volume', 'funding_rates', 'open_interest', 'liquidation_events']
-             analysis_result['derivatives_signals']['perp_trading_volume'] = round(random.uniform(100000000, 10000000000), 2)
-             analysis_result['derivatives_signals']['funding_rates'] = round(random.uniform(-0.1, 0.1), 4) # %
-             analysis_result['derivatives_signals']['open_interest'] = round(random.uniform(10000000, 1000000000), 2)
-        elif 'stablecoin' in category:
-             category_insights['focus'] = 'Analisis kapitalisasi, mekanisme peg, dan cadangan yang mendukung.'
-             category_insights['metrics'] = ['market_cap', 'peg_mechanism', 'reserves/backing', 'redemption_rate']
-             analysis_result['onchain_signals']['market_cap'] = round(random.uniform(100000000, 10000000000), 2)
-             analysis_result['onchain_signals']['redemption_rate'] = round(random.uniform(0.99, 1.01), 4)
-        elif 'indexing' in category:
-             category_insights['focus'] = 'Analisis jumlah query yang diproses, jumlah subgraph/dataset yang diindeks, dan uptime layanan.'
-             category_insights['metrics'] = ['queries_processed', 'subgraphs/datasets_indexed', 'service_uptime', 'query_response_time']
-             analysis_result['onchain_signals']['queries_processed'] = int(random.uniform(1000000, 100000000))
-             analysis_result['onchain_signals']['subgraphs/datasets_indexed'] = int(random.uniform(1000, 100000))
-        elif 'depin' in category or 'decentralized physical infrastructure' in category:
-             category_insights['focus'] = 'Analisis jumlah node/hardware yang berpartisipasi, uptime jaringan, dan nilai token yang dikunci.'
-             category_insights['metrics'] = ['participating_nodes', 'network_uptime', 'token_locked_value', 'resource_provisioned']
-             analysis_result['onchain_signals']['participating_nodes'] = int(random.uniform(1000, 1000000))
-             analysis_result['onchain_signals']['network_uptime'] = round(random.uniform(99, 100), 2) # %
-        elif 'modular' in category:
-             category_insights['focus'] = 'Analisis jumlah rollups/appchains yang terhubung, throughput yang ditangani, dan interoperabilitas.'
-             category_insights['metrics'] = ['connected_rollups/appchains', 'handled_throughput', 'interoperability_score', 'modular_components_used']
-             analysis_result['onchain_signals']['connected_rollups/appchains'] = int(random.uniform(10, 1000))
-             analysis_result['onchain_signals']['handled_throughput'] = round(random.uniform(1000, 100000), 2) # TPS
-        elif 'zero-knowledge' in category or 'zk' in category:
-             category_insights['focus'] = 'Analisis jumlah transaksi ZK yang diproses, waktu verifikasi, dan adopsi aplikasi ZK.'
-             category_insights['metrics'] = ['zk_transactions_processed', 'verification_time', 'zk_app_adoptions', 'proof_size']
-             analysis_result['onchain_signals']['zk_transactions_processed'] = int(random.uniform(10000, 10000000))
-             analysis_result['onchain_signals']['verification_time'] = round(random.uniform(1, 1000), 2) # ms
-        elif 'move' in category:
-             category_insights['focus'] = 'Analisis adopsi bahasa Move, jumlah modul yang dideploy, dan keamanan kontrak.'
-             category_insights['metrics'] = ['move_adoptions', 'modules_deployed', 'contract_security_audits', 'parallel_execution_efficiency']
-             analysis_result['onchain_signals']['move_adoptions'] = int(random.uniform(1000, 100000))
-             analysis_result['onchain_signals']['modules_deployed'] = int(random.uniform(10000, 1000000))
-        elif 'enterprise' in category:
-             category_insights['focus'] = 'Analisis jumlah kemitraan enterprise, penggunaan dalam solusi B2B, dan regulasi yang sesuai.'
-             category_insights['metrics'] = ['enterprise_partnerships', 'b2b_solution_usage', 'regulatory_compliance', 'enterprise_transaction_volume']
-             analysis_result['macro_geopolitical_signals']['enterprise_partnerships'] = int(random.uniform(10, 1000))
-             analysis_result['onchain_signals']['enterprise_transaction_volume'] = round(random.uniform(1000000, 100000000), 2)
-        elif 'platform' in category:
-             category_insights['focus'] = 'Analisis jumlah dApp yang berjalan, aktivitas pengguna di platform, dan ekosistem pengembang.'
-             category_insights['metrics'] = ['dapps_running', 'platform_user_activity', 'developer_ecosystem', 'smart_contract_deployments']
-             analysis_result['onchain_signals']['dapps_running'] = int(random.uniform(100, 10000))
-             analysis_result['onchain_signals']['platform_user_activity'] = int(random.uniform(10000, 1000000))
-        elif 'dag' in category or 'directed acyclic graph' in category:
-             category_insights['focus'] = 'Analisis throughput transaksi, finality time, dan struktur jaringan DAG.'
-             category_insights['metrics'] = ['transaction_throughput', 'finality_time', 'dag_structure_efficiency', 'confirmation_latency']
-             analysis_result['onchain_signals']['transaction_throughput'] = round(random.uniform(1000, 100000), 2) # TPS
-             analysis_result['onchain_signals']['finality_time'] = round(random.uniform(1, 60), 2) # seconds
-        elif 'utxo' in category:
-             category_insights['focus'] = 'Analisis jumlah transaksi UTXO, ukuran mempool, dan efisiensi penggunaan UTXO set.'
-             category_insights['metrics'] = ['utxo_transactions', 'mempool_size', 'utxo_set_efficiency', 'average_utxos_per_transaction']
-             analysis_result['onchain_signals']['utxo_transactions'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['mempool_size'] = round(random.uniform(100, 10000), 2) # MB
-        elif 'naming service' in category:
-             category_insights['focus'] = 'Analisis jumlah nama/domain yang terdaftar, adopsi di dApps, dan keamanan resolver.'
-             category_insights['metrics'] = ['names_registered', 'dapp_adoptions', 'resolver_security', 'renewal_rates']
-             analysis_result['onchain_signals']['names_registered'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['dapp_adoptions'] = int(random.uniform(100, 10000))
-        elif 'code collaboration' in category:
-             category_insights['focus'] = 'Analisis jumlah proyek open-source, kontributor aktif, dan kode yang direview.'
-             category_insights['metrics'] = ['open_source_projects', 'active_contributors', 'code_reviewed', 'merge_request_velocity']
-             analysis_result['onchain_signals']['open_source_projects'] = int(random.uniform(100, 10000))
-             analysis_result['onchain_signals']['active_contributors'] = int(random.uniform(1000, 100000))
-        elif 'socialfi' in category or 'social finance' in category:
-             category_insights['focus'] = 'Analisis engagement pengguna, jumlah creator yang bergabung, dan volume transaksi sosial.'
-             category_insights['metrics'] = ['user_engagement', 'creators_joined', 'social_transaction_volume', 'content_monetization']
-             analysis_result['sentiment_signals']['user_engagement'] = round(random.uniform(0, 100), 2)
-             analysis_result['onchain_signals']['creators_joined'] = int(random.uniform(1000, 100000))
-        elif 'ed-tech' in category or 'education technology' in category:
-             category_insights['focus'] = 'Analisis jumlah pengguna yang teredukasi, kursus yang diselesaikan, dan adopsi token dalam pembelajaran.'
-             category_insights['metrics'] = ['users_educated', 'courses_completed', 'token_adoptions_in_learning', 'educational_outcomes']
-             analysis_result['onchain_signals']['users_educated'] = int(random.uniform(10000, 1000000))
-             analysis_result['onchain_signals']['courses_completed'] = int(random.uniform(1000, 100000))
-        elif 'move-to-earn' in category:
-             category_insights['focus'] = 'Analisis jumlah pengguna aktif, jarak/tempo yang dilacak, dan ekonomi token berbasis aktivitas fisik.'
-             category_insights['metrics'] = ['active_users', 'distance_tracked', 'token_economy_activity', 'fitness_goal_achievements']
-             analysis_result['onchain_signals']['active_users'] = int(random.uniform(10000, 1000000))
-             analysis_result['onchain_signals']['distance_tracked'] = round(random.uniform(1000000, 100000000), 2) # km
-        elif 'cloud' in category or 'decentralized cloud' in category:
-             category_insights['focus'] = 'Analisis kapasitas penyimpanan komputasi yang disediakan, jumlah node, dan uptime layanan.'
-             category_insights['metrics'] = ['computing_storage_capacity', 'node_count', 'service_uptime', 'resource_allocation_efficiency']
-             analysis_result['onchain_signals']['computing_storage_capacity'] = round(random.uniform(1000000, 1000000000), 2) # GB
-             analysis_result['onchain_signals']['node_count'] = int(random.uniform(1000, 1000000))
-        elif 'yield' in category or 'yield aggregator' in category:
-             category_insights['focus'] = 'Analisis APY yang ditawarkan, strategi yield yang digunakan, dan total aset yang dikelola.'
-             category_insights['metrics'] = ['apy_offered', 'yield_strategies', 'total_assets_managed', 'strategy_diversification']
-             analysis_result['onchain_signals']['apy_offered'] = round(random.uniform(5, 50), 2) # %
-             analysis_result['onchain_signals']['total_assets_managed'] = round(random.uniform(10000000, 1000000000), 2)
-        elif 'auction' in category:
-             category_insights['focus'] = 'Analisis volume lelang, jumlah peserta, dan efisiensi mekanisme lelang.'
-             category_insights['metrics'] = ['auction_volume', 'participant_count', 'auction_efficiency', 'bid_distribution']
-             analysis_result['onchain_signals']['auction_volume'] = round(random.uniform(1000000, 100000000), 2)
-             analysis_result['onchain_signals']['participant_count'] = int(random.uniform(100, 10000))
-        elif 'credentials' in category:
-             category_insights['focus'] = 'Analisis jumlah kredensial yang diterbitkan, verifikasi yang dilakukan, dan adopsi di berbagai platform.'
-             category_insights['metrics'] = ['credentials_issued', 'verifications_performed', 'platform_adoptions', 'credential_types']
-             analysis_result['onchain_signals']['credentials_issued'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['verifications_performed'] = int(random.uniform(1000000, 100000000))
-        elif 'wallet' in category:
-             category_insights['focus'] = 'Analisis jumlah pengguna wallet, volume transaksi, dan fitur keamanan yang diadopsi.'
-             category_insights['metrics'] = ['wallet_users', 'transaction_volume', 'security_features_adopted', 'multi_chain_support']
-             analysis_result['onchain_signals']['wallet_users'] = int(random.uniform(100000, 10000000))
-             analysis_result['onchain_signals']['transaction_volume'] = round(random.uniform(10000000, 1000000000), 2)
-        elif 'computation' in category:
-             category_insights['focus'] = 'Analisis permintaan komputasi, jumlah node penyedia, dan waktu pemrosesan.'
-             category_insights['metrics'] = ['compute_demand', 'provider_nodes', 'processing_time', 'computational_efficiency']
-             analysis_result['onchain_signals']['compute_demand'] = round(random.uniform(1000000, 100000000), 2) # Unit komputasi
-             analysis_result['onchain_signals']['provider_nodes'] = int(random.uniform(100, 10000))
-        elif 'middleware' in category:
-             category_insights['focus'] = 'Analisis throughput pesan yang dirouting, latency, dan keandalan layanan middleware.'
-             category_insights['metrics'] = ['message_throughput', 'routing_latency', 'service_reliability', 'protocol_interoperability']
-             analysis_result['onchain_signals']['message_throughput'] = round(random.uniform(1000, 100000), 2) # msg/sec
-             analysis_result['onchain_signals']['routing_latency'] = round(random.uniform(10, 1000), 2) # ms
-        else:
-            category_insights['focus'] = 'Analisis umum berdasarkan volume dan volatilitas.'
-            category_insights['metrics'] = ['price_correlation', 'volatility_index', 'market_cap_rank', 'liquidity_depth']
-            analysis_result['technical_indicators']['volatility_index'] = round(random.uniform(20, 80), 2)
-            analysis_result['technical_indicators']['price_correlation'] = round(random.uniform(-1, 1), 2)
+        # Kategori sudah diresolusi sekali per koin (lihat category_spec); di sini cukup lookup
+        category_key, spec = category_spec(coin_data)
+        category_insights = {'category': category_key, 'focus': spec['focus'], 'metrics': list(spec['metrics'])}
+        for section, key, low, high, digits in spec['signals']:
+            analysis_result[section][key] = _simulate_value(low, high, digits)
 
         analysis_result['category_insights'] = category_insights
 
@@ -1076,7 +1478,7 @@ class CryptoEcosystemScanner:
         analysis_result['risk_management']['kelly_criterion_position_size'] = round(random.uniform(0.1, 10), 2) # % of portfolio
 
         # --- Simulasi Skor Keyakinan (Confidence Score) ---
-        priority_score_map = {'Sangat Tinggi': 0.9, 'Tinggi': 0.75, 'Sedang': 0.6, 'Rendah': 0.4, 'Sangat Rendah': 0.2}
+        priority_score_map = VOLUME_PRIORITY
         vol_score = priority_score_map.get(volume_level, 0.5)
         # Estimasi kasar untuk katalis score
         cat_first_word = catalyst.split(',')[0].split()[0].lower() if catalyst else 'rendah'
@@ -10,7 +10,10 @@
 import logging
 import sys
 import os
+import threading
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 
 # --- PENYESUAIAN PATH DINAMIS ---
@@ -26,6 +29,10 @@ try:
 except ImportError as e:
     logging.critical(f"Gagal mengimpor LLMRouter: {e}")
     raise
+from PERCEPTION_SYSTEM.snapshot_delta import has_relevant_changes, iter_news_items
+from PERCEPTION_SYSTEM.ohlcv_store import OHLCVStore
+from AI_BRAIN.prompt_engineer import compact_report, estimate_tokens, PLACEHOLDER_MARKERS
+from ANALYTICS_CORE.technical_indicators import IndicatorEngine
 
 class QuantumSentientAnalyzer:
     """
@@ -33,6 +40,17 @@ class QuantumSentientAnalyzer:
     untuk sebuah aset tertentu. Menganalisis 6 dimensi utama seperti dokter ahli.
     """
 
+    # Batas waktu default per dimensi (detik)
+    DEFAULT_DIMENSION_TIMEOUTS = {
+        'indicators': 5,
+        'technical': 5,
+        'fundamental': 10,
+        'macro': 10,
+        'quantitative': 10,
+        'sentiment': 10,
+        'risk': 5,
+    }
+
     def __init__(self, orchestrator):
         """
         Inisialisasi Quantum Sentient Analyzer.
@@ -43,11 +61,141 @@ class QuantumSentientAnalyzer:
         self.orchestrator = orchestrator
         # Inisialisasi LLMRouter untuk analisis AI
         self.llm_router = LLMRouter(self.orchestrator)
+        # Hasil sintesis terakhir per (simbol, aset); dipakai ulang jika delta snapshot tidak relevan
+        self._last_thoughts = {}
+        # Anggaran token untuk laporan 6 dimensi di dalam prompt dewan AI
+        qsa_config = self.orchestrator.config.get('quantum_analyzer', {})
+        self.prompt_token_budget = qsa_config.get('prompt_token_budget', 1200)
+        self.numeric_precision = qsa_config.get('numeric_precision', 5)
+        self.placeholder_markers = tuple(m.lower() for m in qsa_config.get('placeholder_markers', PLACEHOLDER_MARKERS))
+
+        # Dimensi analisis dijalankan paralel dengan batas waktu per dimensi (detik, dihitung dari awal)
+        self.parallel_dimensions = qsa_config.get('parallel_dimensions', True)
+        self.dimension_timeouts = dict(self.DEFAULT_DIMENSION_TIMEOUTS)
+        self.dimension_timeouts.update(qsa_config.get('dimension_timeouts_seconds', {}))
+        self.max_parallel_symbols = qsa_config.get('max_parallel_symbols', 4)
+        # Cukup untuk semua dimensi dari semua simbol paralel, agar antrean tidak memakan batas waktu
+        self._dimension_executor = ThreadPoolExecutor(
+            max_workers=qsa_config.get('dimension_max_workers', 5 * self.max_parallel_symbols + 2),
+            thread_name_prefix='qsa-dimension'
+        )
+        self._symbol_executor = ThreadPoolExecutor(max_workers=self.max_parallel_symbols, thread_name_prefix='qsa-symbol')
+
+        # Mesin indikator teknikal: semua simbol dihitung sekaligus, bar baru diproses inkremental
+        indicator_config = self.orchestrator.config.get('indicators', {})
+        self.indicator_engine = IndicatorEngine(indicator_config)
+        self.indicator_timeframe = indicator_config.get('timeframe', '1h')
+        self._indicator_lock = threading.Lock()
+        # Riwayat candle bersama yang diisi IntelligenceAggregator
+        self.ohlcv_store = OHLCVStore()
+
+        # Pool dimensi & simbol ditutup oleh orkestrator saat shutdown
+        register_shutdown_hook = getattr(self.orchestrator, 'register_shutdown_hook', None)
+        if register_shutdown_hook:
+            register_shutdown_hook(self.close)
         logging.info("Quantum Sentient Analyzer v2 berhasil diinisialisasi.")
 
-    def analyze_technical(self, perception_snapshot, symbol):
+    def compute_indicators(self, perception_snapshot):
+        """
+        Menghitung indikator teknikal untuk semua simbol di snapshot sekaligus,
+        dari riwayat OHLCVStore (view tanpa salinan), atau dari candle di
+        `market_data[simbol]['ohlcv']` jika store tidak aktif.
+        Returns:
+            dict: {simbol: {indikator: float atau None}}; kosong jika tidak ada candle.
+        """
+        market_data = perception_snapshot.get('market_data', {})
+        ohlcv_by_symbol = self.ohlcv_store.views(market_data, self.indicator_timeframe)
+        for symbol, data in market_data.items():
+            if symbol not in ohlcv_by_symbol and isinstance(data, dict) and data.get('ohlcv'):
+                ohlcv_by_symbol[symbol] = data['ohlcv']
+        if not ohlcv_by_symbol:
+            return {}
+        with self._indicator_lock:
+            started_at = time.perf_counter()
+            mode = self.indicator_engine.ingest(ohlcv_by_symbol)
+            indicators = self.indicator_engine.latest_by_symbol()
+        logging.debug(f"Indikator teknikal {len(indicators)} simbol ({mode}) dalam "
+                      f"{(time.perf_counter() - started_at) * 1000:.1f} ms.")
+        return indicators
+
+    @staticmethod
+    def _round(value, significant=5):
+        # Angka penting, bukan desimal tetap: harga koin di bawah satu sen tidak boleh menjadi 0
+        return None if value is None else float(f"{value:.{significant}g}")
+
+    def _describe_indicators(self, ind, price):
+        """Menyusun detail teknikal dari nilai indikator nyata (lihat `compute_indicators`)."""
+        r = lambda value: self._round(value, self.numeric_precision)
+        price = ind.get('close') or price
+        sma_periods = self.indicator_engine.settings['sma_periods']
+        ema_periods = self.indicator_engine.settings['ema_periods']
+        sma_fast = ind.get(f'sma_{min(sma_periods)}') if sma_periods else None
+        sma_slow = ind.get(f'sma_{max(sma_periods)}') if sma_periods else None
+
+        # Struktur tren dari susunan harga dan moving average
+        trend, trend_strength = None, None
+        if price and sma_fast and sma_slow:
+            if price > sma_fast > sma_slow:
+                trend = "Bullish"
+            elif price < sma_fast < sma_slow:
+                trend = "Bearish"
+            else:
+                trend = "Sideways"
+            if ind.get('atr'):
+                distance = abs(price - sma_slow) / ind['atr']
+                trend_strength = 'Kuat' if distance > 3 else ('Moderat' if distance > 1 else 'Lemah')
+
+        rsi_value = ind.get('rsi')
+        histogram = ind.get('macd_histogram')
+        momentum = {
+            'rsi': r(rsi_value),
+            'rsi_interpretation': None if rsi_value is None else (
+                'Overbought' if rsi_value > 70 else ('Oversold' if rsi_value < 30 else 'Netral')),
+            'macd': r(ind.get('macd')),
+            'macd_signal': r(ind.get('macd_signal')),
+            'macd_histogram': r(histogram),
+            'macd_interpretation': None if histogram is None else (
+                'Bullish (MACD di atas sinyal)' if histogram > 0 else 'Bearish (MACD di bawah sinyal)'),
+        }
+
+        moving_average = {f'sma_{p}': r(ind.get(f'sma_{p}')) for p in sma_periods}
+        moving_average.update({f'ema_{p}': r(ind.get(f'ema_{p}')) for p in ema_periods})
+        if price and sma_slow:
+            moving_average['position'] = f"Harga {'di atas' if price > sma_slow else 'di bawah'} SMA {max(sma_periods)}"
+
+        percent_b = ind.get('bb_percent_b')
+        atr_percent = ind.get('atr_percent')
+        volatility = {
+            'moving_average': moving_average,
+            'bollinger_bands': {
+                'upper': r(ind.get('bb_upper')),
+                'middle': r(ind.get('bb_middle')),
+                'lower': r(ind.get('bb_lower')),
+                'percent_b': r(percent_b),
+                'bandwidth': r(ind.get('bb_bandwidth')),
+                'position': None if percent_b is None else (
+                    'Di atas band atas' if percent_b > 1 else ('Di bawah band bawah' if percent_b < 0 else 'Di dalam band')),
+            },
+            'atr_1h': r(ind.get('atr')),
+            'atr_percent': r(atr_percent),
+            'volatility_regime': 'Tidak diketahui' if atr_percent is None else (
+                'Tinggi' if atr_percent > 2 else ('Rendah' if atr_percent < 0.5 else 'Normal')),
+        }
+
+        relative_volume = ind.get('relative_volume')
+        volume_profile = {
+            'poc': r(ind.get('poc')),
+            'relative_volume': r(relative_volume),
+            'volume_anomaly': relative_volume is not None and relative_volume > 1.5,
+        }
+        return trend, trend_strength, momentum, volatility, volume_profile
+
+    def analyze_technical(self, perception_snapshot, symbol, indicators=None):
         """
         I. Analisis Teknikal: "Peta Pergerakan Harga"
+        Args:
+            indicators (dict, optional): Nilai indikator simbol ini dari `compute_indicators`.
+                                         Jika tidak ada, dipakai perkiraan kasar dari data 24 jam.
         """
         tech_analysis = {
             'symbol': symbol,
@@ -64,11 +212,16 @@ class QuantumSentientAnalyzer:
             price = market_data.get('price')
             change_24h = market_data.get('change_24h', 0)
             trend = "Bullish" if change_24h > 2 else ("Bearish" if change_24h < -2 else "Sideways")
+            trend_strength = 'Moderat'
+            described = self._describe_indicators(indicators, price) if indicators else None
+            if described:
+                trend = described[0] or trend
+                trend_strength = described[1] or trend_strength
             
             tech_analysis['details']['market_structure'] = {
                 'trend': trend,
                 'hh_hl_lh_ll': 'Data dummy: Pola HH-HL terlihat di timeframe 4H.',
-                'trend_strength': 'Moderat'
+                'trend_strength': trend_strength
             }
 
             # --- Pola Grafik & Candlestick ---
@@ -78,8 +231,17 @@ class QuantumSentientAnalyzer:
                 'volume_confirmation': 'Volume sesuai dengan pergerakan harga.'
             }
 
+            if described:
+                # --- Indikator Momentum, Tren & Volatilitas, Volume Profile (dari candle OHLCV) ---
+                _, _, momentum, volatility, volume_profile = described
+                tech_analysis['details']['momentum_indicators'] = momentum
+                tech_analysis['details']['trend_volatility_indicators'] = volatility
+                tech_analysis['details']['volume_profile'] = volume_profile
+                logging.debug(f"Analisis teknikal untuk {symbol} selesai (indikator OHLCV).")
+                return tech_analysis
+
             # --- Indikator Momentum ---
-            # Placeholder: Logika untuk RSI, MACD
+            # Perkiraan kasar jika candle OHLCV tidak tersedia
             rsi_value = 50 + (change_24h / 2) # Dummy calculation
             rsi_value = max(0, min(100, rsi_value)) # Clamp between 0-100
             
@@ -189,7 +351,7 @@ class QuantumSentientAnalyzer:
 
             # --- Peristiwa Geopolitik ---
             # Placeholder: Data dari berita/intelijen
-            news_articles = perception_snapshot.get('news', [])
+            news_articles = iter_news_items(perception_snapshot.get('news', []))
             geopolitical_events = [article for article in news_articles if any(keyword in (article.get('title', '') + ' ' + article.get('description', '')) for keyword in ['perang', 'sanksi', 'pemilu', 'tension', 'konflik', 'trade war'])]
             macro_analysis['details']['geopolitics'] = {
                 'key_events': [f"{e.get('source', 'N/A')}: {e.get('title', '')[:50]}..." for e in geopolitical_events[:3]], # 3 event teratas
@@ -266,9 +428,35 @@ class QuantumSentientAnalyzer:
 
         return quant_analysis
 
-    def analyze_sentiment_psychology(self, perception_snapshot, symbol):
+    def analyze_news_sentiment(self, perception_snapshot):
+        """
+        Sentimen berita berbasis kata kunci atas semua berita di snapshot.
+        Tidak bergantung pada simbol, sehingga cukup dihitung sekali per snapshot.
+        """
+        all_news_text = " ".join(
+            f"{article.get('title') or ''} {article.get('summary') or article.get('description') or ''}"
+            for article in iter_news_items(perception_snapshot.get('news', {}))
+        ).lower()
+
+        # Logika sederhana untuk sentimen berita
+        positive_keywords = ['naik', 'bullish', 'positif', 'meningkat', 'kemitraan', 'adopsi']
+        negative_keywords = ['turun', 'bearish', 'negatif', 'menurun', 'kerugian', 'regulasi ketat']
+
+        pos_count = sum(all_news_text.count(word) for word in positive_keywords)
+        neg_count = sum(all_news_text.count(word) for word in negative_keywords)
+
+        return {
+            'overall': "Bullish" if pos_count > neg_count else ("Bearish" if neg_count > pos_count else "Netral"),
+            'positive_signals': pos_count,
+            'negative_signals': neg_count
+        }
+
+    def analyze_sentiment_psychology(self, perception_snapshot, symbol, news_sentiment=None):
         """
         V. Analisis Sentimen & Psikologi Pasar: "Mengukur Keserakahan dan Ketakutan"
+        Args:
+            news_sentiment (dict, optional): Hasil `analyze_news_sentiment` yang sudah
+                                             dihitung (dipakai bersama antar simbol).
         """
         sent_analysis = {
             'symbol': symbol,
@@ -296,28 +484,7 @@ class QuantumSentientAnalyzer:
 
             # --- Analisis Berita ---
             # Placeholder: Data dari news_aggregator
-            news_articles = perception_snapshot.get('news', {})
-            # Asumsikan news_articles adalah dict dari hasil scraping
-            all_news_text = ""
-            for source, articles in news_articles.items():
-                if isinstance(articles, list):
-                    for article in articles:
-                        all_news_text += f" {article.get('title', '')} {article.get('summary', '')}"
-            
-            # Logika sederhana untuk sentimen berita
-            positive_keywords = ['naik', 'bullish', 'positif', 'meningkat', 'kemitraan', 'adopsi']
-            negative_keywords = ['turun', 'bearish', 'negatif', 'menurun', 'kerugian', 'regulasi ketat']
-            
-            pos_count = sum(all_news_text.lower().count(word) for word in positive_keywords)
-            neg_count = sum(all_news_text.lower().count(word) for word in negative_keywords)
-            
-            overall_sentiment = "Bullish" if pos_count > neg_count else ("Bearish" if neg_count > pos_count else "Netral")
-
-            sent_analysis['details']['news_sentiment'] = {
-                'overall': overall_sentiment,
-                'positive_signals': pos_count,
-                'negative_signals': neg_count
-            }
+            sent_analysis['details']['news_sentiment'] = news_sentiment or self.analyze_news_sentiment(perception_snapshot)
 
             # --- Narrative Tracking ---
             # Placeholder: Logika untuk mengidentifikasi narasi
@@ -333,9 +500,11 @@ class QuantumSentientAnalyzer:
 
         return sent_analysis
 
-    def analyze_risk_management(self, perception_snapshot, symbol, asset_name):
+    def analyze_risk_management(self, perception_snapshot, symbol, asset_name, indicators=None):
         """
         VI. Manajemen Risiko & Diri: "Bertahan Hidup untuk Bertarung Lagi"
+        Args:
+            indicators (dict, optional): Nilai indikator simbol ini; ATR dipakai untuk position sizing.
         """
         risk_analysis = {
             'symbol': symbol,
@@ -349,8 +518,8 @@ class QuantumSentientAnalyzer:
             market_data = perception_snapshot.get('market_data', {}).get(symbol, {})
             
             # --- Position Sizing ---
-            # Placeholder: Logika berbasis ATR dan toleransi risiko
-            atr_1h = abs(market_data.get('high_1h', 0) - market_data.get('low_1h', 0))
+            # ATR dari riwayat candle; tanpa riwayat, rentang candle 1h terakhir
+            atr_1h = (indicators or {}).get('atr') or abs((market_data.get('high_1h') or 0) - (market_data.get('low_1h') or 0))
             # Asumsi risiko 1% dari modal
             risk_amount_idr = self.orchestrator.config.get('risk_management', {}).get('risk_per_trade_percent', 1.0) / 100.0 * 1000000 # Misal modal 1 juta
             # Asumsi stop loss 2 x ATR
@@ -397,7 +566,107 @@ class QuantumSentientAnalyzer:
 
         return risk_analysis
 
-    def synthesize_quantum_thoughts(self, perception_snapshot, symbol, asset_name):
+    # --- EKSEKUSI PARALEL DIMENSI ---
+    def _run_with_timeouts(self, tasks):
+        """
+        Menjalankan fungsi-fungsi analisis secara paralel dengan batas waktu per
+        tugas (dihitung dari awal). Tugas yang melewati batas tetap berjalan di
+        latar belakang, tetapi hasilnya dibuang.
+        Args:
+            tasks (dict): {nama: (fungsi, args)}; batas waktu dari `dimension_timeouts`.
+        Returns:
+            dict: {nama: hasil, atau None jika gagal/melewati batas waktu}.
+        """
+        if not self.parallel_dimensions:
+            results = {}
+            for name, (func, args) in tasks.items():
+                try:
+                    results[name] = func(*args)
+                except Exception as e:
+                    logging.error(f"Dimensi QSA '{name}' gagal: {e}", exc_info=True)
+                    results[name] = None
+            return results
+
+        started_at = time.monotonic()
+        futures = {name: self._dimension_executor.submit(func, *args) for name, (func, args) in tasks.items()}
+        results = {}
+        for name, future in futures.items():
+            timeout = self.dimension_timeouts.get(name)
+            remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started_at))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logging.warning(f"Dimensi QSA '{name}' melewati batas waktu {timeout}s. Dilewati.")
+                results[name] = None
+            except Exception as e:
+                logging.error(f"Dimensi QSA '{name}' gagal: {e}", exc_info=True)
+                results[name] = None
+        return results
+
+    @staticmethod
+    def _missing_dimension(name, summary):
+        return {
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'summary': summary,
+            'details': {},
+            'error': f"Dimensi '{name}' tidak selesai (gagal atau melewati batas waktu)."
+        }
+
+    def compute_shared_context(self, perception_snapshot):
+        """
+        Menghitung analisis yang tidak bergantung pada simbol (makro & geopolitik,
+        sentimen berita) dan indikator teknikal semua simbol sekali per snapshot,
+        untuk dipakai bersama semua simbol.
+        Returns:
+            dict: {'macro': hasil analyze_macro_geopolitical, 'news_sentiment': dict atau None,
+                   'indicators': {simbol: indikator}}.
+        """
+        shared = self._run_with_timeouts({
+            'macro': (self.analyze_macro_geopolitical, (perception_snapshot,)),
+            'sentiment': (self.analyze_news_sentiment, (perception_snapshot,)),
+            'indicators': (self.compute_indicators, (perception_snapshot,)),
+        })
+        return {
+            'macro': shared['macro'] or self._missing_dimension('macro', 'Analisis makroekonomi & geopolitik global'),
+            'news_sentiment': shared['sentiment'],
+            'indicators': shared['indicators'] or {},
+        }
+
+    def synthesize_many_symbols(self, perception_snapshot, assets):
+        """
+        Menganalisis banyak simbol sekaligus. Analisis yang tidak bergantung pada
+        simbol dihitung sekali, lalu setiap simbol disintesis secara paralel
+        (dibatasi `max_parallel_symbols`).
+        Args:
+            perception_snapshot (dict): Data snapshot dari PerceptionSystem.
+            assets (dict | list): {simbol: nama_aset} atau [(simbol, nama_aset), ...].
+        Returns:
+            dict: {simbol: hasil `synthesize_quantum_thoughts`, atau None jika gagal}.
+        """
+        pairs = list(assets.items()) if isinstance(assets, dict) else list(assets)
+        if not pairs:
+            return {}
+        logging.info(f"Mensintesis 'pemikiran' kuantum untuk {len(pairs)} simbol secara paralel...")
+        shared = self.compute_shared_context(perception_snapshot)
+        futures = {
+            symbol: self._symbol_executor.submit(self.synthesize_quantum_thoughts, perception_snapshot, symbol, asset_name, shared)
+            for symbol, asset_name in pairs
+        }
+        results = {}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                logging.error(f"Sintesis 'pemikiran' kuantum untuk {symbol} gagal: {e}", exc_info=True)
+                results[symbol] = None
+        return results
+
+    def close(self):
+        """Menghentikan pool thread dimensi & simbol. Panggil saat shutdown."""
+        self._dimension_executor.shutdown(wait=False)
+        self._symbol_executor.shutdown(wait=False)
+
+    def synthesize_quantum_thoughts(self, perception_snapshot, symbol, asset_name, shared=None):
         """
         Menggabungkan semua analisis menjadi satu laporan 'pemikiran' komprehensif
         dan meminta AI untuk memberikan interpretasi akhir.
@@ -405,18 +674,37 @@ class QuantumSentientAnalyzer:
             perception_snapshot (dict): Data snapshot dari PerceptionSystem.
             symbol (str): Simbol aset (e.g., 'BTC/USDT').
             asset_name (str): Nama aset (e.g., 'bitcoin').
+            shared (dict, optional): Hasil `compute_shared_context` untuk snapshot ini.
         Returns:
             dict: Hasil sintesis 'pemikiran' kuantum.
         """
+        # Jika snapshot membawa delta dan tidak ada yang berubah untuk aset ini
+        # (harga, metrik on-chain, berita baru), pakai ulang hasil sebelumnya tanpa memanggil AI
+        cache_key = (symbol, asset_name)
+        delta = perception_snapshot.get('delta')
+        if delta and cache_key in self._last_thoughts and not has_relevant_changes(delta, symbol=symbol, asset=asset_name):
+            logging.info(f"Tidak ada perubahan relevan untuk {symbol} sejak {delta.get('previous_timestamp')}. "
+                         f"Memakai ulang 'pemikiran' kuantum sebelumnya.")
+            return dict(self._last_thoughts[cache_key], reused=True)
+
         logging.info(f"Mensintesis 'pemikiran' kuantum 6 dimensi untuk {symbol} ({asset_name})...")
         
-        # 1. Jalankan semua analisis dimensi
-        technical = self.analyze_technical(perception_snapshot, symbol)
-        fundamental = self.analyze_fundamental(perception_snapshot, asset_name)
-        macro = self.analyze_macro_geopolitical(perception_snapshot)
-        quantitative = self.analyze_quantitative_flow(perception_snapshot, symbol, asset_name)
-        sentiment = self.analyze_sentiment_psychology(perception_snapshot, symbol)
-        risk = self.analyze_risk_management(perception_snapshot, symbol, asset_name)
+        # 1. Jalankan semua analisis dimensi secara paralel (makro & sentimen berita dipakai bersama)
+        if shared is None:
+            shared = self.compute_shared_context(perception_snapshot)
+        dimensions = self._run_with_timeouts({
+            'technical': (self.analyze_technical, (perception_snapshot, symbol, shared.get('indicators', {}).get(symbol))),
+            'fundamental': (self.analyze_fundamental, (perception_snapshot, asset_name)),
+            'quantitative': (self.analyze_quantitative_flow, (perception_snapshot, symbol, asset_name)),
+            'sentiment': (self.analyze_sentiment_psychology, (perception_snapshot, symbol, shared['news_sentiment'])),
+            'risk': (self.analyze_risk_management, (perception_snapshot, symbol, asset_name, shared.get('indicators', {}).get(symbol))),
+        })
+        technical = dimensions['technical'] or self._missing_dimension('technical', f'Analisis teknikal untuk {symbol}')
+        fundamental = dimensions['fundamental'] or self._missing_dimension('fundamental', f'Analisis fundamental untuk {asset_name}')
+        macro = shared['macro']
+        quantitative = dimensions['quantitative'] or self._missing_dimension('quantitative', f'Analisis kuantitatif untuk {symbol}')
+        sentiment = dimensions['sentiment'] or self._missing_dimension('sentiment', f'Analisis sentimen & psikologi pasar untuk {symbol}')
+        risk = dimensions['risk'] or self._missing_dimension('risk', f'Analisis manajemen risiko untuk {symbol}')
 
         # 2. Buat struktur data hasil sintesis
         quantum_thoughts = {
@@ -433,49 +721,23 @@ class QuantumSentientAnalyzer:
         }
 
         # --- 3. Permintaan Analisis AI Council ---
-        # Buat prompt untuk AI berdasarkan data yang telah dikumpulkan
-        ai_prompt = f"""
-        Anda adalah dewan AI analis keuangan ahli, berpikir seperti dokter pasar yang mendiagnosis dari berbagai "scan". 
-        Berdasarkan data analisis 6 dimensi berikut untuk aset {symbol} ({asset_name}), berikan interpretasi mendalam dan sinyal trading potensial:
-
-        I. Analisis Teknikal ("Peta Pergerakan Harga"):
-        {technical.get('summary', 'N/A')}
-        Detail: {technical.get('details', {})}
-        
-        II. Analisis Fundamental ("Kesehatan Aset"):
-        {fundamental.get('summary', 'N/A')}
-        Detail: {fundamental.get('details', {})}
-        
-        III. Analisis Makro & Geopolitik ("Arus dan Angin Global"):
-        {macro.get('summary', 'N/A')}
-        Detail: {macro.get('details', {})}
-        
-        IV. Analisis Kuantitatif & Arus Dana ("Membaca Jejak Uang"):
-        {quantitative.get('summary', 'N/A')}
-        Detail: {quantitative.get('details', {})}
-        
-        V. Analisis Sentimen & Psikologi ("Mengukur Keserakahan dan Ketakutan"):
-        {sentiment.get('summary', 'N/A')}
-        Detail: {sentiment.get('details', {})}
-        
-        VI. Manajemen Risiko ("Bertahan Hidup untuk Bertarung Lagi"):
-        {risk.get('summary', 'N/A')}
-        Detail: {risk.get('details', {})}
-
-        Harap berikan:
-        - Kesimpulan utama dari semua faktor.
-        - Sinyal trading (BULLISH/BEARISH/HOLD) dengan confidence level (0-1).
-        - Alasan utama untuk sinyal tersebut.
-        - Rekomendasi manajemen risiko awal (SL, TP, ukuran posisi).
-        - Faktor kunci yang perlu terus dipantau.
-        - Potensi bias psikologis yang mungkin mempengaruhi keputusan.
-        """
+        # Laporan 6 dimensi dipadatkan agar muat dalam anggaran token (tanpa dipotong buta oleh router)
+        ai_prompt = self._build_council_prompt(symbol, asset_name, {
+            'teknikal': technical,
+            'risiko': risk,
+            'kuantitatif': quantitative,
+            'sentimen': sentiment,
+            'fundamental': fundamental,
+            'makro': macro,
+        })
 
         try:
             # 4. Kirim prompt ke LLMRouter untuk mendapatkan analisis dari AI Council
-            ai_interpretation = self.llm_router.get_council_analysis(ai_prompt)
+            ai_interpretation = self.llm_router.get_council_analysis(ai_prompt, max_chars=None)
             quantum_thoughts['ai_interpretation'] = ai_interpretation
             logging.info(f"Interpretasi AI Council berhasil diterima untuk {symbol}.")
+            # Hanya hasil yang berhasil yang boleh dipakai ulang pada siklus berikutnya
+            self._last_thoughts[cache_key] = quantum_thoughts
         except Exception as e:
             error_msg = f"Gagal mendapatkan interpretasi AI Council untuk {symbol}: {e}"
             logging.error(error_msg, exc_info=True)
@@ -488,6 +750,38 @@ class QuantumSentientAnalyzer:
         logging.info(f"Sintesis 'pemikiran' kuantum 6 dimensi untuk {symbol} selesai.")
         return quantum_thoughts
 
+    def _build_council_prompt(self, symbol, asset_name, dimensions):
+        """
+        Menyusun prompt dewan AI dari laporan dimensi dalam bentuk JSON ringkas
+        (kunci disingkat, angka dibulatkan, teks placeholder dibuang).
+        Args:
+            dimensions (dict): {label: hasil analyze_*}, urut dari prioritas tertinggi;
+                               dimensi terakhir dibuang lebih dulu jika anggaran tidak cukup.
+        Returns:
+            str: Prompt lengkap.
+        """
+        sections = {}
+        for label, analysis in dimensions.items():
+            data = dict(analysis.get('details', {}))
+            if analysis.get('error'):
+                data['error'] = analysis['error']
+            sections[label] = data
+
+        report_text, report_tokens, dropped = compact_report(
+            sections, self.prompt_token_budget, self.numeric_precision, self.placeholder_markers
+        )
+        prompt = (
+            f"Anda adalah dewan AI analis keuangan ahli (\"dokter pasar\"). Data analisis 6 dimensi untuk "
+            f"{symbol} ({asset_name}) dalam JSON ringkas (kunci disingkat):\n{report_text}\n\n"
+            f"Berikan: kesimpulan utama; sinyal (BULLISH/BEARISH/HOLD) dengan confidence 0-1; alasan utama; "
+            f"rekomendasi risiko awal (SL, TP, ukuran posisi); faktor yang perlu dipantau; potensi bias psikologis."
+        )
+        legacy_tokens = estimate_tokens(str(sections))
+        logging.info(f"Prompt dewan QSA untuk {symbol}: ~{estimate_tokens(prompt)} token "
+                     f"(laporan ~{report_tokens}/{self.prompt_token_budget}, format lama ~{legacy_tokens})"
+                     f"{'; dimensi dibuang: ' + ', '.join(dropped) if dropped else ''}.")
+        return prompt
+
 # --- CONTOH PENGGUNAAN (Untuk debugging) ---
 if __name__ == '__main__':
     # Untuk debugging, Anda perlu mocking `orchestrator`
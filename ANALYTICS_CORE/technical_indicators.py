@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == MESIN INDIKATOR TEKNIKAL TERVEKTORISASI - PROJECT CHIMERA ==
+# ==============================================================================
+# Lokasi: ANALYTICS_CORE/technical_indicators.py
+# Deskripsi: Pustaka indikator teknikal berbasis NumPy (RSI, MACD, ATR,
+#            Bollinger Bands, SMA/EMA, volume profile/POC) yang menghitung
+#            semua simbol sekaligus dari array OHLCV 2-D (simbol x bar).
+#            IndicatorEngine menyimpan status rekursif per simbol sehingga
+#            bar baru cukup diproses secara inkremental (biaya per bar tidak
+#            bergantung pada panjang riwayat), untuk ratusan simbol per siklus.
+# ==============================================================================
+
+import numpy as np
+
+# Kolom array OHLCV (format CCXT: [timestamp, open, high, low, close, volume])
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+def _as_2d(values) -> np.ndarray:
+    array = np.asarray(values, dtype=float)
+    return array[np.newaxis, :] if array.ndim == 1 else array
+
+
+def to_ohlcv_array(ohlcv_by_symbol: dict, symbols=None, bars: int = None) -> np.ndarray:
+    """
+    Menyusun array OHLCV (simbol x bar x 6) dari {simbol: [[ts, o, h, l, c, v], ...]}.
+    Riwayat yang lebih pendek diratakan ke kanan (bar terakhir sejajar) dan diisi NaN di depan.
+    Args:
+        ohlcv_by_symbol (dict): Candle per simbol, urut dari yang terlama.
+        symbols (list, optional): Urutan simbol (baris). Default: urutan dict.
+        bars (int, optional): Jumlah bar terakhir yang diambil. Default: riwayat terpanjang.
+    """
+    symbols = list(ohlcv_by_symbol) if symbols is None else list(symbols)
+    rows = []
+    for symbol in symbols:
+        # Candle bisa berupa list atau ndarray (view OHLCVStore); jangan uji dengan `or`
+        candles = ohlcv_by_symbol.get(symbol)
+        rows.append(np.empty((0, 6)) if candles is None else np.asarray(candles, dtype=float).reshape(-1, 6))
+    length = bars or max((len(row) for row in rows), default=0)
+    array = np.full((len(symbols), length, 6), np.nan)
+    for index, row in enumerate(rows):
+        row = row[-length:] if length else row[:0]
+        if len(row):
+            array[index, length - len(row):] = row
+    return array
+
+
+# --- 1. RATA-RATA BERGERAK ---
+def _ema_step(state, value, alpha):
+    """Satu langkah EMA. Nilai valid pertama menjadi benih; nilai NaN membiarkan status tetap."""
+    return np.where(np.isnan(value), state, np.where(np.isnan(state), value, state + alpha * (value - state)))
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average per baris; NaN sampai jendela berisi `period` nilai valid."""
+    values = _as_2d(values)
+    valid = ~np.isnan(values)
+    window_sum = np.cumsum(np.where(valid, values, 0.0), axis=1)
+    window_count = np.cumsum(valid, axis=1)
+    window_sum[:, period:] -= window_sum[:, :-period].copy()
+    window_count[:, period:] -= window_count[:, :-period].copy()
+    out = np.full(values.shape, np.nan)
+    full = window_count == period
+    out[full] = window_sum[full] / period
+    return out
+
+
+def rolling_std(values, period: int) -> np.ndarray:
+    """Simpangan baku bergulir (populasi) per baris."""
+    values = _as_2d(values)
+    mean = sma(values, period)
+    mean_sq = sma(values * values, period)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def ema(values, period: int = None, alpha: float = None) -> np.ndarray:
+    """
+    Exponential moving average per baris. Rekursif di sumbu waktu, tetapi
+    setiap langkah tervektorisasi di semua simbol.
+    Args:
+        period (int): Periode EMA (alpha = 2 / (period + 1)).
+        alpha (float, optional): Faktor pemulusan langsung (misal 1/period untuk Wilder).
+    """
+    values = _as_2d(values)
+    alpha = 2.0 / (period + 1) if alpha is None else alpha
+    out = np.empty(values.shape)
+    state = np.full(values.shape[0], np.nan)
+    for t in range(values.shape[1]):
+        state = _ema_step(state, values[:, t], alpha)
+        out[:, t] = state
+    return out
+
+
+def _count_valid(values) -> np.ndarray:
+    return np.cumsum(~np.isnan(values), axis=1)
+
+
+# --- 2. MOMENTUM ---
+def _price_changes(close):
+    changes = np.full(close.shape, np.nan)
+    changes[:, 1:] = close[:, 1:] - close[:, :-1]
+    return changes
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Tanpa kerugian: 100 (atau 50 jika harga datar)
+    return np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), value)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """RSI dengan pemulusan Wilder. NaN sampai ada `period` perubahan harga."""
+    close = _as_2d(close)
+    changes = _price_changes(close)
+    gains = np.where(np.isnan(changes), np.nan, np.maximum(changes, 0.0))
+    losses = np.where(np.isnan(changes), np.nan, np.maximum(-changes, 0.0))
+    value = _rsi_from_averages(ema(gains, alpha=1.0 / period), ema(losses, alpha=1.0 / period))
+    value[_count_valid(changes) < period] = np.nan
+    return value
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    MACD. NaN sampai ada `slow` bar.
+    Returns:
+        tuple: (garis MACD, garis sinyal, histogram), masing-masing simbol x bar.
+    """
+    close = _as_2d(close)
+    line = ema(close, fast) - ema(close, slow)
+    line[(_count_valid(close) < slow) | np.isnan(close)] = np.nan
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+# --- 3. VOLATILITAS ---
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    previous_close = np.full(close.shape, np.nan)
+    previous_close[:, 1:] = close[:, :-1]
+    # fmax mengabaikan NaN: bar pertama memakai high - low saja
+    return np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range (pemulusan Wilder). NaN sampai ada `period` bar."""
+    ranges = true_range(high, low, close)
+    value = ema(ranges, alpha=1.0 / period)
+    value[_count_valid(ranges) < period] = np.nan
+    return value
+
+
+def bollinger_bands(close, period: int = 20, num_std: float = 2.0):
+    """
+    Bollinger Bands.
+    Returns:
+        tuple: (tengah, atas, bawah), masing-masing simbol x bar.
+    """
+    middle = sma(close, period)
+    deviation = rolling_std(close, period) * num_std
+    return middle, middle + deviation, middle - deviation
+
+
+# --- 4. VOLUME PROFILE ---
+def volume_profile(high, low, close, volume, bins: int = 24) -> dict:
+    """
+    Volume profile per simbol atas semua bar yang diberikan: volume setiap bar
+    dimasukkan ke bin harga dari harga tipikalnya, dan Point of Control (POC)
+    adalah titik tengah bin dengan volume terbesar.
+    Returns:
+        dict: {'poc': (simbol,), 'histogram': (simbol, bins), 'low': (simbol,), 'bin_width': (simbol,)}
+    """
+    high, low, close, volume = _as_2d(high), _as_2d(low), _as_2d(close), _as_2d(volume)
+    typical = (high + low + close) / 3.0
+    valid = ~(np.isnan(typical) | np.isnan(volume))
+    range_low = np.where(valid, low, np.inf).min(axis=1)
+    range_high = np.where(valid, high, -np.inf).max(axis=1)
+    has_data = valid.any(axis=1)
+    range_low = np.where(has_data, range_low, np.nan)
+    bin_width = np.where(has_data, (range_high - range_low) / bins, np.nan)
+    bin_width = np.where(bin_width > 0, bin_width, 1.0)
+
+    with np.errstate(invalid='ignore'):
+        index = np.floor((typical - range_low[:, np.newaxis]) / bin_width[:, np.newaxis])
+    index = np.clip(np.nan_to_num(index), 0, bins - 1).astype(int)
+    histogram = np.zeros((typical.shape[0], bins))
+    rows = np.broadcast_to(np.arange(typical.shape[0])[:, np.newaxis], typical.shape)
+    np.add.at(histogram, (rows[valid], index[valid]), volume[valid])
+
+    poc = range_low + (histogram.argmax(axis=1) + 0.5) * bin_width
+    poc = np.where(histogram.sum(axis=1) > 0, poc, np.nan)
+    return {'poc': poc, 'histogram': histogram, 'low': range_low, 'bin_width': bin_width}
+
+
+# --- 5. MESIN INKREMENTAL ---
+class IndicatorEngine:
+    """
+    Menghitung nilai indikator terbaru untuk banyak simbol dan memperbaruinya
+    secara inkremental. Indikator rekursif (EMA, MACD, RSI, ATR) disimpan
+    sebagai status per simbol; indikator berjendela (SMA, Bollinger, volume
+    profile) dihitung dari jendela bar terakhir yang disimpan. Candle terakhir
+    yang masih terbentuk (timestamp sama dengan bar terakhir) menggantikan bar
+    tersebut, bukan ditambahkan sebagai bar baru.
+
+        [indicators]
+        rsi_period = 14
+        sma_periods = [20, 50]
+        volume_profile_bars = 96
+    """
+
+    DEFAULT_SETTINGS = {
+        'rsi_period': 14,
+        'macd_fast': 12,
+        'macd_slow': 26,
+        'macd_signal': 9,
+        'atr_period': 14,
+        'bb_period': 20,
+        'bb_std': 2.0,
+        'sma_periods': [20, 50],
+        'ema_periods': [21],
+        'volume_profile_bars': 96,
+        'volume_profile_bins': 24,
+    }
+
+    # Status rekursif per simbol (satu nilai per simbol)
+    _STATE_FIELDS = ('last_ts', 'prev_close', 'close_count', 'change_count', 'tr_count',
+                     'ema_fast', 'ema_slow', 'macd_signal', 'avg_gain', 'avg_loss', 'atr')
+
+    def __init__(self, settings: dict = None):
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self.settings.update({k: v for k, v in (settings or {}).items() if k in self.DEFAULT_SETTINGS})
+        self.window_size = max(max(self.settings['sma_periods'], default=1), self.settings['bb_period'],
+                               self.settings['volume_profile_bars'])
+        self.symbols = []
+        self._index = {}
+        self._state = None
+        self._checkpoint = None
+
+    # --- 5a. STATUS ---
+    def _empty_state(self, count):
+        state = {field: np.full(count, np.nan) for field in self._STATE_FIELDS}
+        for field in ('close_count', 'change_count', 'tr_count'):
+            state[field] = np.zeros(count)
+        for period in self.settings['ema_periods']:
+            state[f'ema_{period}'] = np.full(count, np.nan)
+        # Jendela bar terakhir: kolom terakhir adalah bar terbaru
+        state['window'] = np.full((count, self.window_size, 6), np.nan)
+        return state
+
+    def reset(self, symbols):
+        """Mengosongkan status untuk daftar simbol baru."""
+        self.symbols = list(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._state = self._empty_state(len(self.symbols))
+        self._checkpoint = self._empty_state(len(self.symbols))
+
+    def initialize(self, ohlcv: np.ndarray, symbols):
+        """
+        Menghitung status dari riwayat penuh dalam satu lintasan tervektorisasi.
+        Bar terakhir diterapkan lewat `update` agar bisa diganti jika masih terbentuk.
+        Args:
+            ohlcv (np.ndarray): Array simbol x bar x 6 (lihat `to_ohlcv_array`).
+            symbols (list): Nama simbol untuk setiap baris.
+        """
+        self.reset(symbols)
+        if ohlcv.shape[1] == 0:
+            return
+        history, last_bar = ohlcv[:, :-1], ohlcv[:, -1]
+        state = self._state
+        settings = self.settings
+        if history.shape[1]:
+            close, high, low = history[..., CLOSE], history[..., HIGH], history[..., LOW]
+            changes = _price_changes(close)
+            ranges = true_range(high, low, close)
+            fast = ema(close, settings['macd_fast'])
+            slow = ema(close, settings['macd_slow'])
+            line = fast - slow
+            line[(_count_valid(close) < settings['macd_slow']) | np.isnan(close)] = np.nan
+
+            valid_close = ~np.isnan(close)
+            last_valid = np.where(valid_close.any(axis=1), history.shape[1] - 1 - np.argmax(valid_close[:, ::-1], axis=1), -1)
+            rows = np.arange(len(self.symbols))
+            state['last_ts'] = np.where(last_valid >= 0, history[rows, last_valid, TIMESTAMP], np.nan)
+            state['prev_close'] = np.where(last_valid >= 0, close[rows, last_valid], np.nan)
+            state['close_count'] = valid_close.sum(axis=1).astype(float)
+            state['change_count'] = (~np.isnan(changes)).sum(axis=1).astype(float)
+            state['tr_count'] = (~np.isnan(ranges)).sum(axis=1).astype(float)
+            state['ema_fast'], state['ema_slow'] = fast[:, -1], slow[:, -1]
+            state['macd_signal'] = ema(line, settings['macd_signal'])[:, -1]
+            state['avg_gain'] = ema(np.where(np.isnan(changes), np.nan, np.maximum(changes, 0.0)), alpha=1.0 / settings['rsi_period'])[:, -1]
+            state['avg_loss'] = ema(np.where(np.isnan(changes), np.nan, np.maximum(-changes, 0.0)), alpha=1.0 / settings['rsi_period'])[:, -1]
+            state['atr'] = ema(ranges, alpha=1.0 / settings['atr_period'])[:, -1]
+            for period in settings['ema_periods']:
+                state[f'ema_{period}'] = ema(close, period)[:, -1]
+            tail = history[:, -self.window_size:]
+            state['window'][:, self.window_size - tail.shape[1]:] = tail
+        self.update(last_bar)
+
+    def _save_checkpoint(self, mask):
+        for field, values in self._state.items():
+            self._checkpoint[field][mask] = values[mask]
+
+    def _restore_checkpoint(self, mask):
+        for field, values in self._checkpoint.items():
+            self._state[field][mask] = values[mask]
+
+    def update(self, bar: np.ndarray, replace_mask=None):
+        """
+        Menerapkan satu bar baru untuk semua simbol sekaligus (O(1) terhadap panjang riwayat).
+        Args:
+            bar (np.ndarray): Array simbol x 6; baris NaN berarti simbol itu tidak punya bar baru.
+            replace_mask (np.ndarray, optional): Simbol yang bar terakhirnya diganti (candle masih terbentuk).
+        """
+        state, settings = self._state, self.settings
+        bar = np.asarray(bar, dtype=float).reshape(len(self.symbols), 6)
+        has_bar = ~np.isnan(bar[:, CLOSE])
+        if replace_mask is not None:
+            replace_mask = replace_mask & has_bar
+            self._restore_checkpoint(replace_mask)
+        self._save_checkpoint(has_bar)
+
+        close = np.where(has_bar, bar[:, CLOSE], np.nan)
+        high = np.where(has_bar, bar[:, HIGH], np.nan)
+        low = np.where(has_bar, bar[:, LOW], np.nan)
+        previous = state['prev_close']
+
+        change = close - previous
+        has_change = has_bar & ~np.isnan(change)
+        gain = np.where(has_change, np.maximum(change, 0.0), np.nan)
+        loss = np.where(has_change, np.maximum(-change, 0.0), np.nan)
+        state['avg_gain'] = _ema_step(state['avg_gain'], gain, 1.0 / settings['rsi_period'])
+        state['avg_loss'] = _ema_step(state['avg_loss'], loss, 1.0 / settings['rsi_period'])
+
+        tr = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        state['atr'] = _ema_step(state['atr'], tr, 1.0 / settings['atr_period'])
+
+        state['ema_fast'] = _ema_step(state['ema_fast'], close, 2.0 / (settings['macd_fast'] + 1))
+        state['ema_slow'] = _ema_step(state['ema_slow'], close, 2.0 / (settings['macd_slow'] + 1))
+        for period in settings['ema_periods']:
+            state[f'ema_{period}'] = _ema_step(state[f'ema_{period}'], close, 2.0 / (period + 1))
+
+        state['close_count'] += has_bar
+        state['change_count'] += has_change
+        state['tr_count'] += has_bar & ~np.isnan(tr)
+        line = np.where(state['close_count'] >= settings['macd_slow'], state['ema_fast'] - state['ema_slow'], np.nan)
+        state['macd_signal'] = _ema_step(state['macd_signal'], np.where(has_bar, line, np.nan),
+                                         2.0 / (settings['macd_signal'] + 1))
+
+        state['prev_close'] = np.where(has_bar, close, previous)
+        state['last_ts'] = np.where(has_bar, bar[:, TIMESTAMP], state['last_ts'])
+        window = state['window']
+        window[has_bar, :-1] = window[has_bar, 1:]
+        window[has_bar, -1] = bar[has_bar]
+
+    def ingest(self, ohlcv_by_symbol: dict) -> str:
+        """
+        Menyinkronkan mesin dengan candle terbaru per simbol. Jika simbol sama dan
+        hanya ada sedikit bar baru, bar diterapkan secara inkremental; jika tidak
+        (simbol berubah, celah terlalu panjang), status dihitung ulang dari riwayat.
+        Args:
+            ohlcv_by_symbol (dict): {simbol: [[ts, o, h, l, c, v], ...]}.
+        Returns:
+            str: 'initialized', 'incremental', atau 'unchanged'.
+        """
+        symbols = sorted(symbol for symbol, rows in ohlcv_by_symbol.items() if rows is not None and len(rows))
+        if self._state is None or symbols != self.symbols:
+            self.initialize(to_ohlcv_array(ohlcv_by_symbol, symbols), symbols)
+            return 'initialized'
+
+        pending = {}
+        replace_mask = np.zeros(len(symbols), dtype=bool)
+        for index, symbol in enumerate(symbols):
+            rows = np.asarray(ohlcv_by_symbol[symbol], dtype=float).reshape(-1, 6)
+            last_ts = self._state['last_ts'][index]
+            if np.isnan(last_ts):
+                newer = rows
+            else:
+                # Riwayat urut menurut waktu: cukup cari posisi bar terakhir yang sudah diproses
+                newer = rows[np.searchsorted(rows[:, TIMESTAMP], last_ts):]
+                if len(newer) == len(rows) and rows[0, TIMESTAMP] > last_ts:
+                    # Tidak ada tumpang tindih dengan bar terakhir: ada celah di riwayat
+                    self.initialize(to_ohlcv_array(ohlcv_by_symbol, symbols), symbols)
+                    return 'initialized'
+                replace_mask[index] = len(newer) > 0 and newer[0, TIMESTAMP] == last_ts
+            if len(newer):
+                pending[index] = newer
+
+        steps = max((len(rows) for rows in pending.values()), default=0)
+        if steps == 0:
+            return 'unchanged'
+        if steps > self.window_size:
+            self.initialize(to_ohlcv_array(ohlcv_by_symbol, symbols), symbols)
+            return 'initialized'
+        for step in range(steps):
+            bar = np.full((len(symbols), 6), np.nan)
+            for index, rows in pending.items():
+                if step < len(rows):
+                    bar[index] = rows[step]
+            self.update(bar, replace_mask if step == 0 else None)
+        return 'incremental'
+
+    # --- 5b. NILAI TERBARU ---
+    def latest(self) -> dict:
+        """
+        Nilai indikator terbaru untuk semua simbol.
+        Returns:
+            dict: {nama_indikator: np.ndarray (simbol,)}.
+        """
+        if self._state is None:
+            return {}
+        state, settings = self._state, self.settings
+        window = state['window']
+        close = window[:, -1, CLOSE]
+        values = {'close': close}
+
+        rsi_value = _rsi_from_averages(state['avg_gain'], state['avg_loss'])
+        values['rsi'] = np.where(state['change_count'] >= settings['rsi_period'], rsi_value, np.nan)
+        line = np.where(state['close_count'] >= settings['macd_slow'], state['ema_fast'] - state['ema_slow'], np.nan)
+        values['macd'] = line
+        values['macd_signal'] = state['macd_signal']
+        values['macd_histogram'] = line - state['macd_signal']
+        values['atr'] = np.where(state['tr_count'] >= settings['atr_period'], state['atr'], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values['atr_percent'] = values['atr'] / close * 100.0
+
+        for period in settings['sma_periods']:
+            values[f'sma_{period}'] = sma(window[:, -period:, CLOSE], period)[:, -1]
+        for period in settings['ema_periods']:
+            values[f'ema_{period}'] = state[f'ema_{period}']
+
+        bb_period = settings['bb_period']
+        middle, upper, lower = bollinger_bands(window[:, -bb_period:, CLOSE], bb_period, settings['bb_std'])
+        values['bb_middle'], values['bb_upper'], values['bb_lower'] = middle[:, -1], upper[:, -1], lower[:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values['bb_percent_b'] = (close - values['bb_lower']) / (values['bb_upper'] - values['bb_lower'])
+            values['bb_bandwidth'] = (values['bb_upper'] - values['bb_lower']) / values['bb_middle']
+
+        volume_window = window[:, -bb_period:, VOLUME]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values['relative_volume'] = window[:, -1, VOLUME] / sma(volume_window, bb_period)[:, -1]
+
+        profile_window = window[:, -settings['volume_profile_bars']:]
+        profile = volume_profile(profile_window[..., HIGH], profile_window[..., LOW], profile_window[..., CLOSE],
+                                 profile_window[..., VOLUME], settings['volume_profile_bins'])
+        values['poc'] = profile['poc']
+        return values
+
+    def get(self, symbol: str) -> dict:
+        """Nilai indikator terbaru satu simbol sebagai float (None jika belum tersedia)."""
+        index = self._index.get(symbol)
+        if index is None:
+            return None
+        return {name: (None if np.isnan(array[index]) else float(array[index])) for name, array in self.latest().items()}
+
+    def latest_by_symbol(self) -> dict:
+        """{simbol: {indikator: float atau None}} untuk semua simbol (satu kali hitung)."""
+        values = self.latest()
+        return {
+            symbol: {name: (None if np.isnan(array[index]) else float(array[index])) for name, array in values.items()}
+            for symbol, index in self._index.items()
+        }
@@ -15,7 +15,7 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseUpload, MediaFileUpload
 
 # Jika mengubah cakupan ini, hapus file token.json.
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]
@@ -109,4 +109,40 @@ class GDriveSynchronizer: # <-- NAMA KELAS YANG BENAR
             
         except Exception as e:
             logging.error(f"Gagal mengunggah file '{filename}' ke Google Drive: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+    def upload_file(self, file_path, filename=None, folder_id=None, mimetype='application/octet-stream'):
+        """
+        Mengunggah file lokal (misal arsip Parquet) ke Google Drive.
+        
+        Args:
+            file_path (str | Path): Path file lokal.
+            filename (str, optional): Nama file di Google Drive. Default: nama file lokal.
+            folder_id (str, optional): ID folder di Google Drive. Jika None, akan diunggah ke root.
+            mimetype (str): MIME type file.
+        
+        Returns:
+            str: ID file yang baru diunggah, atau None jika gagal.
+        """
+        filename = filename or os.path.basename(str(file_path))
+        try:
+            logging.info(f"Mempersiapkan unggahan file '{filename}' ke Google Drive...")
+            file_metadata = {'name': filename}
+            if folder_id:
+                file_metadata['parents'] = [folder_id]
+                
+            media = MediaFileUpload(str(file_path), mimetype=mimetype, resumable=True)
+            
+            file = self.service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id'
+            ).execute()
+            
+            file_id = file.get('id')
+            logging.info(f"File '{filename}' berhasil diunggah dengan ID: {file_id}")
+            return file_id
+            
+        except Exception as e:
+            logging.error(f"Gagal mengunggah file '{filename}' ke Google Drive: {e}", exc_info=True)
+            return None
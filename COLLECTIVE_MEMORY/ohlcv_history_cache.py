@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == CACHE RIWAYAT OHLCV DI DISK - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: COLLECTIVE_MEMORY/ohlcv_history_cache.py
+# Deskripsi: Cache riwayat OHLCV lokal per (sumber, aset, interval) untuk
+#            CoinGeckoToolkit dan YahooFinanceToolkit. Setiap seri disimpan
+#            sebagai file biner float64 (bar x 6: timestamp ms, open, high,
+#            low, close, volume) yang dibaca lewat memory map, sehingga backtest
+#            bisa memutar ulang riwayat bertahun-tahun tanpa jaringan. Setiap
+#            pemanggilan hanya mengambil ekor yang hilang sejak bar terakhir.
+#
+# ==============================================================================
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# --- PENYESUAIAN PATH DINAMIS ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = Path(current_script_dir).parent
+sys.path.insert(0, str(project_root))
+# --- AKHIR PENYESUAIAN PATH ---
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+ROW_BYTES = len(COLUMNS) * 8
+_DTYPE = np.dtype('<f8')
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]', '_', str(text))
+
+
+class OHLCVHistoryCache:
+    """
+    Cache riwayat OHLCV persisten dengan penyegaran ekor inkremental.
+    Pengaturan dibaca dari seksi `[history_cache]` di `chimera_config.toml`:
+
+        [history_cache]
+        cache_dir = "COLLECTIVE_MEMORY/ohlcv_history"
+        min_refresh_seconds = 300
+        offline = false
+
+    Alur pemakaian:
+        bars = cache.get('yahoo', 'BTC-USD', '1h', start_ms, fetch)
+    dengan `fetch(since_ms)` mengembalikan bar [[ts, o, h, l, c, v], ...]
+    sejak `since_ms` (None = seluruh jendela yang diminta).
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'cache_dir': 'COLLECTIVE_MEMORY/ohlcv_history',
+        'min_refresh_seconds': 300,
+        'offline': False,
+    }
+
+    def __init__(self, config: dict = None):
+        """
+        Args:
+            config (dict, optional): Konfigurasi lengkap (`orchestrator.config`).
+        """
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        history_config = (config or {}).get('history_cache', {})
+        self.settings.update({k: v for k, v in history_config.items() if k in self.DEFAULT_SETTINGS})
+        self.enabled = bool(self.settings['enabled'])
+        self.offline = bool(self.settings['offline'])
+        self.min_refresh_seconds = float(self.settings['min_refresh_seconds'])
+        self.cache_dir = project_root / self.settings['cache_dir']
+        self._lock = threading.Lock()
+
+    # --- 1. FILE SERI ---
+    def _path(self, source, key, interval) -> Path:
+        return self.cache_dir / _safe_name(source) / f"{_safe_name(key)}__{_safe_name(interval)}.ohlcv"
+
+    def _load_meta(self, path: Path) -> dict:
+        meta_path = path.with_suffix('.json')
+        if not meta_path.exists():
+            return {}
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, path: Path, meta: dict):
+        with open(path.with_suffix('.json'), 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+
+    @staticmethod
+    def _row_count(path: Path) -> int:
+        # Baris terakhir yang terpotong (penulisan terputus) diabaikan
+        return path.stat().st_size // ROW_BYTES if path.exists() else 0
+
+    def _memmap(self, path: Path) -> np.ndarray:
+        rows = self._row_count(path)
+        if not rows:
+            return np.empty((0, len(COLUMNS)))
+        return np.memmap(path, dtype=_DTYPE, mode='r', shape=(rows, len(COLUMNS)))
+
+    def read(self, source: str, key: str, interval: str, start_ms: float = None, end_ms: float = None) -> np.ndarray:
+        """
+        Membaca bar dari cache lewat memory map (tanpa memuat seluruh file).
+        Args:
+            start_ms, end_ms (float, optional): Rentang timestamp (ms), inklusif.
+        Returns:
+            np.ndarray: Array read-only (bar x 6), urut menurut waktu.
+        """
+        bars = self._memmap(self._path(source, key, interval))
+        if not len(bars):
+            return bars
+        timestamps = bars[:, 0]
+        first = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+        last = len(bars) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+        return bars[first:last]
+
+    def last_timestamp(self, source: str, key: str, interval: str):
+        bars = self._memmap(self._path(source, key, interval))
+        return float(bars[-1, 0]) if len(bars) else None
+
+    def gaps(self, source: str, key: str, interval: str) -> list:
+        """
+        Celah yang tidak bisa diisi ulang dari sumber (mis. setelah pemadaman panjang).
+        Returns:
+            list: [[timestamp bar sebelum celah, timestamp bar sesudah celah], ...] (ms).
+        """
+        return self._load_meta(self._path(source, key, interval)).get('gaps', [])
+
+    # --- 2. PENULISAN ---
+    @staticmethod
+    def _normalize(rows) -> np.ndarray:
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(COLUMNS))
+        rows = rows[~np.isnan(rows[:, 0])]
+        # Urut menurut waktu; untuk timestamp ganda, baris terakhir yang dipakai
+        order = np.argsort(rows[:, 0], kind='stable')
+        rows = rows[order]
+        keep = np.append(rows[1:, 0] != rows[:-1, 0], True) if len(rows) else np.array([], dtype=bool)
+        return rows[keep]
+
+    @staticmethod
+    def _is_contiguous(rows: np.ndarray, last_ts: float) -> bool:
+        """Ekor menyambung jika kosong atau bar pertamanya tidak lebih baru dari bar terakhir di cache."""
+        return not len(rows) or rows[0, 0] <= last_ts
+
+    def _append_tail(self, path: Path, rows: np.ndarray) -> int:
+        """
+        Menimpa bar terakhir (jika timestamp sama) dan menambahkan bar yang lebih baru di akhir file.
+        Pemanggil memastikan `rows` menyambung dengan bar terakhir (lihat `_is_contiguous`).
+        """
+        count = self._row_count(path)
+        last_ts = float(self._memmap(path)[-1, 0]) if count else None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'r+b' if path.exists() else 'wb') as series_file:
+            if last_ts is not None:
+                same = rows[rows[:, 0] == last_ts]
+                if len(same):
+                    series_file.seek((count - 1) * ROW_BYTES)
+                    series_file.write(same[-1].astype(_DTYPE).tobytes())
+                rows = rows[rows[:, 0] > last_ts]
+            series_file.seek(count * ROW_BYTES)
+            series_file.truncate()
+            series_file.write(rows.astype(_DTYPE).tobytes())
+        return len(rows)
+
+    def _merge(self, path: Path, rows: np.ndarray) -> int:
+        """Menggabungkan bar (yang baru menang untuk timestamp sama) lalu menulis ulang file secara atomik."""
+        existing = np.array(self._memmap(path))
+        merged = self._normalize(np.concatenate([existing, rows]))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'wb') as series_file:
+            series_file.write(merged.astype(_DTYPE).tobytes())
+        os.replace(tmp_path, path)
+        return len(merged) - len(existing)
+
+    def _fill_gap(self, path: Path, meta: dict, last_ts: float, tail_rows: np.ndarray, fetch) -> int:
+        """
+        Mengambil ulang seluruh jendela lalu menggabungkannya bersama ekor yang sudah diambil;
+        celah yang tetap tersisa dicatat di `meta['gaps']`.
+        """
+        rows = self._normalize(np.concatenate([tail_rows, self._normalize(fetch(None))]))
+        added = self._merge(path, rows)
+        if not self._is_contiguous(rows, last_ts):
+            meta.setdefault('gaps', []).append([last_ts, float(rows[0, 0])])
+        return added
+
+    # --- 3. API UTAMA ---
+    def get(self, source: str, key: str, interval: str, start_ms: float, fetch, end_ms: float = None) -> np.ndarray:
+        """
+        Mengembalikan bar sejak `start_ms` dari cache, setelah mengambil dari
+        jaringan hanya bagian yang belum ada:
+          - jendela yang diminta belum tercakup cache: ambil seluruh jendela;
+          - selain itu, jika penyegaran terakhir sudah lewat `min_refresh_seconds`:
+            ambil ekor sejak bar terakhir (bar terakhir ikut diperbarui). Jika ekor
+            tidak menyambung (sumber tidak menjangkau bar terakhir), seluruh jendela
+            diambil ulang dan digabung; celah yang tetap tersisa dicatat di sidecar
+            (lihat `gaps`).
+        Jika pengambilan gagal atau mode offline, data cache yang ada dikembalikan.
+        Args:
+            source (str): Nama sumber ('coingecko', 'yahoo').
+            key (str): ID aset di sumber tersebut.
+            interval (str): Interval bar.
+            start_ms (float): Awal jendela (ms).
+            fetch (callable): fetch(since_ms) -> bar; since_ms None berarti seluruh jendela.
+        Returns:
+            np.ndarray: Bar (bar x 6), memory-mapped jika cache aktif.
+        """
+        if not self.enabled:
+            rows = self._normalize(fetch(None))
+            first = np.searchsorted(rows[:, 0], start_ms, side='left')
+            last = len(rows) if end_ms is None else np.searchsorted(rows[:, 0], end_ms, side='right')
+            return rows[first:last]
+
+        path = self._path(source, key, interval)
+        with self._lock:
+            meta = self._load_meta(path)
+            last_ts = self.last_timestamp(source, key, interval)
+            covered_from = meta.get('covered_from')
+            if self.offline:
+                pass
+            elif last_ts is None or covered_from is None or covered_from > start_ms:
+                try:
+                    added = self._merge(path, self._normalize(fetch(None)))
+                    meta['covered_from'] = start_ms if covered_from is None else min(covered_from, start_ms)
+                    meta['fetched_at'] = time.time()
+                    self._save_meta(path, meta)
+                    logging.info(f"Cache riwayat {source}:{key} ({interval}) diisi: {added} bar baru.")
+                except Exception as e:
+                    logging.error(f"Gagal mengisi cache riwayat {source}:{key} ({interval}): {e}")
+            elif time.time() - meta.get('fetched_at', 0) >= self.min_refresh_seconds:
+                try:
+                    rows = self._normalize(fetch(last_ts))
+                    if self._is_contiguous(rows, last_ts):
+                        added = self._append_tail(path, rows)
+                        logging.debug(f"Cache riwayat {source}:{key} ({interval}): {added} bar baru di ekor.")
+                    else:
+                        added = self._fill_gap(path, meta, last_ts, rows, fetch)
+                        logging.warning(f"Ekor cache riwayat {source}:{key} ({interval}) tidak menyambung dengan "
+                                        f"bar terakhir; jendela penuh diambil ulang ({added} bar baru).")
+                    meta['fetched_at'] = time.time()
+                    self._save_meta(path, meta)
+                except Exception as e:
+                    logging.warning(f"Penyegaran ekor cache riwayat {source}:{key} ({interval}) gagal: {e}. "
+                                    f"Memakai data cache.")
+        return self.read(source, key, interval, start_ms, end_ms)
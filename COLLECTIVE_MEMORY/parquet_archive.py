@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == ARSIP SNAPSHOT PARQUET (KOLOMNAR) - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: COLLECTIVE_MEMORY/parquet_archive.py
+# Deskripsi: Arsip snapshot persepsi dalam format Parquet/Arrow dengan skema
+#            tetap. Snapshot ditambahkan sebagai row group ke satu file per jam
+#            atau per hari (bukan satu CSV kecil per siklus), dan dapat dibaca
+#            kembali per rentang waktu dengan proyeksi kolom untuk backtest
+#            dan analisis.
+#
+# ==============================================================================
+
+import datetime as dt
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# --- PENYESUAIAN PATH DINAMIS ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = Path(current_script_dir).parent
+sys.path.insert(0, str(project_root))
+# --- AKHIR PENYESUAIAN PATH ---
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logging.warning("pyarrow tidak ditemukan. Arsip Parquet akan dinonaktifkan.")
+
+
+SCHEMA_VERSION = 1
+
+if PYARROW_AVAILABLE:
+    MARKET_STRUCT = pa.struct([
+        ('symbol', pa.string()),
+        ('price', pa.float64()),
+        ('change_24h', pa.float64()),
+        ('volume_24h', pa.float64()),
+        ('high_1h', pa.float64()),
+        ('low_1h', pa.float64()),
+        ('close_1h', pa.float64()),
+        ('volume_1h', pa.float64()),
+    ])
+    NEWS_STRUCT = pa.struct([
+        ('source', pa.string()),
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('published_at', pa.string()),
+        ('raw_json', pa.string()),
+    ])
+    ERROR_STRUCT = pa.struct([
+        ('component', pa.string()),
+        ('error', pa.string()),
+    ])
+    # Skema tetap: bagian snapshot yang bentuknya bebas (on-chain, sosial) disimpan sebagai JSON
+    SNAPSHOT_SCHEMA = pa.schema([
+        ('schema_version', pa.int16()),
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('processing_time_seconds', pa.float64()),
+        ('processing_time_by_stage', pa.map_(pa.string(), pa.float64())),
+        ('sources', pa.map_(pa.string(), pa.string())),
+        ('market', pa.list_(MARKET_STRUCT)),
+        ('news', pa.list_(NEWS_STRUCT)),
+        ('onchain_json', pa.string()),
+        ('social_json', pa.string()),
+        ('errors', pa.list_(ERROR_STRUCT)),
+    ])
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(value):
+    """Mengubah timestamp ISO (dengan akhiran 'Z') menjadi datetime UTC."""
+    if isinstance(value, dt.datetime):
+        return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+    parsed = dt.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+
+
+def _flatten_news(news):
+    """
+    Meratakan struktur berita bersarang ({misi: [item, ...]}) menjadi daftar
+    item dengan kolom tetap; item aslinya tetap disimpan di `raw_json`.
+    """
+    items = []
+
+    def visit(source, node):
+        if isinstance(node, list):
+            for item in node:
+                if isinstance(item, dict):
+                    items.append({
+                        'source': str(item.get('source') or source),
+                        'title': item.get('title') or item.get('headline'),
+                        'url': item.get('url') or item.get('link'),
+                        'published_at': str(item.get('published_at') or item.get('publishedAt') or '') or None,
+                        'raw_json': json.dumps(item, default=str),
+                    })
+                else:
+                    items.append({'source': source, 'title': None, 'url': None, 'published_at': None,
+                                  'raw_json': json.dumps(item, default=str)})
+        elif isinstance(node, dict):
+            for key, child in node.items():
+                visit(key if source is None else f"{source}.{key}", child)
+
+    visit(None, news or {})
+    return items
+
+
+def snapshot_to_row(snapshot: dict) -> dict:
+    """Memetakan satu snapshot persepsi ke satu baris sesuai SNAPSHOT_SCHEMA."""
+    market_rows = []
+    for symbol, data in (snapshot.get('market_data') or {}).items():
+        data = data or {}
+        row = {'symbol': data.get('symbol', symbol)}
+        for field in ('price', 'change_24h', 'volume_24h', 'high_1h', 'low_1h', 'close_1h', 'volume_1h'):
+            row[field] = _to_float(data.get(field))
+        market_rows.append(row)
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'timestamp': _parse_timestamp(snapshot['timestamp']),
+        'processing_time_seconds': _to_float(snapshot.get('processing_time_seconds')),
+        'processing_time_by_stage': [(k, _to_float(v)) for k, v in (snapshot.get('processing_time_by_stage') or {}).items()],
+        'sources': [(k, str(v)) for k, v in (snapshot.get('sources') or {}).items()],
+        'market': market_rows,
+        'news': _flatten_news(snapshot.get('news')),
+        'onchain_json': json.dumps(snapshot.get('onchain') or {}, default=str),
+        'social_json': json.dumps(snapshot.get('social') or {}, default=str),
+        'errors': [{'component': str(e.get('component')), 'error': str(e.get('error'))}
+                   for e in (snapshot.get('errors') or []) if isinstance(e, dict)],
+    }
+
+
+class ParquetSnapshotArchive:
+    """
+    Arsip snapshot Parquet lokal, satu file per periode (jam/hari).
+    Setiap `append` menambahkan satu row group. File ditulis ulang secara
+    atomik (row group lama disalin apa adanya + row group baru, lalu rename),
+    sehingga file di disk selalu valid dan bisa dibaca kapan saja.
+    """
+
+    def __init__(self, orchestrator):
+        """
+        Args:
+            orchestrator: Instance dari ChimeraOrchestrator (untuk konfigurasi).
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow diperlukan untuk arsip Parquet.")
+        parquet_config = orchestrator.config.get('archive', {}).get('parquet', {})
+        self.directory = project_root / parquet_config.get('directory', 'COLLECTIVE_MEMORY/parquet_archive')
+        self.partition = parquet_config.get('partition', 'hourly')
+        if self.partition not in ('hourly', 'daily'):
+            logging.warning(f"Partisi Parquet '{self.partition}' tidak dikenal. Menggunakan 'hourly'.")
+            self.partition = 'hourly'
+        self.compression = parquet_config.get('compression', 'zstd')
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    # --- 1. PERIODE & PATH ---
+    def _period_start(self, timestamp: dt.datetime) -> dt.datetime:
+        timestamp = timestamp.astimezone(dt.timezone.utc)
+        if self.partition == 'daily':
+            return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+
+    def _period_length(self) -> dt.timedelta:
+        return dt.timedelta(days=1) if self.partition == 'daily' else dt.timedelta(hours=1)
+
+    def _path_for_period(self, period_start: dt.datetime) -> Path:
+        fmt = '%Y%m%d' if self.partition == 'daily' else '%Y%m%d_%H'
+        return self.directory / f"perception_{period_start.strftime(fmt)}.parquet"
+
+    def _period_of_path(self, path: Path):
+        stem = path.stem.replace('perception_', '')
+        fmt = '%Y%m%d_%H' if '_' in stem else '%Y%m%d'
+        try:
+            return dt.datetime.strptime(stem, fmt).replace(tzinfo=dt.timezone.utc)
+        except ValueError:
+            return None
+
+    # --- 2. PENULISAN ---
+    def append(self, snapshots):
+        """
+        Menambahkan snapshot ke file periode masing-masing (satu row group per
+        periode per panggilan).
+        Args:
+            snapshots (list): Daftar snapshot persepsi (dict).
+        Returns:
+            list: Path file Parquet yang diperbarui.
+        """
+        rows_by_period = {}
+        for snapshot in snapshots:
+            row = snapshot_to_row(snapshot)
+            rows_by_period.setdefault(self._period_start(row['timestamp']), []).append(row)
+
+        written = []
+        for period_start, rows in sorted(rows_by_period.items()):
+            path = self._path_for_period(period_start)
+            table = pa.Table.from_pylist(rows, schema=SNAPSHOT_SCHEMA)
+            self._append_row_group(path, table)
+            written.append(path)
+            logging.debug(f"{len(rows)} snapshot ditambahkan ke {path.name}.")
+        return written
+
+    def _append_row_group(self, path: Path, table):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with pq.ParquetWriter(tmp_path, SNAPSHOT_SCHEMA, compression=self.compression) as writer:
+            if path.exists():
+                existing = pq.ParquetFile(path)
+                for index in range(existing.num_row_groups):
+                    writer.write_table(existing.read_row_group(index).cast(SNAPSHOT_SCHEMA))
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def completed_files(self, now: dt.datetime = None):
+        """
+        File yang periodenya sudah berakhir (tidak akan ditambah lagi), cocok
+        untuk diunggah ke penyimpanan jarak jauh.
+        """
+        now = now or dt.datetime.now(dt.timezone.utc)
+        completed = []
+        for path in sorted(self.directory.glob('perception_*.parquet')):
+            period_start = self._period_of_path(path)
+            if period_start and period_start + self._period_length() <= now:
+                completed.append(path)
+        return completed
+
+    # --- 3. PEMBACAAN ---
+    def read_table(self, start=None, end=None, columns=None):
+        """
+        Membaca snapshot dalam rentang waktu [start, end) dengan proyeksi kolom.
+        Hanya file periode yang beririsan dengan rentang yang dibuka, dan row
+        group di luar rentang dilewati berdasarkan statistik kolom timestamp.
+        Args:
+            start (datetime|str, optional): Batas awal (inklusif).
+            end (datetime|str, optional): Batas akhir (eksklusif).
+            columns (list, optional): Kolom yang dibaca (misal ['timestamp', 'market']).
+        Returns:
+            pyarrow.Table: Tabel snapshot, diurutkan berdasarkan timestamp.
+        """
+        start = _parse_timestamp(start) if start is not None else None
+        end = _parse_timestamp(end) if end is not None else None
+        if columns is not None and 'timestamp' not in columns:
+            columns = ['timestamp'] + list(columns)
+
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', start))
+        if end is not None:
+            filters.append(('timestamp', '<', end))
+
+        tables = []
+        for path in sorted(self.directory.glob('perception_*.parquet')):
+            period_start = self._period_of_path(path)
+            if period_start is None:
+                continue
+            if start is not None and period_start + self._period_length() <= start:
+                continue
+            if end is not None and period_start >= end:
+                continue
+            tables.append(pq.read_table(path, columns=columns, filters=filters or None))
+
+        if not tables:
+            schema = SNAPSHOT_SCHEMA if columns is None else pa.schema([SNAPSHOT_SCHEMA.field(c) for c in columns])
+            return schema.empty_table()
+        return pa.concat_tables(tables).sort_by('timestamp')
+
+    def read(self, start=None, end=None, columns=None):
+        """Seperti `read_table`, tetapi mengembalikan pandas DataFrame."""
+        return self.read_table(start=start, end=end, columns=columns).to_pandas()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == PENGARSIP SNAPSHOT LATAR BELAKANG - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: COLLECTIVE_MEMORY/snapshot_archiver.py
+# Deskripsi: Memindahkan pengarsipan snapshot persepsi keluar dari jalur kritis
+#            siklus kognitif. Snapshot dimasukkan ke antrean terbatas, ditulis
+#            ke direktori spool lokal (write-ahead) oleh thread pekerja, lalu
+#            diarsipkan dalam batch: sebagai CSV ke Google Drive, atau sebagai
+#            row group di arsip Parquet lokal (file per jam/hari yang diunggah
+#            setelah periodenya selesai). Arsip yang gagal dicoba ulang dengan
+#            backoff; file spool sisa proses sebelumnya ikut diarsipkan saat start.
+#
+# ==============================================================================
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import datetime as dt
+from pathlib import Path
+
+import pandas as pd
+
+# --- PENYESUAIAN PATH DINAMIS ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = Path(current_script_dir).parent
+sys.path.insert(0, str(project_root))
+# --- AKHIR PENYESUAIAN PATH ---
+
+from COLLECTIVE_MEMORY.parquet_archive import ParquetSnapshotArchive
+
+
+class SnapshotArchiver:
+    """
+    Pengarsip snapshot di latar belakang dengan antrean terbatas, spool
+    write-ahead di disk lokal, batching, dan retry.
+    """
+
+    def __init__(self, orchestrator, gdrive_sync, folder_id):
+        """
+        Args:
+            orchestrator: Instance dari ChimeraOrchestrator (untuk konfigurasi).
+            gdrive_sync (GDriveSynchronizer): Pengunggah ke Google Drive (boleh None
+                                              untuk format Parquet yang hanya lokal).
+            folder_id (str): ID folder tujuan di Google Drive.
+        """
+        self.orchestrator = orchestrator
+        self.gdrive_sync = gdrive_sync
+        self.folder_id = folder_id
+
+        archive_config = self.orchestrator.config.get('archive', {})
+        self.batch_size = archive_config.get('batch_size', 20)
+        self.batch_interval = archive_config.get('batch_interval_seconds', 300)
+        self.retry_base_delay = archive_config.get('retry_base_delay_seconds', 30)
+        self.retry_max_delay = archive_config.get('retry_max_delay_seconds', 900)
+        self.spool_dir = project_root / archive_config.get('spool_dir', 'COLLECTIVE_MEMORY/archive_spool')
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+        # Format arsip: 'parquet' (row group per batch, file per jam/hari) atau 'csv' (satu CSV per batch)
+        self.format = archive_config.get('format', 'csv')
+        self.parquet_archive = None
+        if self.format == 'parquet':
+            try:
+                self.parquet_archive = ParquetSnapshotArchive(self.orchestrator)
+            except ImportError as e:
+                logging.warning(f"Arsip Parquet tidak tersedia ({e}). Kembali ke format CSV.")
+                self.format = 'csv'
+        self._uploaded_manifest = None
+        if self.parquet_archive:
+            # Manifest unggahan disimpan di direktori arsip, bukan di spool (isi spool hanya snapshot)
+            self._uploaded_manifest = self.parquet_archive.directory / 'uploaded_parquet.json'
+            legacy_manifest = self.spool_dir / 'uploaded_parquet.json'
+            if legacy_manifest.exists() and not self._uploaded_manifest.exists():
+                os.replace(legacy_manifest, self._uploaded_manifest)
+
+        self.queue = queue.Queue(maxsize=archive_config.get('queue_max_size', 100))
+        self._spool_lock = threading.Lock()
+        self._sequence = 0
+        self._failures = 0
+        self._next_attempt = 0.0
+        # File spool dari proses sebelumnya (misal setelah crash) ikut diunggah.
+        # Hanya nama file spool (diawali timestamp) yang dicocokkan.
+        self._pending_files = sorted(self.spool_dir.glob('[0-9]*.json'))
+        self._oldest_pending = time.monotonic() if self._pending_files else None
+        if self._pending_files:
+            logging.info(f"Ditemukan {len(self._pending_files)} snapshot di spool yang belum diarsipkan.")
+
+        self._stop_event = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='snapshot-archiver', daemon=True)
+        self._worker.start()
+        logging.info(f"Pengarsip snapshot latar belakang aktif (format: {self.format}, spool: {self.spool_dir}).")
+
+    # --- 1. JALUR KRITIS: MASUKKAN KE ANTREAN ---
+    def enqueue(self, snapshot: dict) -> bool:
+        """
+        Memasukkan snapshot ke antrean arsip tanpa menunggu unggahan.
+        Snapshot diserialisasi saat ini juga, sehingga perubahan pada dict
+        setelah dipanggil tidak memengaruhi arsip. Jika antrean penuh, snapshot
+        langsung ditulis ke spool agar tidak hilang.
+        Returns:
+            bool: True jika masuk antrean, False jika ditulis langsung ke spool.
+        """
+        payload = json.dumps(snapshot, default=str)
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            logging.warning("Antrean arsip penuh. Snapshot ditulis langsung ke spool.")
+            self._write_spool(payload)
+            return False
+
+    # --- 2. SPOOL WRITE-AHEAD ---
+    def _write_spool(self, payload: str):
+        """Menulis satu snapshot ke spool secara atomik (tulis file sementara lalu rename)."""
+        with self._spool_lock:
+            self._sequence += 1
+            name = f"{dt.datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{self._sequence:06d}.json"
+            tmp_path = self.spool_dir / f".{name}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as spool_file:
+                spool_file.write(payload)
+            final_path = self.spool_dir / name
+            os.replace(tmp_path, final_path)
+            self._pending_files.append(final_path)
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+
+    # --- 3. PEKERJA LATAR BELAKANG ---
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._write_spool(self.queue.get(timeout=1.0))
+                # Kuras sisa antrean tanpa menunggu
+                while True:
+                    self._write_spool(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            except Exception as e:
+                logging.error(f"Gagal menulis snapshot ke spool: {e}", exc_info=True)
+
+            if self._should_flush():
+                self._flush_batch()
+
+    def _should_flush(self, force=False) -> bool:
+        if not self._pending_files or time.monotonic() < self._next_attempt:
+            return False
+        if force or len(self._pending_files) >= self.batch_size:
+            return True
+        return time.monotonic() - self._oldest_pending >= self.batch_interval
+
+    def _flush_batch(self) -> bool:
+        """
+        Mengarsipkan satu batch file spool. File spool hanya dihapus setelah
+        batch berhasil diarsipkan.
+        Returns:
+            bool: True jika batch berhasil diarsipkan.
+        """
+        with self._spool_lock:
+            batch_files = self._pending_files[:self.batch_size]
+
+        valid_snapshots, valid_files, rejected_files = [], [], []
+        for path in batch_files:
+            try:
+                with open(path, 'r', encoding='utf-8') as spool_file:
+                    snapshot = json.load(spool_file)
+            except Exception as e:
+                logging.error(f"File spool {path.name} rusak, dipindahkan ke karantina: {e}")
+                rejected_files.append(path)
+                continue
+            if not isinstance(snapshot, dict):
+                logging.error(f"File spool {path.name} bukan snapshot ({type(snapshot).__name__}), "
+                              f"dipindahkan ke karantina.")
+                rejected_files.append(path)
+                continue
+            valid_snapshots.append(snapshot)
+            valid_files.append(path)
+        # File yang tidak valid tidak boleh menggagalkan (dan memblokir) seluruh batch
+        if rejected_files:
+            self._quarantine(rejected_files)
+
+        file_id = None
+        try:
+            if valid_snapshots:
+                file_id = self._archive_batch(valid_snapshots)
+        except Exception as e:
+            logging.error(f"Pengarsipan batch snapshot gagal: {e}", exc_info=True)
+
+        if valid_snapshots and not file_id:
+            self._failures += 1
+            delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (self._failures - 1)))
+            self._next_attempt = time.monotonic() + delay
+            logging.warning(f"Pengarsipan {len(valid_snapshots)} snapshot gagal (percobaan ke-{self._failures}). "
+                            f"Dicoba lagi dalam {delay}s; data tetap aman di spool.")
+            return False
+
+        self._failures = 0
+        self._next_attempt = 0.0
+        for path in valid_files:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._forget_pending(valid_files)
+        return True
+
+    def _quarantine(self, paths):
+        """Memindahkan file spool yang tidak valid ke `spool_dir/rejected` agar tidak dicoba ulang."""
+        quarantine_dir = self.spool_dir / 'rejected'
+        quarantine_dir.mkdir(exist_ok=True)
+        for path in paths:
+            try:
+                os.replace(path, quarantine_dir / path.name)
+            except OSError as e:
+                logging.error(f"Gagal memindahkan {path.name} ke karantina: {e}")
+        self._forget_pending(paths)
+
+    def _forget_pending(self, paths):
+        done = set(paths)
+        with self._spool_lock:
+            self._pending_files = [path for path in self._pending_files if path not in done]
+            self._oldest_pending = time.monotonic() if self._pending_files else None
+
+    def _archive_batch(self, snapshots):
+        """
+        Mengarsipkan satu batch snapshot sesuai format yang dikonfigurasi.
+        Returns:
+            str: ID/penanda arsip, atau None jika gagal.
+        """
+        if self.parquet_archive:
+            paths = self.parquet_archive.append(snapshots)
+            # Data sudah aman di arsip lokal; unggahan file yang periodenya selesai boleh tertunda
+            self._upload_completed_parquet_files()
+            return str(paths[-1]) if paths else None
+        return self._upload_batch_as_csv(snapshots)
+
+    def _upload_completed_parquet_files(self):
+        """Mengunggah file Parquet yang periodenya sudah selesai dan belum pernah diunggah."""
+        if not (self.gdrive_sync and self.folder_id):
+            return
+        try:
+            with open(self._uploaded_manifest, 'r', encoding='utf-8') as manifest_file:
+                uploaded = set(json.load(manifest_file))
+        except (FileNotFoundError, ValueError):
+            uploaded = set()
+
+        for path in self.parquet_archive.completed_files():
+            if path.name in uploaded:
+                continue
+            if self.gdrive_sync.upload_file(path, path.name, self.folder_id, mimetype='application/vnd.apache.parquet'):
+                uploaded.add(path.name)
+            else:
+                logging.warning(f"Unggahan {path.name} gagal. Akan dicoba lagi pada batch berikutnya.")
+                break
+
+        tmp_path = self._uploaded_manifest.with_name(f".{self._uploaded_manifest.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(sorted(uploaded), manifest_file)
+        os.replace(tmp_path, self._uploaded_manifest)
+
+    def _upload_batch_as_csv(self, snapshots):
+        """
+        Menggabungkan beberapa snapshot menjadi satu CSV (satu baris per snapshot).
+        Returns:
+            str: ID file di Google Drive, atau None jika gagal.
+        """
+        df_snapshots = pd.json_normalize(snapshots, sep='_')
+        first = snapshots[0].get('timestamp', '').replace(':', '').replace('-', '')[:15]
+        last = snapshots[-1].get('timestamp', '').replace(':', '').replace('-', '')[:15]
+        filename = f"perception_snapshots_{first}_{last}_{len(snapshots)}.csv"
+        logging.info(f"Mengunggah batch {len(snapshots)} snapshot ke Google Drive ({filename})...")
+        return self.gdrive_sync.upload_data_as_csv(df_snapshots, filename, self.folder_id)
+
+    # --- 4. SHUTDOWN ---
+    def close(self, timeout: float = 30.0):
+        """
+        Menghentikan pekerja: sisa antrean ditulis ke spool, lalu satu upaya
+        unggah terakhir dilakukan. Yang gagal tetap di spool untuk proses berikutnya.
+        """
+        self._stop_event.set()
+        self._worker.join(timeout=timeout)
+        while True:
+            try:
+                self._write_spool(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        self._next_attempt = 0.0
+        while self._should_flush(force=True) and self._flush_batch():
+            pass
+        logging.info(f"Pengarsip snapshot dihentikan. {len(self._pending_files)} snapshot tersisa di spool.")
@@ -9,11 +9,11 @@
 
 import logging
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import os
 import sys
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 
 # --- PENYESUAIAN PATH DINAMIS ---
 current_script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +21,11 @@ project_root = Path(current_script_dir).parent
 sys.path.insert(0, str(project_root))
 # --- AKHIR PENYESUAIAN PATH ---
 
+from UTILS.response_cache import ResponseCache
+from UTILS.http_session import HttpSessionFactory
+from UTILS.circuit_breaker import CircuitBreakerRegistry
+from UTILS.ticker_snapshot import fetch_ticker_snapshot
+
 # --- Impor Gemini Pro untuk fallback cerdas ---
 try:
     import google.generativeai as genai
@@ -32,19 +37,17 @@ except ImportError:
 
 class SmartAPIClient:
     """
-    Klien HTTP yang cerdas dengan retry dan timeout.
+    Klien HTTP yang cerdas dengan retry, timeout, dan cache respons (TTL).
+    Koneksi diambil dari connection pool bersama (`HttpSessionFactory`).
     """
-    def __init__(self, base_url, api_key=None, headers=None, timeout=5):
+    def __init__(self, base_url, api_key=None, headers=None, timeout=5, provider=None):
         self.base_url = base_url
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=2,  # Kurangi retry untuk kecepatan
-            backoff_factor=0.3,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Nama provider dipakai sebagai kunci cache & aturan TTL (default: host base_url)
+        self.provider = provider or urlparse(base_url).hostname
+        self.cache = ResponseCache()
+        self.circuit_breakers = CircuitBreakerRegistry()
+        # Retry & keep-alive diatur oleh pabrik sesi bersama ([http] di konfigurasi)
+        self.http_sessions = HttpSessionFactory()
         
         self.headers = headers or {}
         if api_key:
@@ -52,15 +55,33 @@ class SmartAPIClient:
             self.headers['Authorization'] = f'Bearer {api_key}'
         self.timeout = timeout
 
-    def get(self, endpoint, params=None):
+    def get(self, endpoint, params=None, use_cache=True):
+        """
+        Melakukan GET dan mengembalikan JSON. Respons disimpan di cache bersama
+        berdasarkan (provider, endpoint, params); gunakan `use_cache=False`
+        untuk memaksa permintaan baru.
+        """
+        if not use_cache:
+            return self._fetch(endpoint, params)
+        return self.cache.get_or_fetch(self.provider, endpoint, params, lambda: self._fetch(endpoint, params))
+
+    def _fetch(self, endpoint, params=None):
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        # Circuit terbuka: lewati seketika tanpa menunggu timeout
+        if not self.circuit_breakers.allow_request(self.provider):
+            logging.debug(f"Circuit breaker {self.provider} terbuka, permintaan ke {url} dilewati.")
+            return None
+        start_time = time.monotonic()
         try:
-            response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
+            response = self.http_sessions.get_session().get(url, params=params, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.circuit_breakers.record_failure(self.provider, time.monotonic() - start_time)
             logging.warning(f"Permintaan ke {url} gagal: {e}")
             return None
+        self.circuit_breakers.record_success(self.provider, time.monotonic() - start_time)
+        return data
 
 class APIManager:
     """
@@ -71,6 +92,14 @@ class APIManager:
         self.orchestrator = orchestrator
         self.secrets = self.orchestrator.secrets
         self.clients = {}
+        # Connection pool HTTP bersama (keep-alive, retry, timeout), dikonfigurasi dari [http]
+        HttpSessionFactory().configure(self.orchestrator.config)
+        # Cache respons bersama (TTL per endpoint), dikonfigurasi dari [response_cache]
+        self.response_cache = ResponseCache()
+        self.response_cache.configure(self.orchestrator.config)
+        # Circuit breaker per penyedia (bersama), dikonfigurasi dari [circuit_breaker]
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.circuit_breakers.configure(self.orchestrator.config)
         self._initialize_clients()
         
         # --- Inisialisasi Gemini untuk fallback ---
@@ -126,7 +155,8 @@ class APIManager:
         coingecko_headers = {'Authorization': f'Bearer {coingecko_key}'} if coingecko_key else {}
         self.clients['coingecko'] = SmartAPIClient(
             'https://api.coingecko.com/api/v3',
-            headers=coingecko_headers
+            headers=coingecko_headers,
+            provider='coingecko'
         )
         logging.info("Klien CoinGecko (backup) diinisialisasi.")
 
@@ -135,7 +165,8 @@ class APIManager:
         cmc_headers = {'X-CMC_PRO_API_KEY': cmc_key} if cmc_key else {}
         self.clients['coinmarketcap'] = SmartAPIClient(
             'https://pro-api.coinmarketcap.com/v1',
-            headers=cmc_headers
+            headers=cmc_headers,
+            provider='coinmarketcap'
         )
         logging.info("Klien CoinMarketCap (backup) diinisialisasi.")
 
@@ -144,7 +175,8 @@ class APIManager:
         av_headers = {} # Alpha Vantage biasanya menggunakan parameter ?apikey=
         self.clients['alpha_vantage'] = SmartAPIClient(
             'https://www.alphavantage.co/query',
-            headers=av_headers # Kunci akan dikirim sebagai parameter
+            headers=av_headers, # Kunci akan dikirim sebagai parameter
+            provider='alpha_vantage'
         )
         logging.info("Klien Alpha Vantage (data makro) diinisialisasi.")
 
@@ -153,7 +185,8 @@ class APIManager:
         newsapi_headers = {} # Gunakan parameter
         self.clients['newsapi'] = SmartAPIClient(
             'https://newsapi.org/v2',
-            headers=newsapi_headers # Kunci akan dikirim sebagai parameter
+            headers=newsapi_headers, # Kunci akan dikirim sebagai parameter
+            provider='newsapi'
         )
         logging.info("Klien NewsAPI (berita) diinisialisasi.")
 
@@ -163,6 +196,29 @@ class APIManager:
         """Mendapatkan klien API yang telah diinisialisasi."""
         return self.clients.get(client_name)
 
+    def get_cache_stats(self):
+        """Mengembalikan penghitung hit/miss cache respons bersama."""
+        return self.response_cache.get_stats()
+
+    def get_provider_health(self):
+        """Status circuit breaker dan skor kesehatan setiap penyedia."""
+        return self.circuit_breakers.get_stats()
+
+    def get_ticker_snapshot(self, symbols=None):
+        """
+        Mengambil ticker banyak simbol dari Binance dalam satu permintaan `fetch_tickers`
+        (lihat `UTILS.ticker_snapshot.fetch_ticker_snapshot`).
+        Args:
+            symbols (list, optional): Daftar simbol CCXT. Jika None, semua ticker bursa.
+        Returns:
+            dict: {symbol: ticker CCXT}. Simbol yang gagal tidak dimasukkan.
+        """
+        binance_client = self.clients.get('binance')
+        if not binance_client:
+            logging.warning("Klien Binance tidak tersedia untuk snapshot ticker.")
+            return {}
+        return fetch_ticker_snapshot(binance_client, symbols, circuit_breakers=self.circuit_breakers)
+
     def fetch_with_fallback(self, primary_func, fallback_funcs, gemini_prompt=None):
         """
         Mencoba fungsi utama, jika gagal, coba fungsi fallback secara berurutan.
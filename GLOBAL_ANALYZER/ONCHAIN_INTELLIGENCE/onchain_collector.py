@@ -13,9 +13,8 @@
 import logging
 import sys
 import os
-import requests
+import threading
 import time
-import random
 from collections import defaultdict
 
 # --- PENYESUAIAN PATH DINAMIS ---
@@ -24,6 +23,10 @@ project_root = os.path.dirname(os.path.dirname(current_script_dir)) # Naik ke PR
 sys.path.insert(0, project_root)
 # --- AKHIR PENYESUAIAN PATH ---
 
+from UTILS.rate_limiter import RateLimiter
+from UTILS.http_session import HttpSessionFactory
+from UTILS.circuit_breaker import CircuitBreakerRegistry
+
 class OnChainCollector:
     """
     Mengumpulkan data on-chain mentah dengan rotasi kunci, fallback, dan ketahanan terhadap error.
@@ -43,6 +46,20 @@ class OnChainCollector:
         
         # Untuk melacak indeks kunci terakhir yang digunakan untuk setiap layanan multi-kunci
         self.key_indices = defaultdict(int)
+        # Rotasi kunci dipanggil dari banyak thread (agregasi paralel)
+        self._key_lock = threading.Lock()
+
+        # Rate limiter token-bucket bersama (per host), dikonfigurasi dari [rate_limits]
+        self.rate_limiter = RateLimiter()
+        self.rate_limiter.configure(self.orchestrator.config)
+
+        # Connection pool HTTP bersama (keep-alive, retry, timeout), dikonfigurasi dari [http]
+        self.http_sessions = HttpSessionFactory()
+        self.http_sessions.configure(self.orchestrator.config)
+
+        # Circuit breaker per penyedia/kunci (bersama), dikonfigurasi dari [circuit_breaker]
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.circuit_breakers.configure(self.orchestrator.config)
         
         # Muat semua kunci API on-chain yang tersedia
         self._load_api_keys()
@@ -101,6 +118,7 @@ class OnChainCollector:
     def _rotate_key(self, service_name):
         """
         Mendapatkan kunci API berikutnya dengan rotasi round-robin.
+        Kunci yang circuit breaker-nya sedang terbuka dilewati.
         Args:
             service_name (str): Nama layanan (e.g., 'coinstats', 'messari', 'coindesk', 'etherscan').
         Returns:
@@ -113,12 +131,22 @@ class OnChainCollector:
             # logging.debug(f"Tidak ada kunci yang ditemukan untuk rotasi {service_name}.")
             return None
 
-        index = self.key_indices[service_name]
-        key = keys[index]
-        # Update index untuk rotasi berikutnya
-        self.key_indices[service_name] = (index + 1) % len(keys)
-        # logging.debug(f"Kunci {service_name} diputar ke index {index}.")
-        return key
+        with self._key_lock:
+            for _ in range(len(keys)):
+                index = self.key_indices[service_name] % len(keys)
+                key = keys[index]
+                # Update index untuk rotasi berikutnya
+                self.key_indices[service_name] = (index + 1) % len(keys)
+                if self.circuit_breakers.allow_request(self._key_breaker_name(service_name, key)):
+                    # logging.debug(f"Kunci {service_name} diputar ke index {index}.")
+                    return key
+        logging.warning(f"Semua kunci {service_name} sedang dilewati (circuit breaker terbuka).")
+        return None
+
+    def _key_breaker_name(self, service_name, key):
+        """Nama circuit breaker per kunci (memakai indeks, bukan isi kunci)."""
+        keys = self.clients.get(f"{service_name}_keys", [])
+        return f"{service_name}#{keys.index(key)}" if key in keys else service_name
 
     # --- FUNGSI PENGUMPULAN DATA ON-CHAIN SPESIFIK ---
     def collect_all_onchain_data(self, assets=None):
@@ -160,7 +188,7 @@ class OnChainCollector:
                 if asset.lower() == 'ethereum':
                     # Contoh spesifik untuk Ethereum
                     eth_price_data = self._get_etherscan_data('stats', 'ethprice')
-                    if eth_price_
+                    if eth_price_data:
                          asset_data['eth_price_info'] = eth_price_data
                     
                     # Tambahkan data lain dari Etherscan jika diperlukan
@@ -223,31 +251,44 @@ class OnChainCollector:
         Returns:
             dict: Data dari Etherscan, atau None jika gagal.
         """
-        try:
-            etherscan_key = self._rotate_key('etherscan')
-            if not etherscan_key:
-                logging.warning("Tidak ada kunci Etherscan yang tersedia.")
-                return None
+        # Penyedia yang circuit-nya terbuka dilewati seketika, tanpa menunggu timeout
+        if not self.circuit_breakers.allow_request('etherscan'):
+            logging.warning("Circuit breaker Etherscan terbuka, permintaan dilewati.")
+            return None
 
-            url = f"https://api.etherscan.io/api"
-            params = {
-                'module': module,
-                'action': action,
-                'apikey': etherscan_key
-            }
-            # Tambahkan jitter kecil untuk menghindari rate limit
-            time.sleep(random.uniform(0.1, 0.3))
-            response = requests.get(url, params=params)
+        etherscan_key = self._rotate_key('etherscan')
+        if not etherscan_key:
+            logging.warning("Tidak ada kunci Etherscan yang tersedia.")
+            return None
+        key_breaker = self._key_breaker_name('etherscan', etherscan_key)
+
+        url = f"https://api.etherscan.io/api"
+        params = {
+            'module': module,
+            'action': action,
+            'apikey': etherscan_key
+        }
+        # Tunggu kuota rate limit host (hanya memblokir jika kuota habis); tidak dihitung sebagai latensi
+        self.rate_limiter.acquire(url)
+        start_time = time.monotonic()
+        try:
+            response = self.http_sessions.get_session().get(url, params=params)
             response.raise_for_status()
             data = response.json()
+            # Penyedia terjangkau; status di dalam respons menentukan kesehatan kunci
+            self.circuit_breakers.record_success('etherscan', time.monotonic() - start_time)
             
             if data.get('status') == '1': # Sukses
+                self.circuit_breakers.record_success(key_breaker)
                 logging.debug(f"Data Etherscan ({module}.{action}) berhasil diambil.")
                 return data.get('result')
             else:
+                self.circuit_breakers.record_failure(key_breaker)
                 logging.warning(f"API Etherscan mengembalikan error: {data.get('message')}")
                 return None
         except Exception as e:
+            self.circuit_breakers.record_failure('etherscan', time.monotonic() - start_time)
+            self.circuit_breakers.record_failure(key_breaker)
             logging.error(f"Kesalahan saat mengambil data Etherscan ({module}.{action}): {e}", exc_info=True)
             return None
 
@@ -266,7 +307,7 @@ class OnChainCollector:
              if asset.lower() == 'ethereum':
                  # Contoh spesifik untuk Ethereum
                  eth_price_data = self._get_etherscan_data('stats', 'ethprice')
-                 if eth_price_
+                 if eth_price_data:
                       data_points['eth_price_info'] = eth_price_data
              
              # Tambahkan data dari sumber lain jika tersedia
@@ -1 +1,121 @@
-# Rotasi otomatis akun API (Claude, Gemini, dll.)
\ No newline at end of file
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == ACCOUNT SWITCHER (PENJADWAL KUNCI API LLM) - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: NEURAL_NETWORK/ai_api_manager/account_switcher.py
+# Deskripsi: Rotasi otomatis akun API (Claude, Gemini, dll.). Menggantikan
+#            round-robin biasa: di bawah satu lock, memilih kunci dengan sisa
+#            kuota terbesar menurut QuotaMonitor dan melewati kunci yang sedang
+#            diistirahatkan (429/403/error beruntun). Aman dipanggil dari
+#            banyak thread dewan secara bersamaan.
+#
+# ==============================================================================
+
+import logging
+import threading
+
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import QuotaMonitor, mask_key
+
+
+class KeyReservation:
+    """
+    Reservasi satu permintaan pada sebuah kunci API (hasil `AccountSwitcher.acquire`).
+    Status: 'reserved' -> 'claimed' (permintaan dikirim) atau 'released' (kuota dikembalikan).
+    """
+
+    __slots__ = ('api_key', 'token', 'state')
+
+    def __init__(self, api_key: str, token: int):
+        self.api_key = api_key
+        self.token = token
+        self.state = 'reserved'
+
+    def __repr__(self):
+        return f"KeyReservation({mask_key(self.api_key)}, token={self.token}, state={self.state})"
+
+
+class AccountSwitcher:
+    """
+    Penjadwal kunci API per model yang sadar kuota.
+
+    Alur pemakaian:
+        reservation = switcher.acquire('google')      # None jika semua kunci istirahat/habis
+        if switcher.claim(reservation):               # False jika reservasi sudah dilepas
+            ... panggil model dengan reservation.api_key ...
+            switcher.report_success(reservation.api_key, tokens)   # atau report_failure(...)
+        switcher.release(reservation)                 # jika permintaan tidak jadi dikirim (cache hit, batal)
+    """
+
+    def __init__(self, model_inventory: dict, quota_monitor: QuotaMonitor = None):
+        """
+        Args:
+            model_inventory (dict): {nama_model: [kunci API, ...]}.
+            quota_monitor (QuotaMonitor, optional): Pemantau kuota bersama.
+        """
+        self.model_inventory = model_inventory
+        self.quota_monitor = quota_monitor or QuotaMonitor()
+        self._lock = threading.Lock()
+
+    def acquire(self, model_name: str):
+        """
+        Memilih kunci dengan sisa kuota terbesar untuk sebuah model dan
+        mencatat reservasi permintaannya. Jika sisa kuota sama, kunci yang
+        paling lama tidak dipakai didahulukan (setara round-robin).
+        Returns:
+            KeyReservation: Kunci API beserta token reservasinya, atau None jika
+                model tidak punya kunci yang bisa dipakai.
+        """
+        keys = self.model_inventory.get(model_name) or []
+        if not keys:
+            return None
+        with self._lock:
+            scored = [(self.quota_monitor.headroom(model_name, key), -self.quota_monitor.last_used(key), key)
+                      for key in keys]
+            headroom, _, api_key = max(scored, key=lambda item: (item[0], item[1]))
+            if headroom <= 0:
+                logging.warning(f"Semua {len(keys)} kunci API untuk {model_name} sedang diistirahatkan atau kuotanya habis.")
+                return None
+            # Dicatat di dalam lock agar thread berikutnya melihat kuota yang sudah berkurang
+            token = self.quota_monitor.record_request(api_key)
+        logging.debug(f"Kunci {mask_key(api_key)} dipilih untuk {model_name} (sisa kuota {headroom:.0%}).")
+        return KeyReservation(api_key, token)
+
+    def claim(self, reservation: KeyReservation) -> bool:
+        """
+        Menandai reservasi terpakai tepat sebelum permintaan dikirim.
+        Returns:
+            bool: False jika reservasi sudah dilepas (misal tugas dewan dibatalkan);
+                permintaan tidak boleh dikirim.
+        """
+        if reservation is None:
+            return True
+        with self._lock:
+            if reservation.state == 'released':
+                return False
+            reservation.state = 'claimed'
+            return True
+
+    def release(self, reservation: KeyReservation):
+        """
+        Mengembalikan tepat satu reservasi yang tidak jadi dikirim. Tidak
+        berpengaruh jika permintaannya sudah dikirim atau reservasi sudah dilepas.
+        """
+        if reservation is None:
+            return
+        with self._lock:
+            if reservation.state != 'reserved':
+                return
+            reservation.state = 'released'
+        self.quota_monitor.cancel_request(reservation.api_key, reservation.token)
+
+    def report_success(self, api_key: str, tokens: int = 0):
+        if api_key:
+            self.quota_monitor.record_success(api_key, tokens)
+
+    def report_failure(self, api_key: str):
+        if api_key:
+            self.quota_monitor.record_failure(api_key)
+
+    def get_stats(self) -> dict:
+        return self.quota_monitor.get_stats()
@@ -1 +1,266 @@
-# Pemantauan kuota penggunaan real-time
\ No newline at end of file
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == PEMANTAU KUOTA KUNCI API LLM - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: NEURAL_NETWORK/ai_api_manager/quota_monitor.py
+# Deskripsi: Pemantauan kuota penggunaan real-time per kunci API LLM:
+#            jumlah permintaan dan token dalam jendela bergulir satu menit,
+#            waktu reset rate limit dari respons 429, dan tingkat error (EWMA).
+#            Kunci yang terkena 429/403 atau error beruntun "diistirahatkan"
+#            sementara, sehingga AccountSwitcher tidak memilihnya.
+#
+# ==============================================================================
+
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from UTILS.singleton import SingletonMeta
+
+WINDOW_SECONDS = 60.0
+
+
+def mask_key(api_key: str) -> str:
+    """Representasi kunci API yang aman untuk log."""
+    return f"...{api_key[-4:]}" if api_key and len(api_key) > 8 else "***"
+
+
+def retry_after_from_headers(headers) -> float:
+    """
+    Membaca lama tunggu (detik) dari header respons rate limit:
+    `Retry-After` (detik atau tanggal HTTP), atau `X-RateLimit-Reset`
+    (epoch dalam detik/milidetik, format OpenRouter).
+    Returns:
+        float: Detik sampai reset, atau None jika tidak diketahui.
+    """
+    if not headers:
+        return None
+    retry_after = headers.get('Retry-After') or headers.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get('X-RateLimit-Reset') or headers.get('x-ratelimit-reset')
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        if reset > 1e12:  # milidetik
+            reset /= 1000.0
+        return max(0.0, reset - time.time())
+    return None
+
+
+def report_rate_limit(api_key: str, status, headers=None) -> bool:
+    """
+    Dipanggil wrapper model saat permintaan gagal dengan status HTTP. Status
+    429/403 dicatat ke QuotaMonitor (kunci diistirahatkan).
+    Returns:
+        bool: True jika status merupakan rate limit / kuota.
+    """
+    if status not in (429, 403) or not api_key:
+        return False
+    QuotaMonitor().record_rate_limit(api_key, status, retry_after_from_headers(headers))
+    return True
+
+
+class KeyUsage:
+    """Status penggunaan satu kunci API. Semua akses dilakukan dengan lock QuotaMonitor dipegang."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.requests = deque()   # (timestamp, token reservasi) permintaan dalam jendela
+        self.tokens = deque()     # (timestamp, jumlah token)
+        self.token_total = 0
+        self.error_rate = 0.0
+        self.outcomes = 0
+        self.benched_until = 0.0
+        self.bench_reason = None
+        self.last_used = 0.0
+
+    def prune(self, now):
+        while self.requests and now - self.requests[0][0] > WINDOW_SECONDS:
+            self.requests.popleft()
+        while self.tokens and now - self.tokens[0][0] > WINDOW_SECONDS:
+            self.token_total -= self.tokens.popleft()[1]
+
+
+class QuotaMonitor(metaclass=SingletonMeta):
+    """
+    Pemantau kuota kunci API LLM yang dipakai bersama di seluruh proses
+    (LLMRouter, wrapper model, klien streaming). Batas dibaca dari
+    seksi `[llm.quota]` di `chimera_config.toml`:
+
+        [llm.quota]
+        requests_per_minute = 20
+        tokens_per_minute = 100000
+        rate_limit_bench_seconds = 60
+
+        [llm.quota.models.google]
+        requests_per_minute = 15
+    """
+
+    DEFAULT_SETTINGS = {
+        'requests_per_minute': 20,
+        'tokens_per_minute': 100000,
+        'rate_limit_bench_seconds': 60,
+        'forbidden_bench_seconds': 900,
+        'error_rate_threshold': 0.5,
+        'error_min_samples': 5,
+        'error_bench_seconds': 120,
+        'error_alpha': 0.2,
+    }
+
+    def __init__(self):
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self.model_limits = {}
+        self._usage = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Memuat batas kuota dari konfigurasi orkestrator (`[llm.quota]`)."""
+        quota_config = (config or {}).get('llm', {}).get('quota', {})
+        with self._lock:
+            self.settings.update({k: v for k, v in quota_config.items() if k in self.DEFAULT_SETTINGS})
+            self.model_limits = dict(quota_config.get('models', {}))
+
+    # --- 1. STATUS PER KUNCI ---
+    def _get(self, api_key: str) -> KeyUsage:
+        # Kunci API tidak disimpan mentah sebagai identitas status
+        digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        usage = self._usage.get(digest)
+        if usage is None:
+            usage = KeyUsage(mask_key(api_key))
+            self._usage[digest] = usage
+        return usage
+
+    def _limit(self, model_name: str, name: str) -> float:
+        return float(self.model_limits.get(model_name, {}).get(name, self.settings[name]))
+
+    def _bench(self, usage: KeyUsage, seconds: float, reason: str, now: float):
+        until = now + seconds
+        if until > usage.benched_until:
+            usage.benched_until = until
+            usage.bench_reason = reason
+            logging.warning(f"Kunci API LLM {usage.label} diistirahatkan {seconds:.0f}s ({reason}).")
+
+    # --- 2. PENCATATAN ---
+    def record_request(self, api_key: str) -> int:
+        """
+        Mencatat satu permintaan yang akan dikirim dengan kunci ini (reservasi kuota).
+        Returns:
+            int: Token reservasi untuk `cancel_request`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            usage = self._get(api_key)
+            usage.prune(now)
+            token = next(self._tokens)
+            usage.requests.append((now, token))
+            usage.last_used = now
+            return token
+
+    def cancel_request(self, api_key: str, token: int):
+        """
+        Menghapus tepat satu reservasi (permintaan tidak jadi dikirim). Reservasi
+        yang sudah keluar dari jendela atau sudah dihapus diabaikan.
+        """
+        with self._lock:
+            usage = self._get(api_key)
+            for entry in usage.requests:
+                if entry[1] == token:
+                    usage.requests.remove(entry)
+                    return
+
+    def record_success(self, api_key: str, tokens: int = 0):
+        """Mencatat permintaan yang berhasil beserta perkiraan token yang dipakai."""
+        with self._lock:
+            now = time.monotonic()
+            usage = self._get(api_key)
+            usage.prune(now)
+            if tokens:
+                usage.tokens.append((now, tokens))
+                usage.token_total += tokens
+            usage.error_rate *= 1 - self.settings['error_alpha']
+            usage.outcomes += 1
+
+    def record_failure(self, api_key: str):
+        """Mencatat permintaan yang gagal; error rate tinggi mengistirahatkan kunci."""
+        with self._lock:
+            now = time.monotonic()
+            usage = self._get(api_key)
+            alpha = self.settings['error_alpha']
+            usage.error_rate = alpha + (1 - alpha) * usage.error_rate
+            usage.outcomes += 1
+            if (usage.outcomes >= self.settings['error_min_samples']
+                    and usage.error_rate >= self.settings['error_rate_threshold']):
+                self._bench(usage, self.settings['error_bench_seconds'],
+                            f"error rate {usage.error_rate:.0%}", now)
+                # Setelah istirahat, kunci mendapat kesempatan baru
+                usage.error_rate = self.settings['error_rate_threshold'] / 2
+                usage.outcomes = 0
+
+    def record_rate_limit(self, api_key: str, status: int, retry_after: float = None):
+        """
+        Mencatat respons 429 (rate limit) atau 403 (kuota habis / kunci ditolak).
+        Args:
+            api_key (str): Kunci API.
+            status (int): Kode status HTTP.
+            retry_after (float, optional): Detik sampai reset, dari header respons.
+        """
+        with self._lock:
+            now = time.monotonic()
+            usage = self._get(api_key)
+            if status == 403:
+                seconds = self.settings['forbidden_bench_seconds']
+            else:
+                seconds = retry_after if retry_after is not None else self.settings['rate_limit_bench_seconds']
+            self._bench(usage, seconds, f"HTTP {status}", now)
+
+    # --- 3. KUERI ---
+    def headroom(self, model_name: str, api_key: str) -> float:
+        """
+        Sisa kapasitas kunci 0..1: sisa terkecil dari kuota permintaan dan token
+        dalam jendela satu menit, dikali (1 - error rate). Kunci yang sedang
+        diistirahatkan atau kuotanya habis bernilai 0.
+        """
+        with self._lock:
+            now = time.monotonic()
+            usage = self._get(api_key)
+            if now < usage.benched_until:
+                return 0.0
+            usage.prune(now)
+            request_room = 1.0 - len(usage.requests) / max(1.0, self._limit(model_name, 'requests_per_minute'))
+            token_room = 1.0 - usage.token_total / max(1.0, self._limit(model_name, 'tokens_per_minute'))
+            return max(0.0, min(request_room, token_room)) * (1.0 - usage.error_rate)
+
+    def last_used(self, api_key: str) -> float:
+        with self._lock:
+            return self._get(api_key).last_used
+
+    def get_stats(self) -> dict:
+        """Ringkasan penggunaan per kunci (label kunci disamarkan)."""
+        with self._lock:
+            now = time.monotonic()
+            stats = {}
+            for usage in self._usage.values():
+                usage.prune(now)
+                stats[usage.label] = {
+                    'requests_last_minute': len(usage.requests),
+                    'tokens_last_minute': usage.token_total,
+                    'error_rate': round(usage.error_rate, 4),
+                    'benched_seconds_left': round(max(0.0, usage.benched_until - now), 1),
+                    'bench_reason': usage.bench_reason if now < usage.benched_until else None,
+                }
+            return stats
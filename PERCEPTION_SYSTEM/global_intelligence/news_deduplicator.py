@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == DEDUPLIKASI BERITA (MINHASH + LSH) - PROJECT CHIMERA ==
+# ==============================================================================
+# Lokasi: PERCEPTION_SYSTEM/global_intelligence/news_deduplicator.py
+# Deskripsi: Menyaring berita yang hampir sama (cerita yang sama dengan judul
+#            sedikit berbeda dari NewsAPI, TheNewsAPI, misi scraping, dsb.)
+#            sebelum dikirim ke Dewan AI. Sidik jari MinHash atas judul +
+#            deskripsi diindeks dengan LSH (banding) yang disimpan ke disk,
+#            sehingga cerita yang sudah dianalisis di siklus sebelumnya juga
+#            tidak dikirim ulang.
+# ==============================================================================
+
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# --- PENYESUAIAN PATH DINAMIS ---
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+# Naik tiga level: global_intelligence -> PERCEPTION_SYSTEM -> PROJECTCHIMERA
+project_root = os.path.dirname(os.path.dirname(current_script_dir))
+sys.path.insert(0, project_root)
+# --- AKHIR PENYESUAIAN PATH ---
+
+from PERCEPTION_SYSTEM.snapshot_delta import news_item_id
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _normalize_text(text: str) -> str:
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class NewsDeduplicator:
+    """
+    Deduplikasi berita hampir-sama dengan MinHash + LSH yang persisten.
+    Alur pemakaian: `filter_novel(items)` mengembalikan berita yang belum
+    pernah terlihat (dan unik di dalam batch itu sendiri); setelah berita
+    berhasil dianalisis, `remember(ids)` menambahkannya ke indeks.
+
+        [news_dedup]
+        similarity_threshold = 0.5
+        num_perm = 64
+        bands = 16
+        retention_hours = 72
+        pending_ttl_seconds = 3600
+    """
+
+    def __init__(self, orchestrator):
+        """
+        Args:
+            orchestrator: Instance dari ChimeraOrchestrator (untuk konfigurasi).
+        """
+        dedup_config = orchestrator.config.get('news_dedup', {})
+        self.enabled = dedup_config.get('enabled', True)
+        self.similarity_threshold = float(dedup_config.get('similarity_threshold', 0.5))
+        self.num_perm = int(dedup_config.get('num_perm', 64))
+        self.bands = int(dedup_config.get('bands', 16))
+        if self.num_perm % self.bands:
+            raise ValueError("news_dedup.num_perm harus habis dibagi news_dedup.bands.")
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = int(dedup_config.get('shingle_size', 5))
+        self.max_chars = int(dedup_config.get('max_chars', 600))
+        self.retention_seconds = float(dedup_config.get('retention_hours', 72)) * 3600
+        self.max_entries = int(dedup_config.get('max_entries', 20000))
+        # Kandidat dari filter_novel yang tidak pernah di-remember() dibuang setelah periode ini
+        self.pending_ttl_seconds = float(dedup_config.get('pending_ttl_seconds', 3600))
+        self.index_path = Path(project_root) / dedup_config.get('index_path', 'COLLECTIVE_MEMORY/news_fingerprints.npz')
+
+        # Permutasi hash tetap (seed tetap) agar sidik jari yang disimpan tetap valid antar proses
+        rng = np.random.RandomState(1)
+        self._perm_a = rng.randint(1, np.iinfo(np.int64).max, size=self.num_perm, dtype=np.int64).astype(np.uint64)
+        self._perm_b = rng.randint(0, np.iinfo(np.int64).max, size=self.num_perm, dtype=np.int64).astype(np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = {}        # id -> np.ndarray (num_perm,)
+        self._seen_at = {}           # id -> timestamp
+        self._buckets = defaultdict(set)  # (band, hash band) -> {id}
+        self._pending = {}           # id -> (signature, waktu masuk), menunggu remember()
+        self._load()
+
+    # --- 1. SIDIK JARI ---
+    def _shingles(self, text: str):
+        text = _normalize_text(text)[:self.max_chars]
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """Sidik jari MinHash (num_perm nilai uint64) dari sebuah teks."""
+        shingles = self._shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles],
+            dtype=np.uint64
+        )
+        # (a*h + b) mod p, dipotong ke 32 bit; overflow uint64 disengaja (keluarga hash universal)
+        with np.errstate(over='ignore'):
+            permuted = np.bitwise_and((np.outer(hashes, self._perm_a) + self._perm_b) % _MERSENNE_PRIME, _MAX_HASH)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(sig_a, sig_b) -> float:
+        """Perkiraan kemiripan Jaccard dari dua sidik jari MinHash."""
+        return float(np.mean(sig_a == sig_b))
+
+    def _find_duplicate(self, signature, buckets, signatures):
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates |= buckets.get(band_key, set())
+        for candidate in candidates:
+            if self.similarity(signature, signatures[candidate]) >= self.similarity_threshold:
+                return candidate
+        return None
+
+    # --- 2. API UTAMA ---
+    @staticmethod
+    def _item_text(item: dict) -> str:
+        return item.get('text') or f"{item.get('title') or ''} {item.get('description') or ''}"
+
+    def filter_novel(self, items: list) -> list:
+        """
+        Mengembalikan item berita yang belum pernah terlihat, dengan membuang
+        duplikat terhadap indeks persisten maupun duplikat di dalam `items`.
+        Args:
+            items (list): Item berita (dict) dengan 'text' atau 'title'/'description',
+                          dan opsional 'id'.
+        Returns:
+            list: Item yang dianggap cerita baru (urutan dipertahankan).
+        """
+        if not self.enabled or not items:
+            return list(items or [])
+
+        novel = []
+        batch_buckets = defaultdict(set)
+        batch_signatures = {}
+        duplicates = 0
+        with self._lock:
+            self._expire_pending(time.time())
+            for item in items:
+                item_id = str(item.get('id') or news_item_id(item))
+                signature = self.signature(self._item_text(item))
+                if (item_id in self._signatures
+                        or self._find_duplicate(signature, self._buckets, self._signatures)
+                        or self._find_duplicate(signature, batch_buckets, batch_signatures)):
+                    duplicates += 1
+                    continue
+                batch_signatures[item_id] = signature
+                for band_key in self._band_keys(signature):
+                    batch_buckets[band_key].add(item_id)
+                self._pending[item_id] = (signature, time.time())
+                novel.append(item)
+
+        logging.info(f"Deduplikasi berita: {len(novel)} cerita baru, {duplicates} duplikat dibuang "
+                     f"(indeks: {len(self._signatures)} cerita).")
+        return novel
+
+    def remember(self, item_ids=None):
+        """
+        Menambahkan cerita yang sudah diproses ke indeks persisten lalu menyimpannya.
+        Args:
+            item_ids (iterable, optional): ID dari `filter_novel`. Jika None, semua yang tertunda.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            ids = list(self._pending) if item_ids is None else [str(i) for i in item_ids if str(i) in self._pending]
+            now = time.time()
+            for item_id in ids:
+                self._add(item_id, self._pending.pop(item_id)[0], now)
+            if item_ids is None:
+                self._pending.clear()
+            self._expire_pending(now)
+            self._prune(now)
+            self._save()
+
+    def _add(self, item_id, signature, seen_at):
+        self._signatures[item_id] = signature
+        self._seen_at[item_id] = seen_at
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].add(item_id)
+
+    def _remove(self, item_id):
+        signature = self._signatures.pop(item_id)
+        self._seen_at.pop(item_id, None)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _expire_pending(self, now):
+        """Membuang kandidat tertunda yang tidak pernah dikonfirmasi (mis. dewan AI gagal menjawab)."""
+        expired = [item_id for item_id, (_, added_at) in self._pending.items()
+                   if now - added_at > self.pending_ttl_seconds]
+        for item_id in expired:
+            del self._pending[item_id]
+
+    def _prune(self, now):
+        expired = [item_id for item_id, seen_at in self._seen_at.items() if now - seen_at > self.retention_seconds]
+        overflow = len(self._seen_at) - len(expired) - self.max_entries
+        if overflow > 0:
+            survivors = sorted((seen_at, item_id) for item_id, seen_at in self._seen_at.items()
+                               if now - seen_at <= self.retention_seconds)
+            expired.extend(item_id for _, item_id in survivors[:overflow])
+        for item_id in expired:
+            self._remove(item_id)
+
+    # --- 3. PERSISTENSI ---
+    def _save(self):
+        """Menyimpan indeks secara atomik (file sementara lalu rename)."""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            ids = list(self._signatures)
+            signatures = np.stack([self._signatures[i] for i in ids]) if ids else np.empty((0, self.num_perm), dtype=np.uint64)
+            tmp_path = self.index_path.with_name(f".{self.index_path.name}.tmp")
+            with open(tmp_path, 'wb') as index_file:
+                np.savez(index_file, ids=np.array(ids, dtype=str), seen_at=np.array([self._seen_at[i] for i in ids]),
+                         signatures=signatures, num_perm=self.num_perm)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logging.error(f"Gagal menyimpan indeks deduplikasi berita: {e}", exc_info=True)
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with np.load(self.index_path) as data:
+                if int(data['num_perm']) != self.num_perm:
+                    logging.warning("Konfigurasi num_perm berubah. Indeks deduplikasi berita lama diabaikan.")
+                    return
+                for item_id, seen_at, signature in zip(data['ids'], data['seen_at'], data['signatures']):
+                    self._add(str(item_id), signature.astype(np.uint64), float(seen_at))
+            self._prune(time.time())
+            logging.info(f"Indeks deduplikasi berita dimuat: {len(self._signatures)} cerita.")
+        except Exception as e:
+            logging.error(f"Gagal memuat indeks deduplikasi berita: {e}. Memulai dengan indeks kosong.")
+            self._signatures.clear()
+            self._seen_at.clear()
+            self._buckets.clear()
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == PENYIMPANAN OHLCV RING BUFFER - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: PERCEPTION_SYSTEM/ohlcv_store.py
+# Deskripsi: Riwayat candle OHLCV di memori per (simbol, timeframe) dalam ring
+#            buffer NumPy yang dialokasikan sekali. Riwayat diisi penuh satu
+#            kali (backfill), lalu hanya bar baru yang ditambahkan. Konsumen
+#            (indikator teknikal, manajemen risiko, HybridFusionEngine)
+#            mendapat view read-only tanpa salinan. Isi buffer disimpan ke disk
+#            berkala agar restart tidak perlu backfill ulang.
+#
+# ==============================================================================
+
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from UTILS.singleton import SingletonMeta
+
+# Kolom setiap bar (format CCXT)
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+_COLUMN_INDEX = {name: i for i, name in enumerate(OHLCV_COLUMNS)}
+
+PROJECT_ROOT = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """Durasi satu bar dalam detik untuk timeframe CCXT ('1m', '1h', '4h', '1d', ...)."""
+    match = re.fullmatch(r'(\d+)([mhdw])', timeframe)
+    if not match:
+        raise ValueError(f"Timeframe tidak dikenal: {timeframe}")
+    return int(match.group(1)) * _TIMEFRAME_UNITS[match.group(2)]
+
+
+class OHLCVRingBuffer:
+    """
+    Ring buffer bar OHLCV berkapasitas tetap untuk satu (simbol, timeframe).
+    Setiap bar ditulis dua kali (slot i dan i + kapasitas), sehingga N bar
+    terakhir selalu berupa potongan memori yang bersambung dan `view()` tidak
+    perlu menyalin. View mengikuti penulisan berikutnya; salin (`.copy()`)
+    jika perlu dipegang lebih lama dari satu siklus.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._data = np.full((2 * self.capacity, len(OHLCV_COLUMNS)), np.nan)
+        self._end = 0      # slot tulis berikutnya, 0..kapasitas-1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_timestamp(self):
+        """Timestamp (ms) bar terakhir, atau None jika buffer kosong."""
+        if not self._count:
+            return None
+        return float(self._data[self._end - 1 + self.capacity, 0])
+
+    def _write(self, slots, rows):
+        self._data[slots] = rows
+        self._data[slots + self.capacity] = rows
+
+    def extend(self, rows) -> int:
+        """
+        Menambahkan bar (urut dari yang terlama). Bar yang lebih lama dari bar
+        terakhir diabaikan; bar dengan timestamp yang sama menggantikan bar
+        terakhir (candle yang masih terbentuk).
+        Returns:
+            int: Jumlah bar baru yang ditambahkan (tidak termasuk penggantian).
+        """
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(OHLCV_COLUMNS))
+        if not len(rows):
+            return 0
+        last_ts = self.last_timestamp
+        if last_ts is not None:
+            current = rows[rows[:, 0] == last_ts]
+            if len(current):
+                self._write(np.array([(self._end - 1) % self.capacity]), current[-1:])
+            rows = rows[rows[:, 0] > last_ts]
+        # Hanya `kapasitas` bar terakhir yang muat
+        rows = rows[-self.capacity:]
+        if len(rows):
+            self._write((self._end + np.arange(len(rows))) % self.capacity, rows)
+            self._end = (self._end + len(rows)) % self.capacity
+            self._count = min(self._count + len(rows), self.capacity)
+        return len(rows)
+
+    def view(self, bars: int = None) -> np.ndarray:
+        """
+        View read-only (bar x 6) dari `bars` bar terakhir, urut dari yang terlama. Tanpa salinan.
+        """
+        bars = self._count if bars is None else max(0, min(int(bars), self._count))
+        stop = self._end + self.capacity
+        view = self._data[stop - bars:stop]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str, bars: int = None) -> np.ndarray:
+        """View read-only satu kolom ('close', 'volume', ...) dari `bars` bar terakhir."""
+        return self.view(bars)[:, _COLUMN_INDEX[name]]
+
+    def clear(self):
+        self._data[:] = np.nan
+        self._end = 0
+        self._count = 0
+
+
+class OHLCVStore(metaclass=SingletonMeta):
+    """
+    Kumpulan ring buffer OHLCV per (simbol, timeframe) yang dipakai bersama di
+    seluruh proses. Pengaturan dibaca dari seksi `[ohlcv_store]` di
+    `chimera_config.toml`:
+
+        [ohlcv_store]
+        capacity = 1000
+        backfill_bars = 500
+        snapshot_path = "COLLECTIVE_MEMORY/ohlcv_store.npz"
+        snapshot_interval_seconds = 300
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'capacity': 1000,
+        'backfill_bars': 500,
+        'snapshot_path': 'COLLECTIVE_MEMORY/ohlcv_store.npz',
+        'snapshot_interval_seconds': 300,
+    }
+
+    def __init__(self):
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self._buffers = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._last_saved = time.monotonic()
+
+    def configure(self, config: dict):
+        """
+        Memuat pengaturan dari konfigurasi orkestrator (`[ohlcv_store]`) dan,
+        pada pemanggilan pertama, memulihkan isi buffer dari snapshot disk.
+        """
+        store_config = (config or {}).get('ohlcv_store', {})
+        with self._lock:
+            self.settings.update({k: v for k, v in store_config.items() if k in self.DEFAULT_SETTINGS})
+            if not self._loaded:
+                self._loaded = True
+                if self.settings['enabled']:
+                    self.load()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.settings['enabled'])
+
+    @property
+    def snapshot_path(self) -> Path:
+        return PROJECT_ROOT / self.settings['snapshot_path']
+
+    # --- 1. AKSES BUFFER ---
+    def buffer(self, symbol: str, timeframe: str) -> OHLCVRingBuffer:
+        """Ring buffer untuk (simbol, timeframe); dibuat kosong jika belum ada."""
+        key = (symbol, timeframe)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = OHLCVRingBuffer(self.settings['capacity'])
+                self._buffers[key] = buffer
+            return buffer
+
+    def has(self, symbol: str, timeframe: str) -> bool:
+        with self._lock:
+            return len(self._buffers.get((symbol, timeframe)) or ()) > 0
+
+    def last_timestamp(self, symbol: str, timeframe: str):
+        with self._lock:
+            buffer = self._buffers.get((symbol, timeframe))
+            return buffer.last_timestamp if buffer is not None else None
+
+    def needs_backfill(self, symbol: str, timeframe: str) -> bool:
+        """
+        True jika buffer kosong atau bar terakhirnya terlalu lama untuk dikejar
+        secara inkremental (lebih dari `backfill_bars` bar tertinggal).
+        """
+        last_ts = self.last_timestamp(symbol, timeframe)
+        if last_ts is None:
+            return True
+        behind = (time.time() - last_ts / 1000.0) / timeframe_seconds(timeframe)
+        return behind > self.settings['backfill_bars']
+
+    def update(self, symbol: str, timeframe: str, rows, replace: bool = False) -> int:
+        """
+        Menambahkan bar dari bursa ke buffer.
+        Args:
+            rows (list | np.ndarray): Candle [[ts, o, h, l, c, v], ...], urut dari yang terlama.
+            replace (bool): Kosongkan buffer dulu (backfill penuh).
+        Returns:
+            int: Jumlah bar baru.
+        """
+        with self._lock:
+            buffer = self.buffer(symbol, timeframe)
+            if replace:
+                buffer.clear()
+            added = buffer.extend(rows)
+            self._dirty = True
+        return added
+
+    def view(self, symbol: str, timeframe: str, bars: int = None):
+        """View read-only (bar x 6) dari bar terakhir, atau None jika belum ada riwayat."""
+        with self._lock:
+            buffer = self._buffers.get((symbol, timeframe))
+            if buffer is None or not len(buffer):
+                return None
+            return buffer.view(bars)
+
+    def column(self, symbol: str, timeframe: str, name: str, bars: int = None):
+        """View read-only satu kolom (misal 'close'), atau None jika belum ada riwayat."""
+        view = self.view(symbol, timeframe, bars)
+        return None if view is None else view[:, _COLUMN_INDEX[name]]
+
+    def views(self, symbols, timeframe: str, bars: int = None) -> dict:
+        """{simbol: view} untuk simbol yang punya riwayat."""
+        result = {}
+        for symbol in symbols:
+            view = self.view(symbol, timeframe, bars)
+            if view is not None:
+                result[symbol] = view
+        return result
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'buffers': len(self._buffers),
+                'bars': sum(len(b) for b in self._buffers.values()),
+                'memory_mb': round(sum(b._data.nbytes for b in self._buffers.values()) / (1024 * 1024), 2),
+            }
+
+    # --- 2. SNAPSHOT DISK ---
+    def save(self, path=None):
+        """Menyimpan semua buffer ke satu file .npz secara atomik (file sementara lalu rename)."""
+        path = Path(path) if path else self.snapshot_path
+        try:
+            with self._lock:
+                keys = [key for key, buffer in self._buffers.items() if len(buffer)]
+                counts = np.array([len(self._buffers[key]) for key in keys], dtype=np.int64)
+                bars = (np.concatenate([self._buffers[key].view() for key in keys])
+                        if keys else np.empty((0, len(OHLCV_COLUMNS))))
+                self._dirty = False
+                self._last_saved = time.monotonic()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, 'wb') as snapshot_file:
+                np.savez(snapshot_file, symbols=np.array([k[0] for k in keys], dtype=str),
+                         timeframes=np.array([k[1] for k in keys], dtype=str), counts=counts, bars=bars)
+            os.replace(tmp_path, path)
+            logging.debug(f"Snapshot OHLCV disimpan: {len(keys)} buffer, {len(bars)} bar.")
+        except Exception as e:
+            logging.error(f"Gagal menyimpan snapshot OHLCV: {e}", exc_info=True)
+
+    def save_if_due(self):
+        """Menyimpan snapshot jika ada perubahan dan interval `snapshot_interval_seconds` sudah lewat."""
+        if (self.enabled and self._dirty
+                and time.monotonic() - self._last_saved >= self.settings['snapshot_interval_seconds']):
+            self.save()
+
+    def load(self, path=None):
+        """Memulihkan buffer dari snapshot disk (jika ada)."""
+        path = Path(path) if path else self.snapshot_path
+        if not path.exists():
+            return
+        try:
+            with np.load(path) as data:
+                offsets = np.concatenate([[0], np.cumsum(data['counts'])])
+                bars = data['bars']
+                with self._lock:
+                    for i, (symbol, timeframe) in enumerate(zip(data['symbols'], data['timeframes'])):
+                        self.buffer(str(symbol), str(timeframe)).extend(bars[offsets[i]:offsets[i + 1]])
+            logging.info(f"Snapshot OHLCV dimuat: {len(offsets) - 1} buffer, {len(bars)} bar.")
+        except Exception as e:
+            logging.error(f"Gagal memuat snapshot OHLCV: {e}. Memulai dengan buffer kosong.")
+            with self._lock:
+                self._buffers.clear()
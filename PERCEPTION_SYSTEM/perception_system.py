@@ -6,7 +6,8 @@
 # Lokasi: PERCEPTION_SYSTEM/perception_system.py
 # Deskripsi: Sistem persepsi yang menyeluruh, mengintegrasikan data pasar,
 #            on-chain, berita (API & scraping), dan tren sosial.
-#            Menyimpan snapshot ke Collective Memory (Google Drive).
+#            Menyimpan snapshot ke Collective Memory (Google Drive) dan
+#            menyertakan delta terhadap snapshot sebelumnya.
 #
 # ==============================================================================
 
@@ -17,6 +18,7 @@ import time
 import datetime as dt
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # --- PENYESUAIAN PATH DINAMIS UNTUK MENGATASI MASALAH IMPOR ---
 # Mendapatkan path absolut dari direktori script ini
@@ -32,9 +34,12 @@ sys.path.insert(0, project_root)
 try:
     from CONTROL_PANEL.api_manager import APIManager
     from COLLECTIVE_MEMORY.gdrive_synchronizer import GDriveSynchronizer
+    from COLLECTIVE_MEMORY.snapshot_archiver import SnapshotArchiver
     from GLOBAL_ANALYZER.ONCHAIN_INTELLIGENCE.onchain_collector import OnChainCollector
     from GLOBAL_ANALYZER.ONCHAIN_INTELLIGENCE.metric_generator import OnChainMetricGenerator
     from PERCEPTION_SYSTEM.global_intelligence.news_aggregator import NewsAggregator
+    from PERCEPTION_SYSTEM.platform_integrations.intelligence_aggregator import IntelligenceAggregator
+    from PERCEPTION_SYSTEM.snapshot_delta import SnapshotDeltaTracker
     from WEB_SCRAPERS.intelligent_scraper import IntelligentScraper
     logging.info("Semua komponen PerceptionSystem berhasil diimpor.")
 except ImportError as e:
@@ -66,6 +71,10 @@ class PerceptionSystem:
             self.api_manager = self.orchestrator.api_manager
             logging.info("APIManager berhasil diinisialisasi.")
 
+            # 1b. IntelligenceAggregator: data pasar konkuren (ticker bulk, hedged price, riwayat OHLCVStore)
+            self.intelligence_aggregator = IntelligenceAggregator(self.orchestrator)
+            logging.info("IntelligenceAggregator berhasil diinisialisasi.")
+
             # 2. GDriveSynchronizer: Untuk arsip snapshot
             self.gdrive_sync = GDriveSynchronizer(self.orchestrator)
             logging.info("GDriveSynchronizer berhasil diinisialisasi.")
@@ -90,6 +99,28 @@ class PerceptionSystem:
         # Konfigurasi
         self.assets_to_scan = self.orchestrator.config.get('market', {}).get('assets', ['BTC/USDT', 'ETH/USDT'])
         self.gdrive_folder_id = self.orchestrator.config.get('gdrive', {}).get('raw_data_folder_id', None)
+
+        # Mode scan konkuren: tahap pasar, on-chain, dan berita berjalan paralel
+        perception_config = self.orchestrator.config.get('perception', {})
+        self.concurrent_scan = perception_config.get('concurrent_scan', True)
+        # Batas waktu per tahap (detik, dihitung dari awal scan)
+        self.stage_deadlines = {'market_data': 10, 'onchain': 15, 'news_intel': 20}
+        self.stage_deadlines.update(perception_config.get('stage_deadlines_seconds', {}))
+        self._stage_executor = ThreadPoolExecutor(max_workers=len(self.stage_deadlines), thread_name_prefix='perception-stage')
+        # Tahap yang melewati deadline tetap berjalan di latar belakang; jangan ditumpuk di siklus berikutnya
+        self._inflight_stages = {}
+
+        # Delta inkremental: snapshot sebelumnya disimpan sebagai baseline, dan setiap
+        # snapshot baru membawa snapshot['delta'] (simbol berubah, berita baru, metrik on-chain)
+        self.delta_tracker = SnapshotDeltaTracker(self.orchestrator) if perception_config.get('incremental_delta', True) else None
+
+        # Pengarsip latar belakang: scan() hanya memasukkan snapshot ke antrean.
+        # Format Parquet diarsipkan lokal meskipun Google Drive tidak dikonfigurasi.
+        archive_config = self.orchestrator.config.get('archive', {})
+        self.snapshot_archiver = None
+        has_gdrive = bool(self.gdrive_sync and self.gdrive_folder_id)
+        if archive_config.get('background_upload', True) and (has_gdrive or archive_config.get('format') == 'parquet'):
+            self.snapshot_archiver = SnapshotArchiver(self.orchestrator, self.gdrive_sync, self.gdrive_folder_id)
         logging.info("Sistem Persepsi vFinal berhasil diinisialisasi.")
 
     def scan(self, specific_symbols=None, specific_assets=None):
@@ -114,72 +145,41 @@ class PerceptionSystem:
             'errors': [] # Untuk mencatat error non-kritis
         }
 
-        # --- 1. Kumpulkan Data Pasar ---
-        logging.info("1. Mengumpulkan data pasar...")
-        try:
-            symbols_to_scan = specific_symbols if specific_symbols else self.assets_to_scan
-            market_data = {}
-            
-            # Gunakan APIManager untuk mengumpulkan data pasar dari berbagai sumber
-            # Ini akan menggunakan fallback internal (Binance API -> CoinGecko -> CoinCap -> CoinStats)
-            market_data = self.api_manager.aggregate_market_data(symbols=symbols_to_scan)
-            
-            perception_snapshot['market_data'] = market_data
-            perception_snapshot['sources']['market_data'] = 'success' if market_data else 'no_data'
-            successful_symbols = list(market_data.keys()) if market_data else []
-            logging.debug(f"Data pasar untuk {len(successful_symbols)} simbol dikumpulkan.")
-        except Exception as e:
-            error_msg = f"Kesalahan saat mengumpulkan data pasar: {e}"
-            logging.error(error_msg, exc_info=True)
-            perception_snapshot['errors'].append({'component': 'market_data', 'error': str(e)})
-            perception_snapshot['sources']['market_data'] = 'failed'
-
-        # --- 2. Kumpulkan Data On-Chain ---
-        logging.info("2. Mengumpulkan data on-chain...")
-        try:
-            if self.onchain_collector and self.metric_generator:
-                # Fokus pada BTC dan ETH untuk on-chain data jika tidak spesifik
-                assets_to_scan_onchain = specific_assets if specific_assets else ['bitcoin', 'ethereum'] 
-                raw_onchain_data = self.onchain_collector.collect_all_onchain_data(assets=assets_to_scan_onchain)
-                onchain_metrics = self.metric_generator.generate_all_metrics(raw_onchain_data)
-                perception_snapshot['onchain'] = onchain_metrics
-                perception_snapshot['sources']['onchain'] = 'success' if raw_onchain_data else 'no_data'
-                logging.debug("Data on-chain berhasil dikumpulkan dan diproses.")
-            else:
-                 logging.info("Sub-sistem On-Chain tidak tersedia. Melewati pengumpulan data on-chain.")
-                 perception_snapshot['sources']['onchain'] = 'unavailable'
-        except Exception as e:
-            error_msg = f"Kesalahan saat mengumpulkan data on-chain: {e}"
-            logging.error(error_msg, exc_info=True)
-            perception_snapshot['errors'].append({'component': 'onchain', 'error': str(e)})
-            perception_snapshot['sources']['onchain'] = 'failed'
-
-        # --- 3. Kumpulkan Data Berita & Intelijen ---
-        logging.info("3. Mengumpulkan data berita & intelijen...")
-        try:
-             if self.news_aggregator:
-                 # Gunakan NewsAggregator yang terintegrasi dengan IntelligentScraper dan API
-                 aggregated_intelligence = self.news_aggregator.aggregate_all()
-                 perception_snapshot['news'] = aggregated_intelligence
-                 perception_snapshot['sources']['news_intel'] = 'success' if aggregated_intelligence else 'no_data'
-                 logging.debug("Data berita & intelijen berhasil dikumpulkan.")
-             else:
-                 logging.info("NewsAggregator tidak tersedia. Melewati pengumpulan data berita.")
-                 perception_snapshot['sources']['news_intel'] = 'unavailable'
-        except Exception as e:
-            error_msg = f"Kesalahan saat mengumpulkan data berita/intelijen: {e}"
-            logging.error(error_msg, exc_info=True)
-            perception_snapshot['errors'].append({'component': 'news_intel', 'error': str(e)})
-            perception_snapshot['sources']['news_intel'] = 'failed'
+        # --- 1-3. Kumpulkan Data Pasar, On-Chain, dan Berita & Intelijen ---
+        # (nama tahap di 'sources', kunci data di snapshot, fungsi pengumpul)
+        stages = [
+            ('market_data', 'market_data', lambda: self._collect_market_data(specific_symbols)),
+            ('onchain', 'onchain', lambda: self._collect_onchain_data(specific_assets)),
+            ('news_intel', 'news', self._collect_news_intel),
+        ]
+        if self.concurrent_scan:
+            stage_results = self._run_stages_concurrently(stages)
+        else:
+            stage_results = {name: self._run_stage(name, func) for name, _, func in stages}
 
         # --- 4. Finalisasi Snapshot & Arsipkan ---
+        perception_snapshot['processing_time_by_stage'] = {}
+        for name, snapshot_key, _ in stages:
+            result = stage_results[name]
+            perception_snapshot['sources'][name] = result['status']
+            perception_snapshot['processing_time_by_stage'][name] = result['duration']
+            if result['data'] is not None:
+                perception_snapshot[snapshot_key] = result['data']
+            if result['error']:
+                perception_snapshot['errors'].append({'component': name, 'error': result['error']})
+
         perception_end_time = dt.datetime.utcnow()
         perception_duration = (perception_end_time - perception_start_time).total_seconds()
         perception_snapshot['processing_time_seconds'] = perception_duration
-        logging.info(f"--- Siklus Persepsi Komprehensif Selesai (Durasi: {perception_duration:.2f}s) ---")
+        logging.info(f"--- Siklus Persepsi Komprehensif Selesai (Durasi: {perception_duration:.2f}s, "
+                     f"per tahap: {perception_snapshot['processing_time_by_stage']}) ---")
 
         # --- 5. Arsipkan snapshot ke Google Drive ---
-        if self.gdrive_sync and self.gdrive_folder_id:
+        if self.snapshot_archiver:
+            # Unggahan (batch + retry) ditangani pekerja latar belakang
+            self.snapshot_archiver.enqueue(perception_snapshot)
+            logging.debug("Snapshot dimasukkan ke antrean arsip.")
+        elif self.gdrive_sync and self.gdrive_folder_id:
             try:
                 logging.info("Mengarsipkan snapshot ke Collective Memory (Google Drive)...")
                 # Gunakan json_normalize untuk membuat DataFrame yang rapi
@@ -197,8 +197,123 @@ class PerceptionSystem:
         else:
              logging.info("GDriveSynchronizer tidak tersedia atau folder ID tidak diset. Melewati pengarsipan.")
 
+        # --- 6. Hitung delta terhadap snapshot sebelumnya ---
+        # Dilakukan setelah pengarsipan agar delta tidak ikut diarsipkan
+        if self.delta_tracker:
+            try:
+                perception_snapshot['delta'] = self.delta_tracker.update(perception_snapshot, full_universe=not specific_symbols)
+            except Exception as e:
+                logging.error(f"Gagal menghitung delta snapshot: {e}", exc_info=True)
+                perception_snapshot['errors'].append({'component': 'delta', 'error': str(e)})
+
         return perception_snapshot
 
+    def close(self):
+        """
+        Menghentikan pekerja latar belakang (pengarsip & thread tahap) dan melepaskan
+        sumber daya IntelligenceAggregator. Panggil saat shutdown.
+        """
+        if self.snapshot_archiver:
+            self.snapshot_archiver.close()
+        self._stage_executor.shutdown(wait=False)
+        self.intelligence_aggregator.close()
+
+    # --- TAHAP-TAHAP PENGUMPULAN DATA ---
+    def _collect_market_data(self, specific_symbols=None):
+        """
+        Tahap 1: data pasar.
+        Returns:
+            tuple: (data, status)
+        """
+        logging.info("1. Mengumpulkan data pasar...")
+        symbols_to_scan = specific_symbols if specific_symbols else self.assets_to_scan
+        # IntelligenceAggregator mengambil semua simbol secara konkuren (ticker bulk + OHLCV),
+        # dengan fallback harga (Binance -> CoinGecko -> CoinCap -> CoinStats)
+        market_data = self.intelligence_aggregator.aggregate_market_data(symbols=symbols_to_scan)
+        successful_symbols = list(market_data.keys()) if market_data else []
+        logging.debug(f"Data pasar untuk {len(successful_symbols)} simbol dikumpulkan.")
+        return market_data, 'success' if market_data else 'no_data'
+
+    def _collect_onchain_data(self, specific_assets=None):
+        """
+        Tahap 2: data on-chain mentah + metrik turunannya.
+        Returns:
+            tuple: (data, status)
+        """
+        logging.info("2. Mengumpulkan data on-chain...")
+        if not (self.onchain_collector and self.metric_generator):
+            logging.info("Sub-sistem On-Chain tidak tersedia. Melewati pengumpulan data on-chain.")
+            return None, 'unavailable'
+        # Fokus pada BTC dan ETH untuk on-chain data jika tidak spesifik
+        assets_to_scan_onchain = specific_assets if specific_assets else ['bitcoin', 'ethereum']
+        raw_onchain_data = self.onchain_collector.collect_all_onchain_data(assets=assets_to_scan_onchain)
+        onchain_metrics = self.metric_generator.generate_all_metrics(raw_onchain_data)
+        logging.debug("Data on-chain berhasil dikumpulkan dan diproses.")
+        return onchain_metrics, 'success' if raw_onchain_data else 'no_data'
+
+    def _collect_news_intel(self):
+        """
+        Tahap 3: berita & intelijen (API dan scraping).
+        Returns:
+            tuple: (data, status)
+        """
+        logging.info("3. Mengumpulkan data berita & intelijen...")
+        if not self.news_aggregator:
+            logging.info("NewsAggregator tidak tersedia. Melewati pengumpulan data berita.")
+            return None, 'unavailable'
+        # Gunakan NewsAggregator yang terintegrasi dengan IntelligentScraper dan API
+        aggregated_intelligence = self.news_aggregator.aggregate_all()
+        logging.debug("Data berita & intelijen berhasil dikumpulkan.")
+        return aggregated_intelligence, 'success' if aggregated_intelligence else 'no_data'
+
+    def _run_stage(self, name, stage_func):
+        """
+        Menjalankan satu tahap, mengukur durasinya, dan menangkap error-nya.
+        Returns:
+            dict: {'status', 'data', 'error', 'duration'}
+        """
+        stage_start = time.monotonic()
+        try:
+            data, status = stage_func()
+            return {'status': status, 'data': data, 'error': None, 'duration': time.monotonic() - stage_start}
+        except Exception as e:
+            logging.error(f"Kesalahan pada tahap persepsi '{name}': {e}", exc_info=True)
+            return {'status': 'failed', 'data': None, 'error': str(e), 'duration': time.monotonic() - stage_start}
+
+    def _run_stages_concurrently(self, stages):
+        """
+        Menjalankan semua tahap secara paralel dengan deadline per tahap
+        (dihitung dari awal scan). Tahap yang melewati deadline ditandai
+        'timeout' dan tidak menahan siklus; hasilnya yang datang terlambat dibuang.
+        Args:
+            stages (list): [(nama_tahap, kunci_snapshot, fungsi)].
+        Returns:
+            dict: {nama_tahap: hasil `_run_stage`}.
+        """
+        scan_start = time.monotonic()
+        futures = {}
+        results = {}
+        for name, _, stage_func in stages:
+            previous = self._inflight_stages.get(name)
+            if previous is not None and not previous.done():
+                logging.warning(f"Tahap persepsi '{name}' dari siklus sebelumnya masih berjalan. Dilewati.")
+                results[name] = {'status': 'timeout', 'data': None, 'duration': 0.0,
+                                 'error': 'Tahap sebelumnya belum selesai (melewati deadline).'}
+                continue
+            futures[name] = self._stage_executor.submit(self._run_stage, name, stage_func)
+            self._inflight_stages[name] = futures[name]
+
+        for name, future in futures.items():
+            deadline = self.stage_deadlines.get(name)
+            remaining = None if deadline is None else max(0.0, deadline - (time.monotonic() - scan_start))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logging.warning(f"Tahap persepsi '{name}' melewati deadline {deadline}s. Ditandai 'timeout'.")
+                results[name] = {'status': 'timeout', 'data': None, 'duration': time.monotonic() - scan_start,
+                                 'error': f"Melewati deadline {deadline}s."}
+        return results
+
 # --- CONTOH PENGGUNAAN (Untuk debugging) ---
 if __name__ == '__main__':
     # Untuk debugging, Anda perlu mocking `orchestrator`
@@ -14,6 +14,7 @@
 # --- Import Library Standar ---
 import logging
 import sys
+import time
 
 # --- Import Library Pihak Ketiga ---
 # Pastikan library berikut sudah terinstal:
@@ -26,6 +27,14 @@ except ImportError:
 
 import numpy as np
 
+# --- Import Modul Proyek ---
+from COLLECTIVE_MEMORY.ohlcv_history_cache import OHLCVHistoryCache
+
+# Nilai `days` yang diterima endpoint OHLC CoinGecko dan granularitas candle-nya
+# (1 hari: 30 menit, 7-30 hari: 4 jam, 90 hari ke atas: 4 hari)
+OHLC_DAYS = (1, 7, 14, 30, 90, 180, 365)
+OHLC_INTERVALS = {1: '30m', 7: '4h', 14: '4h', 30: '4h', 90: '4d', 180: '4d', 365: '4d', 'max': '4d'}
+
 # Konfigurasi logging dasar untuk modul ini
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [%(levelname)s] - %(message)s')
 
@@ -45,6 +54,8 @@ class CoinGeckoToolkit:
         """
         logging.info("Inisialisasi CoinGecko Toolkit...")
         self.cg = None
+        # Cache riwayat OHLCV lokal (memory-mapped), dikonfigurasi dari [history_cache]
+        self.history_cache = OHLCVHistoryCache(getattr(orchestrator, 'config', None))
 
         # Mengambil kunci API dari 'secrets' yang sudah dimuat oleh orkestrator.
         # Ini mengasumsikan 'secrets.vault' memiliki seksi [market_data_apis].
@@ -69,9 +80,73 @@ class CoinGeckoToolkit:
             logging.critical(f"Terjadi error tak terduga saat inisialisasi CoinGeckoToolkit: {e}")
 
 
+    @staticmethod
+    def _ohlc_days(days) -> tuple:
+        """
+        Memetakan `days` ke nilai yang diterima endpoint OHLC dan interval candle-nya.
+        Returns:
+            tuple: (days untuk API, interval).
+        """
+        if days == 'max':
+            return 'max', OHLC_INTERVALS['max']
+        api_days = next((d for d in OHLC_DAYS if d >= days), 'max')
+        return api_days, OHLC_INTERVALS[api_days]
+
+    @staticmethod
+    def _tail_days(interval: str, since_ms: float):
+        """
+        Nilai `days` terkecil dengan interval yang sama yang mencakup ekor sejak `since_ms`.
+        Jika celah lebih panjang dari jangkauan interval (mis. > 30 hari untuk 4h), nilai
+        terbesar dikembalikan; cache riwayat mendeteksi ekor yang tidak menyambung.
+        """
+        gap_days = (time.time() * 1000 - since_ms) / 86400000.0
+        candidates = [d for d in OHLC_DAYS if OHLC_INTERVALS[d] == interval] + (['max'] if interval == '4d' else [])
+        return next((d for d in candidates if d == 'max' or d >= gap_days), candidates[-1])
+
+    def get_historical_ohlcv(self, coin_id: str = 'bitcoin', vs_currency: str = 'usd', days=7) -> np.ndarray:
+        """
+        Mengambil candle OHLC historis dari cache lokal, dan hanya mengambil ekor
+        yang belum ada dari CoinGecko. Endpoint OHLC CoinGecko tidak menyertakan
+        volume, sehingga kolom volume berisi NaN.
+
+        Args:
+            coin_id (str): ID koin sesuai CoinGecko (contoh: 'bitcoin', 'ethereum').
+            vs_currency (str): Mata uang pembanding (contoh: 'usd', 'idr').
+            days (int | str): Jumlah hari data historis, atau 'max'.
+
+        Returns:
+            np.ndarray: Array (bar x 6) [timestamp ms, open, high, low, close, volume],
+                        memory-mapped dari cache. Array kosong jika tidak ada data.
+        """
+        if not self.cg:
+            logging.error("Pengambilan data dibatalkan. Klien CoinGecko belum terinisialisasi.")
+            return np.empty((0, 6))
+
+        api_days, interval = self._ohlc_days(days)
+        start_ms = 0 if days == 'max' else time.time() * 1000 - days * 86400000.0
+
+        def fetch(since_ms):
+            request_days = api_days if since_ms is None else self._tail_days(interval, since_ms)
+            candles = self.cg.get_coin_ohlc_by_id(id=coin_id, vs_currency=vs_currency, days=request_days)
+            rows = np.asarray(candles, dtype=float).reshape(-1, 5)
+            return np.column_stack([rows, np.full(len(rows), np.nan)])
+
+        logging.info(f"Mengambil data OHLC historis untuk '{coin_id}' vs '{vs_currency}' ({days} hari, {interval})...")
+        try:
+            bars = self.history_cache.get('coingecko', f"{coin_id}_{vs_currency}", interval, start_ms, fetch)
+        except Exception as e:
+            logging.error(f"Gagal mengambil data dari CoinGecko untuk '{coin_id}'. Error: {e}")
+            return np.empty((0, 6))
+        if not len(bars):
+            logging.warning(f"Tidak ada data harga yang ditemukan untuk '{coin_id}'.")
+        return bars
+
     def get_historical_data(self, coin_id: str = 'bitcoin', vs_currency: str = 'usd', days: int = 7) -> np.ndarray:
         """
-        Mengambil data harga historis dari CoinGecko.
+        Mengambil data harga historis dari CoinGecko (endpoint market_chart).
+        Granularitasnya otomatis dari CoinGecko (5 menit untuk 1 hari, per jam
+        untuk 2-90 hari, harian di atasnya), lebih rapat daripada candle OHLC
+        (`get_historical_ohlcv`), sehingga tidak dilayani dari cache OHLC.
 
         Args:
             coin_id (str): ID koin sesuai CoinGecko (contoh: 'bitcoin', 'ethereum').
@@ -109,4 +184,4 @@ class CoinGeckoToolkit:
         except Exception as e:
             # Menangkap semua kemungkinan error dari API (koneksi, id tidak valid, dll.)
             logging.error(f"Gagal mengambil data dari CoinGecko untuk '{coin_id}'. Error: {e}")
-            return np.array([])
\ No newline at end of file
+            return np.array([])
@@ -16,10 +16,20 @@ import logging
 import sys
 import os
 import time
-import random
+import asyncio
+import threading
 import requests
 import ccxt
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# --- Impor CCXT async untuk mode pengambilan data konkuren ---
+try:
+    import ccxt.async_support as ccxt_async
+    CCXT_ASYNC_AVAILABLE = True
+except ImportError:
+    CCXT_ASYNC_AVAILABLE = False
+    logging.warning("ccxt.async_support tidak ditemukan. Mode pengambilan data async akan dinonaktifkan.")
 
 # --- PENYESUAIAN PATH DINAMIS UNTUK MENGATASI MASALAH IMPOR ---
 # Mendapatkan path absolut dari direktori script ini
@@ -31,6 +41,17 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_script_di
 sys.path.insert(0, str(project_root))
 # --- AKHIR PENYESUAIAN PATH ---
 
+from UTILS.rate_limiter import RateLimiter
+from UTILS.http_session import HttpSessionFactory
+from UTILS.response_cache import ResponseCache
+from UTILS.latency_histogram import LatencyHistogram
+from UTILS.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from UTILS.ticker_snapshot import fetch_ticker_snapshot
+from PERCEPTION_SYSTEM.ohlcv_store import OHLCVStore
+
+# Host yang dipakai sebagai kunci rate limit untuk semua panggilan CCXT Binance
+BINANCE_HOST = 'api.binance.com'
+
 class IntelligenceAggregator:
     """
     Mengelola semua koneksi API, menyediakan data dengan mekanisme fallback
@@ -50,9 +71,60 @@ class IntelligenceAggregator:
         
         # Untuk melacak indeks kunci terakhir yang digunakan untuk setiap layanan multi-kunci
         self.key_indices = defaultdict(int)
+        # Rotasi kunci dipanggil dari banyak thread (agregasi paralel, hedged request)
+        self._key_lock = threading.Lock()
+
+        # Rate limiter token-bucket bersama (per host), dikonfigurasi dari [rate_limits]
+        self.rate_limiter = RateLimiter()
+        self.rate_limiter.configure(self.orchestrator.config)
+
+        # Connection pool HTTP bersama (keep-alive, retry, timeout), dikonfigurasi dari [http]
+        self.http_sessions = HttpSessionFactory()
+        self.http_sessions.configure(self.orchestrator.config)
+
+        # Cache respons bersama (TTL + stale-while-revalidate), dikonfigurasi dari [response_cache]
+        self.response_cache = ResponseCache()
+        self.response_cache.configure(self.orchestrator.config)
+
+        # Circuit breaker per penyedia/kunci (bersama), dikonfigurasi dari [circuit_breaker]
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.circuit_breakers.configure(self.orchestrator.config)
         
         # Muat semua kunci API yang tersedia
         self._load_api_keys()
+
+        # --- Konfigurasi mode pengambilan data pasar konkuren (async) ---
+        market_config = self.orchestrator.config.get('market', {})
+        self.async_fetch_enabled = market_config.get('async_fetch', True) and CCXT_ASYNC_AVAILABLE
+        # Batas permintaan paralel per bursa (semaphore), agar tidak melanggar rate limit bursa
+        self.max_concurrent_per_exchange = market_config.get('max_concurrent_requests_per_exchange', 10)
+        # Batas waktu total satu putaran agregasi async (detik)
+        self.async_fetch_timeout = market_config.get('async_fetch_timeout_seconds', 30)
+        # Jumlah candle 1h per simbol; cukup untuk indikator teknikal (MACD, SMA 50, volume profile)
+        self.ohlcv_limit = market_config.get('ohlcv_limit', 120)
+        self.ohlcv_timeframe = market_config.get('ohlcv_timeframe', '1h')
+        # Riwayat OHLCV bersama (ring buffer per simbol & timeframe), dikonfigurasi dari [ohlcv_store].
+        # Jika aktif, riwayat diisi sekali lalu hanya bar baru yang diminta dari bursa
+        self.ohlcv_store = OHLCVStore()
+        self.ohlcv_store.configure(self.orchestrator.config)
+        self.async_clients = {}
+        self._async_loop = None
+        self._async_thread = None
+        self._async_lock = threading.Lock()
+        # Melindungi hasil parsial agregasi async yang dibaca thread pemanggil saat batas waktu
+        self._partial_lock = threading.Lock()
+
+        # --- Konfigurasi hedged request untuk get_market_price ---
+        self.hedged_price_enabled = market_config.get('hedged_price_fetch', True)
+        # Persentil latensi penyedia yang dipakai sebagai batas hedge (0.95 = p95)
+        self.hedge_percentile = market_config.get('hedge_percentile', 0.95)
+        self.hedge_initial_delay = market_config.get('hedge_initial_delay_seconds', 1.0)
+        self.hedge_min_delay = market_config.get('hedge_min_delay_seconds', 0.05)
+        self.hedge_max_delay = market_config.get('hedge_max_delay_seconds', 3.0)
+        self.hedge_min_samples = market_config.get('hedge_min_samples', 20)
+        # Histogram latensi per penyedia harga (dipakai untuk batas hedge adaptif)
+        self.provider_latency = defaultdict(LatencyHistogram)
+        self._hedge_executor = None
         
         logging.info("Intelligence Aggregator v4 berhasil diinisialisasi.")
 
@@ -60,14 +132,18 @@ class IntelligenceAggregator:
         """
         Memuat semua kunci API dari secrets.vault.
         """
+        self.clients = {}
         try:
             # --- 1. BURSA (Menggunakan CCXT) ---
             exchange_secrets = self.secrets.get('exchange_apis', {})
             binance_api_key = exchange_secrets.get('binance_api_key')
             binance_secret_key = exchange_secrets.get('binance_secret_key')
+            # Disimpan untuk membuat klien CCXT async dengan kredensial yang sama
+            self.exchange_credentials = {
+                'binance': {'apiKey': binance_api_key, 'secret': binance_secret_key}
+            }
 
             if binance_api_key and binance_secret_key:
-                self.clients = {}
                 self.clients['binance'] = ccxt.binance({
                     'apiKey': binance_api_key,
                     'secret': binance_secret_key,
@@ -130,6 +206,7 @@ class IntelligenceAggregator:
     def _rotate_key(self, service_name):
         """
         Mendapatkan kunci API berikutnya dengan rotasi round-robin.
+        Kunci yang circuit breaker-nya sedang terbuka dilewati.
         Args:
             service_name (str): Nama layanan (e.g., 'coinstats', 'messari', 'coindesk', 'etherscan').
         Returns:
@@ -142,12 +219,41 @@ class IntelligenceAggregator:
             # logging.debug(f"Tidak ada kunci yang ditemukan untuk rotasi {service_name}.")
             return None
 
-        index = self.key_indices[service_name]
-        key = keys[index]
-        # Update index untuk rotasi berikutnya
-        self.key_indices[service_name] = (index + 1) % len(keys)
-        # logging.debug(f"Kunci {service_name} diputar ke index {index}.")
-        return key
+        with self._key_lock:
+            for _ in range(len(keys)):
+                index = self.key_indices[service_name] % len(keys)
+                key = keys[index]
+                # Update index untuk rotasi berikutnya
+                self.key_indices[service_name] = (index + 1) % len(keys)
+                if self.circuit_breakers.allow_request(self._key_breaker_name(service_name, key)):
+                    # logging.debug(f"Kunci {service_name} diputar ke index {index}.")
+                    return key
+        logging.warning(f"Semua kunci {service_name} sedang dilewati (circuit breaker terbuka).")
+        return None
+
+    def _key_breaker_name(self, service_name, key):
+        """Nama circuit breaker per kunci (memakai indeks, bukan isi kunci)."""
+        keys = self.clients.get(f"{service_name}_keys", [])
+        return f"{service_name}#{keys.index(key)}" if key in keys else service_name
+
+    def _call_with_rotated_key(self, service_name, request_func):
+        """
+        Memanggil `request_func(api_key)` dengan kunci hasil rotasi dan mencatat
+        hasilnya ke circuit breaker kunci tersebut.
+        Raises:
+            CircuitOpenError: Jika tidak ada kunci yang boleh dipakai.
+        """
+        api_key = self._rotate_key(service_name)
+        if not api_key:
+            raise CircuitOpenError(f"Tidak ada kunci {service_name} yang tersedia.")
+        breaker_name = self._key_breaker_name(service_name, api_key)
+        try:
+            result = request_func(api_key)
+        except Exception:
+            self.circuit_breakers.record_failure(breaker_name)
+            raise
+        self.circuit_breakers.record_success(breaker_name)
+        return result
 
     def get_client(self, client_name):
         """
@@ -159,140 +265,314 @@ class IntelligenceAggregator:
         """
         return self.clients.get(client_name)
 
+    def get_cache_stats(self):
+        """Mengembalikan penghitung hit/miss cache respons bersama."""
+        return self.response_cache.get_stats()
+
+    def get_provider_health(self):
+        """Status circuit breaker dan skor kesehatan setiap penyedia/kunci."""
+        return self.circuit_breakers.get_stats()
+
+    def _check_circuit(self, provider):
+        """Melempar CircuitOpenError seketika jika circuit penyedia sedang terbuka."""
+        if not self.circuit_breakers.allow_request(provider.lower()):
+            raise CircuitOpenError(f"Circuit breaker {provider} terbuka, penyedia dilewati.")
+
+    def _http_get_json(self, url, params=None, headers=None, provider=None):
+        """
+        Permintaan GET mentah (dengan rate limit) yang mengembalikan JSON.
+        Dipanggil lewat `response_cache.get_or_fetch`, sehingga cache hit tidak
+        memakai kuota rate limit sama sekali. Jika `provider` diberikan, latensi
+        permintaan yang berhasil dicatat ke histogram penyedia tersebut.
+        """
+        if provider:
+            self._check_circuit(provider)
+        # Tunggu kuota rate limit host (hanya memblokir jika kuota habis)
+        self.rate_limiter.acquire(url)
+        start_time = time.monotonic()
+        try:
+            response = self.http_sessions.get_session().get(url, params=params, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            if provider:
+                self.circuit_breakers.record_failure(provider.lower(), time.monotonic() - start_time)
+            raise
+        if provider:
+            latency = time.monotonic() - start_time
+            self.provider_latency[provider].record(latency)
+            self.circuit_breakers.record_success(provider.lower(), latency)
+        return data
+
+    def _fetch_binance_ticker(self, symbol):
+        self._check_circuit('Binance')
+        self.rate_limiter.acquire(BINANCE_HOST)
+        start_time = time.monotonic()
+        try:
+            ticker = self.clients['binance'].fetch_ticker(symbol)
+        except Exception:
+            self.circuit_breakers.record_failure('binance', time.monotonic() - start_time)
+            raise
+        latency = time.monotonic() - start_time
+        self.provider_latency['Binance'].record(latency)
+        self.circuit_breakers.record_success('binance', latency)
+        return ticker
+
     # --- FUNGSI PENGUMPULAN DATA PASAR (FALLBACK) ---
     def get_market_price(self, symbol: str = 'BTC/USDT'):
         """
         Mendapatkan harga pasar saat ini dengan mekanisme fallback yang tangguh.
         Prioritas: Binance -> CoinGecko -> CoinCap -> CoinStats (rotasi).
+        Setiap respons penyedia melewati cache respons bersama (TTL per provider).
+        Jika mode hedged aktif (`[market] hedged_price_fetch`), penyedia berikutnya
+        ikut dipanggil secara paralel bila penyedia sebelumnya belum menjawab
+        dalam batas p95 latensinya.
         Args:
             symbol (str): Simbol pasangan trading (format CCXT).
         Returns:
             float: Harga terakhir, atau None jika semua sumber gagal.
         """
         logging.info(f"Mengambil harga pasar untuk {symbol} (fallback on-chain)...")
-        
-        # --- Prioritas 1: Binance (sumber paling real-time) ---
-        try:
-            if self.clients.get('binance'):
-                # Tambahkan jitter kecil untuk menghindari rate limit
-                time.sleep(random.uniform(0.1, 0.3))
-                ticker = self.clients['binance'].fetch_ticker(symbol)
-                price = float(ticker['last'])
-                logging.info(f"Harga dari Binance: {price}")
-                return price
-            else:
-                logging.warning("Klien Binance tidak tersedia untuk fallback harga.")
-        except ccxt.NetworkError as e:
-            logging.warning(f"Binance (jaringan) gagal: {e}. Fallback ke CoinGecko.")
-        except ccxt.ExchangeError as e:
-             logging.warning(f"Binance (bursa) gagal: {e}. Fallback ke CoinGecko.")
-        except Exception as e:
-            logging.warning(f"Binance gagal (error lain): {e}. Fallback ke CoinGecko.")
+        providers = self._get_price_providers()
 
-        # --- Prioritas 2: CoinGecko ---
-        try:
-            # CoinGecko menggunakan ID aset, bukan simbol pair
-            asset_id_map = {'BTC/USDT': 'bitcoin', 'ETH/USDT': 'ethereum'} # Tambahkan mapping sesuai kebutuhan
-            asset_id = asset_id_map.get(symbol)
-            if not asset_id:
-                 # Fallback sederhana untuk ekstraksi ID
-                 asset_id = symbol.split('/')[0].lower()
-            
-            if self.clients.get('coingecko_key'):
-                 headers = {"Authorization": f"Bearer {self.clients['coingecko_key']}"}
-            else:
-                 headers = {} # CoinGecko API publik
+        if self.hedged_price_enabled:
+            return self._get_market_price_hedged(symbol, providers)
 
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={asset_id}&vs_currencies=usd"
-            # Tambahkan jitter kecil untuk menghindari rate limit
-            time.sleep(random.uniform(0.1, 0.3))
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            price = data.get(asset_id, {}).get('usd')
-            if price:
-                logging.info(f"Harga dari CoinGecko: {price}")
-                return float(price)
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"CoinGecko (jaringan) gagal: {e}. Fallback ke CoinCap.")
-        except Exception as e:
-            logging.warning(f"CoinGecko gagal (error lain): {e}. Fallback ke CoinCap.")
+        for name, price_func in providers:
+            try:
+                price = price_func(symbol)
+                if price:
+                    logging.info(f"Harga dari {name}: {price}")
+                    return price
+            except CircuitOpenError as e:
+                logging.debug(f"{e}")
+            except ccxt.NetworkError as e:
+                logging.warning(f"{name} (jaringan) gagal: {e}. Fallback ke sumber berikutnya.")
+            except ccxt.ExchangeError as e:
+                logging.warning(f"{name} (bursa) gagal: {e}. Fallback ke sumber berikutnya.")
+            except requests.exceptions.RequestException as e:
+                logging.warning(f"{name} (jaringan) gagal: {e}. Fallback ke sumber berikutnya.")
+            except Exception as e:
+                logging.warning(f"{name} gagal (error lain): {e}. Fallback ke sumber berikutnya.")
 
-        # --- Prioritas 3: CoinCap ---
-        try:
-            # CoinCap menggunakan slug yang konsisten dengan id
-            asset_slug_map = {'BTC/USDT': 'bitcoin', 'ETH/USDT': 'ethereum'}
-            asset_slug = asset_slug_map.get(symbol, symbol.split('/')[0].lower())
-            
-            headers = {"Authorization": f"Bearer {self.clients['coincap_key']}"} if self.clients.get('coincap_key') else {}
-            url = f"https://api.coincap.io/v2/assets/{asset_slug}" # Perbaikan: Gunakan slug
-            # Tambahkan jitter kecil untuk menghindari rate limit
-            time.sleep(random.uniform(0.1, 0.3))
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            price = data.get('data', {}).get('priceUsd')
-            if price:
-                logging.info(f"Harga dari CoinCap: {price}")
-                return float(price)
-        except requests.exceptions.RequestException as e:
-             logging.warning(f"CoinCap (jaringan) gagal: {e}. Fallback ke CoinStats.")
-        except Exception as e:
-             logging.warning(f"CoinCap gagal (error lain): {e}. Fallback ke CoinStats.")
+        logging.error(f"Semua sumber harga gagal untuk {symbol}.")
+        return None
+
+    def _get_price_providers(self):
+        """
+        Daftar penyedia harga, diurutkan ulang berdasarkan skor kesehatan
+        circuit breaker. Penyedia dengan skor setara mengikuti urutan prioritas
+        bawaan, dan penyedia dengan circuit terbuka ditaruh paling akhir.
+        Returns:
+            list: [(nama_provider, fungsi(symbol) -> float atau None)].
+        """
+        providers = [
+            ('Binance', self._get_price_from_binance),
+            ('CoinGecko', self._get_price_from_coingecko),
+            ('CoinCap', self._get_price_from_coincap),
+            ('CoinStats', self._get_price_from_coinstats),
+        ]
+        return self.circuit_breakers.rank(providers, key=lambda provider: provider[0].lower())
+
+    def _get_price_from_binance(self, symbol):
+        # --- Prioritas 1: Binance (sumber paling real-time) ---
+        if not self.clients.get('binance'):
+            logging.warning("Klien Binance tidak tersedia untuk fallback harga.")
+            return None
+        ticker = self.response_cache.get_or_fetch(
+            'binance', 'fetch_ticker', {'symbol': symbol},
+            lambda: self._fetch_binance_ticker(symbol)
+        )
+        return float(ticker['last'])
 
+    def _get_price_from_coingecko(self, symbol):
+        # --- Prioritas 2: CoinGecko ---
+        # CoinGecko menggunakan ID aset, bukan simbol pair
+        asset_id_map = {'BTC/USDT': 'bitcoin', 'ETH/USDT': 'ethereum'} # Tambahkan mapping sesuai kebutuhan
+        asset_id = asset_id_map.get(symbol)
+        if not asset_id:
+             # Fallback sederhana untuk ekstraksi ID
+             asset_id = symbol.split('/')[0].lower()
+
+        if self.clients.get('coingecko_key'):
+             headers = {"Authorization": f"Bearer {self.clients['coingecko_key']}"}
+        else:
+             headers = {} # CoinGecko API publik
+
+        url = f"https://api.coingecko.com/api/v3/simple/price?ids={asset_id}&vs_currencies=usd"
+        data = self.response_cache.get_or_fetch(
+            'coingecko', 'simple/price', {'ids': asset_id, 'vs_currencies': 'usd'},
+            lambda: self._http_get_json(url, headers=headers, provider='CoinGecko')
+        )
+        price = data.get(asset_id, {}).get('usd')
+        return float(price) if price else None
+
+    def _get_price_from_coincap(self, symbol):
+        # --- Prioritas 3: CoinCap ---
+        # CoinCap menggunakan slug yang konsisten dengan id
+        asset_slug_map = {'BTC/USDT': 'bitcoin', 'ETH/USDT': 'ethereum'}
+        asset_slug = asset_slug_map.get(symbol, symbol.split('/')[0].lower())
+
+        headers = {"Authorization": f"Bearer {self.clients['coincap_key']}"} if self.clients.get('coincap_key') else {}
+        url = f"https://api.coincap.io/v2/assets/{asset_slug}" # Perbaikan: Gunakan slug
+        data = self.response_cache.get_or_fetch(
+            'coincap', f'v2/assets/{asset_slug}', None,
+            lambda: self._http_get_json(url, headers=headers, provider='CoinCap')
+        )
+        price = data.get('data', {}).get('priceUsd')
+        return float(price) if price else None
+
+    def _get_price_from_coinstats(self, symbol):
         # --- Prioritas 4: CoinStats (dengan rotasi kunci) ---
-        try:
-            asset_symbol_simple = symbol.split('/')[0] # BTC, ETH
-            api_key = self._rotate_key('coinstats')
-            if not api_key:
-                raise ValueError("Tidak ada kunci CoinStats yang tersedia.")
-
-            headers = {"Authorization": f"Bearer {api_key}"}
-            url = f"https://open-api.coinstats.app/api/v1/coins/{asset_symbol_simple}?currency=USD"
-            # Tambahkan jitter kecil untuk menghindari rate limit
-            time.sleep(random.uniform(0.1, 0.3))
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            price = data.get('coin', {}).get('price')
-            if price:
-                logging.info(f"Harga dari CoinStats: {price}")
-                return float(price)
-        except requests.exceptions.RequestException as e:
-             logging.error(f"Semua sumber harga gagal. Terakhir gagal di CoinStats: {e}")
-        except Exception as e:
-             logging.error(f"Semua sumber harga gagal. Terakhir gagal di CoinStats: {e}")
-        
+        asset_symbol_simple = symbol.split('/')[0] # BTC, ETH
+        if not self.clients.get('coinstats_keys'):
+            raise ValueError("Tidak ada kunci CoinStats yang tersedia.")
+
+        url = f"https://open-api.coinstats.app/api/v1/coins/{asset_symbol_simple}?currency=USD"
+        # Kunci hanya diputar saat benar-benar memanggil API (bukan saat cache hit)
+        data = self.response_cache.get_or_fetch(
+            'coinstats', f'api/v1/coins/{asset_symbol_simple}', {'currency': 'USD'},
+            lambda: self._call_with_rotated_key('coinstats', lambda api_key: self._http_get_json(
+                url, headers={"Authorization": f"Bearer {api_key}"}, provider='CoinStats'
+            ))
+        )
+        price = data.get('coin', {}).get('price')
+        return float(price) if price else None
+
+    # --- HEDGED REQUEST (FALLBACK PARALEL) ---
+    def _get_hedge_delay(self, provider):
+        """
+        Batas waktu tunggu sebelum penyedia berikutnya ikut dipanggil, yaitu
+        persentil latensi (default p95) penyedia ini, dibatasi min/maks.
+        Sebelum sampel cukup, dipakai `hedge_initial_delay_seconds`.
+        """
+        histogram = self.provider_latency.get(provider)
+        if histogram is None or histogram.count < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        delay = histogram.percentile(self.hedge_percentile)
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    def _get_hedge_executor(self):
+        with self._async_lock:
+            if self._hedge_executor is None:
+                # Cukup satu thread per penyedia untuk satu permintaan harga, dikali beberapa pemanggil paralel
+                self._hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='price-hedge')
+            return self._hedge_executor
+
+    def _get_market_price_hedged(self, symbol, providers):
+        """
+        Hedged request: panggil penyedia pertama; jika belum menjawab dalam batas
+        p95-nya (atau gagal), panggil penyedia berikutnya secara paralel. Harga
+        valid pertama yang masuk dipakai, sisanya dibatalkan/diabaikan.
+        Args:
+            symbol (str): Simbol pasangan trading.
+            providers (list): [(nama_provider, fungsi harga)] sesuai prioritas.
+        Returns:
+            float: Harga terakhir, atau None jika semua sumber gagal.
+        """
+        executor = self._get_hedge_executor()
+        pending = {}
+        next_index = 0
+
+        while pending or next_index < len(providers):
+            if next_index < len(providers):
+                name, price_func = providers[next_index]
+                pending[executor.submit(price_func, symbol)] = name
+                next_index += 1
+                wait_timeout = self._get_hedge_delay(name) if next_index < len(providers) else None
+            else:
+                wait_timeout = None
+
+            while pending:
+                done, _ = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Penyedia yang sedang berjalan melewati batas hedge: luncurkan berikutnya
+                    logging.debug(f"Hedge harga {symbol}: {list(pending.values())} belum menjawab dalam {wait_timeout:.2f}s.")
+                    break
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        price = future.result()
+                    except CircuitOpenError as e:
+                        logging.debug(f"{e}")
+                        continue
+                    except Exception as e:
+                        logging.warning(f"{name} gagal: {e}. Fallback ke sumber berikutnya.")
+                        continue
+                    if price:
+                        for other in pending:
+                            other.cancel()  # Hanya membatalkan yang belum mulai; sisanya diabaikan
+                        logging.info(f"Harga dari {name}: {price} (hedged)")
+                        return price
+                if next_index < len(providers):
+                    # Penyedia gagal lebih awal: tidak perlu menunggu batas hedge
+                    break
+
+        logging.error(f"Semua sumber harga gagal untuk {symbol}.")
         return None
 
-    def get_detailed_market_data(self, symbol='BTC/USDT'):
+    def get_latency_stats(self):
+        """Ringkasan histogram latensi (p50/p95/p99) per penyedia harga."""
+        return {provider: histogram.summary() for provider, histogram in self.provider_latency.items()}
+
+    def get_ticker_snapshot(self, symbols=None):
+        """
+        Mengambil ticker banyak simbol sekaligus dengan satu panggilan `fetch_tickers`
+        (lihat `UTILS.ticker_snapshot.fetch_ticker_snapshot`), dengan rate limit
+        dan circuit breaker Binance.
+        Args:
+            symbols (list, optional): Daftar simbol. Jika None, kembalikan semua ticker bursa.
+        Returns:
+            dict: {symbol: ticker CCXT}. Simbol yang gagal tidak dimasukkan.
+        """
+        client = self.clients.get('binance')
+        if not client:
+            logging.warning("Klien Binance tidak tersedia untuk snapshot ticker.")
+            return {}
+        return fetch_ticker_snapshot(client, symbols, rate_limiter=self.rate_limiter, rate_limit_host=BINANCE_HOST,
+                                     circuit_breakers=self.circuit_breakers)
+
+    def get_market_prices(self, symbols):
+        """
+        Mendapatkan harga terakhir untuk banyak simbol dari satu snapshot ticker.
+        Simbol yang tidak tersedia di Binance di-fallback ke `get_market_price`.
+        Args:
+            symbols (list): Daftar simbol pasangan trading.
+        Returns:
+            dict: {symbol: harga (float) atau None}.
+        """
+        snapshot = self.get_ticker_snapshot(symbols)
+        prices = {}
+        for symbol in symbols:
+            last_price = snapshot.get(symbol, {}).get('last')
+            prices[symbol] = float(last_price) if last_price is not None else self.get_market_price(symbol)
+        return prices
+
+    def get_detailed_market_data(self, symbol='BTC/USDT', ticker=None):
         """
         Mendapatkan data pasar yang lebih detail (OHLCV, volume) dari exchange.
         Args:
             symbol (str): Simbol pasangan trading.
+            ticker (dict, optional): Ticker yang sudah diambil (misal dari `get_ticker_snapshot`).
+                                     Jika diberikan, `fetch_ticker` tidak dipanggil lagi.
         Returns:
             dict: Data OHLCV dan statistik, atau None jika gagal.
         """
         try:
             if self.clients.get('binance'):
                 client = self.clients['binance']
-                # Tambahkan jitter kecil untuk menghindari rate limit
-                time.sleep(random.uniform(0.1, 0.3))
-                # Fetch ticker
-                ticker = client.fetch_ticker(symbol)
-                # Fetch recent OHLCV (e.g., last 2 hours of 1h candles)
-                ohlcv = client.fetch_ohlcv(symbol, timeframe='1h', limit=2)
+                # Satu token rate limit Binance per panggilan (hanya memblokir jika kuota habis)
+                # Fetch ticker (jika belum tersedia dari snapshot)
+                if ticker is None:
+                    self.rate_limiter.acquire(BINANCE_HOST)
+                    ticker = client.fetch_ticker(symbol)
+                # Fetch OHLCV: backfill penuh sekali, setelah itu hanya bar sejak bar terakhir di store
+                since, limit, backfill = self._ohlcv_request(symbol)
+                self.rate_limiter.acquire(BINANCE_HOST)
+                ohlcv = client.fetch_ohlcv(symbol, timeframe=self.ohlcv_timeframe, since=since, limit=limit)
+                self._store_ohlcv(symbol, ohlcv, backfill)
                 
-                data = {
-                    'symbol': symbol,
-                    'price': ticker.get('last'),
-                    'change_24h': ticker.get('percentage'),
-                    'volume_24h': ticker.get('baseVolume'),
-                    'high_1h': ohlcv[-1][2] if len(ohlcv) >= 1 else None,
-                    'low_1h': ohlcv[-1][3] if len(ohlcv) >= 1 else None,
-                    'close_1h': ohlcv[-1][4] if len(ohlcv) >= 1 else None,
-                    'volume_1h': ohlcv[-1][5] if len(ohlcv) >= 1 else None,
-                }
+                data = self._build_detailed_market_data(symbol, ticker, ohlcv)
                 logging.debug(f"Data pasar detail untuk {symbol} berhasil diambil.")
                 return data
             else:
@@ -301,6 +581,233 @@ class IntelligenceAggregator:
             logging.error(f"Kesalahan saat mengambil data pasar detail untuk {symbol}: {e}", exc_info=True)
         return None
 
+    def _ohlcv_request(self, symbol):
+        """
+        Menentukan parameter `fetch_ohlcv` untuk sebuah simbol.
+        Returns:
+            tuple: (since dalam ms atau None, limit, apakah backfill penuh).
+        """
+        if not self.ohlcv_store.enabled:
+            return None, self.ohlcv_limit, False
+        backfill_bars = self.ohlcv_store.settings['backfill_bars']
+        if self.ohlcv_store.needs_backfill(symbol, self.ohlcv_timeframe):
+            return None, backfill_bars, True
+        # Bar terakhir ikut diminta lagi: candle yang masih terbentuk diperbarui
+        return int(self.ohlcv_store.last_timestamp(symbol, self.ohlcv_timeframe)), backfill_bars, False
+
+    def _store_ohlcv(self, symbol, ohlcv, backfill):
+        if self.ohlcv_store.enabled and ohlcv:
+            added = self.ohlcv_store.update(symbol, self.ohlcv_timeframe, ohlcv, replace=backfill)
+            if backfill:
+                logging.info(f"Riwayat OHLCV {symbol} ({self.ohlcv_timeframe}) diisi: {added} bar.")
+
+    def _build_detailed_market_data(self, symbol, ticker, ohlcv):
+        """
+        Menyusun dictionary data pasar detail dari ticker dan candle OHLCV.
+        Dipakai bersama oleh jalur sinkron dan async agar bentuk datanya identik.
+        Jika OHLCVStore aktif, riwayat candle dibaca konsumen dari store (bukan dari snapshot).
+        Args:
+            symbol (str): Simbol pasangan trading.
+            ticker (dict): Hasil `fetch_ticker` CCXT.
+            ohlcv (list): Hasil `fetch_ohlcv` CCXT.
+        Returns:
+            dict: Data OHLCV dan statistik.
+        """
+        ohlcv = ohlcv or []
+        data = {
+            'symbol': symbol,
+            'price': ticker.get('last'),
+            'change_24h': ticker.get('percentage'),
+            'volume_24h': ticker.get('baseVolume'),
+            'high_1h': ohlcv[-1][2] if len(ohlcv) >= 1 else None,
+            'low_1h': ohlcv[-1][3] if len(ohlcv) >= 1 else None,
+            'close_1h': ohlcv[-1][4] if len(ohlcv) >= 1 else None,
+            'volume_1h': ohlcv[-1][5] if len(ohlcv) >= 1 else None,
+        }
+        if not self.ohlcv_store.enabled:
+            # Candle mentah [ts, open, high, low, close, volume] untuk mesin indikator teknikal
+            data['ohlcv'] = ohlcv
+        return data
+
+    # --- FUNGSI PENGAMBILAN DATA PASAR KONKUREN (ASYNC) ---
+    def _get_async_loop(self):
+        """
+        Mendapatkan event loop async milik aggregator. Loop berjalan di thread
+        latar belakang dan dipakai ulang antar siklus, sehingga klien CCXT async
+        (dan koneksi HTTP-nya) tidak perlu dibuat ulang setiap siklus.
+        Returns:
+            asyncio.AbstractEventLoop: Event loop yang sedang berjalan.
+        """
+        with self._async_lock:
+            if self._async_loop is None or self._async_loop.is_closed():
+                self._async_loop = asyncio.new_event_loop()
+                self._async_thread = threading.Thread(
+                    target=self._async_loop.run_forever,
+                    name="IntelligenceAggregatorLoop",
+                    daemon=True
+                )
+                self._async_thread.start()
+        return self._async_loop
+
+    def _run_async(self, coro, timeout=None):
+        """
+        Menjalankan coroutine di event loop aggregator dan menunggu hasilnya
+        dari kode sinkron (misalnya PerceptionSystem.scan).
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_async_loop())
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    async def _get_async_client(self, client_name):
+        """
+        Mendapatkan (atau membuat secara malas) klien CCXT async untuk sebuah bursa.
+        Harus dipanggil dari dalam event loop aggregator.
+        """
+        if client_name not in self.async_clients:
+            credentials = self.exchange_credentials.get(client_name, {})
+            if not self.clients.get(client_name) or not credentials.get('apiKey'):
+                self.async_clients[client_name] = None
+            else:
+                exchange_class = getattr(ccxt_async, client_name)
+                self.async_clients[client_name] = exchange_class({
+                    'apiKey': credentials.get('apiKey'),
+                    'secret': credentials.get('secret'),
+                    'options': {'defaultType': 'spot'},
+                    'enableRateLimit': True,
+                    'timeout': 10000, # 10 detik timeout
+                })
+                logging.info(f"Klien CCXT async untuk {client_name} berhasil dibuat.")
+        return self.async_clients[client_name]
+
+    async def _fetch_ticker_snapshot_async(self, client, semaphore, symbols):
+        """
+        Versi async dari `get_ticker_snapshot`: satu `fetch_tickers` untuk semua simbol,
+        fallback `fetch_ticker` konkuren hanya untuk simbol yang terlewat.
+        """
+        snapshot = {}
+        try:
+            await self.rate_limiter.acquire_async(BINANCE_HOST)
+            tickers = await client.fetch_tickers(symbols)
+            snapshot = {symbol: tickers[symbol] for symbol in symbols if symbol in tickers}
+        except Exception as e:
+            logging.warning(f"Snapshot ticker massal async gagal: {e}. Fallback ke permintaan per simbol.")
+
+        async def _fetch_single_ticker(symbol):
+            async with semaphore:
+                try:
+                    await self.rate_limiter.acquire_async(BINANCE_HOST)
+                    return symbol, await client.fetch_ticker(symbol)
+                except Exception as e:
+                    logging.warning(f"Ticker async untuk {symbol} gagal diambil: {e}")
+                    return symbol, None
+
+        missing_symbols = [symbol for symbol in symbols if symbol not in snapshot]
+        for symbol, ticker in await asyncio.gather(*(_fetch_single_ticker(s) for s in missing_symbols)):
+            if ticker:
+                snapshot[symbol] = ticker
+        return snapshot
+
+    async def _fetch_detailed_market_data_async(self, client, semaphore, symbol, ticker=None):
+        """
+        Versi async dari `get_detailed_market_data` untuk satu simbol.
+        Jika ticker sudah tersedia dari snapshot, hanya OHLCV yang diminta.
+        Dibatasi oleh semaphore bursa.
+        Returns:
+            tuple: (symbol, dict data detail atau None jika gagal).
+        """
+        if ticker is None:
+            return symbol, None
+        async with semaphore:
+            try:
+                await self.rate_limiter.acquire_async(BINANCE_HOST)
+                since, limit, backfill = self._ohlcv_request(symbol)
+                ohlcv = await client.fetch_ohlcv(symbol, timeframe=self.ohlcv_timeframe, since=since, limit=limit)
+            except Exception as e:
+                logging.warning(f"Pengambilan data pasar async untuk {symbol} gagal: {e}")
+                return symbol, None
+        self._store_ohlcv(symbol, ohlcv, backfill)
+        return symbol, self._build_detailed_market_data(symbol, ticker, ohlcv)
+
+    async def _aggregate_market_data_async(self, symbols, market_data=None):
+        """
+        Mengumpulkan data pasar untuk semua simbol secara konkuren.
+        Simbol yang gagal diambil dari bursa akan di-fallback ke `get_market_price`
+        (dijalankan di thread agar tidak memblokir event loop).
+        Args:
+            symbols (list): Daftar simbol.
+            market_data (dict, optional): Penampung hasil; diisi per simbol begitu
+                selesai (di bawah `_partial_lock`), sehingga pemanggil tetap punya
+                hasil parsial jika batas waktu tercapai.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_per_exchange)
+        market_data = {} if market_data is None else market_data
+        client = await self._get_async_client('binance')
+        if client:
+            # Satu permintaan ticker massal, lalu OHLCV per simbol secara konkuren
+            snapshot = await self._fetch_ticker_snapshot_async(client, semaphore, symbols)
+
+            async def _fetch_detailed(symbol):
+                symbol, detailed_data = await self._fetch_detailed_market_data_async(
+                    client, semaphore, symbol, snapshot.get(symbol))
+                if detailed_data and detailed_data.get('price') is not None:
+                    with self._partial_lock:
+                        market_data[symbol] = detailed_data
+
+            await asyncio.gather(*(_fetch_detailed(symbol) for symbol in symbols))
+        else:
+            logging.warning("Klien Binance async tidak tersedia untuk data pasar detail.")
+
+        # --- Fallback ke harga saja untuk simbol yang gagal ---
+        missing_symbols = [symbol for symbol in symbols if symbol not in market_data]
+        if missing_symbols:
+            logging.info(f"{len(missing_symbols)} simbol gagal dari bursa. Fallback ke harga saja...")
+
+            async def _fallback_price(symbol):
+                async with semaphore:
+                    price = await asyncio.to_thread(self.get_market_price, symbol)
+                with self._partial_lock:
+                    market_data[symbol] = {'symbol': symbol, 'price': price}
+
+            await asyncio.gather(*(_fallback_price(symbol) for symbol in missing_symbols))
+
+        # Pertahankan urutan simbol sesuai input
+        with self._partial_lock:
+            return {symbol: market_data[symbol] for symbol in symbols}
+
+    async def _close_async_clients(self):
+        """Menutup semua klien CCXT async (melepaskan sesi aiohttp)."""
+        for client_name, client in self.async_clients.items():
+            if client:
+                try:
+                    await client.close()
+                except Exception as e:
+                    logging.warning(f"Gagal menutup klien async {client_name}: {e}")
+        self.async_clients = {}
+
+    def close(self):
+        """
+        Melepaskan sumber daya async (klien CCXT async & event loop latar belakang)
+        serta thread pool hedged request, dan menyimpan snapshot OHLCV. Panggil saat shutdown sistem.
+        """
+        if self.ohlcv_store.enabled:
+            self.ohlcv_store.save()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+            self._hedge_executor = None
+        if self._async_loop is None or self._async_loop.is_closed():
+            return
+        try:
+            self._run_async(self._close_async_clients(), timeout=10)
+        except Exception as e:
+            logging.warning(f"Gagal menutup klien async dengan bersih: {e}")
+        self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+        self._async_thread.join(timeout=5)
+        self._async_loop.close()
+        logging.info("Sumber daya async Intelligence Aggregator berhasil dilepaskan.")
+
     # --- FUNGSI PENGUMPULAN BERITA & INTELIJEN (FALLBACK) ---
     def get_latest_news(self, query="cryptocurrency"):
         """
@@ -322,13 +829,11 @@ class IntelligenceAggregator:
                     'q': query,
                     'sortBy': 'publishedAt',
                     'language': 'en',
-                    'apiKey': api_key
                 }
-                # Tambahkan jitter kecil untuk menghindari rate limit
-                time.sleep(random.uniform(0.1, 0.3))
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = self.response_cache.get_or_fetch(
+                    'newsapi', 'v2/everything', params,
+                    lambda: self._http_get_json(url, params={**params, 'apiKey': api_key}, provider='NewsAPI')
+                )
                 articles = data.get('articles', [])
                 for article in articles:
                      all_articles.append({
@@ -350,17 +855,15 @@ class IntelligenceAggregator:
                  api_key = self.clients['thenewsapi_key']
                  url = f"https://thenewsapi.com/api/v1/news/all"
                  params = {
-                     'api_token': api_key,
                      'search': query,
                      'locale': 'en-US',
                      'sort': 'published_at',
                      'limit': 10 # Batasi jumlah
                  }
-                 # Tambahkan jitter kecil untuk menghindari rate limit
-                 time.sleep(random.uniform(0.1, 0.3))
-                 response = requests.get(url, params=params)
-                 response.raise_for_status()
-                 data = response.json()
+                 data = self.response_cache.get_or_fetch(
+                     'thenewsapi', 'api/v1/news/all', params,
+                     lambda: self._http_get_json(url, params={**params, 'api_token': api_key}, provider='TheNewsAPI')
+                 )
                  articles = data.get('data', [])
                  for article in articles:
                      all_articles.append({
@@ -398,8 +901,7 @@ class IntelligenceAggregator:
             dict: Data dari Etherscan, atau None jika gagal.
         """
         try:
-            etherscan_key = self._rotate_key('etherscan')
-            if not etherscan_key:
+            if not self.clients.get('etherscan_keys'):
                 logging.warning("Tidak ada kunci Etherscan yang tersedia.")
                 return None
 
@@ -407,20 +909,24 @@ class IntelligenceAggregator:
             params = {
                 'module': module,
                 'action': action,
-                'apikey': etherscan_key
             }
-            # Tambahkan jitter kecil untuk menghindari rate limit
-            time.sleep(random.uniform(0.1, 0.3))
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') == '1': # Sukses
-                logging.debug(f"Data Etherscan ({module}.{action}) berhasil diambil.")
-                return data.get('result')
-            else:
-                logging.warning(f"API Etherscan mengembalikan error: {data.get('message')}")
-                return None
+
+            def request(api_key):
+                data = self._http_get_json(url, params={**params, 'apikey': api_key}, provider='Etherscan')
+                if data.get('status') != '1':
+                    # Respons error tidak disimpan di cache dan dihitung sebagai kegagalan kunci
+                    raise ValueError(f"API Etherscan mengembalikan error: {data.get('message')}")
+                return data
+
+            data = self.response_cache.get_or_fetch(
+                'etherscan', f'{module}/{action}', params,
+                lambda: self._call_with_rotated_key('etherscan', request)
+            )
+            logging.debug(f"Data Etherscan ({module}.{action}) berhasil diambil.")
+            return data.get('result')
+        except (ValueError, CircuitOpenError) as e:
+            logging.warning(f"{e}")
+            return None
         except requests.exceptions.RequestException as e:
              logging.error(f"Kesalahan saat mengambil data Etherscan ({module}.{action}): {e}", exc_info=True)
              return None
@@ -432,22 +938,46 @@ class IntelligenceAggregator:
     def aggregate_market_data(self, symbols=['BTC/USDT', 'ETH/USDT']):
         """
         Mengumpulkan dan menggabungkan data pasar untuk beberapa simbol.
+        Jika mode async aktif (`[market] async_fetch`), semua simbol diambil
+        secara konkuren; jika tidak, diambil berurutan. Jika mode async gagal
+        atau melewati batas waktu, hasil parsialnya dipakai dan hanya simbol
+        yang belum terkumpul yang diambil berurutan.
         Args:
             symbols (list): Daftar simbol pasangan trading.
         Returns:
             dict: Data pasar yang dikumpulkan.
         """
         market_data = {}
-        for symbol in symbols:
+        if self.async_fetch_enabled and symbols:
+            partial = {}
+            try:
+                market_data = self._run_async(
+                    self._aggregate_market_data_async(list(symbols), partial),
+                    timeout=self.async_fetch_timeout
+                )
+                self.ohlcv_store.save_if_due()
+                return market_data
+            except Exception as e:
+                with self._partial_lock:
+                    market_data = dict(partial)
+                logging.error(f"Agregasi data pasar async gagal: {e!r}. {len(market_data)}/{len(symbols)} simbol "
+                              f"sudah terkumpul; sisanya diambil berurutan.")
+
+        missing_symbols = [symbol for symbol in symbols if symbol not in market_data]
+        # Ambil semua ticker dengan satu permintaan, bukan satu per simbol
+        ticker_snapshot = self.get_ticker_snapshot(missing_symbols) if missing_symbols and self.clients.get('binance') else {}
+        for symbol in missing_symbols:
             # Prioritaskan data detail dari exchange
-            detailed_data = self.get_detailed_market_data(symbol)
+            detailed_data = self.get_detailed_market_data(symbol, ticker=ticker_snapshot.get(symbol))
             if detailed_data and detailed_data.get('price') is not None:
                 market_data[symbol] = detailed_data
             else:
                 # Fallback ke harga saja
                 price = self.get_market_price(symbol)
                 market_data[symbol] = {'symbol': symbol, 'price': price}
-        return market_data
+        self.ohlcv_store.save_if_due()
+        # Pertahankan urutan simbol sesuai input
+        return {symbol: market_data[symbol] for symbol in symbols}
 
     def aggregate_onchain_data(self, assets=['bitcoin', 'ethereum']):
         """
@@ -463,7 +993,7 @@ class IntelligenceAggregator:
              if asset.lower() == 'ethereum':
                  # Contoh spesifik untuk Ethereum
                  eth_price_data = self.get_etherscan_data('stats', 'ethprice')
-                 if eth_price_
+                 if eth_price_data:
                       data_points['eth_price_info'] = eth_price_data
              
              # Tambahkan placeholder untuk data aset lain (Glassnode, CryptoQuant, dll.)
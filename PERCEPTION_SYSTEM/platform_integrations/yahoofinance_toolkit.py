@@ -13,6 +13,9 @@
 
 # --- Import Library Standar ---
 import logging
+import re
+import time
+from datetime import datetime, timezone
 
 # --- Import Library Pihak Ketiga ---
 # Pastikan library berikut sudah terinstal:
@@ -20,6 +23,12 @@ import logging
 import yfinance as yf
 import numpy as np
 
+# --- Import Modul Proyek ---
+from COLLECTIVE_MEMORY.ohlcv_history_cache import OHLCVHistoryCache
+
+# Durasi satuan `period` yfinance dalam detik
+_PERIOD_UNITS = {'d': 86400, 'wk': 604800, 'mo': 2592000, 'y': 31536000}
+
 # Konfigurasi logging dasar untuk modul ini
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [%(levelname)s] - %(message)s')
 
@@ -30,17 +39,45 @@ class YahooFinanceToolkit:
     dari API publik Yahoo Finance.
     """
 
-    def __init__(self):
+    def __init__(self, orchestrator=None):
         """
         Konstruktor untuk YahooFinanceToolkit.
+
+        Args:
+            orchestrator (ChimeraOrchestrator, optional): Untuk konfigurasi [history_cache].
         """
         logging.info("Inisialisasi Yahoo Finance Toolkit...")
+        # Cache riwayat OHLCV lokal (memory-mapped)
+        self.history_cache = OHLCVHistoryCache(getattr(orchestrator, 'config', None))
         logging.info(">>> Yahoo Finance Toolkit berhasil diinisialisasi.")
 
 
-    def get_historical_data(self, symbol: str, period: str = '7d', interval: str = '1h') -> np.ndarray:
+    @staticmethod
+    def _period_start_ms(period: str) -> float:
+        """Awal jendela `period` yfinance ('7d', '1mo', '1y', 'ytd', 'max') dalam ms."""
+        now = time.time()
+        if period == 'max':
+            return 0.0
+        if period == 'ytd':
+            return datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc).timestamp() * 1000
+        match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+        if not match:
+            raise ValueError(f"Periode tidak dikenal: {period}")
+        return (now - int(match.group(1)) * _PERIOD_UNITS[match.group(2)]) * 1000
+
+    @staticmethod
+    def _history_to_rows(hist_data) -> np.ndarray:
+        """Mengubah DataFrame `Ticker.history` menjadi array (bar x 6) [timestamp ms, O, H, L, C, V]."""
+        if hist_data.empty:
+            return np.empty((0, 6))
+        timestamps = np.array([t.timestamp() * 1000 for t in hist_data.index])
+        values = hist_data[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float)
+        return np.column_stack([timestamps, values])
+
+    def get_historical_ohlcv(self, symbol: str, period: str = '7d', interval: str = '1h') -> np.ndarray:
         """
-        Mengambil data harga penutupan (Close) historis untuk simbol tertentu.
+        Mengambil candle OHLCV historis dari cache lokal, dan hanya mengambil
+        ekor yang belum ada dari Yahoo Finance.
 
         Args:
             symbol (str): Simbol ticker sesuai format Yahoo Finance (misal: 'BTC-USD').
@@ -48,30 +85,46 @@ class YahooFinanceToolkit:
             interval (str): Frekuensi atau interval data (contoh: '1m', '5m', '1h', '1d').
 
         Returns:
-            np.ndarray: Sebuah array NumPy berisi data harga penutupan.
-                        Mengembalikan array kosong jika terjadi error atau tidak ada data.
+            np.ndarray: Array (bar x 6) [timestamp ms, open, high, low, close, volume],
+                        memory-mapped dari cache. Array kosong jika tidak ada data.
         """
         logging.info(f"Mencoba mengambil data historis untuk '{symbol}' (Periode: {period}, Interval: {interval})...")
-        try:
-            # Membuat objek Ticker dari yfinance
-            ticker = yf.Ticker(symbol)
-
-            # Mengambil data historis
-            hist_data = ticker.history(period=period, interval=interval)
+        ticker = yf.Ticker(symbol)
 
-            # Pemeriksaan keamanan: Pastikan data tidak kosong
-            if hist_data.empty:
-                logging.warning(f"Tidak ada data yang ditemukan untuk simbol '{symbol}' dengan parameter yang diberikan.")
-                return np.array([])
-
-            # Ekstrak hanya kolom 'Close' dan konversi ke NumPy array
-            close_prices = hist_data['Close'].values
-
-            logging.info(f"Berhasil mengambil {len(close_prices)} titik data untuk '{symbol}'.")
-            return close_prices
+        def fetch(since_ms):
+            if since_ms is None:
+                return self._history_to_rows(ticker.history(period=period, interval=interval))
+            start = datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc)
+            return self._history_to_rows(ticker.history(start=start, interval=interval))
 
+        try:
+            bars = self.history_cache.get('yahoo', symbol, interval, self._period_start_ms(period), fetch)
         except Exception as e:
             # Menangkap semua kemungkinan error dari library yfinance
             # (misal: koneksi gagal, simbol tidak valid, dll)
             logging.error(f"Gagal mengambil data untuk '{symbol}'. Error: {e}")
-            return np.array([])
\ No newline at end of file
+            return np.empty((0, 6))
+        if not len(bars):
+            logging.warning(f"Tidak ada data yang ditemukan untuk simbol '{symbol}' dengan parameter yang diberikan.")
+        return bars
+
+    def get_historical_data(self, symbol: str, period: str = '7d', interval: str = '1h') -> np.ndarray:
+        """
+        Mengambil data harga penutupan (Close) historis untuk simbol tertentu,
+        lewat cache lokal `get_historical_ohlcv`.
+
+        Args:
+            symbol (str): Simbol ticker sesuai format Yahoo Finance (misal: 'BTC-USD').
+            period (str): Durasi data yang akan diambil (contoh: '1d', '5d', '1mo', '1y').
+            interval (str): Frekuensi atau interval data (contoh: '1m', '5m', '1h', '1d').
+
+        Returns:
+            np.ndarray: Sebuah array NumPy berisi data harga penutupan.
+                        Mengembalikan array kosong jika terjadi error atau tidak ada data.
+        """
+        bars = self.get_historical_ohlcv(symbol, period, interval)
+        if not len(bars):
+            return np.array([])
+        logging.info(f"Berhasil mengambil {len(bars)} titik data untuk '{symbol}'.")
+        # Kolom close dari memory map (tanpa salinan)
+        return bars[:, 4]
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == DELTA SNAPSHOT PERSEPSI - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: PERCEPTION_SYSTEM/snapshot_delta.py
+# Deskripsi: Melacak snapshot persepsi sebelumnya dan menghasilkan delta
+#            terstruktur (simbol yang berubah, berita baru, metrik on-chain
+#            yang diperbarui), sehingga konsumen seperti StrategicCortex,
+#            BlackSwanShield dan QuantumSentientAnalyzer cukup memproses
+#            bagian yang berubah, bukan seluruh snapshot di setiap siklus.
+#
+# ==============================================================================
+
+import hashlib
+import logging
+import numbers
+from collections import OrderedDict
+
+
+def iter_news_items(news):
+    """
+    Meratakan data berita snapshot (dict bersarang per sumber atau list)
+    menjadi daftar item berita berbentuk dict.
+    """
+    items = []
+    if isinstance(news, list):
+        for item in news:
+            if isinstance(item, dict):
+                items.append(item)
+            elif isinstance(item, (list, dict)):
+                items.extend(iter_news_items(item))
+    elif isinstance(news, dict):
+        for value in news.values():
+            if isinstance(value, (list, dict)):
+                items.extend(iter_news_items(value))
+    return items
+
+
+def news_item_id(item: dict) -> str:
+    """ID stabil untuk satu item berita: URL jika ada, jika tidak sumber + judul."""
+    url = item.get('url') or item.get('link')
+    if url:
+        basis = str(url).strip()
+    else:
+        basis = f"{item.get('source', '')}|{item.get('title') or item.get('headline') or ''}".strip().lower()
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+def _flatten_metrics(data, prefix=''):
+    """Mengubah dict bersarang menjadi {'aset.metrik.sub': nilai}."""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, dict) and value:
+                flat.update(_flatten_metrics(value, path))
+            else:
+                flat[path] = value
+    return flat
+
+
+def has_relevant_changes(delta, symbol=None, asset=None, include_news=True) -> bool:
+    """
+    Apakah delta memuat perubahan yang relevan untuk sebuah simbol/aset.
+    Delta yang tidak ada atau delta awal selalu dianggap berubah.
+    Args:
+        delta (dict): Delta dari `SnapshotDeltaTracker.update`.
+        symbol (str, optional): Simbol pasar (misal 'BTC/USDT').
+        asset (str, optional): Nama aset on-chain (misal 'bitcoin').
+        include_news (bool): Apakah berita baru dihitung sebagai perubahan.
+    """
+    if not delta or delta.get('is_initial'):
+        return True
+    if symbol is not None and symbol in delta['market_data']['changed']:
+        return True
+    if asset is not None and asset in delta['onchain']['changed_assets']:
+        return True
+    if include_news and delta['news']['new_items']:
+        return True
+    return False
+
+
+class SnapshotDeltaTracker:
+    """
+    Menyimpan baseline dari snapshot sebelumnya dan menghitung delta untuk
+    setiap snapshot baru. Bagian snapshot dari tahap yang gagal/timeout tidak
+    dibandingkan (ditandai 'stale') dan baseline-nya dipertahankan, sehingga
+    kegagalan sesaat tidak terlihat sebagai "semua data berubah".
+
+        [perception]
+        incremental_delta = true
+        delta_numeric_tolerance = 0.0005
+        news_memory_size = 5000
+    """
+
+    # (nama tahap di snapshot['sources'], kunci data di snapshot)
+    SECTIONS = (('market_data', 'market_data'), ('onchain', 'onchain'), ('news_intel', 'news'))
+
+    def __init__(self, orchestrator):
+        """
+        Args:
+            orchestrator: Instance dari ChimeraOrchestrator (untuk konfigurasi).
+        """
+        perception_config = orchestrator.config.get('perception', {})
+        # Perubahan numerik relatif di bawah toleransi ini dianggap tidak berubah
+        self.numeric_tolerance = float(perception_config.get('delta_numeric_tolerance', 0.0005))
+        self.news_memory_size = int(perception_config.get('news_memory_size', 5000))
+
+        self.previous_timestamp = None
+        self._market_baseline = {}
+        self._onchain_baseline = {}
+        # ID berita yang sudah pernah dikirim ke konsumen (LRU terbatas)
+        self._seen_news = OrderedDict()
+
+    # --- 1. PERBANDINGAN NILAI ---
+    def _value_changed(self, old, new) -> bool:
+        if isinstance(old, numbers.Number) and isinstance(new, numbers.Number) \
+                and not isinstance(old, bool) and not isinstance(new, bool):
+            scale = max(abs(old), abs(new))
+            return scale > 0 and abs(new - old) > self.numeric_tolerance * scale
+        return old != new
+
+    def _record_changed(self, old: dict, new: dict) -> bool:
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return old != new
+        if old.keys() != new.keys():
+            return True
+        return any(self._value_changed(old[key], new[key]) for key in new)
+
+    # --- 2. DELTA PER BAGIAN ---
+    def _diff_market(self, market_data, full_universe):
+        changed, added = {}, []
+        for symbol, data in (market_data or {}).items():
+            previous = self._market_baseline.get(symbol)
+            if previous is None:
+                added.append(symbol)
+            elif not self._record_changed(previous, data):
+                # Baseline tidak digeser, agar perubahan kecil yang menumpuk tetap terdeteksi
+                continue
+            changed[symbol] = data
+            self._market_baseline[symbol] = data
+
+        removed = []
+        if full_universe:
+            removed = [symbol for symbol in self._market_baseline if symbol not in (market_data or {})]
+            for symbol in removed:
+                del self._market_baseline[symbol]
+        return {
+            'changed': changed,
+            'added': added,
+            'removed': removed,
+            'unchanged_count': len(market_data or {}) - len(changed),
+        }
+
+    def _diff_onchain(self, onchain):
+        flat = _flatten_metrics(onchain)
+        changed = {}
+        for path, value in flat.items():
+            if path not in self._onchain_baseline or self._value_changed(self._onchain_baseline[path], value):
+                changed[path] = {'old': self._onchain_baseline.get(path), 'new': value}
+                self._onchain_baseline[path] = value
+        return {
+            'changed': changed,
+            'changed_assets': sorted({path.split('.', 1)[0] for path in changed}),
+        }
+
+    def _diff_news(self, news):
+        new_items = []
+        for item in iter_news_items(news):
+            item_id = news_item_id(item)
+            if item_id in self._seen_news:
+                self._seen_news.move_to_end(item_id)
+                continue
+            self._seen_news[item_id] = True
+            new_items.append(item)
+        while len(self._seen_news) > self.news_memory_size:
+            self._seen_news.popitem(last=False)
+        return {'new_items': new_items, 'seen_count': len(self._seen_news)}
+
+    # --- 3. API UTAMA ---
+    def update(self, snapshot: dict, full_universe: bool = True) -> dict:
+        """
+        Membandingkan snapshot baru dengan baseline, lalu memperbarui baseline.
+        Args:
+            snapshot (dict): Snapshot persepsi lengkap dari `PerceptionSystem.scan`.
+            full_universe (bool): False jika scan hanya mencakup sebagian simbol
+                                  (simbol yang tidak ada tidak dianggap 'removed').
+        Returns:
+            dict: Delta terstruktur, misal
+                {'is_initial': False, 'has_changes': True,
+                 'market_data': {'changed': {...}, 'added': [...], 'removed': [...], 'unchanged_count': 0},
+                 'onchain': {'changed': {'bitcoin.active_addresses': {'old': 1, 'new': 2}}, 'changed_assets': [...]},
+                 'news': {'new_items': [...], 'seen_count': 0},
+                 'stale_sections': [...]}
+        """
+        is_initial = self.previous_timestamp is None
+        sources = snapshot.get('sources', {})
+        stale_sections = [snapshot_key for stage, snapshot_key in self.SECTIONS
+                          if sources.get(stage, 'success') != 'success']
+
+        empty_market = {'changed': {}, 'added': [], 'removed': [], 'unchanged_count': 0}
+        delta = {
+            'timestamp': snapshot.get('timestamp'),
+            'previous_timestamp': self.previous_timestamp,
+            'is_initial': is_initial,
+            'market_data': empty_market if 'market_data' in stale_sections
+            else self._diff_market(snapshot.get('market_data'), full_universe),
+            'onchain': {'changed': {}, 'changed_assets': []} if 'onchain' in stale_sections
+            else self._diff_onchain(snapshot.get('onchain')),
+            'news': {'new_items': [], 'seen_count': len(self._seen_news)} if 'news' in stale_sections
+            else self._diff_news(snapshot.get('news')),
+            'stale_sections': stale_sections,
+        }
+        delta['has_changes'] = bool(
+            delta['market_data']['changed'] or delta['market_data']['removed']
+            or delta['onchain']['changed'] or delta['news']['new_items']
+        )
+        self.previous_timestamp = snapshot.get('timestamp')
+
+        logging.info(f"Delta persepsi: {len(delta['market_data']['changed'])} simbol berubah "
+                     f"({delta['market_data']['unchanged_count']} tetap), "
+                     f"{len(delta['onchain']['changed'])} metrik on-chain diperbarui, "
+                     f"{len(delta['news']['new_items'])} berita baru"
+                     f"{', bagian usang: ' + ', '.join(stale_sections) if stale_sections else ''}.")
+        return delta
+
+    def reset(self):
+        """Menghapus baseline; snapshot berikutnya menghasilkan delta awal (penuh)."""
+        self.previous_timestamp = None
+        self._market_baseline.clear()
+        self._onchain_baseline.clear()
+        self._seen_news.clear()
@@ -37,6 +37,8 @@ class ChimeraOrchestrator:
         """
         print("Inisialisasi Orkestrator Chimera v3...")
         self.is_shutting_down = False
+        # Fungsi penutup komponen yang dipanggil saat shutdown (lihat register_shutdown_hook)
+        self._shutdown_hooks = []
 
         # --- Memuat konfigurasi ---
         self.config = self._load_single_config("chimera_config.toml")
@@ -155,6 +157,15 @@ class ChimeraOrchestrator:
             print(f"\n[FATAL STARTUP ERROR]: Gagal mengkonfigurasi logging: {e}")
             sys.exit(1)
 
+    def register_shutdown_hook(self, hook):
+        """
+        Mendaftarkan fungsi penutup (misal `close`) komponen yang memiliki thread
+        atau loop latar belakang. Dipakai oleh komponen yang dibuat di dalam
+        komponen lain (LLMRouter, QuantumSentientAnalyzer); semua dipanggil saat
+        shutdown dengan urutan terbalik dari pendaftaran.
+        """
+        self._shutdown_hooks.append(hook)
+
     def start(self):
         """Memulai siklus utama robot."""
         logging.info("==================================================")
@@ -171,8 +182,20 @@ class ChimeraOrchestrator:
 
         logging.info("==================================================")
         logging.info("||   ORKESTRATOR CHIMERA MEMULAI PROSEDUR SHUTDOWN   ||")
-        # Tambahkan logika shutdown untuk setiap komponen jika diperlukan
-        # Misalnya, menyimpan state, menutup koneksi API, dll.
+        # 1. PerceptionSystem: sisa antrean arsip snapshot di-flush, snapshot OHLCV
+        #    disimpan, dan klien/loop async IntelligenceAggregator ditutup
+        closers = []
+        perception_system = getattr(self, 'perception_system', None)
+        if perception_system:
+            closers.append(('PerceptionSystem', perception_system.close))
+        # 2. Komponen terdaftar (pool dewan AI, loop async LLM, pool dimensi QSA)
+        for hook in reversed(self._shutdown_hooks):
+            closers.append((getattr(hook, '__qualname__', repr(hook)), hook))
+        for name, close in closers:
+            try:
+                close()
+            except Exception as e:
+                logging.error(f"Gagal menutup {name} saat shutdown: {e}", exc_info=True)
         # if self.gdrive_sync:
         #     self.gdrive_sync.save_final_state()
         logging.info("||   Sistem berhasil dimatikan. Selamat tinggal.   ||")
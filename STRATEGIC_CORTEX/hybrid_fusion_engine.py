@@ -17,6 +17,9 @@ import logging
 # --- Import Library Pihak Ketiga ---
 import numpy as np
 
+# --- Import Modul Proyek ---
+from PERCEPTION_SYSTEM.ohlcv_store import OHLCVStore
+
 # Konfigurasi logging dasar untuk modul ini
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [%(levelname)s] - %(message)s')
 
@@ -41,6 +44,9 @@ class HybridFusionEngine:
         # max_daily_drawdown, mesin bisa memutuskan untuk tidak membuka posisi baru.
         self.risk_profile = orchestrator.risk_profile
 
+        # Riwayat candle bersama (ring buffer per simbol & timeframe) dari Perception System
+        self.ohlcv_store = OHLCVStore()
+
         logging.info(">>> Hybrid Fusion Engine berhasil diinisialisasi.")
 
 
@@ -97,4 +103,22 @@ class HybridFusionEngine:
             'signal': signal,
             'confidence': confidence,
             'reason': reason
-        }
\ No newline at end of file
+        }
+
+    def analyze_symbol(self, symbol: str, timeframe: str = '1h', bars: int = None) -> dict:
+        """
+        Menjalankan `analyze_and_decide` atas harga penutupan dari riwayat
+        OHLCVStore (view tanpa salinan).
+
+        Args:
+            symbol (str): Simbol pasangan trading (misal 'BTC/USDT').
+            timeframe (str): Timeframe candle.
+            bars (int, optional): Jumlah bar terakhir. Default: seluruh riwayat.
+
+        Returns:
+            dict: Sinyal, tingkat kepercayaan, dan alasan keputusan.
+        """
+        closes = self.ohlcv_store.column(symbol, timeframe, 'close', bars)
+        if closes is None:
+            closes = np.empty(0)
+        return self.analyze_and_decide(closes)
\ No newline at end of file
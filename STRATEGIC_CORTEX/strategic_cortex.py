@@ -20,6 +20,9 @@ project_root = os.path.dirname(current_script_dir) # Naik ke PROJECTCHIMERA/
 sys.path.insert(0, project_root)
 # --- AKHIR PENYESUAIAN PATH ---
 
+from PERCEPTION_SYSTEM.snapshot_delta import iter_news_items, news_item_id
+from PERCEPTION_SYSTEM.global_intelligence.news_deduplicator import NewsDeduplicator
+
 class StrategicCortex:
     """
     Korteks Strategis: Menganalisis data kompleks dan membuat keputusan trading.
@@ -51,8 +54,50 @@ class StrategicCortex:
             logging.critical(f"Kesalahan saat menginisialisasi komponen AI_BRAIN: {e}", exc_info=True)
             raise # Hentikan inisialisasi jika komponen inti gagal
 
+        # Mode batch: banyak artikel per prompt per anggota dewan (bukan satu ronde dewan per artikel)
+        cortex_config = self.orchestrator.config.get('strategic_cortex', {})
+        self.batch_mode = cortex_config.get('batch_mode', True)
+        self.batch_token_budget = cortex_config.get('batch_token_budget', 6000)
+        self.max_article_chars = cortex_config.get('max_article_chars', 2000)
+        self.max_articles_per_batch = cortex_config.get('max_articles_per_batch', 20)
+
+        # Deduplikasi berita hampir-sama (MinHash + LSH persisten) sebelum dikirim ke dewan AI
+        self.news_deduplicator = NewsDeduplicator(self.orchestrator)
+
+        # Laporan dewan per artikel yang masih ada di jendela berita snapshot:
+        # {article_id: {task_name: laporan}}. Sinyal disintesis ulang dari seluruh
+        # jendela setiap siklus; hanya artikel baru yang dikirim ke LLM
+        self.article_reports = {}
+        # Artikel yang sudah dikirim ke dewan tetapi belum mendapat laporan; ikut batch berikutnya
+        self.unanswered_ids = set()
+
         logging.info("StrategicCortex vFinal berhasil diinisialisasi.")
 
+    @staticmethod
+    def _build_articles(news_items):
+        """Item berita -> artikel {'id', 'title', 'text'} dengan ID stabil (duplikat ID dibuang)."""
+        articles = []
+        article_ids = set()
+        for i, news_item in enumerate(news_items):
+            if not isinstance(news_item, dict):
+                logging.warning(f"Item berita ke-{i} bukan dictionary. Melewati.")
+                continue
+
+            title = news_item.get('title') or 'No Title'
+            description = news_item.get('description') or ''
+            full_text = f"{title}\n\n{description}".strip()
+
+            if not full_text:
+                logging.warning(f"Berita ke-{i} tidak memiliki teks. Melewati.")
+                continue
+
+            article_id = news_item_id(news_item)[:12]
+            if article_id in article_ids:
+                continue
+            article_ids.add(article_id)
+            articles.append({'id': article_id, 'title': title, 'text': full_text})
+        return articles
+
     def analyze(self, perception_snapshot: dict):
         """
         Fungsi utama untuk menganalisis data persepsi dan menghasilkan sinyal trading.
@@ -60,6 +105,8 @@ class StrategicCortex:
         Args:
             perception_snapshot (dict): Data gabungan dari PerceptionSystem.
                 Harus mengandung kunci seperti 'market_data', 'onchain', 'news'.
+                Jika ada 'delta', hanya berita baru yang dikirim ke dewan AI; sinyal
+                tetap disintesis dari laporan seluruh berita di snapshot.
 
         Returns:
             dict: Sinyal trading akhir, misal {'signal': 'BULLISH', 'confidence': 0.8, ...}
@@ -76,70 +123,99 @@ class StrategicCortex:
         # Data sudah diterima sebagai argumen
         
         # --- b. Mengambil data berita dari snapshot ---
-        # Asumsikan data berita ada di bawah kunci 'news'
-        # Berdasarkan struktur dari PerceptionSystem sebelumnya, ini bisa berupa dict atau list
-        news_data_for_analysis = []
-        
+        # Jendela berita = semua item di snapshot['news'] (dict per sumber atau list)
         raw_news_data = perception_snapshot.get('news', {})
-        if isinstance(raw_news_data, dict):
-            # Jika berupa dict (misalnya dari scraping), gabungkan semua nilai
-            for source_news in raw_news_data.values():
-                if isinstance(source_news, list):
-                    news_data_for_analysis.extend(source_news)
-        elif isinstance(raw_news_data, list):
-            # Jika berupa list langsung
-            news_data_for_analysis = raw_news_data
-        else:
+        if not isinstance(raw_news_data, (dict, list)):
             logging.warning("Format data 'news' dalam perception_snapshot tidak dikenali.")
-            news_data_for_analysis = []
+            raw_news_data = []
+        window_articles = self._build_articles(iter_news_items(raw_news_data))
+        window_ids = {article['id'] for article in window_articles}
+
+        delta = perception_snapshot.get('delta')
+        news_stale = bool(delta) and 'news' in delta.get('stale_sections', [])
+        if not news_stale:
+            # Laporan artikel yang sudah keluar dari jendela berita tidak lagi ikut sintesis
+            for article_id in [a for a in self.article_reports if a not in window_ids]:
+                del self.article_reports[article_id]
+            self.unanswered_ids &= window_ids
+
+        if delta and not delta.get('is_initial'):
+            # Berita lama sudah dianalisis pada siklus sebelumnya; cukup berita baru
+            # ditambah berita yang belum terjawab dewan pada siklus sebelumnya
+            new_ids = {news_item_id(item)[:12] for item in delta['news']['new_items'] if isinstance(item, dict)}
+            articles = [article for article in window_articles
+                        if article['id'] in new_ids or article['id'] in self.unanswered_ids]
+            logging.debug(f"Mode inkremental: {len(articles)} berita baru sejak {delta.get('previous_timestamp')}.")
+        else:
+            articles = [article for article in window_articles if article['id'] not in self.article_reports]
 
-        logging.debug(f"Berita yang dianalisis: {len(news_data_for_analysis)} item(s)")
+        logging.debug(f"Berita yang dianalisis: {len(articles)} dari {len(window_articles)} item di jendela berita")
 
-        # --- f. Jika tidak ada berita, kembalikan sinyal 'HOLD' ---
-        # (Catatan: Logika ini bisa diubah jika kita ingin analisis berdasarkan data lain)
-        if not news_data_for_analysis:
-            logging.info("Tidak ada berita baru. Mengembalikan sinyal HOLD berdasarkan kebijakan awal.")
-            # Namun, kita bisa tetap melanjutkan untuk analisis berdasarkan data lain
-            # Untuk sekarang, kita ikuti spesifikasi awal.
-            # return {'signal': 'HOLD', 'reason': 'No news data available'}
+        # --- f. Jika tidak ada berita baru, sinyal disintesis ulang dari laporan yang tersimpan ---
+        if not articles:
+            logging.info(f"Tidak ada berita baru; memakai {len(self.article_reports)} laporan artikel yang tersimpan.")
 
-        # --- c. Jika ada berita, kirim teks berita ke llm_router.get_council_analysis() ---
-        all_council_reports = []
-        for i, news_item in enumerate(news_data_for_analysis):
-            if not isinstance(news_item, dict):
-                logging.warning(f"Item berita ke-{i} bukan dictionary. Melewati.")
-                continue
+        # --- c. Jika ada berita, kirim teks berita ke dewan AI ---
+        # Hanya cerita baru (bukan salinan cerita yang sudah dianalisis) yang sampai ke LLM
+        candidate_ids = {article['id'] for article in articles}
+        articles = self.news_deduplicator.filter_novel(articles)
 
-            title = news_item.get('title', 'No Title')
-            description = news_item.get('description', '')
-            full_text = f"{title}\n\n{description}".strip()
-
-            if not full_text:
-                logging.warning(f"Berita ke-{i} tidak memiliki teks. Melewati.")
-                continue
-
-            logging.info(f"Menganalisis berita: {title[:50]}...")
+        # {article_id: {task_name: laporan}}
+        article_reports = {}
+        if articles and self.batch_mode:
+            logging.info(f"Menganalisis {len(articles)} berita dalam mode batch...")
             try:
-                # Meminta analisis dari dewan AI secara paralel
-                # Ini adalah bagian utama dari integrasi AI
-                council_report = self.llm_router.get_council_analysis(full_text)
-                if council_report:
-                    all_council_reports.append(council_report)
-                    logging.debug(f"Laporan dewan untuk berita '{title[:30]}...': Diterima")
-                else:
-                    logging.warning(f"Tidak ada laporan dari dewan untuk berita '{title[:30]}...'")
+                article_reports = self.llm_router.get_council_batch_analysis(
+                    articles,
+                    token_budget=self.batch_token_budget,
+                    max_chars=self.max_article_chars,
+                    max_articles_per_batch=self.max_articles_per_batch
+                )
             except Exception as e:
-                logging.error(f"Kesalahan saat menganalisis berita '{title[:30]}...': {e}", exc_info=True)
-                # Tidak menghentikan proses jika satu berita gagal
+                logging.error(f"Kesalahan saat analisis dewan batch: {e}", exc_info=True)
+        else:
+            for article in articles:
+                title = article['title']
+                logging.info(f"Menganalisis berita: {title[:50]}...")
+                try:
+                    # Meminta analisis dari dewan AI secara paralel
+                    # Ini adalah bagian utama dari integrasi AI
+                    council_report = self.llm_router.get_council_analysis(article['text'])
+                    if council_report:
+                        article_reports[article['id']] = council_report
+                        logging.debug(f"Laporan dewan untuk berita '{title[:30]}...': Diterima")
+                    else:
+                        logging.warning(f"Tidak ada laporan dari dewan untuk berita '{title[:30]}...'")
+                except Exception as e:
+                    logging.error(f"Kesalahan saat menganalisis berita '{title[:30]}...': {e}", exc_info=True)
+                    # Tidak menghentikan proses jika satu berita gagal
+
+        # Cerita yang mendapat minimal satu laporan disimpan untuk sintesis siklus berikutnya dan dicatat di indeks;
+        # yang tidak terjawab dicatat di unanswered_ids dan dikirim ulang pada siklus berikutnya
+        answered_ids = [article_id for article_id, reports in article_reports.items()
+                        if reports and any(report is not None for report in reports.values())]
+        for article_id in answered_ids:
+            self.article_reports[article_id] = article_reports[article_id]
+        self.news_deduplicator.remember(answered_ids)
+        attempted_ids = {article['id'] for article in articles}
+        self.unanswered_ids = (self.unanswered_ids - candidate_ids) | (attempted_ids - set(answered_ids))
+        if self.unanswered_ids:
+            logging.info(f"{len(self.unanswered_ids)} berita belum mendapat laporan dewan; dicoba lagi siklus berikutnya.")
+
+        cache_stats = self.llm_router.get_cache_stats()
+        logging.info(f"Cache respons LLM: hit rate {cache_stats['hit_rate']:.0%} "
+                     f"({cache_stats.get('hits', 0)} hit, {cache_stats.get('misses', 0)} miss, {cache_stats['entries']} entri).")
 
         # --- d. Jika ada laporan, sintesis menjadi sinyal akhir ---
+        # Disintesis dari seluruh laporan di jendela berita, bukan hanya berita siklus ini
         final_signal = {'signal': 'HOLD', 'confidence': 0.0, 'reason': 'No strong AI signal from news analysis.'}
-        if all_council_reports:
-            logging.info(f"Menyintesis {len(all_council_reports)} laporan dari dewan...")
+        if self.article_reports:
+            logging.info(f"Menyintesis laporan dewan untuk {len(self.article_reports)} berita "
+                         f"({len(answered_ids)} baru)...")
             try:
                 # Mengirim laporan ke synthesizer untuk menghasilkan sinyal trading akhir
                 # Ini adalah bagian kedua dari integrasi AI
-                synthesized_result = self.synthesizer.synthesize_council_reports(all_council_reports)
+                synthesized_result = self.synthesizer.synthesize_article_reports(self.article_reports)
                 if synthesized_result and isinstance(synthesized_result, dict):
                     final_signal = synthesized_result
                     logging.info(f"Sinyal akhir dihasilkan dari analisis berita: {final_signal}")
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == CIRCUIT BREAKER & SKOR KESEHATAN PROVIDER - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/circuit_breaker.py
+# Deskripsi: Circuit breaker per penyedia data (atau per kunci API) dengan status
+#            closed/open/half-open, tingkat error bergulir, dan EWMA latensi.
+#            Penyedia yang circuit-nya terbuka dilewati seketika tanpa menunggu
+#            timeout, dan urutan fallback bisa diurutkan ulang berdasarkan
+#            skor kesehatan langsung.
+#
+# ==============================================================================
+
+import logging
+import threading
+import time
+from collections import deque
+
+from UTILS.singleton import SingletonMeta
+
+
+class CircuitOpenError(Exception):
+    """Dilempar saat permintaan ditolak karena circuit penyedia sedang terbuka."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker untuk satu penyedia/kunci.
+    - closed: semua permintaan diteruskan; hasil dicatat di jendela bergulir.
+    - open: permintaan ditolak seketika sampai `open_seconds` berlalu.
+    - half_open: sejumlah kecil permintaan uji diteruskan; sukses menutup
+      circuit, gagal membukanya kembali.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, settings: dict):
+        self.name = name
+        self.settings = settings
+        self.state = self.CLOSED
+        self.outcomes = deque()  # (timestamp, sukses)
+        self.latency_ewma = None
+        self.opened_at = 0.0
+        self.half_open_inflight = 0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        window = self.settings['window_seconds']
+        while self.outcomes and now - self.outcomes[0][0] > window:
+            self.outcomes.popleft()
+
+    def _error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self.outcomes if not ok)
+        return failures / len(self.outcomes)
+
+    def _open(self, now):
+        self.state = self.OPEN
+        self.opened_at = now
+        self.half_open_inflight = 0
+        logging.warning(f"Circuit breaker '{self.name}' TERBUKA (error rate {self._error_rate():.0%}). "
+                        f"Penyedia dilewati selama {self.settings['open_seconds']}s.")
+
+    def allow_request(self) -> bool:
+        """Apakah permintaan boleh diteruskan ke penyedia ini sekarang."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.settings['open_seconds']:
+                    return False
+                self.state = self.HALF_OPEN
+                self.half_open_inflight = 0
+                self.probe_started_at = now
+                logging.info(f"Circuit breaker '{self.name}' setengah terbuka: mengirim permintaan uji.")
+            if self.state == self.HALF_OPEN:
+                # Permintaan uji yang hasilnya tidak pernah dicatat tidak boleh mengunci circuit
+                probe_expired = now - self.probe_started_at >= self.settings['open_seconds']
+                if self.half_open_inflight >= self.settings['half_open_max_calls'] and not probe_expired:
+                    return False
+                if probe_expired:
+                    self.half_open_inflight = 0
+                self.half_open_inflight += 1
+                self.probe_started_at = now
+            return True
+
+    def is_open(self) -> bool:
+        """Apakah circuit sedang terbuka (tanpa mengubah status / memakai slot uji)."""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.settings['open_seconds']
+
+    def record_success(self, latency: float = None):
+        """Mencatat permintaan yang berhasil (dan latensinya dalam detik)."""
+        with self._lock:
+            now = time.monotonic()
+            self._update_latency(latency)
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self.outcomes.clear()
+                logging.info(f"Circuit breaker '{self.name}' kembali TERTUTUP.")
+            self.outcomes.append((now, True))
+            self._prune(now)
+
+    def record_failure(self, latency: float = None):
+        """Mencatat permintaan yang gagal; dapat membuka circuit."""
+        with self._lock:
+            now = time.monotonic()
+            self._update_latency(latency)
+            self.outcomes.append((now, False))
+            self._prune(now)
+            if self.state == self.HALF_OPEN:
+                self._open(now)
+            elif (self.state == self.CLOSED
+                  and len(self.outcomes) >= self.settings['min_calls']
+                  and self._error_rate() >= self.settings['failure_rate_threshold']):
+                self._open(now)
+
+    def _update_latency(self, latency):
+        if latency is None:
+            return
+        alpha = self.settings['latency_alpha']
+        self.latency_ewma = latency if self.latency_ewma is None else alpha * latency + (1 - alpha) * self.latency_ewma
+
+    def health_score(self) -> float:
+        """
+        Skor kesehatan 0..1: (1 - error rate) dikali faktor latensi.
+        Penyedia tanpa data latensi dianggap berlatensi sama dengan
+        `latency_reference_seconds`. Circuit terbuka bernilai 0.
+        """
+        if self.is_open():
+            return 0.0
+        with self._lock:
+            self._prune(time.monotonic())
+            reference = self.settings['latency_reference_seconds']
+            latency = self.latency_ewma if self.latency_ewma is not None else reference
+            score = (1.0 - self._error_rate()) / (1.0 + latency / reference)
+            return score * 0.5 if self.state == self.HALF_OPEN else score
+
+    def snapshot(self) -> dict:
+        score = self.health_score()
+        with self._lock:
+            return {
+                'state': self.state,
+                'error_rate': self._error_rate(),
+                'calls_in_window': len(self.outcomes),
+                'latency_ewma': self.latency_ewma,
+                'health_score': score,
+            }
+
+
+class CircuitBreakerRegistry(metaclass=SingletonMeta):
+    """
+    Registri circuit breaker per nama penyedia/kunci yang dipakai bersama di
+    seluruh proses, sehingga APIManager, IntelligenceAggregator dan
+    OnChainCollector berbagi pandangan yang sama tentang kesehatan penyedia.
+    Pengaturan dibaca dari seksi `[circuit_breaker]` di `chimera_config.toml`.
+    """
+
+    DEFAULT_SETTINGS = {
+        'enabled': True,
+        'window_seconds': 60,
+        'min_calls': 5,
+        'failure_rate_threshold': 0.5,
+        'open_seconds': 30,
+        'half_open_max_calls': 1,
+        'latency_alpha': 0.3,
+        'latency_reference_seconds': 1.0,
+    }
+
+    def __init__(self):
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """Memuat pengaturan circuit breaker dari konfigurasi orkestrator."""
+        breaker_config = (config or {}).get('circuit_breaker', {})
+        # Diperbarui di tempat agar breaker yang sudah ada ikut memakai pengaturan baru
+        self.settings.update({k: v for k, v in breaker_config.items() if k in self.DEFAULT_SETTINGS})
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.settings['enabled'])
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Mendapatkan (atau membuat) circuit breaker untuk sebuah penyedia/kunci."""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.settings)
+                self._breakers[name] = breaker
+            return breaker
+
+    def allow_request(self, name: str) -> bool:
+        return not self.enabled or self.get(name).allow_request()
+
+    def is_open(self, name: str) -> bool:
+        return self.enabled and self.get(name).is_open()
+
+    def record_success(self, name: str, latency: float = None):
+        self.get(name).record_success(latency)
+
+    def record_failure(self, name: str, latency: float = None):
+        self.get(name).record_failure(latency)
+
+    def rank(self, items, key=lambda item: item):
+        """
+        Mengurutkan ulang penyedia berdasarkan skor kesehatan (tertinggi dulu).
+        Urutan bersifat stabil: penyedia dengan skor setara (dibulatkan 0.05)
+        tetap mengikuti urutan prioritas semula.
+        Args:
+            items (list): Daftar penyedia (misal [(nama, fungsi)]).
+            key (callable): Fungsi untuk mengambil nama breaker dari item.
+        Returns:
+            list: Daftar yang sudah diurutkan ulang.
+        """
+        if not self.enabled:
+            return list(items)
+        return sorted(items, key=lambda item: -round(self.get(key(item)).health_score() * 20) / 20)
+
+    def get_stats(self) -> dict:
+        """Status, error rate, EWMA latensi, dan skor kesehatan setiap breaker."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
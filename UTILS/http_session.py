@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == PABRIK SESI HTTP BERSAMA (CONNECTION POOL) - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/http_session.py
+# Deskripsi: Menyediakan sesi `requests` yang dipakai bersama oleh semua modul
+#            agar koneksi TCP+TLS ke setiap host dipakai ulang (keep-alive),
+#            bukan dibuka ulang pada setiap panggilan `requests.get/post`.
+#            Mendukung ukuran pool per host, kebijakan retry, dan timeout
+#            default, semuanya dibaca dari seksi `[http]` di konfigurasi.
+#
+# ==============================================================================
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from UTILS.singleton import SingletonMeta
+
+
+class PooledSession(requests.Session):
+    """
+    Sesi `requests` yang memakai timeout default jika pemanggil tidak
+    menyertakan `timeout` sendiri.
+    """
+
+    def __init__(self, default_timeout):
+        super().__init__()
+        self.default_timeout = default_timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+    def close(self):
+        # Adapter (connection pool) dipakai bersama oleh semua thread; jangan ditutup di sini
+        pass
+
+
+class HttpSessionFactory(metaclass=SingletonMeta):
+    """
+    Pabrik sesi HTTP untuk seluruh proses. Adapter (yang memegang connection
+    pool) dibuat sekali dan dipakai bersama; setiap thread mendapat objek
+    `Session` sendiri (cookie/header tidak tercampur antar thread) yang
+    di-mount ke adapter yang sama, sehingga koneksi tetap dipakai ulang.
+
+        [http]
+        pool_maxsize = 10
+        connect_timeout_seconds = 5
+
+        [http.pool_sizes]
+        "api.binance.com" = 20
+    """
+
+    DEFAULT_SETTINGS = {
+        'pool_connections': 20,
+        'pool_maxsize': 10,
+        'max_retries': 2,
+        'backoff_factor': 0.3,
+        'status_forcelist': [429, 500, 502, 503, 504],
+        'connect_timeout_seconds': 5,
+        'read_timeout_seconds': 30,
+    }
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._build_adapters(dict(self.DEFAULT_SETTINGS), {})
+
+    def _build_retry(self, settings):
+        # Hanya metode idempoten yang diulang; POST (misal panggilan LLM) tidak
+        return Retry(
+            total=int(settings['max_retries']),
+            backoff_factor=float(settings['backoff_factor']),
+            status_forcelist=list(settings['status_forcelist']),
+            allowed_methods=frozenset(['HEAD', 'GET', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def _build_adapters(self, settings, pool_sizes):
+        retry = self._build_retry(settings)
+        self.settings = settings
+        self.default_timeout = (float(settings['connect_timeout_seconds']), float(settings['read_timeout_seconds']))
+        self.default_adapter = HTTPAdapter(
+            pool_connections=int(settings['pool_connections']),
+            pool_maxsize=int(settings['pool_maxsize']),
+            max_retries=retry,
+        )
+        # Adapter khusus untuk host dengan kebutuhan paralelisme lebih tinggi
+        self.host_adapters = {
+            host: HTTPAdapter(pool_connections=1, pool_maxsize=int(size), max_retries=retry)
+            for host, size in pool_sizes.items()
+        }
+        self._generation += 1
+
+    def configure(self, config: dict):
+        """
+        Memuat pengaturan pool, retry, dan timeout dari konfigurasi orkestrator.
+        Adapter baru hanya dibuat jika pengaturannya berubah.
+        Args:
+            config (dict): Konfigurasi lengkap (`orchestrator.config`).
+        """
+        http_config = (config or {}).get('http', {})
+        settings = dict(self.DEFAULT_SETTINGS)
+        settings.update({k: v for k, v in http_config.items() if k in self.DEFAULT_SETTINGS})
+        pool_sizes = dict(http_config.get('pool_sizes', {}))
+        with self._lock:
+            if settings == self.settings and pool_sizes == self._pool_sizes():
+                return
+            self._build_adapters(settings, pool_sizes)
+        logging.debug(f"Pabrik sesi HTTP dikonfigurasi: {settings}, pool per host: {pool_sizes}")
+
+    def _pool_sizes(self):
+        return {host: adapter._pool_maxsize for host, adapter in self.host_adapters.items()}
+
+    def get_session(self) -> requests.Session:
+        """
+        Mendapatkan sesi HTTP milik thread saat ini (dibuat sekali per thread,
+        atau dibuat ulang jika konfigurasi berubah).
+        """
+        session = getattr(self._local, 'session', None)
+        if session is not None and self._local.generation == self._generation:
+            return session
+        with self._lock:
+            session = PooledSession(self.default_timeout)
+            session.mount('http://', self.default_adapter)
+            session.mount('https://', self.default_adapter)
+            for host, adapter in self.host_adapters.items():
+                # requests memilih adapter dengan prefix terpanjang yang cocok
+                session.mount(f'https://{host}/', adapter)
+                session.mount(f'http://{host}/', adapter)
+            self._local.session = session
+            self._local.generation = self._generation
+        return session
+
+
+def get_http_session() -> requests.Session:
+    """Jalan pintas untuk `HttpSessionFactory().get_session()`."""
+    return HttpSessionFactory().get_session()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == HISTOGRAM LATENSI - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/latency_histogram.py
+# Deskripsi: Histogram latensi dengan bucket logaritmik tetap untuk melacak
+#            distribusi waktu respons tiap penyedia data (p50/p95/p99).
+#            Jumlah sampel diluruhkan (dibagi dua) secara berkala agar
+#            persentil mengikuti kondisi jaringan terbaru.
+#
+# ==============================================================================
+
+import bisect
+import math
+import threading
+
+
+class LatencyHistogram:
+    """
+    Histogram latensi (dalam detik) yang aman dipakai dari banyak thread.
+    Bucket tumbuh secara geometris dari `min_latency` hingga `max_latency`,
+    sehingga memori tetap konstan berapa pun jumlah sampelnya.
+    """
+
+    def __init__(self, min_latency: float = 0.005, max_latency: float = 60.0,
+                 buckets_per_decade: int = 10, decay_after: int = 500):
+        """
+        Args:
+            min_latency (float): Batas atas bucket terkecil (detik).
+            max_latency (float): Batas atas bucket terbesar (detik).
+            buckets_per_decade (int): Resolusi bucket per kelipatan 10.
+            decay_after (int): Jumlah sampel sebelum semua hitungan dibagi dua.
+        """
+        decades = math.log10(max_latency / min_latency)
+        num_buckets = int(math.ceil(decades * buckets_per_decade)) + 1
+        self.bounds = [min_latency * (10 ** (i / buckets_per_decade)) for i in range(num_buckets)]
+        self.counts = [0] * (len(self.bounds) + 1)  # Bucket terakhir untuk latensi > max_latency
+        self.decay_after = decay_after
+        self.total = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        """Mencatat satu sampel latensi (detik)."""
+        index = bisect.bisect_left(self.bounds, latency)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            self.total_latency += latency
+            if self.total >= self.decay_after:
+                # Peluruhan: sampel lama berbobot setengah
+                self.counts = [count // 2 for count in self.counts]
+                self.total = sum(self.counts)
+                self.total_latency /= 2
+
+    def percentile(self, q: float):
+        """
+        Mengembalikan perkiraan persentil ke-q (0..1) dari latensi tercatat,
+        yaitu batas atas bucket tempat persentil itu jatuh.
+        Returns:
+            float: Latensi dalam detik, atau None jika belum ada sampel.
+        """
+        with self._lock:
+            if self.total == 0:
+                return None
+            target = q * self.total
+            cumulative = 0
+            for index, count in enumerate(self.counts):
+                cumulative += count
+                if cumulative >= target and count:
+                    return self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+            return self.bounds[-1]
+
+    @property
+    def count(self) -> int:
+        return self.total
+
+    def mean(self):
+        """Rata-rata latensi (detik), atau None jika belum ada sampel."""
+        with self._lock:
+            return self.total_latency / self.total if self.total else None
+
+    def summary(self) -> dict:
+        """Ringkasan untuk logging/dashboard."""
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+        }
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == CACHE RESPONS LLM PERSISTEN (SQLITE) - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/llm_response_cache.py
+# Deskripsi: Cache respons dewan AI yang dialamatkan berdasarkan konten:
+#            kunci = hash(task_type, prompt yang dinormalisasi). Model yang
+#            menjawab hanya dicatat, bukan bagian kunci, karena model bisa
+#            berupa fallback acak/rotasi untuk tugas yang sama.
+#            Disimpan di SQLite lokal sehingga bertahan antar proses, dengan
+#            TTL per jenis tugas, eviksi berdasarkan ukuran (LRU), dan
+#            statistik hit rate. Berita yang sama di siklus berikutnya tidak
+#            lagi memicu panggilan LLM.
+#
+# ==============================================================================
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from UTILS.singleton import SingletonMeta
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalisasi prompt untuk kunci cache: Unicode NFKC dan spasi dirapikan."""
+    text = unicodedata.normalize('NFKC', prompt or '')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class LLMResponseCache(metaclass=SingletonMeta):
+    """
+    Cache respons LLM persisten di SQLite, aman dipakai dari banyak thread.
+    Konfigurasi dibaca dari seksi `[llm_cache]` di `chimera_config.toml`:
+
+        [llm_cache]
+        path = "COLLECTIVE_MEMORY/llm_cache.sqlite3"
+        default_ttl_seconds = 21600
+        max_size_mb = 128
+
+        [llm_cache.ttl_seconds]
+        fast_sentiment_analysis = 3600
+    """
+
+    DEFAULT_CONFIG = {
+        'enabled': True,
+        'path': 'COLLECTIVE_MEMORY/llm_cache.sqlite3',
+        'default_ttl_seconds': 21600,
+        'max_size_mb': 128,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._db_path = None
+        self._size_bytes = 0
+        self._stats = defaultdict(int)
+        self._ttl_rules = {}
+        self._apply_config(dict(self.DEFAULT_CONFIG), {})
+
+    def _apply_config(self, settings, ttl_rules):
+        self.enabled = bool(settings['enabled'])
+        self.default_ttl = float(settings['default_ttl_seconds'])
+        self.max_size_bytes = int(float(settings['max_size_mb']) * 1024 * 1024)
+        self._ttl_rules = {str(task): float(ttl) for task, ttl in ttl_rules.items()}
+        db_path = Path(settings['path'])
+        if not db_path.is_absolute():
+            db_path = PROJECT_ROOT / db_path
+        if db_path != self._db_path:
+            self._db_path = db_path
+            self._close_connection()
+
+    def configure(self, config: dict):
+        """
+        Memuat pengaturan cache LLM dari konfigurasi orkestrator.
+        Args:
+            config (dict): Konfigurasi lengkap (`orchestrator.config`).
+        """
+        cache_config = (config or {}).get('llm_cache', {})
+        settings = dict(self.DEFAULT_CONFIG)
+        settings.update({k: v for k, v in cache_config.items() if k in self.DEFAULT_CONFIG})
+        with self._lock:
+            self._apply_config(settings, cache_config.get('ttl_seconds', {}))
+        logging.debug(f"Cache respons LLM dikonfigurasi: {settings}")
+
+    # --- 1. KONEKSI & SKEMA ---
+    def _connection(self):
+        """Membuka koneksi SQLite sekali (dipanggil dengan lock dipegang)."""
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False, timeout=10)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_responses ('
+                ' key TEXT PRIMARY KEY, task_type TEXT, model TEXT, response TEXT,'
+                ' created_at REAL, expires_at REAL, last_access REAL, size INTEGER)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_last_access ON llm_responses(last_access)')
+            self._conn.commit()
+            self._size_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_responses').fetchone()[0]
+        return self._conn
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- 2. KUNCI & TTL ---
+    @staticmethod
+    def make_key(task_type: str, prompt: str) -> str:
+        """Kunci cache yang dialamatkan berdasarkan konten (jenis tugas + prompt)."""
+        payload = json.dumps([task_type, normalize_prompt(prompt)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_ttl(self, task_type: str) -> float:
+        return self._ttl_rules.get(task_type, self.default_ttl)
+
+    # --- 3. BACA & TULIS ---
+    def get(self, task_type: str, prompt: str):
+        """
+        Mengambil respons tersimpan untuk tugas & prompt ini, dari model mana pun.
+        Returns:
+            object: Respons (hasil `generate` wrapper), atau None jika tidak ada/kedaluwarsa.
+        """
+        if not self.enabled:
+            return None
+        key = self.make_key(task_type, prompt)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute('SELECT response, expires_at, size FROM llm_responses WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    self._stats['misses'] += 1
+                    return None
+                response, expires_at, size = row
+                if expires_at <= now:
+                    conn.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+                    conn.commit()
+                    self._size_bytes -= size
+                    self._stats['expirations'] += 1
+                    self._stats['misses'] += 1
+                    return None
+                conn.execute('UPDATE llm_responses SET last_access = ? WHERE key = ?', (now, key))
+                conn.commit()
+                self._stats['hits'] += 1
+            return json.loads(response)
+        except (sqlite3.Error, ValueError) as e:
+            logging.warning(f"Gagal membaca cache respons LLM: {e}")
+            self._stats['errors'] += 1
+            return None
+
+    def put(self, task_type: str, prompt: str, response, model: str = None):
+        """Menyimpan respons (respons None/gagal tidak disimpan); `model` hanya dicatat."""
+        if not self.enabled or response is None:
+            return
+        key = self.make_key(task_type, prompt)
+        try:
+            payload = json.dumps(response, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            return
+        size = len(payload.encode('utf-8'))
+        if size > self.max_size_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                previous = conn.execute('SELECT size FROM llm_responses WHERE key = ?', (key,)).fetchone()
+                conn.execute(
+                    'INSERT OR REPLACE INTO llm_responses (key, task_type, model, response, created_at, expires_at, last_access, size)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, task_type, model, payload, now, now + self.get_ttl(task_type), now, size)
+                )
+                self._size_bytes += size - (previous[0] if previous else 0)
+                self._stats['writes'] += 1
+                if self._size_bytes > self.max_size_bytes:
+                    self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Gagal menulis cache respons LLM: {e}")
+            self._stats['errors'] += 1
+
+    def _evict(self, conn, now):
+        """Hapus entri kedaluwarsa, lalu entri yang paling lama tidak diakses sampai di bawah 90% batas."""
+        expired = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses WHERE expires_at <= ?', (now,)).fetchone()
+        conn.execute('DELETE FROM llm_responses WHERE expires_at <= ?', (now,))
+        self._size_bytes -= expired[1]
+        self._stats['expirations'] += expired[0]
+
+        target = int(self.max_size_bytes * 0.9)
+        if self._size_bytes <= target:
+            return
+        evicted = 0
+        for key, size in conn.execute('SELECT key, size FROM llm_responses ORDER BY last_access ASC').fetchall():
+            if self._size_bytes <= target:
+                break
+            conn.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+            self._size_bytes -= size
+            evicted += 1
+        self._stats['evictions'] += evicted
+
+    def clear(self):
+        """Menghapus semua entri cache."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM llm_responses')
+            conn.commit()
+            self._size_bytes = 0
+
+    # --- 4. STATISTIK ---
+    def get_stats(self) -> dict:
+        """Statistik cache: hits, misses, hit_rate, jumlah entri, dan ukuran di disk."""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = 0
+            if self.enabled:
+                try:
+                    entries = self._connection().execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            size_bytes = self._size_bytes
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hit_rate'] = stats.get('hits', 0) / lookups if lookups else 0.0
+        stats['entries'] = entries
+        stats['size_bytes'] = size_bytes
+        return stats
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == RATE LIMITER TOKEN-BUCKET - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/rate_limiter.py
+# Deskripsi: Pembatas laju permintaan (token bucket) per host/penyedia API yang
+#            dipakai bersama oleh semua kolektor. Menggantikan jitter acak
+#            `time.sleep(random.uniform(...))`: pemanggil hanya menunggu jika
+#            kuota host benar-benar habis. Aman dipakai dari banyak thread
+#            maupun dari asyncio.
+#
+# ==============================================================================
+
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+from UTILS.singleton import SingletonMeta
+
+
+class TokenBucket:
+    """
+    Token bucket sederhana. Token terisi ulang sebanyak `rate` per detik hingga
+    maksimal `burst`. Setiap permintaan mengambil token; jika token kurang,
+    pemanggil menunggu sampai tokennya tersedia.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Args:
+            rate (float): Jumlah permintaan per detik. <= 0 berarti tanpa batas.
+            burst (float): Kapasitas maksimum bucket (permintaan beruntun).
+        """
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Mengambil token (boleh menjadi 'utang') dan mengembalikan berapa lama
+        pemanggil harus menunggu. Lock hanya dipegang saat menghitung, bukan
+        saat menunggu, sehingga pemanggil lain tidak ikut terblokir.
+        Returns:
+            float: Waktu tunggu dalam detik (0 jika token tersedia).
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Mengambil token, memblokir thread hanya jika kuota habis."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Versi asyncio dari `acquire` (tidak memblokir event loop)."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+
+class RateLimiter(metaclass=SingletonMeta):
+    """
+    Registri token bucket per host yang dipakai bersama di seluruh proses.
+    Batas per host dibaca dari seksi `[rate_limits]` di `chimera_config.toml`:
+
+        [rate_limits.default]
+        requests_per_second = 5.0
+        burst = 10
+
+        [rate_limits."api.coingecko.com"]
+        requests_per_second = 0.5
+        burst = 5
+    """
+
+    DEFAULT_LIMIT = {'requests_per_second': 5.0, 'burst': 10}
+
+    def __init__(self):
+        self._limits = {'default': dict(self.DEFAULT_LIMIT)}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """
+        Memuat batas per host dari konfigurasi orkestrator. Bucket untuk host
+        yang batasnya berubah akan dibuat ulang; yang lain dipertahankan.
+        Args:
+            config (dict): Konfigurasi lengkap (`orchestrator.config`).
+        """
+        rate_config = (config or {}).get('rate_limits', {})
+        with self._lock:
+            for host, limit in rate_config.items():
+                if not isinstance(limit, dict):
+                    continue
+                new_limit = {
+                    'requests_per_second': float(limit.get('requests_per_second', self.DEFAULT_LIMIT['requests_per_second'])),
+                    'burst': float(limit.get('burst', self.DEFAULT_LIMIT['burst'])),
+                }
+                if self._limits.get(host) != new_limit:
+                    self._limits[host] = new_limit
+                    self._buckets.pop(host, None)
+                    if host == 'default':
+                        # Bucket yang memakai batas default harus mengikuti batas baru
+                        for bucket_host in [h for h in self._buckets if h not in self._limits]:
+                            self._buckets.pop(bucket_host, None)
+        logging.debug(f"Rate limiter dikonfigurasi untuk host: {list(self._limits.keys())}")
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        """Mendapatkan (atau membuat) token bucket untuk sebuah host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = self._limits.get(host, self._limits['default'])
+                bucket = TokenBucket(limit['requests_per_second'], limit['burst'])
+                self._buckets[host] = bucket
+            return bucket
+
+    @staticmethod
+    def host_from_url(url: str) -> str:
+        """Mengekstrak nama host dari URL (misal 'api.coingecko.com')."""
+        return urlparse(url).hostname or url
+
+    def acquire(self, host: str, tokens: float = 1.0) -> float:
+        """
+        Menunggu (jika perlu) sampai host punya kuota, lalu mengambil token.
+        Args:
+            host (str): Nama host atau URL lengkap.
+        Returns:
+            float: Lama waktu tunggu dalam detik.
+        """
+        host = self.host_from_url(host) if '://' in host else host
+        wait_time = self.get_bucket(host).acquire(tokens)
+        if wait_time > 0:
+            logging.debug(f"Rate limit {host}: menunggu {wait_time:.2f}s.")
+        return wait_time
+
+    async def acquire_async(self, host: str, tokens: float = 1.0) -> float:
+        """Versi asyncio dari `acquire`."""
+        host = self.host_from_url(host) if '://' in host else host
+        wait_time = await self.get_bucket(host).acquire_async(tokens)
+        if wait_time > 0:
+            logging.debug(f"Rate limit {host}: menunggu {wait_time:.2f}s.")
+        return wait_time
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == CACHE RESPONS API (TTL + STALE-WHILE-REVALIDATE) - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/response_cache.py
+# Deskripsi: Cache respons API di memori yang dipakai bersama oleh APIManager dan
+#            IntelligenceAggregator. Kunci cache adalah (provider, endpoint,
+#            params), dengan TTL per endpoint, eviksi LRU, dan batas memori.
+#            Mode stale-while-revalidate langsung mengembalikan nilai terakhir
+#            yang sudah kedaluwarsa sambil memperbaruinya di latar belakang.
+#
+# ==============================================================================
+
+import json
+import logging
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from UTILS.singleton import SingletonMeta
+
+
+class ResponseCache(metaclass=SingletonMeta):
+    """
+    Cache LRU ber-TTL untuk respons API, aman dipakai dari banyak thread.
+    Konfigurasi dibaca dari seksi `[response_cache]` di `chimera_config.toml`:
+
+        [response_cache]
+        max_memory_mb = 64
+        stale_while_revalidate = true
+
+        [response_cache.ttl_seconds]
+        coingecko = 60
+        "coingecko/simple/price" = 30
+    """
+
+    DEFAULT_CONFIG = {
+        'enabled': True,
+        'max_entries': 1000,
+        'max_memory_mb': 64,
+        'default_ttl_seconds': 60,
+        'stale_while_revalidate': True,
+        'max_stale_seconds': 60,
+        'refresh_workers': 4,
+    }
+
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> {'value', 'stored_at', 'ttl', 'size', 'provider'}
+        self._memory_bytes = 0
+        self._ttl_rules = {}
+        self._refreshing = set()
+        self._executor = None
+        self._lock = threading.RLock()
+        self._stats = defaultdict(int)
+        self._provider_stats = defaultdict(lambda: defaultdict(int))
+        self._apply_config(dict(self.DEFAULT_CONFIG), {})
+
+    def _apply_config(self, settings, ttl_rules):
+        self.enabled = bool(settings['enabled'])
+        self.max_entries = int(settings['max_entries'])
+        self.max_memory_bytes = int(float(settings['max_memory_mb']) * 1024 * 1024)
+        self.default_ttl = float(settings['default_ttl_seconds'])
+        self.stale_while_revalidate = bool(settings['stale_while_revalidate'])
+        self.max_stale = float(settings['max_stale_seconds'])
+        self.refresh_workers = int(settings['refresh_workers'])
+        self._ttl_rules = {str(rule): float(ttl) for rule, ttl in ttl_rules.items()}
+
+    def configure(self, config: dict):
+        """
+        Memuat pengaturan cache dan TTL per endpoint dari konfigurasi orkestrator.
+        Args:
+            config (dict): Konfigurasi lengkap (`orchestrator.config`).
+        """
+        cache_config = (config or {}).get('response_cache', {})
+        settings = dict(self.DEFAULT_CONFIG)
+        settings.update({k: v for k, v in cache_config.items() if k in self.DEFAULT_CONFIG})
+        with self._lock:
+            self._apply_config(settings, cache_config.get('ttl_seconds', {}))
+            self._evict_if_needed()
+        logging.debug(f"Cache respons dikonfigurasi: {settings}, aturan TTL: {self._ttl_rules}")
+
+    # --- 1. KUNCI & TTL ---
+    @staticmethod
+    def make_key(provider: str, endpoint: str, params=None) -> str:
+        """Membuat kunci cache yang stabil dari (provider, endpoint, params)."""
+        params_str = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{provider}|{endpoint.strip('/')}|{params_str}"
+
+    def get_ttl(self, provider: str, endpoint: str) -> float:
+        """
+        Mencari TTL untuk sebuah endpoint. Urutan prioritas:
+        "provider/endpoint" -> "provider" -> default_ttl_seconds.
+        """
+        specific = f"{provider}/{endpoint.strip('/')}"
+        if specific in self._ttl_rules:
+            return self._ttl_rules[specific]
+        return self._ttl_rules.get(provider, self.default_ttl)
+
+    @staticmethod
+    def _estimate_size(value) -> int:
+        """Perkiraan ukuran nilai dalam byte (untuk batas memori)."""
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
+
+    # --- 2. PENYIMPANAN & EVIKSI ---
+    def _store(self, key, provider, value, ttl):
+        size = self._estimate_size(value)
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry:
+                self._memory_bytes -= old_entry['size']
+            if size > self.max_memory_bytes:
+                logging.debug(f"Respons {key} terlalu besar untuk cache ({size} byte), dilewati.")
+                return
+            self._entries[key] = {
+                'value': value,
+                'stored_at': time.monotonic(),
+                'ttl': ttl,
+                'size': size,
+                'provider': provider,
+            }
+            self._memory_bytes += size
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        """Membuang entri yang paling lama tidak dipakai (LRU) sampai batas terpenuhi."""
+        while self._entries and (len(self._entries) > self.max_entries or self._memory_bytes > self.max_memory_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._memory_bytes -= entry['size']
+            self._stats['evictions'] += 1
+
+    def invalidate(self, provider: str = None):
+        """Menghapus semua entri cache, atau hanya milik satu provider."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if provider is None or e['provider'] == provider]:
+                self._memory_bytes -= self._entries.pop(key)['size']
+
+    # --- 3. PENGAMBILAN ---
+    def get_or_fetch(self, provider: str, endpoint: str, params, fetch_func, ttl: float = None):
+        """
+        Mengembalikan respons dari cache jika masih segar; jika tidak, memanggil
+        `fetch_func()` dan menyimpan hasilnya. Hasil None tidak disimpan, dan
+        exception dari `fetch_func` diteruskan ke pemanggil.
+        Args:
+            provider (str): Nama penyedia (misal 'coingecko').
+            endpoint (str): Endpoint/path yang dipanggil.
+            params (dict): Parameter yang menentukan isi respons (tanpa kunci API).
+            fetch_func (callable): Fungsi tanpa argumen yang mengambil data asli.
+            ttl (float, optional): TTL khusus; jika None, diambil dari konfigurasi.
+        Returns:
+            Respons (dari cache atau hasil `fetch_func`).
+        """
+        if not self.enabled:
+            return fetch_func()
+
+        key = self.make_key(provider, endpoint, params)
+        ttl = self.get_ttl(provider, endpoint) if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                age = time.monotonic() - entry['stored_at']
+                if age <= entry['ttl']:
+                    self._entries.move_to_end(key)
+                    self._count(provider, 'hits')
+                    return entry['value']
+                if self.stale_while_revalidate and age <= entry['ttl'] + self.max_stale:
+                    # Sajikan nilai lama sekarang, perbarui di latar belakang
+                    self._entries.move_to_end(key)
+                    self._count(provider, 'stale_hits')
+                    self._schedule_refresh(key, provider, fetch_func, ttl)
+                    return entry['value']
+                self._memory_bytes -= self._entries.pop(key)['size']
+                self._stats['expirations'] += 1
+            self._count(provider, 'misses')
+
+        value = fetch_func()
+        if value is not None:
+            self._store(key, provider, value, ttl)
+        return value
+
+    def _count(self, provider, counter):
+        self._stats[counter] += 1
+        self._provider_stats[provider][counter] += 1
+
+    def _schedule_refresh(self, key, provider, fetch_func, ttl):
+        """Menjadwalkan pembaruan latar belakang; satu pembaruan per kunci pada satu waktu."""
+        if key in self._refreshing:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers, thread_name_prefix='cache-refresh')
+        self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, provider, fetch_func, ttl)
+
+    def _refresh(self, key, provider, fetch_func, ttl):
+        counter = 'refresh_failures'
+        try:
+            value = fetch_func()
+            if value is not None:
+                self._store(key, provider, value, ttl)
+                counter = 'refreshes'
+        except Exception as e:
+            logging.warning(f"Pembaruan cache latar belakang untuk {provider} gagal: {e}")
+        finally:
+            with self._lock:
+                self._stats[counter] += 1
+                self._refreshing.discard(key)
+
+    # --- 4. STATISTIK ---
+    def get_stats(self) -> dict:
+        """
+        Mengembalikan penghitung cache (hit/miss/stale/eviksi), hit rate,
+        penggunaan memori, dan rincian per provider.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats.get('hits', 0) + stats.get('stale_hits', 0) + stats.get('misses', 0)
+            stats['hit_rate'] = (stats.get('hits', 0) + stats.get('stale_hits', 0)) / lookups if lookups else 0.0
+            stats['entries'] = len(self._entries)
+            stats['memory_bytes'] = self._memory_bytes
+            stats['providers'] = {provider: dict(counters) for provider, counters in self._provider_stats.items()}
+        return stats
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == SNAPSHOT TICKER MASSAL - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: UTILS/ticker_snapshot.py
+# Deskripsi: Satu implementasi pengambilan ticker banyak simbol lewat satu
+#            panggilan `fetch_tickers` CCXT, dipakai bersama oleh APIManager
+#            dan IntelligenceAggregator. Hanya simbol yang terlewat di hasil
+#            massal yang diambil per simbol.
+#
+# ==============================================================================
+
+import logging
+import time
+
+
+def fetch_ticker_snapshot(client, symbols=None, rate_limiter=None, rate_limit_host=None,
+                          circuit_breakers=None, breaker_name='binance'):
+    """
+    Mengambil ticker banyak simbol sekaligus lalu memecahnya per simbol.
+    Args:
+        client: Klien bursa CCXT (sinkron).
+        symbols (list, optional): Daftar simbol CCXT. Jika None, semua ticker bursa.
+        rate_limiter (RateLimiter, optional): Jika ada, kuota `rate_limit_host` ditunggu sebelum tiap permintaan.
+        rate_limit_host (str, optional): Host kunci rate limit.
+        circuit_breakers (CircuitBreakerRegistry, optional): Jika ada, permintaan massal dicatat
+                                                             ke breaker `breaker_name` dan dilewati saat terbuka.
+        breaker_name (str): Nama circuit breaker penyedia.
+    Returns:
+        dict: {symbol: ticker CCXT}. Simbol yang gagal tidak dimasukkan.
+    """
+    symbols = list(symbols) if symbols else None
+    if circuit_breakers is not None and not circuit_breakers.allow_request(breaker_name):
+        logging.warning(f"Circuit breaker {breaker_name} terbuka, snapshot ticker dilewati.")
+        return {}
+
+    def _acquire():
+        # Tunggu kuota rate limit host (hanya memblokir jika kuota habis)
+        if rate_limiter is not None and rate_limit_host:
+            rate_limiter.acquire(rate_limit_host)
+
+    snapshot = {}
+    _acquire()
+    start_time = time.monotonic()
+    try:
+        tickers = client.fetch_tickers(symbols)
+        if circuit_breakers is not None:
+            circuit_breakers.record_success(breaker_name, time.monotonic() - start_time)
+        if symbols:
+            snapshot = {symbol: tickers[symbol] for symbol in symbols if symbol in tickers}
+        else:
+            snapshot = dict(tickers)
+        logging.debug(f"Snapshot ticker massal: {len(snapshot)} simbol dalam satu permintaan.")
+    except Exception as e:
+        if circuit_breakers is not None:
+            circuit_breakers.record_failure(breaker_name, time.monotonic() - start_time)
+        logging.warning(f"Snapshot ticker massal gagal: {e}. Fallback ke permintaan per simbol.")
+
+    # --- Fallback per simbol hanya untuk yang terlewat ---
+    for symbol in [s for s in (symbols or []) if s not in snapshot]:
+        try:
+            _acquire()
+            snapshot[symbol] = client.fetch_ticker(symbol)
+        except Exception as e:
+            logging.warning(f"Ticker untuk {symbol} gagal diambil: {e}")
+    return snapshot
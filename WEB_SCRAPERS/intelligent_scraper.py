@@ -10,10 +10,7 @@
 import logging
 import sys
 import os
-import requests
 from bs4 import BeautifulSoup
-import time
-import random
 
 # --- PENYESUAIAN PATH DINAMIS ---
 current_script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +18,9 @@ project_root = os.path.dirname(current_script_dir)
 sys.path.insert(0, project_root)
 # --- AKHIR PENYESUAIAN PATH ---
 
+from UTILS.rate_limiter import RateLimiter
+from UTILS.http_session import HttpSessionFactory
+
 # Impor library scraping lain jika diperlukan
 # from playwright.sync_api import sync_playwright # Untuk halaman dinamis
 # from scrapegraphai import SmartScraperGraph # Jika tersedia dan stabil
@@ -39,6 +39,12 @@ class IntelligentScraper:
         # Anda bisa memuat konfigurasi scraping dari file jika diperlukan
         # self.config = self.orchestrator.config.get('scraping', {})
         self.missions = []  # Initialize missions attribute as empty list
+        # Rate limiter token-bucket bersama (per host), dikonfigurasi dari [rate_limits]
+        self.rate_limiter = RateLimiter()
+        self.rate_limiter.configure(self.orchestrator.config)
+        # Connection pool HTTP bersama (keep-alive, retry, timeout), dikonfigurasi dari [http]
+        self.http_sessions = HttpSessionFactory()
+        self.http_sessions.configure(self.orchestrator.config)
         logging.info("Scraper Cerdas v3 berhasil diinisialisasi.")
 
     def scrape_coinmarketcap_price(self, symbol):
@@ -63,9 +69,9 @@ class IntelligentScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
         try:
-            # Tambahkan jitter
-            time.sleep(random.uniform(0.5, 1.5))
-            response = requests.get(url, headers=headers, timeout=10)
+            # Tunggu kuota rate limit host (hanya memblokir jika kuota habis)
+            self.rate_limiter.acquire(url)
+            response = self.http_sessions.get_session().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -92,8 +98,9 @@ class IntelligentScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
         try:
-            time.sleep(random.uniform(0.5, 1.5))
-            response = requests.get(url, headers=headers, timeout=10)
+            # Tunggu kuota rate limit host (hanya memblokir jika kuota habis)
+            self.rate_limiter.acquire(url)
+            response = self.http_sessions.get_session().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -8,10 +8,11 @@
 #
 # ==============================================================================
 
-import requests
 from bs4 import BeautifulSoup
 import logging
 
+from UTILS.http_session import HttpSessionFactory
+
 class SocialMediaScraper:
     """
     Melakukan scraping data dari sumber web publik.
@@ -21,6 +22,9 @@ class SocialMediaScraper:
         self.orchestrator = orchestrator
         self.secrets = self.orchestrator.secrets
         self.scrapeops_key = self.secrets.get('tool_apis', {}).get('scrapeops_key')
+        # Connection pool HTTP bersama (keep-alive, retry, timeout), dikonfigurasi dari [http]
+        self.http_sessions = HttpSessionFactory()
+        self.http_sessions.configure(self.orchestrator.config)
         
         if not self.scrapeops_key:
             logging.warning("Kunci API ScrapeOps tidak ditemukan. Scraping akan dilakukan tanpa proksi.")
@@ -49,8 +53,8 @@ class SocialMediaScraper:
             }
             
             logging.info(f"Scraping CoinMarketCap Trending via {'Proxy' if proxies else 'Direct Connection'}...")
-            # Menggunakan parameter `proxies` dari library requests
-            response = requests.get(target_url, headers=headers, proxies=proxies, timeout=20)
+            # Menggunakan parameter `proxies` dari library requests (lewat sesi bersama)
+            response = self.http_sessions.get_session().get(target_url, headers=headers, proxies=proxies, timeout=20)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
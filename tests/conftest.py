@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# == KONFIGURASI PYTEST - PROJECT CHIMERA ==
+# ==============================================================================
+#
+# Lokasi: tests/conftest.py
+# Deskripsi: Menambahkan root proyek ke sys.path dan menyediakan fixture
+#            bersama untuk pengujian modul-modul murni (tanpa jaringan).
+#
+# ==============================================================================
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from UTILS.singleton import SingletonMeta
+
+
+@pytest.fixture
+def fresh_singleton():
+    """Membuat instance baru sebuah kelas SingletonMeta; instance lama dipulihkan setelah tes."""
+    saved = dict(SingletonMeta._instances)
+
+    def factory(cls, *args, **kwargs):
+        SingletonMeta._instances.pop(cls, None)
+        return cls(*args, **kwargs)
+
+    yield factory
+    SingletonMeta._instances.clear()
+    SingletonMeta._instances.update(saved)
+
+
+def make_ohlcv(bars: int, start_ms: float = 1_700_000_000_000, step_ms: float = 3_600_000, seed: int = 0,
+               base: float = 100.0) -> np.ndarray:
+    """Candle sintetis [[ts, o, h, l, c, v], ...] dengan random walk yang deterministik."""
+    rng = np.random.default_rng(seed)
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate([[base], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, bars))
+    volume = rng.uniform(100, 1000, bars)
+    timestamps = start_ms + step_ms * np.arange(bars)
+    return np.column_stack([timestamps, open_, high, low, close, volume])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Pengujian IncrementalJSONParser dan parse_final_json untuk respons LLM yang di-stream.
+
+import json
+
+import pytest
+
+from AI_BRAIN.model_wrappers.async_streaming_client import IncrementalJSONParser, parse_final_json
+
+RESPONSE = ('Berikut hasilnya:\n```json\n{"sentiment": "BULLISH", "scores": {"a": [1, 2]}, '
+            '"note": "kurung } dan koma, \\" di string", "confidence": 0.8}\n```')
+
+
+def feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, len(RESPONSE)])
+def test_object_fields_emitted_as_they_complete(chunk_size):
+    seen = []
+    parser = IncrementalJSONParser(on_field=lambda key, value: seen.append(key))
+    events = feed_in_chunks(parser, RESPONSE, chunk_size)
+
+    expected = json.loads(RESPONSE[RESPONSE.index('{'):RESPONSE.rindex('}') + 1])
+    assert parser.done
+    assert parser.result == expected
+    assert [key for key, _ in events] == seen == ['sentiment', 'scores', 'note', 'confidence']
+
+
+def test_field_is_available_before_stream_ends():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"signal": "BUY", "reason": "mom') == [('signal', 'BUY')]
+    assert not parser.done
+    assert parser.feed('entum"}') == [('reason', 'momentum')]
+    assert parser.done
+
+
+def test_array_elements_are_indexed():
+    parser = IncrementalJSONParser()
+    events = feed_in_chunks(parser, '[{"id": "a"}, {"id": "b"}, 3]', 4)
+    assert events == [(0, {'id': 'a'}), (1, {'id': 'b'}), (2, 3)]
+    assert parser.result == [{'id': 'a'}, {'id': 'b'}, 3]
+
+
+def test_invalid_field_is_skipped():
+    parser = IncrementalJSONParser()
+    parser.feed('{"good": 1, "bad": tru, "also_good": [2]}')
+    assert parser.result == {'good': 1, 'also_good': [2]}
+
+
+def test_text_after_json_is_ignored():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1} dan {"b": 2}')
+    assert parser.done
+    assert parser.result == {'a': 1}
+
+
+def test_parse_final_json_falls_back_to_incremental_result():
+    assert parse_final_json('```json\n{"a": 1}\n```') == {'a': 1}
+
+    parser = IncrementalJSONParser()
+    parser.feed(RESPONSE)
+    assert parse_final_json(RESPONSE, parser)['confidence'] == 0.8
+    assert parse_final_json('bukan json') is None
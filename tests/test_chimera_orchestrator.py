@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Pengujian ChimeraOrchestrator.shutdown: semua komponen dengan pekerja latar belakang ditutup.
+
+import pytest
+
+from SENTIENT_CORE.chimera_orchestrator import ChimeraOrchestrator
+
+
+class Closable:
+    def __init__(self, name, closed, fail=False):
+        self.name = name
+        self.closed = closed
+        self.fail = fail
+
+    def close(self):
+        self.closed.append(self.name)
+        if self.fail:
+            raise RuntimeError('gagal')
+
+
+@pytest.fixture
+def orchestrator():
+    # Tanpa memuat konfigurasi/sub-sistem: hanya state yang dipakai shutdown
+    orchestrator = ChimeraOrchestrator.__new__(ChimeraOrchestrator)
+    orchestrator.is_shutting_down = False
+    orchestrator._shutdown_hooks = []
+    return orchestrator
+
+
+def test_shutdown_closes_perception_then_registered_hooks_in_reverse(orchestrator):
+    closed = []
+    orchestrator.perception_system = Closable('perception', closed)
+    for name in ('cortex_router', 'qsa_router', 'qsa'):
+        orchestrator.register_shutdown_hook(Closable(name, closed).close)
+
+    orchestrator.shutdown()
+    assert closed == ['perception', 'qsa', 'qsa_router', 'cortex_router']
+
+    # Shutdown kedua (misal dari blok finally) tidak menutup ulang
+    orchestrator.shutdown()
+    assert len(closed) == 4
+
+
+def test_shutdown_continues_after_failing_close(orchestrator):
+    closed = []
+    orchestrator.perception_system = Closable('perception', closed, fail=True)
+    orchestrator.register_shutdown_hook(Closable('router', closed, fail=True).close)
+    orchestrator.register_shutdown_hook(Closable('qsa', closed).close)
+
+    orchestrator.shutdown()
+    assert closed == ['perception', 'qsa', 'router']
+
+
+def test_shutdown_without_perception_system(orchestrator):
+    closed = []
+    orchestrator.register_shutdown_hook(Closable('router', closed).close)
+    orchestrator.shutdown()
+    assert closed == ['router']
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Pengujian CircuitBreaker: transisi closed -> open -> half_open -> closed/open dan peringkat kesehatan.
+
+import pytest
+
+from UTILS import circuit_breaker
+from UTILS.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, 'time', clock)
+    return clock
+
+
+def make_breaker(**overrides):
+    settings = dict(CircuitBreakerRegistry.DEFAULT_SETTINGS)
+    settings.update(overrides)
+    return CircuitBreaker('test', settings)
+
+
+def test_opens_only_after_min_calls_and_threshold(clock):
+    breaker = make_breaker(min_calls=4, failure_rate_threshold=0.5)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+
+def test_error_rate_below_threshold_stays_closed(clock):
+    breaker = make_breaker(min_calls=4, failure_rate_threshold=0.5)
+    for ok in (True, True, False, True, False, True):
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker(min_calls=3, window_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 61
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = make_breaker(min_calls=1, open_seconds=30, half_open_max_calls=1)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()   # hanya satu permintaan uji
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = make_breaker(min_calls=1, open_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_lost_probe_does_not_lock_circuit(clock):
+    breaker = make_breaker(min_calls=1, open_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    # Hasil permintaan uji tidak pernah dicatat; setelah open_seconds uji baru diizinkan
+    clock.now += 30
+    assert breaker.allow_request()
+
+
+def test_health_score_reflects_errors_latency_and_state(clock):
+    fast, slow = make_breaker(), make_breaker()
+    fast.record_success(latency=0.1)
+    slow.record_success(latency=3.0)
+    assert fast.health_score() > slow.health_score()
+
+    broken = make_breaker(min_calls=1)
+    broken.record_failure()
+    assert broken.health_score() == 0.0
+
+
+def test_registry_ranks_by_health_and_keeps_priority_on_ties(clock, fresh_singleton):
+    registry = fresh_singleton(CircuitBreakerRegistry)
+    registry.configure({'circuit_breaker': {'min_calls': 1}})
+    registry.record_failure('binance')
+    assert registry.rank(['binance', 'coingecko', 'coincap']) == ['coingecko', 'coincap', 'binance']
+    assert not registry.allow_request('binance')
+
+
+def test_disabled_registry_allows_everything(clock, fresh_singleton):
+    registry = fresh_singleton(CircuitBreakerRegistry)
+    registry.configure({'circuit_breaker': {'enabled': False, 'min_calls': 1}})
+    registry.record_failure('binance')
+    assert registry.allow_request('binance')
+    assert registry.rank(['binance', 'coingecko']) == ['binance', 'coingecko']
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Pengujian CoinGeckoToolkit: data harga historis tetap dari market_chart, candle OHLC lewat cache.
+
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pycoingecko')
+
+from COLLECTIVE_MEMORY.ohlcv_history_cache import OHLCVHistoryCache
+from PERCEPTION_SYSTEM.platform_integrations.coingecko_toolkit import CoinGeckoToolkit
+
+
+class FakeCoinGecko:
+    def __init__(self):
+        self.calls = []
+
+    def get_coin_market_chart_by_id(self, id, vs_currency, days):
+        self.calls.append(('market_chart', days))
+        now = time.time() * 1000
+        # Titik per jam, seperti market_chart untuk 2-90 hari
+        return {'prices': [[now - (days * 24 - i) * 3600000, 100.0 + i] for i in range(days * 24)]}
+
+    def get_coin_ohlc_by_id(self, id, vs_currency, days):
+        self.calls.append(('ohlc', days))
+        now = time.time() * 1000 // 14400000 * 14400000
+        return [[now - (41 - i) * 14400000, 1.0, 2.0, 0.5, 1.5] for i in range(42)]
+
+
+@pytest.fixture
+def toolkit(tmp_path):
+    toolkit = CoinGeckoToolkit.__new__(CoinGeckoToolkit)
+    toolkit.cg = FakeCoinGecko()
+    toolkit.history_cache = OHLCVHistoryCache({'history_cache': {'cache_dir': str(tmp_path)}})
+    return toolkit
+
+
+def test_historical_data_keeps_market_chart_granularity(toolkit):
+    prices = toolkit.get_historical_data('bitcoin', 'usd', days=7)
+    assert toolkit.cg.calls == [('market_chart', 7)]
+    assert len(prices) == 7 * 24
+    assert prices[-1] == 100.0 + 7 * 24 - 1
+
+
+def test_historical_ohlcv_uses_ohlc_endpoint(toolkit):
+    bars = toolkit.get_historical_ohlcv('bitcoin', 'usd', days=7)
+    assert toolkit.cg.calls == [('ohlc', 7)]
+    assert bars.shape[1] == 6 and len(bars) > 0
+    assert np.isnan(bars[:, 5]).all()
+
+
+def test_historical_data_without_client(toolkit):
+    toolkit.cg = None
+    assert len(toolkit.get_historical_data()) == 0
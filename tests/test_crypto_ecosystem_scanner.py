@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Tes pemindai ekosistem: peringkat prioritas koin, pemindaian paralel, dan resolusi kategori.
+import threading
+
+import pytest
+
+from ANALYTICS_CORE.crypto_ecosystem_scanner import (CATEGORY_REGISTRY, DEFAULT_CATEGORY, INTERNAL_COIN_LIST,
+                                                   CryptoEcosystemScanner, catalyst_score, category_spec,
+                                                   normalize_category, rank_coins, resolve_category)
+
+
+def _coin(symbol, volume='Sedang', catalyst=''):
+    return {'simbol': symbol, 'nama_lengkap': symbol, 'kategori': 'Lapis 1',
+            'volume_perdagangan': volume, 'potensi_katalis': catalyst}
+
+
+def test_catalyst_score_counts_parts_and_keywords():
+    assert catalyst_score('') == 0.0
+    assert catalyst_score(None) == 0.0
+    assert catalyst_score('Meme trends') == 0.2
+    assert catalyst_score('ETF inflows, halving') == 0.2 * 2 + 0.15 * 2
+    assert catalyst_score('etf, halving, upgrade, listing, airdrop') == 1.0
+
+
+def test_rank_coins_orders_by_volume_then_catalyst_then_original_order():
+    coins = [
+        _coin('LOW', 'Rendah', 'ETF, halving, upgrade'),
+        _coin('MID_A', 'Sedang', 'Meme trends'),
+        _coin('TOP', 'Sangat Tinggi'),
+        _coin('MID_B', 'Sedang', 'Meme trends'),
+        _coin('MID_C', 'Sedang', 'Exchange listing'),
+        _coin('UNKNOWN', 'Tidak Diketahui'),
+    ]
+    ranked = [coin['simbol'] for coin in rank_coins(coins)]
+    assert ranked == ['TOP', 'MID_C', 'MID_A', 'MID_B', 'UNKNOWN', 'LOW']
+
+
+def test_rank_coins_top_n_matches_full_sort_prefix():
+    coins = [_coin(f"C{i}", ('Tinggi', 'Sedang', 'Rendah')[i % 3], 'launch' if i % 4 == 0 else 'news')
+             for i in range(40)]
+    full = rank_coins(coins)
+    for top_n in (0, 1, 7, 39, 40, 100):
+        assert rank_coins(coins, top_n) == full[:top_n]
+
+
+def test_scan_all_limits_concurrency_and_ranks_results():
+    coins = [_coin(f"C{i}", 'Tinggi' if i < 3 else 'Rendah') for i in range(10)]
+    scanner = CryptoEcosystemScanner.__new__(CryptoEcosystemScanner)
+    scanner.max_workers = 3
+    scanner.default_top_n = 5
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    def fake_analyze(coin, snapshot):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        threading.Event().wait(0.01)
+        with lock:
+            active['now'] -= 1
+        return {'coin_info': coin}
+
+    scanner._analyze_coin_by_category = fake_analyze
+    results = list(scanner.scan_all({}, coins=coins, max_workers=2))
+    assert len(results) == 10
+    assert active['peak'] <= 2
+    by_rank = sorted(results, key=lambda result: result['rank'])
+    assert [result['coin_info']['simbol'] for result in by_rank] == [coin['simbol'] for coin in rank_coins(coins)]
+
+
+def test_scan_all_reports_failed_coin_without_stopping():
+    coins = [_coin('OK'), _coin('BAD')]
+    scanner = CryptoEcosystemScanner.__new__(CryptoEcosystemScanner)
+    scanner.max_workers = 2
+
+    def fake_analyze(coin, snapshot):
+        if coin['simbol'] == 'BAD':
+            raise RuntimeError('boom')
+        return {'coin_info': coin}
+
+    scanner._analyze_coin_by_category = fake_analyze
+    results = {result['coin_info']['simbol']: result for result in scanner.scan_all({}, coins=coins)}
+    assert 'error' not in results['OK']
+    assert 'boom' in results['BAD']['error']
+
+
+def test_normalize_category():
+    assert normalize_category('Lapis 2 / ZK-Rollup') == 'lapis 2 zk rollup'
+    assert normalize_category(None) == ''
+
+
+@pytest.mark.parametrize('category, expected', [
+    ('AI / DePIN', 'ai'),
+    ('Cross-Chain', DEFAULT_CATEGORY),      # 'ai' tidak cocok di dalam 'chain'
+    ('Supply Chain', 'supply_chain'),
+    ('Payments / Fork', 'payments'),
+    ('Payment', 'payments'),
+    ('Lapis 1 / Smart Contracts', 'lapis_1'),
+    ('Lapis 2 / ZK-Rollup', 'lapis_2'),
+    ('Perp DEX', 'perp_dex'),               # frasa terpanjang menang atas 'dex'
+    ('DEX Aggregator', 'dex'),
+    ('Decentralized Cloud', 'cloud'),
+    ('Oracle', 'oracle'),
+    ('', DEFAULT_CATEGORY),
+    ('Sesuatu yang Baru', DEFAULT_CATEGORY),
+])
+def test_resolve_category_matches_whole_words(category, expected):
+    assert resolve_category(category) == expected
+
+
+def test_category_spec_caches_resolved_key_on_coin():
+    coin = {'simbol': 'X', 'kategori': 'AI / Agents'}
+    key, spec = category_spec(coin)
+    assert key == 'ai' and spec is CATEGORY_REGISTRY['ai']
+    coin['kategori'] = 'Memecoin'
+    assert category_spec(coin)[0] == 'ai'
+
+
+def test_every_internal_coin_resolves_to_registry_key():
+    for coin in INTERNAL_COIN_LIST:
+        assert coin['kunci_kategori'] in CATEGORY_REGISTRY
+        assert coin['kunci_kategori'] == resolve_category(coin['kategori'])
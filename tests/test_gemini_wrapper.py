@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Pengujian GeminiWrapper: setiap instance mengirim kunci API miliknya sendiri.
+
+import threading
+
+from AI_BRAIN.model_wrappers import gemini_wrapper
+from AI_BRAIN.model_wrappers.gemini_wrapper import GeminiWrapper, gemini_response_text
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self._text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'candidates': [{'content': {'parts': [{'text': self._text}]}}]}
+
+
+class RecordingSession:
+    def __init__(self):
+        self.keys = []
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.keys.append(headers['x-goog-api-key'])
+        return FakeResponse('{"key": "%s"}' % headers['x-goog-api-key'])
+
+
+def test_parallel_wrappers_use_their_own_key(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(gemini_wrapper, 'get_http_session', lambda: session)
+    wrappers = [GeminiWrapper(f'key-{i}') for i in range(4)]
+    results = {}
+
+    def call(wrapper):
+        for _ in range(25):
+            assert wrapper.generate('prompt') == {'key': wrapper.api_key}
+        results[wrapper.api_key] = True
+
+    threads = [threading.Thread(target=call, args=(wrapper,)) for wrapper in wrappers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert sorted(set(session.keys)) == [f'key-{i}' for i in range(4)]
+
+
+def test_response_text_joins_parts_and_tolerates_empty():
+    assert gemini_response_text({'candidates': [{'content': {'parts': [{'text': 'a'}, {'text': 'b'}]}}]}) == 'ab'
+    assert gemini_response_text({}) == ''
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Pengujian IntelligenceAggregator.aggregate_market_data: hasil parsial saat mode async melewati batas waktu.
+
+import asyncio
+import threading
+import time
+from collections import Counter, defaultdict
+
+from PERCEPTION_SYSTEM.platform_integrations.intelligence_aggregator import BINANCE_HOST, IntelligenceAggregator
+
+
+class NullStore:
+    enabled = False
+
+    def save_if_due(self):
+        pass
+
+
+def make_aggregator(slow_symbols):
+    aggregator = IntelligenceAggregator.__new__(IntelligenceAggregator)
+    aggregator.async_fetch_enabled = True
+    aggregator.async_fetch_timeout = 0.5
+    aggregator.max_concurrent_per_exchange = 10
+    aggregator.async_clients = {}
+    aggregator._async_loop = None
+    aggregator._async_thread = None
+    aggregator._async_lock = threading.Lock()
+    aggregator._partial_lock = threading.Lock()
+    aggregator._hedge_executor = None
+    aggregator.ohlcv_store = NullStore()
+    aggregator.clients = {'binance': object()}
+    aggregator.sequential_calls = []
+
+    async def get_async_client(name):
+        return object()
+
+    async def ticker_snapshot_async(client, semaphore, symbols):
+        return {symbol: {'last': 1.0} for symbol in symbols}
+
+    async def detailed_async(client, semaphore, symbol, ticker=None):
+        if symbol in slow_symbols:
+            await asyncio.sleep(30)
+        return symbol, {'symbol': symbol, 'price': 1.0, 'source': 'async'}
+
+    def ticker_snapshot(symbols):
+        aggregator.sequential_calls.append(list(symbols))
+        return {symbol: {'last': 2.0} for symbol in symbols}
+
+    def detailed(symbol, ticker=None):
+        return {'symbol': symbol, 'price': 2.0, 'source': 'sequential'}
+
+    aggregator._get_async_client = get_async_client
+    aggregator._fetch_ticker_snapshot_async = ticker_snapshot_async
+    aggregator._fetch_detailed_market_data_async = detailed_async
+    aggregator.get_ticker_snapshot = ticker_snapshot
+    aggregator.get_detailed_market_data = detailed
+    return aggregator
+
+
+def test_timeout_keeps_partial_results_and_refetches_only_missing():
+    symbols = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+    aggregator = make_aggregator(slow_symbols={'ETH/USDT'})
+    try:
+        market_data = aggregator.aggregate_market_data(symbols)
+    finally:
+        aggregator.close()
+    assert list(market_data) == symbols
+    assert market_data['BTC/USDT']['source'] == 'async'
+    assert market_data['SOL/USDT']['source'] == 'async'
+    assert market_data['ETH/USDT']['source'] == 'sequential'
+    assert aggregator.sequential_calls == [['ETH/USDT']]
+
+
+def test_async_success_skips_sequential_path():
+    aggregator = make_aggregator(slow_symbols=set())
+    try:
+        market_data = aggregator.aggregate_market_data(['BTC/USDT', 'ETH/USDT'])
+    finally:
+        aggregator.close()
+    assert {data['source'] for data in market_data.values()} == {'async'}
+    assert aggregator.sequential_calls == []
+
+
+class YieldingIndices(defaultdict):
+    """Indeks rotasi yang melepas GIL di antara baca dan tulis untuk memancing race."""
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        time.sleep(0.0005)
+        return value
+
+
+class OpenBreakers:
+    def allow_request(self, name):
+        return True
+
+
+def test_rotate_key_is_round_robin_across_threads():
+    aggregator = IntelligenceAggregator.__new__(IntelligenceAggregator)
+    aggregator.clients = {'etherscan_keys': ['k0', 'k1', 'k2', 'k3']}
+    aggregator.key_indices = YieldingIndices(int)
+    aggregator._key_lock = threading.Lock()
+    aggregator.circuit_breakers = OpenBreakers()
+    picked = []
+
+    def worker():
+        for _ in range(25):
+            picked.append(aggregator._rotate_key('etherscan'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Counter(picked) == {'k0': 50, 'k1': 50, 'k2': 50, 'k3': 50}
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.hosts = []
+
+    def acquire(self, host):
+        self.hosts.append(host)
+
+
+class FakeBinance:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ticker(self, symbol):
+        self.calls.append('fetch_ticker')
+        return {'last': 100.0, 'percentage': 1.0, 'baseVolume': 5.0}
+
+    def fetch_ohlcv(self, symbol, timeframe=None, since=None, limit=None):
+        self.calls.append('fetch_ohlcv')
+        return [[0, 1.0, 2.0, 0.5, 1.5, 10.0]]
+
+
+def test_detailed_market_data_takes_one_binance_token_per_call():
+    aggregator = IntelligenceAggregator.__new__(IntelligenceAggregator)
+    aggregator.clients = {'binance': FakeBinance()}
+    aggregator.rate_limiter = CountingLimiter()
+    aggregator.ohlcv_store = NullStore()
+    aggregator.ohlcv_timeframe = '1h'
+    aggregator.ohlcv_limit = 24
+
+    assert aggregator.get_detailed_market_data('BTC/USDT')['close_1h'] == 1.5
+    assert aggregator.clients['binance'].calls == ['fetch_ticker', 'fetch_ohlcv']
+    assert aggregator.rate_limiter.hosts == [BINANCE_HOST, BINANCE_HOST]
+
+    # Ticker dari snapshot: hanya OHLCV yang diminta, satu token
+    aggregator.rate_limiter.hosts.clear()
+    aggregator.get_detailed_market_data('BTC/USDT', ticker={'last': 100.0})
+    assert aggregator.rate_limiter.hosts == [BINANCE_HOST]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Pengujian LLMResponseCache: kunci konten, TTL, dan eviksi berdasarkan ukuran.
+
+import pytest
+
+from UTILS import llm_response_cache
+from UTILS.llm_response_cache import LLMResponseCache, normalize_prompt
+
+
+@pytest.fixture
+def cache(fresh_singleton, tmp_path):
+    cache = fresh_singleton(LLMResponseCache)
+    cache.configure({'llm_cache': {'path': str(tmp_path / 'llm_cache.sqlite3'), 'max_size_mb': 1,
+                                   'ttl_seconds': {'fast_sentiment_analysis': 60}}})
+    return cache
+
+
+def test_prompt_normalization_ignores_whitespace_and_unicode_width():
+    assert normalize_prompt('  Analisis\n\tBTC  ') == normalize_prompt('Analisis BTC')
+    assert normalize_prompt('ＢＴＣ') == 'BTC'
+
+
+def test_hit_does_not_depend_on_answering_model(cache):
+    cache.put('deep_market_analysis', 'prompt A', {'signal': 'BUY'}, model='google')
+    # Fallback acak memilih model lain untuk tugas & prompt yang sama
+    assert cache.get('deep_market_analysis', 'prompt  A') == {'signal': 'BUY'}
+    assert cache.get('fast_sentiment_analysis', 'prompt A') is None
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_failed_responses_are_not_stored(cache):
+    cache.put('deep_market_analysis', 'prompt', None, model='google')
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_entries_expire_after_task_ttl(cache, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_response_cache.time, 'time', lambda: now[0])
+    cache.put('fast_sentiment_analysis', 'prompt', {'s': 1})
+    now[0] += 59
+    assert cache.get('fast_sentiment_analysis', 'prompt') == {'s': 1}
+    now[0] += 2
+    assert cache.get('fast_sentiment_analysis', 'prompt') is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_size_limit_evicts_least_recently_used(cache, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_response_cache.time, 'time', lambda: now[0])
+    payload = 'x' * 300_000
+    for index in range(3):
+        now[0] += 1
+        cache.put('deep_market_analysis', f'prompt {index}', {'text': payload})
+    now[0] += 1
+    assert cache.get('deep_market_analysis', 'prompt 0') is not None   # prompt 0 baru diakses
+    now[0] += 1
+    cache.put('deep_market_analysis', 'prompt 3', {'text': payload})
+    assert cache.get('deep_market_analysis', 'prompt 1') is None
+    assert cache.get('deep_market_analysis', 'prompt 0') is not None
+    assert cache.get_stats()['size_bytes'] <= cache.max_size_bytes
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Pengujian eksekusi dewan LLMRouter: pemilihan model hedge dan pelepasan kunci yang dipesan.
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from AI_BRAIN.llm_router import LLMRouter
+from NEURAL_NETWORK.ai_api_manager.account_switcher import AccountSwitcher
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import QuotaMonitor, mask_key
+from UTILS.latency_histogram import LatencyHistogram
+
+
+def make_router(inventory, benched=()):
+    router = LLMRouter.__new__(LLMRouter)
+    router.model_inventory = inventory
+    router.model_latency = defaultdict(LatencyHistogram)
+    router.hedge_min_samples = 2
+    router.hedge_initial_delay = 20.0
+    router.rotated = []
+
+    def rotate_key(model_name):
+        router.rotated.append(model_name)
+        return None if model_name in benched else f"{model_name}-key"
+
+    router._rotate_key = rotate_key
+    return router
+
+
+def record(router, model_name, latency, samples=3):
+    for _ in range(samples):
+        router.model_latency[model_name].record(latency)
+
+
+def test_hedge_picks_lowest_latency_model():
+    router = make_router({'openai': ['k'], 'deepseek': ['k'], 'google': ['k']})
+    record(router, 'openai', 4.0)
+    record(router, 'deepseek', 1.0)
+    record(router, 'google', 2.0)
+    assert router._select_hedge_model({'anthropic'}) == ('deepseek', 'deepseek-key')
+
+
+def test_hedge_skips_models_with_all_keys_benched():
+    router = make_router({'openai': ['k'], 'deepseek': ['k'], 'google': ['k']}, benched={'deepseek'})
+    record(router, 'openai', 4.0)
+    record(router, 'deepseek', 1.0)
+    record(router, 'google', 2.0)
+    assert router._select_hedge_model(set()) == ('google', 'google-key')
+    assert router.rotated == ['deepseek', 'google']
+
+
+def test_hedge_none_when_every_alternative_is_benched():
+    router = make_router({'openai': ['k'], 'deepseek': ['k'], 'google': []}, benched={'deepseek'})
+    assert router._select_hedge_model({'openai'}) == (None, None)
+
+
+class NullCache:
+    def get(self, *args):
+        return None
+
+    def put(self, *args):
+        pass
+
+
+class SlowHedgeCache(NullCache):
+    """Cache tiruan yang lambat untuk permintaan kedua (hedge) saja."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def get(self, *args):
+        self.calls += 1
+        if self.calls > 1:
+            time.sleep(self.delay)
+        return None
+
+
+class BlockingWrapper:
+    """Wrapper tiruan: menunggu `release` sebelum menjawab."""
+
+    def __init__(self, release, delay=None):
+        self.release = release
+        self.delay = delay
+
+    def generate(self, prompt):
+        self.release.wait(self.delay if self.delay is not None else 5)
+        return {'ok': True}
+
+
+@pytest.fixture
+def council(fresh_singleton):
+    monitor = fresh_singleton(QuotaMonitor)
+    monitor.configure({'llm': {'quota': {'requests_per_minute': 10}}})
+    inventory = {'deepseek': ['deepseek-key-0001'], 'openai': ['openai-key-0002']}
+    router = LLMRouter.__new__(LLMRouter)
+    router.model_inventory = inventory
+    router.account_switcher = AccountSwitcher(inventory, monitor)
+    router.model_latency = defaultdict(LatencyHistogram)
+    router.response_cache = NullCache()
+    router.async_client = None
+    # Satu worker: tugas berikutnya mengantre dan bisa dibatalkan sebelum berjalan
+    router.executor = ThreadPoolExecutor(max_workers=1)
+    router.hedge_enabled = False
+    router.hedge_min_samples = 100
+    router.hedge_initial_delay = 0.05
+    released = threading.Event()
+    yield router, monitor, released
+    released.set()
+    router.executor.shutdown(wait=True)
+
+
+def requests_per_key(monitor):
+    return {label: stats['requests_last_minute'] for label, stats in monitor.get_stats().items()}
+
+
+def test_deadline_releases_keys_of_jobs_that_never_started(council):
+    router, monitor, released = council
+    router._get_wrapper = lambda model_name, api_key: BlockingWrapper(released)
+    jobs = {name: ('fast_sentiment_analysis', f"prompt {name}", None) for name in ('a', 'b', 'c')}
+
+    results = router._run_council_jobs(jobs, deadline=0.2)
+
+    assert results == {'a': None, 'b': None, 'c': None}
+    # Hanya permintaan pertama yang sempat dikirim; dua lainnya dibatalkan di antrean
+    assert requests_per_key(monitor)[mask_key('deepseek-key-0001')] == 1
+
+
+def test_winner_releases_key_of_unsent_hedge(council):
+    router, monitor, released = council
+    router.hedge_enabled = True
+    # Hedge masih mengantre atau masih di cache saat jawaban pertama menang: tidak boleh terkirim
+    router.response_cache = SlowHedgeCache(0.3)
+    router._get_wrapper = lambda model_name, api_key: BlockingWrapper(released, delay=0.2)
+
+    results = router._run_council_jobs({'a': ('fast_sentiment_analysis', 'prompt', None)}, deadline=5)
+
+    assert results == {'a': {'ok': True}}
+    usage = requests_per_key(monitor)
+    assert usage[mask_key('deepseek-key-0001')] == 1
+    assert usage[mask_key('openai-key-0002')] == 0
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Pengujian NewsDeduplicator: ambang kemiripan, indeks persisten, dan kedaluwarsa kandidat tertunda.
+
+import pytest
+
+from PERCEPTION_SYSTEM.global_intelligence import news_deduplicator
+from PERCEPTION_SYSTEM.global_intelligence.news_deduplicator import NewsDeduplicator
+
+BASE = "Bitcoin ETF sees record weekly inflows as institutions pile into spot funds"
+NEAR = "Bitcoin ETF sees record weekly inflows as institutions pile into spot funds again"
+OTHER = "Ethereum developers schedule the Pectra network upgrade for early spring"
+
+
+class FakeOrchestrator:
+    def __init__(self, tmp_path, **overrides):
+        self.config = {'news_dedup': {'index_path': str(tmp_path / 'news_fingerprints.npz'), **overrides}}
+
+
+def item(item_id, text):
+    return {'id': item_id, 'text': text}
+
+
+def test_similarity_separates_near_duplicates_from_other_stories(tmp_path):
+    dedup = NewsDeduplicator(FakeOrchestrator(tmp_path))
+    base = dedup.signature(BASE)
+
+    assert dedup.similarity(base, dedup.signature(BASE.upper() + '!')) == 1.0
+    assert dedup.similarity(base, dedup.signature(NEAR)) >= dedup.similarity_threshold
+    assert dedup.similarity(base, dedup.signature(OTHER)) < dedup.similarity_threshold
+
+
+def test_near_duplicates_inside_batch_are_dropped(tmp_path):
+    dedup = NewsDeduplicator(FakeOrchestrator(tmp_path))
+    novel = dedup.filter_novel([item('a', BASE), item('b', NEAR), item('c', OTHER)])
+    assert [entry['id'] for entry in novel] == ['a', 'c']
+
+
+def test_threshold_one_keeps_near_duplicates(tmp_path):
+    dedup = NewsDeduplicator(FakeOrchestrator(tmp_path, similarity_threshold=1.0))
+    novel = dedup.filter_novel([item('a', BASE), item('b', NEAR)])
+    assert [entry['id'] for entry in novel] == ['a', 'b']
+
+
+def test_remembered_stories_persist_across_instances(tmp_path):
+    dedup = NewsDeduplicator(FakeOrchestrator(tmp_path))
+    dedup.filter_novel([item('a', BASE), item('c', OTHER)])
+    dedup.remember(['a'])
+
+    reloaded = NewsDeduplicator(FakeOrchestrator(tmp_path))
+    novel = reloaded.filter_novel([item('b', NEAR), item('c', OTHER)])
+    assert [entry['id'] for entry in novel] == ['c']
+
+
+def test_unremembered_pending_entries_expire(tmp_path, monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(news_deduplicator.time, 'time', lambda: clock[0])
+    dedup = NewsDeduplicator(FakeOrchestrator(tmp_path, pending_ttl_seconds=60))
+
+    dedup.filter_novel([item('a', BASE)])
+    assert 'a' in dedup._pending
+    clock[0] += 61
+    dedup.filter_novel([item('c', OTHER)])
+
+    assert 'a' not in dedup._pending
+    assert 'c' in dedup._pending
+
+
+def test_num_perm_must_divide_into_bands(tmp_path):
+    with pytest.raises(ValueError):
+        NewsDeduplicator(FakeOrchestrator(tmp_path, num_perm=64, bands=10))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Pengujian OHLCVHistoryCache: pengisian awal, ekor inkremental, dan deteksi celah setelah pemadaman.
+
+import numpy as np
+
+from COLLECTIVE_MEMORY.ohlcv_history_cache import OHLCVHistoryCache
+from tests.conftest import make_ohlcv
+
+STEP = 3_600_000
+START = 1_700_000_000_000
+
+
+class Source:
+    """Sumber palsu: `bars` adalah seluruh riwayat; `window` membatasi jangkauan tiap permintaan."""
+
+    def __init__(self, bars, window=None):
+        self.bars = np.asarray(bars, dtype=float)
+        self.window = window
+        self.calls = []
+
+    def fetch(self, since_ms):
+        self.calls.append(since_ms)
+        bars = self.bars
+        if self.window is not None:
+            bars = bars[-self.window:]
+        if since_ms is not None:
+            bars = bars[bars[:, 0] >= since_ms]
+        return bars
+
+
+def make_cache(tmp_path, **settings):
+    config = {'history_cache': {'cache_dir': str(tmp_path / 'ohlcv_history'), 'min_refresh_seconds': 0, **settings}}
+    return OHLCVHistoryCache(config)
+
+
+def test_initial_fill_then_tail_only(tmp_path):
+    cache = make_cache(tmp_path)
+    history = np.array(make_ohlcv(60, start_ms=START, step_ms=STEP))
+    source = Source(history[:50])
+
+    first = cache.get('test', 'BTC', '1h', START, source.fetch)
+    assert len(first) == 50
+
+    # Bar terakhir masih terbentuk (close berubah) dan 10 bar baru muncul
+    updated = history.copy()
+    updated[49, 4] += 1.0
+    source.bars = updated
+    second = cache.get('test', 'BTC', '1h', START, source.fetch)
+
+    assert source.calls == [None, history[49, 0]]
+    assert len(second) == 60
+    np.testing.assert_array_equal(second, updated)
+    assert cache.gaps('test', 'BTC', '1h') == []
+
+
+def test_tail_not_contiguous_refetches_window_and_records_gap(tmp_path):
+    cache = make_cache(tmp_path)
+    history = np.array(make_ohlcv(200, start_ms=START, step_ms=STEP))
+    source = Source(history[:50], window=50)
+    cache.get('test', 'BTC', '1h', START, source.fetch)
+
+    # Pemadaman panjang: sumber hanya menjangkau 50 bar terakhir dari 200
+    source.bars = history
+    bars = cache.get('test', 'BTC', '1h', START, source.fetch)
+
+    assert source.calls == [None, history[49, 0], None]
+    assert len(bars) == 100
+    np.testing.assert_array_equal(bars[-50:], history[-50:])
+    assert cache.gaps('test', 'BTC', '1h') == [[history[49, 0], history[150, 0]]]
+
+
+def test_tail_reaching_back_is_merged_without_gap(tmp_path):
+    cache = make_cache(tmp_path)
+    history = np.array(make_ohlcv(120, start_ms=START, step_ms=STEP))
+    source = Source(history[:50])
+    cache.get('test', 'BTC', '1h', START, source.fetch)
+
+    source.bars = history
+    bars = cache.get('test', 'BTC', '1h', START, source.fetch)
+
+    np.testing.assert_array_equal(bars, history)
+    assert cache.gaps('test', 'BTC', '1h') == []
+
+
+def test_offline_and_failed_fetch_return_cached_bars(tmp_path):
+    history = np.array(make_ohlcv(30, start_ms=START, step_ms=STEP))
+    make_cache(tmp_path).get('test', 'BTC', '1h', START, Source(history).fetch)
+
+    def failing(since_ms):
+        raise ConnectionError("offline")
+
+    assert len(make_cache(tmp_path).get('test', 'BTC', '1h', START, failing)) == 30
+    offline_source = Source(history)
+    assert len(make_cache(tmp_path, offline=True).get('test', 'BTC', '1h', START, offline_source.fetch)) == 30
+    assert offline_source.calls == []
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Tes ring buffer OHLCV: wraparound, penggantian candle terbentuk, dan snapshot disk.
+import numpy as np
+import pytest
+
+from PERCEPTION_SYSTEM.ohlcv_store import OHLCVRingBuffer, OHLCVStore, timeframe_seconds
+from tests.conftest import make_ohlcv
+
+
+def test_view_stays_contiguous_across_wraparound():
+    rows = make_ohlcv(25)
+    buffer = OHLCVRingBuffer(8)
+    for start in range(0, 25, 3):
+        buffer.extend(rows[start:start + 3])
+        expected = rows[max(0, min(start + 3, 25) - 8):start + 3]
+        assert len(buffer) == len(expected)
+        assert np.array_equal(buffer.view(), expected)
+    assert buffer.last_timestamp == rows[-1, 0]
+    assert np.array_equal(buffer.view(5), rows[-5:])
+    assert np.array_equal(buffer.column('close'), rows[-8:, 4])
+
+
+def test_extend_larger_than_capacity_keeps_latest_bars():
+    rows = make_ohlcv(20)
+    buffer = OHLCVRingBuffer(6)
+    assert buffer.extend(rows) == 6
+    assert np.array_equal(buffer.view(), rows[-6:])
+
+
+def test_forming_candle_is_replaced_and_stale_bars_ignored():
+    rows = make_ohlcv(10)
+    buffer = OHLCVRingBuffer(4)
+    buffer.extend(rows[:9])
+    forming = rows[8].copy()
+    forming[4] *= 1.5
+    # Bar lama diabaikan, bar dengan timestamp sama menggantikan bar terakhir
+    assert buffer.extend(np.vstack([rows[3], forming])) == 0
+    assert buffer.view()[-1, 4] == forming[4]
+    assert buffer.extend(rows[9:]) == 1
+    assert np.array_equal(buffer.view()[:-2], rows[6:8])
+    assert np.array_equal(buffer.view()[-2], forming)
+
+
+def test_view_is_read_only():
+    buffer = OHLCVRingBuffer(4)
+    buffer.extend(make_ohlcv(3))
+    with pytest.raises(ValueError):
+        buffer.view()[0, 4] = 0.0
+
+
+def test_snapshot_roundtrip_after_wraparound(fresh_singleton, tmp_path):
+    rows = make_ohlcv(30, base=0.0005)
+    store = fresh_singleton(OHLCVStore)
+    store.settings['capacity'] = 12
+    store.update('PEPE/USDT', '1h', rows[:20])
+    store.update('PEPE/USDT', '1h', rows[20:])
+    store.update('BTC/USDT', '4h', make_ohlcv(5, step_ms=4 * 3_600_000, seed=1))
+    path = tmp_path / 'ohlcv_store.npz'
+    store.save(path)
+
+    restored = fresh_singleton(OHLCVStore)
+    restored.settings['capacity'] = 12
+    restored.load(path)
+    assert np.array_equal(restored.view('PEPE/USDT', '1h'), rows[-12:])
+    assert len(restored.view('BTC/USDT', '4h')) == 5
+    assert restored.view('ETH/USDT', '1h') is None
+
+
+def test_timeframe_seconds():
+    assert timeframe_seconds('15m') == 900
+    assert timeframe_seconds('4h') == 14400
+    with pytest.raises(ValueError):
+        timeframe_seconds('1y')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Pengujian PerceptionSystem.scan: tahap data pasar memakai IntelligenceAggregator.
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('googleapiclient')
+
+from PERCEPTION_SYSTEM import perception_system as perception_module
+from PERCEPTION_SYSTEM.perception_system import PerceptionSystem
+
+
+class FakeAggregator:
+    instances = []
+
+    def __init__(self, orchestrator):
+        self.orchestrator = orchestrator
+        self.calls = []
+        self.closed = False
+        FakeAggregator.instances.append(self)
+
+    def aggregate_market_data(self, symbols):
+        self.calls.append(list(symbols))
+        return {symbol: {'symbol': symbol, 'price': 100.0 + i} for i, symbol in enumerate(symbols)}
+
+    def close(self):
+        self.closed = True
+
+
+class Unavailable:
+    """Pengganti komponen yang tidak diuji di sini (on-chain, berita, Drive)."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def perception(monkeypatch):
+    FakeAggregator.instances = []
+    monkeypatch.setattr(perception_module, 'IntelligenceAggregator', FakeAggregator)
+    for name in ('GDriveSynchronizer', 'OnChainCollector', 'OnChainMetricGenerator', 'NewsAggregator', 'IntelligentScraper'):
+        monkeypatch.setattr(perception_module, name, Unavailable)
+    orchestrator = SimpleNamespace(
+        # APIManager tidak punya aggregate_market_data; tahap pasar tidak boleh bergantung padanya
+        api_manager=object(),
+        secrets={},
+        config={
+            'market': {'assets': ['BTC/USDT', 'ETH/USDT']},
+            'perception': {'incremental_delta': False},
+            'archive': {'background_upload': False},
+        },
+    )
+    system = PerceptionSystem(orchestrator)
+    system.onchain_collector = system.metric_generator = system.news_aggregator = None
+    yield system
+    system.close()
+
+
+@pytest.mark.parametrize('concurrent', [True, False])
+def test_scan_market_stage_uses_intelligence_aggregator(perception, concurrent):
+    perception.concurrent_scan = concurrent
+    snapshot = perception.scan()
+
+    aggregator = FakeAggregator.instances[-1]
+    assert aggregator.calls == [['BTC/USDT', 'ETH/USDT']]
+    assert snapshot['sources']['market_data'] == 'success'
+    assert snapshot['market_data']['ETH/USDT']['price'] == 101.0
+    assert not [error for error in snapshot['errors'] if error['component'] == 'market_data']
+
+
+def test_scan_specific_symbols(perception):
+    snapshot = perception.scan(specific_symbols=['SOL/USDT'])
+    assert FakeAggregator.instances[-1].calls == [['SOL/USDT']]
+    assert list(snapshot['market_data']) == ['SOL/USDT']
+
+
+def test_close_releases_intelligence_aggregator(perception):
+    perception.close()
+    assert FakeAggregator.instances[-1].closed
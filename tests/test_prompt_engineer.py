@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Pengujian prompt_engineer: pembagian batch artikel, pemetaan respons batch, dan pemadatan laporan.
+
+import json
+
+import numpy as np
+
+from AI_BRAIN.prompt_engineer import (
+    abbreviate_key, build_batch_prompt, compact_report, estimate_tokens, parse_batch_response,
+    split_into_batches,
+)
+
+
+def articles(count, length=400):
+    return [{'id': f'a{i}', 'text': chr(ord('a') + i % 26) * length} for i in range(count)]
+
+
+def test_batches_fit_token_budget_and_keep_order():
+    items = articles(10)
+    batches = split_into_batches('risk_scenario', items, token_budget=600, max_chars=400)
+    assert [a['id'] for batch in batches for a in batch] == [a['id'] for a in items]
+    assert len(batches) > 1
+    for batch in batches:
+        assert estimate_tokens(build_batch_prompt('risk_scenario', batch, 400)) <= 600
+
+
+def test_batches_respect_article_cap_and_oversized_articles():
+    assert [len(b) for b in split_into_batches('t', articles(5, 10), 100000, max_articles_per_batch=2)] == [2, 2, 1]
+    # Artikel yang melebihi anggaran sendirian tetap dikirim sebagai batch tunggal
+    assert [len(b) for b in split_into_batches('t', articles(2, 5000), 50, max_chars=5000)] == [1, 1]
+
+
+def test_batch_prompt_labels_and_truncates_articles():
+    prompt = build_batch_prompt('fast_sentiment_analysis', articles(2, 50), max_chars=10)
+    assert '### ARTICLE id=a0\n' + 'a' * 10 + '\n' in prompt
+    assert 'a' * 11 not in prompt
+
+
+def test_parse_batch_response_maps_reports_by_id():
+    response = [{'id': 'a1', 'confidence': 0.4}, {'id': 'a0', 'confidence': 0.9}, {'id': 'zz'}, 'junk']
+    assert parse_batch_response(response, ['a0', 'a1', 'a2']) == {
+        'a0': {'confidence': 0.9}, 'a1': {'confidence': 0.4}, 'a2': None,
+    }
+
+
+def test_parse_batch_response_accepts_wrapped_and_keyed_forms():
+    assert parse_batch_response({'results': [{'id': 7, 'x': 1}]}, [7]) == {'7': {'x': 1}}
+    assert parse_batch_response({'a0': {'x': 1}, 'a1': 'bad'}, ['a0', 'a1']) == {'a0': {'x': 1}, 'a1': None}
+    assert parse_batch_response(None, ['a0']) == {'a0': None}
+
+
+REPORT = {
+    'technical': {
+        'momentum_indicators': {'rsi': 61.23456789, 'macd': np.float64(0.000012345678), 'volume_anomaly': False},
+        'candlestick_patterns': {'recent_pattern': 'Data dummy: tidak ada pola.'},
+        'summary': 'Tren naik dengan volume yang menguat di atas rata-rata dua puluh hari terakhir. ' * 3,
+    },
+    'fundamental': {'notes': ['n/a', 'Adopsi institusional meningkat'], 'score': float('nan')},
+    'macro': {'inflation_rate': 3.1, 'policy': 'Suku bunga ditahan ' * 20},
+}
+
+
+def test_compact_report_abbreviates_rounds_and_drops_placeholders():
+    text, tokens, dropped = compact_report(REPORT, token_budget=10000, precision=4)
+    data = json.loads(text)
+    assert dropped == []
+    assert tokens == estimate_tokens(text)
+    technical = data['technical']
+    assert technical['mom_ind'] == {'rsi': 61.23, 'macd': 1.235e-05, 'vol_anomaly': False}
+    assert 'candle_pat' not in technical                  # hanya berisi placeholder
+    assert data['fundamental'] == {'notes': ['Adopsi institusional meningkat']}   # NaN dan 'n/a' dibuang
+    assert abbreviate_key('momentum_indicators') == 'mom_ind'
+
+
+def test_compact_report_shrinks_text_before_dropping_sections():
+    full_tokens = compact_report(REPORT, token_budget=10000)[1]
+    text, tokens, dropped = compact_report(REPORT, token_budget=full_tokens // 2)
+    assert dropped == []
+    assert tokens <= full_tokens // 2
+    assert json.loads(text)['technical']['mom_ind']['rsi'] == 61.23
+
+
+def test_compact_report_drops_lowest_priority_sections_last():
+    text, tokens, dropped = compact_report(REPORT, token_budget=20)
+    # 'fundamental' sudah kosong setelah teks dibuang; 'macro' (prioritas terendah) dihilangkan
+    assert dropped == ['macro']
+    assert list(json.loads(text)) == ['technical']
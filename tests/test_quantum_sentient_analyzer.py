@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Pengujian QuantumSentientAnalyzer.compute_indicators dengan riwayat dari OHLCVStore.
+
+import threading
+
+import numpy as np
+
+from ANALYTICS_CORE.quantum_sentient_analyzer import QuantumSentientAnalyzer
+from ANALYTICS_CORE.technical_indicators import IndicatorEngine
+from PERCEPTION_SYSTEM.ohlcv_store import OHLCVStore
+from tests.conftest import make_ohlcv
+
+
+def make_analyzer(store):
+    # Tanpa orkestrator/LLMRouter: hanya atribut yang dipakai compute_indicators
+    analyzer = QuantumSentientAnalyzer.__new__(QuantumSentientAnalyzer)
+    analyzer.indicator_engine = IndicatorEngine()
+    analyzer.indicator_timeframe = '1h'
+    analyzer._indicator_lock = threading.Lock()
+    analyzer.ohlcv_store = store
+    return analyzer
+
+
+def test_compute_indicators_from_store_views(fresh_singleton):
+    store = fresh_singleton(OHLCVStore)
+    store.update('BTC/USDT', '1h', make_ohlcv(120, seed=1, base=60000))
+    store.update('ETH/USDT', '1h', make_ohlcv(120, seed=2, base=3000))
+    analyzer = make_analyzer(store)
+    snapshot = {'market_data': {'BTC/USDT': {'price': 60000}, 'ETH/USDT': {'price': 3000}}}
+
+    # View store berupa ndarray, bukan list
+    assert isinstance(store.views(snapshot['market_data'], '1h')['BTC/USDT'], np.ndarray)
+    indicators = analyzer.compute_indicators(snapshot)
+
+    assert set(indicators) == {'BTC/USDT', 'ETH/USDT'}
+    for symbol in indicators:
+        assert 0 <= indicators[symbol]['rsi'] <= 100
+        assert indicators[symbol]['atr'] > 0
+        assert indicators[symbol]['close'] == store.view(symbol, '1h')[-1, 4]
+
+
+def test_compute_indicators_incremental_after_store_update(fresh_singleton):
+    store = fresh_singleton(OHLCVStore)
+    bars = make_ohlcv(121, seed=3)
+    store.update('SOL/USDT', '1h', bars[:120])
+    store.update('XRP/USDT', '1h', make_ohlcv(121, seed=4)[:120])
+    analyzer = make_analyzer(store)
+    snapshot = {'market_data': {'SOL/USDT': {}, 'XRP/USDT': {}}}
+    analyzer.compute_indicators(snapshot)
+
+    store.update('SOL/USDT', '1h', bars[120:])
+    indicators = analyzer.compute_indicators(snapshot)
+    assert indicators['SOL/USDT']['close'] == bars[-1, 4]
+
+
+def test_compute_indicators_falls_back_to_snapshot_ohlcv(fresh_singleton):
+    store = fresh_singleton(OHLCVStore)
+    analyzer = make_analyzer(store)
+    snapshot = {'market_data': {'ADA/USDT': {'ohlcv': make_ohlcv(60, seed=5).tolist()}}}
+    indicators = analyzer.compute_indicators(snapshot)
+    assert indicators['ADA/USDT']['rsi'] is not None
+
+
+def test_describe_indicators_keeps_sub_cent_prices(fresh_singleton):
+    store = fresh_singleton(OHLCVStore)
+    store.update('PEPE/USDT', '1h', make_ohlcv(120, seed=3, base=0.00001234))
+    analyzer = make_analyzer(store)
+    analyzer.numeric_precision = 5
+    indicators = analyzer.compute_indicators({'market_data': {'PEPE/USDT': {'price': 0.00001234}}})['PEPE/USDT']
+
+    _, _, momentum, volatility, volume_profile = analyzer._describe_indicators(indicators, 0.00001234)
+
+    bands = volatility['bollinger_bands']
+    assert 0 < bands['lower'] < bands['middle'] < bands['upper'] < 0.0001
+    assert volatility['atr_1h'] > 0
+    assert volatility['moving_average']['sma_20'] > 0
+    assert volume_profile['poc'] > 0
+    assert momentum['macd'] != 0
+    assert bands['middle'] == float(f"{indicators['bb_middle']:.5g}")
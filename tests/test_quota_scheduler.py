@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Pengujian QuotaMonitor dan AccountSwitcher: jendela kuota, istirahat 429/403, dan pemilihan kunci.
+
+import threading
+from collections import Counter
+
+import pytest
+
+from NEURAL_NETWORK.ai_api_manager import quota_monitor
+from NEURAL_NETWORK.ai_api_manager.account_switcher import AccountSwitcher
+from NEURAL_NETWORK.ai_api_manager.quota_monitor import QuotaMonitor, mask_key, retry_after_from_headers
+
+KEYS = ['key-aaaaaaaa-1', 'key-bbbbbbbb-2', 'key-cccccccc-3']
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.wall = 1_700_000_000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.wall
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(quota_monitor, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def monitor(fresh_singleton, clock):
+    monitor = fresh_singleton(QuotaMonitor)
+    monitor.configure({'llm': {'quota': {
+        'requests_per_minute': 4,
+        'tokens_per_minute': 1000,
+        'models': {'google': {'requests_per_minute': 2}},
+    }}})
+    return monitor
+
+
+def test_headroom_tracks_requests_and_tokens_in_window(monitor, clock):
+    key = KEYS[0]
+    assert monitor.headroom('openrouter', key) == 1.0
+    monitor.record_request(key)
+    assert monitor.headroom('openrouter', key) == pytest.approx(0.75)
+    assert monitor.headroom('google', key) == pytest.approx(0.5)
+
+    monitor.record_success(key, tokens=900)
+    assert monitor.headroom('openrouter', key) == pytest.approx(0.1)
+
+    clock.now += 61
+    assert monitor.headroom('openrouter', key) == 1.0
+
+
+def test_cancelled_reservation_frees_quota(monitor):
+    token = monitor.record_request(KEYS[0])
+    monitor.cancel_request(KEYS[0], token)
+    assert monitor.headroom('openrouter', KEYS[0]) == 1.0
+
+
+def test_cancel_removes_exactly_that_reservation(monitor, clock):
+    first = monitor.record_request(KEYS[0])
+    clock.now += 30
+    monitor.record_request(KEYS[0])
+    monitor.cancel_request(KEYS[0], first)
+    monitor.cancel_request(KEYS[0], first)   # dua kali: tetap hanya satu yang terhapus
+    clock.now += 31
+    # Reservasi kedua masih di jendela meski yang pertama dibatalkan lebih dulu
+    assert monitor.headroom('openrouter', KEYS[0]) == pytest.approx(0.75)
+
+
+def test_rate_limit_and_forbidden_bench_keys(monitor, clock):
+    monitor.record_rate_limit(KEYS[0], 429, retry_after=10)
+    monitor.record_rate_limit(KEYS[1], 403)
+    assert monitor.headroom('openrouter', KEYS[0]) == 0.0
+    clock.now += 11
+    assert monitor.headroom('openrouter', KEYS[0]) > 0
+    assert monitor.headroom('openrouter', KEYS[1]) == 0.0
+    assert monitor.get_stats()[mask_key(KEYS[1])]['bench_reason'] == 'HTTP 403'
+
+
+def test_repeated_errors_bench_then_give_a_fresh_start(monitor, clock):
+    for _ in range(5):
+        monitor.record_failure(KEYS[0])
+    assert monitor.headroom('openrouter', KEYS[0]) == 0.0
+    clock.now += QuotaMonitor.DEFAULT_SETTINGS['error_bench_seconds'] + 1
+    assert monitor.headroom('openrouter', KEYS[0]) == pytest.approx(0.75)
+
+
+def test_retry_after_headers(clock):
+    assert retry_after_from_headers({'Retry-After': '12'}) == 12.0
+    assert retry_after_from_headers({'x-ratelimit-reset': str((clock.wall + 30) * 1000)}) == pytest.approx(30.0)
+    assert retry_after_from_headers({'Retry-After': 'Tue, 14 Nov 2023 22:13:50 GMT'}) == pytest.approx(30.0)
+    assert retry_after_from_headers({}) is None
+
+
+def test_switcher_spreads_load_and_skips_benched_keys(monitor):
+    switcher = AccountSwitcher({'openrouter': KEYS}, monitor)
+    picked = [switcher.acquire('openrouter').api_key for _ in range(3)]
+    assert sorted(picked) == sorted(KEYS)
+
+    monitor.record_rate_limit(KEYS[0], 429, retry_after=60)
+    picked = [switcher.acquire('openrouter').api_key for _ in range(6)]
+    assert KEYS[0] not in picked
+    assert switcher.acquire('openrouter') is None   # kuota dua kunci lainnya habis (4/menit)
+
+
+def test_switcher_returns_none_without_keys(monitor):
+    assert AccountSwitcher({'google': []}, monitor).acquire('google') is None
+
+
+def test_release_returns_only_unsent_reservations(monitor):
+    switcher = AccountSwitcher({'openrouter': KEYS[:1]}, monitor)
+    sent, dropped = switcher.acquire('openrouter'), switcher.acquire('openrouter')
+    assert switcher.claim(sent)
+    switcher.release(sent)        # sudah dikirim: kuota tetap terpakai
+    switcher.release(dropped)
+    switcher.release(dropped)
+    assert not switcher.claim(dropped)
+    assert monitor.headroom('openrouter', KEYS[0]) == pytest.approx(0.75)
+
+
+def test_switcher_is_fair_across_threads(monitor):
+    monitor.configure({'llm': {'quota': {'requests_per_minute': 1000}}})
+    switcher = AccountSwitcher({'openrouter': KEYS}, monitor)
+    picked = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(20):
+            key = switcher.acquire('openrouter').api_key
+            with lock:
+                picked.append(key)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Counter(picked) == {key: 40 for key in KEYS}
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Pengujian TokenBucket dan RateLimiter: pengisian ulang token, utang token, dan batas per host.
+
+import asyncio
+
+import pytest
+
+from UTILS import rate_limiter
+from UTILS.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Pengganti modul `time`: sleep() memajukan monotonic() tanpa menunggu."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def test_burst_is_free_then_callers_wait_for_refill(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 100
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_reservations_queue_up_as_debt(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    # Tanpa menunggu: setiap reservasi menambah utang sehingga pemanggil berikutnya menunggu lebih lama
+    waits = [bucket._reserve(1.0) for _ in range(4)]
+    assert waits == [0.0, pytest.approx(1.0), pytest.approx(2.0), pytest.approx(3.0)]
+    clock.now += 3.0
+    assert bucket._reserve(1.0) == pytest.approx(1.0)
+
+
+def test_zero_rate_means_unlimited(clock):
+    bucket = TokenBucket(rate=0, burst=1)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+    assert clock.sleeps == []
+
+
+def test_acquire_async_does_not_block_event_loop(clock, monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_sleep)
+    bucket = TokenBucket(rate=4.0, burst=1)
+
+    async def run():
+        return [await bucket.acquire_async() for _ in range(2)]
+
+    assert asyncio.run(run()) == [0.0, pytest.approx(0.25)]
+    assert slept == [pytest.approx(0.25)]
+    assert clock.sleeps == []
+
+
+def test_per_host_limits_and_url_hosts(clock, fresh_singleton):
+    limiter = fresh_singleton(RateLimiter)
+    limiter.configure({'rate_limits': {
+        'default': {'requests_per_second': 10.0, 'burst': 5},
+        'api.coingecko.com': {'requests_per_second': 0.5, 'burst': 1},
+    }})
+
+    assert limiter.acquire('https://api.coingecko.com/api/v3/ping') == 0.0
+    assert limiter.acquire('api.coingecko.com') == pytest.approx(2.0)
+    assert limiter.get_bucket('api.coingecko.com') is limiter.get_bucket('api.coingecko.com')
+    assert limiter.get_bucket('example.org').rate == 10.0
+
+
+def test_changed_default_rebuilds_buckets_using_default(clock, fresh_singleton):
+    limiter = fresh_singleton(RateLimiter)
+    limiter.configure({'rate_limits': {'api.binance.com': {'requests_per_second': 20.0, 'burst': 40}}})
+    binance = limiter.get_bucket('api.binance.com')
+    other = limiter.get_bucket('example.org')
+
+    limiter.configure({'rate_limits': {'default': {'requests_per_second': 1.0, 'burst': 2}}})
+
+    assert limiter.get_bucket('api.binance.com') is binance
+    assert limiter.get_bucket('example.org') is not other
+    assert limiter.get_bucket('example.org').rate == 1.0
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Pengujian ResponseCache: TTL per endpoint, stale-while-revalidate, dan eviksi LRU.
+
+import pytest
+
+from UTILS import response_cache
+from UTILS.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class InlineExecutor:
+    """Menjalankan pembaruan latar belakang secara langsung (deterministik)."""
+
+    def submit(self, func, *args):
+        func(*args)
+
+
+class Source:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'price': self.calls}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(fresh_singleton, clock):
+    cache = fresh_singleton(ResponseCache)
+    cache.configure({'response_cache': {
+        'default_ttl_seconds': 60,
+        'max_stale_seconds': 30,
+        'ttl_seconds': {'coingecko': 20, 'coingecko/simple/price': 5},
+    }})
+    cache._executor = InlineExecutor()
+    return cache
+
+
+def test_ttl_rules_prefer_endpoint_then_provider(cache):
+    assert cache.get_ttl('coingecko', '/simple/price/') == 5
+    assert cache.get_ttl('coingecko', 'coins/list') == 20
+    assert cache.get_ttl('binance', 'ticker') == 60
+
+
+def test_key_ignores_param_order(cache):
+    assert cache.make_key('p', '/a/', {'x': 1, 'y': 2}) == cache.make_key('p', 'a', {'y': 2, 'x': 1})
+
+
+def test_fresh_hit_then_stale_served_while_refreshing(cache, clock):
+    source = Source()
+    assert cache.get_or_fetch('coingecko', 'simple/price', {'ids': 'btc'}, source) == {'price': 1}
+    assert cache.get_or_fetch('coingecko', 'simple/price', {'ids': 'btc'}, source) == {'price': 1}
+    assert source.calls == 1
+
+    clock.now += 10
+    # Kedaluwarsa tetapi masih dalam jendela stale: nilai lama disajikan, pembaruan berjalan
+    assert cache.get_or_fetch('coingecko', 'simple/price', {'ids': 'btc'}, source) == {'price': 1}
+    assert source.calls == 2
+    assert cache.get_or_fetch('coingecko', 'simple/price', {'ids': 'btc'}, source) == {'price': 2}
+
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['stale_hits'], stats['misses'], stats['refreshes']) == (2, 1, 1, 1)
+    assert stats['providers']['coingecko']['hits'] == 2
+
+
+def test_entry_past_stale_window_is_refetched(cache, clock):
+    source = Source()
+    cache.get_or_fetch('coingecko', 'simple/price', None, source)
+    clock.now += 5 + 30 + 1
+    assert cache.get_or_fetch('coingecko', 'simple/price', None, source) == {'price': 2}
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_none_and_exceptions_are_not_cached(cache):
+    assert cache.get_or_fetch('p', 'e', None, lambda: None) is None
+
+    def failing():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch('p', 'e', None, failing)
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_lru_eviction_by_entry_count(fresh_singleton, clock):
+    cache = fresh_singleton(ResponseCache)
+    cache.configure({'response_cache': {'max_entries': 2}})
+    for name in ('a', 'b'):
+        cache.get_or_fetch('p', name, None, lambda: name)
+    cache.get_or_fetch('p', 'a', None, lambda: 'fresh a')   # 'a' menjadi yang terbaru dipakai
+    cache.get_or_fetch('p', 'c', None, lambda: 'c')
+
+    assert cache.get_or_fetch('p', 'a', None, lambda: 'miss') == 'a'
+    assert cache.get_or_fetch('p', 'b', None, lambda: 'miss') == 'miss'
+    assert cache.get_stats()['evictions'] >= 1
+
+
+def test_invalidate_by_provider(cache):
+    cache.get_or_fetch('coingecko', 'a', None, lambda: 1)
+    cache.get_or_fetch('binance', 'a', None, lambda: 2)
+    cache.invalidate('coingecko')
+    assert cache.get_stats()['entries'] == 1
+    assert cache.get_or_fetch('binance', 'a', None, lambda: 'miss') == 2
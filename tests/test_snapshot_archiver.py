@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Pengujian SnapshotArchiver: spool hanya berisi snapshot, file tidak valid dikarantina.
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from COLLECTIVE_MEMORY.snapshot_archiver import SnapshotArchiver
+
+
+class FakeDrive:
+    def __init__(self):
+        self.uploaded = []
+
+    def upload_file(self, path, name, folder_id, mimetype=None):
+        self.uploaded.append(name)
+        return True
+
+
+def make_archiver(tmp_path, drive):
+    config = {'archive': {
+        'format': 'parquet',
+        'spool_dir': str(tmp_path / 'spool'),
+        # Batch hanya di-flush secara eksplisit oleh tes
+        'batch_size': 1000,
+        'batch_interval_seconds': 3600,
+        'parquet': {'directory': str(tmp_path / 'parquet'), 'partition': 'hourly'},
+    }}
+    return SnapshotArchiver(SimpleNamespace(config=config), drive, 'folder-id')
+
+
+def snapshot(hour):
+    return {'timestamp': f"2020-01-01T{hour:02d}:30:00Z", 'market_data': {'BTC/USDT': {'price': 100.0 + hour}}}
+
+
+def test_manifest_lives_outside_spool_and_survives_restart(tmp_path):
+    drive = FakeDrive()
+    archiver = make_archiver(tmp_path, drive)
+    archiver.enqueue(snapshot(1))
+    archiver.close()
+    assert drive.uploaded == ['perception_20200101_01.parquet']
+    assert (tmp_path / 'parquet' / 'uploaded_parquet.json').exists()
+    assert list((tmp_path / 'spool').glob('*.json')) == []
+
+    # Setelah restart, manifest tidak ikut dianggap snapshot tertunda
+    restarted = make_archiver(tmp_path, drive)
+    assert restarted._pending_files == []
+    restarted.enqueue(snapshot(2))
+    restarted.close()
+    assert drive.uploaded == ['perception_20200101_01.parquet', 'perception_20200101_02.parquet']
+    assert len(restarted.parquet_archive.read_table()) == 2
+
+
+def test_legacy_manifest_in_spool_is_moved(tmp_path):
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    (spool / 'uploaded_parquet.json').write_text(json.dumps(['perception_20200101_01.parquet']))
+    archiver = make_archiver(tmp_path, FakeDrive())
+    assert archiver._pending_files == []
+    assert not (spool / 'uploaded_parquet.json').exists()
+    manifest = tmp_path / 'parquet' / 'uploaded_parquet.json'
+    assert json.loads(manifest.read_text()) == ['perception_20200101_01.parquet']
+    archiver.close()
+
+
+def test_invalid_spool_files_are_quarantined_without_blocking_batch(tmp_path):
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    (spool / '20200101_010000_000000_000001.json').write_text(json.dumps(snapshot(1)))
+    (spool / '20200101_010000_000000_000002.json').write_text(json.dumps(['bukan', 'snapshot']))
+    (spool / '20200101_010000_000000_000003.json').write_text('{rusak')
+    (spool / '20200101_010000_000000_000004.json').write_text(json.dumps(snapshot(1)))
+    archiver = make_archiver(tmp_path, FakeDrive())
+    assert len(archiver._pending_files) == 4
+
+    assert archiver._flush_batch() is True
+    assert archiver._pending_files == []
+    assert sorted(p.name for p in (spool / 'rejected').iterdir()) == [
+        '20200101_010000_000000_000002.json', '20200101_010000_000000_000003.json']
+    assert list(spool.glob('*.json')) == []
+    assert len(archiver.parquet_archive.read_table()) == 2
+    archiver.close()
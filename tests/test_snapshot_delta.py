@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Pengujian SnapshotDeltaTracker: delta pasar dengan toleransi, berita baru, on-chain, dan bagian usang.
+
+from PERCEPTION_SYSTEM.snapshot_delta import (
+    SnapshotDeltaTracker, has_relevant_changes, iter_news_items, news_item_id,
+)
+
+
+class FakeOrchestrator:
+    def __init__(self, **perception):
+        self.config = {'perception': perception}
+
+
+def snapshot(timestamp, market=None, onchain=None, news=None, sources=None):
+    return {'timestamp': timestamp, 'market_data': market or {}, 'onchain': onchain or {},
+            'news': news or {}, 'sources': sources or {}}
+
+
+def test_first_delta_is_initial_and_relevant():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator())
+    delta = tracker.update(snapshot(1, market={'BTC/USDT': {'price': 100.0}}))
+    assert delta['is_initial']
+    assert delta['market_data']['added'] == ['BTC/USDT']
+    assert has_relevant_changes(delta, symbol='ETH/USDT')
+
+
+def test_small_drifts_accumulate_against_fixed_baseline():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator(delta_numeric_tolerance=0.01))
+    tracker.update(snapshot(1, market={'BTC/USDT': {'price': 100.0}}))
+
+    second = tracker.update(snapshot(2, market={'BTC/USDT': {'price': 100.6}}))
+    assert second['market_data']['changed'] == {}
+    assert second['market_data']['unchanged_count'] == 1
+    assert not has_relevant_changes(second, symbol='BTC/USDT', include_news=False)
+
+    # 100 -> 101.2 melewati toleransi 1% terhadap baseline awal, meskipun 100.6 -> 101.2 tidak
+    third = tracker.update(snapshot(3, market={'BTC/USDT': {'price': 101.2}}))
+    assert 'BTC/USDT' in third['market_data']['changed']
+
+
+def test_removed_symbols_only_for_full_universe():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator())
+    tracker.update(snapshot(1, market={'BTC/USDT': {'price': 1.0}, 'ETH/USDT': {'price': 2.0}}))
+    partial = tracker.update(snapshot(2, market={'BTC/USDT': {'price': 1.0}}), full_universe=False)
+    assert partial['market_data']['removed'] == []
+    full = tracker.update(snapshot(3, market={'BTC/USDT': {'price': 1.0}}))
+    assert full['market_data']['removed'] == ['ETH/USDT']
+    assert full['has_changes']
+
+
+def test_news_items_are_reported_once():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator())
+    first_news = {'newsapi': [{'title': 'A', 'url': 'https://x/a'}]}
+    tracker.update(snapshot(1, news=first_news))
+    repeat = tracker.update(snapshot(2, news=first_news))
+    assert repeat['news']['new_items'] == []
+    assert not repeat['has_changes']
+
+    more = tracker.update(snapshot(3, news={'newsapi': [{'title': 'A', 'url': 'https://x/a'},
+                                                        {'title': 'B', 'url': 'https://x/b'}]}))
+    assert [item['title'] for item in more['news']['new_items']] == ['B']
+
+
+def test_onchain_changes_are_flattened_per_asset():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator())
+    tracker.update(snapshot(1, onchain={'bitcoin': {'active_addresses': 10, 'fees': {'avg': 1.0}}}))
+    delta = tracker.update(snapshot(2, onchain={'bitcoin': {'active_addresses': 10, 'fees': {'avg': 2.0}}}))
+    assert delta['onchain']['changed'] == {'bitcoin.fees.avg': {'old': 1.0, 'new': 2.0}}
+    assert delta['onchain']['changed_assets'] == ['bitcoin']
+    assert has_relevant_changes(delta, asset='bitcoin', include_news=False)
+    assert not has_relevant_changes(delta, asset='ethereum', include_news=False)
+
+
+def test_stale_section_keeps_baseline():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator())
+    tracker.update(snapshot(1, market={'BTC/USDT': {'price': 100.0}}))
+    stale = tracker.update(snapshot(2, market={}, sources={'market_data': 'timeout'}))
+    assert stale['stale_sections'] == ['market_data']
+    assert stale['market_data']['removed'] == []
+
+    recovered = tracker.update(snapshot(3, market={'BTC/USDT': {'price': 100.0}}))
+    assert recovered['market_data']['changed'] == {}
+
+
+def test_news_memory_is_bounded():
+    tracker = SnapshotDeltaTracker(FakeOrchestrator(news_memory_size=2))
+    tracker.update(snapshot(1, news=[{'url': 'https://x/1'}, {'url': 'https://x/2'}, {'url': 'https://x/3'}]))
+    delta = tracker.update(snapshot(2, news=[{'url': 'https://x/1'}]))
+    assert len(delta['news']['new_items']) == 1
+    assert delta['news']['seen_count'] == 2
+
+
+def test_news_helpers():
+    nested = {'scraped': {'site': [{'title': 'A'}, 'junk']}, 'api': [[{'title': 'B'}]]}
+    assert [item['title'] for item in iter_news_items(nested)] == ['A', 'B']
+    assert news_item_id({'url': ' https://x/a '}) == news_item_id({'url': 'https://x/a', 'title': 'Other'})
+    assert news_item_id({'source': 'S', 'title': 'Hello'}) == news_item_id({'source': 'S', 'title': 'HELLO'})
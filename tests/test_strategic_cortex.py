@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Pengujian StrategicCortex.analyze: laporan per artikel dipertahankan antar siklus delta.
+
+import pytest
+
+from PERCEPTION_SYSTEM.global_intelligence.news_deduplicator import NewsDeduplicator
+from PERCEPTION_SYSTEM.snapshot_delta import SnapshotDeltaTracker
+from STRATEGIC_CORTEX.strategic_cortex import StrategicCortex
+
+TOPICS = {
+    'a': 'Bitcoin ETF sees record weekly inflows from large institutions',
+    'b': 'Ethereum developers schedule the next network upgrade for spring',
+    'c': 'Solana validators report a brief outage on mainnet this morning',
+}
+
+
+class FakeOrchestrator:
+    def __init__(self, tmp_path):
+        self.config = {'news_dedup': {'index_path': str(tmp_path / 'news_fingerprints.npz')}}
+
+
+class FakeRouter:
+    def __init__(self):
+        self.sent = []
+        self.failing = False
+
+    def get_council_batch_analysis(self, articles, **kwargs):
+        self.sent.append(sorted(article['id'] for article in articles))
+        report = None if self.failing else {'sentiment': 'BULLISH'}
+        return {article['id']: {'fast_sentiment_analysis': report} for article in articles}
+
+    def get_cache_stats(self):
+        return {'hit_rate': 0.0, 'entries': 0}
+
+
+class FakeSynthesizer:
+    def __init__(self):
+        self.received = []
+
+    def synthesize_article_reports(self, article_reports):
+        self.received.append(sorted(article_reports))
+        return {'signal': 'BULLISH', 'confidence': 0.7}
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    return FakeOrchestrator(tmp_path)
+
+
+@pytest.fixture
+def cortex(orchestrator):
+    cortex = StrategicCortex.__new__(StrategicCortex)
+    cortex.llm_router = FakeRouter()
+    cortex.synthesizer = FakeSynthesizer()
+    cortex.batch_mode = True
+    cortex.batch_token_budget = 6000
+    cortex.max_article_chars = 2000
+    cortex.max_articles_per_batch = 20
+    cortex.news_deduplicator = NewsDeduplicator(orchestrator)
+    cortex.article_reports = {}
+    cortex.unanswered_ids = set()
+    return cortex
+
+
+def run_cycle(cortex, tracker, *keys):
+    news = {'newsapi': [{'title': TOPICS[key], 'url': f'https://news.example/{key}', 'description': ''}
+                        for key in keys]}
+    snapshot = {'timestamp': len(cortex.synthesizer.received), 'news': news}
+    snapshot['delta'] = tracker.update(snapshot)
+    return cortex.analyze(snapshot)
+
+
+def test_signal_kept_when_delta_has_no_new_news(cortex, orchestrator):
+    tracker = SnapshotDeltaTracker(orchestrator)
+    first = run_cycle(cortex, tracker, 'a', 'b')
+    second = run_cycle(cortex, tracker, 'a', 'b')
+
+    assert first['signal'] == second['signal'] == 'BULLISH'
+    assert len(cortex.llm_router.sent) == 1
+    assert cortex.synthesizer.received[1] == cortex.synthesizer.received[0]
+    assert len(cortex.synthesizer.received[1]) == 2
+
+
+def test_only_new_items_reach_llm_and_departed_ids_are_dropped(cortex, orchestrator):
+    tracker = SnapshotDeltaTracker(orchestrator)
+    run_cycle(cortex, tracker, 'a', 'b')
+    first_ids = set(cortex.article_reports)
+    run_cycle(cortex, tracker, 'b', 'c')
+
+    assert len(cortex.llm_router.sent) == 2
+    assert len(cortex.llm_router.sent[1]) == 1
+    new_id = cortex.llm_router.sent[1][0]
+    assert new_id not in first_ids
+    # 'a' keluar dari jendela, 'b' dipertahankan, 'c' masuk
+    assert len(cortex.article_reports) == 2
+    assert new_id in cortex.article_reports
+    assert cortex.synthesizer.received[-1] == sorted(cortex.article_reports)
+
+
+def test_unanswered_items_are_retried_next_delta_cycle(cortex, orchestrator):
+    tracker = SnapshotDeltaTracker(orchestrator)
+    cortex.llm_router.failing = True
+    first = run_cycle(cortex, tracker, 'a')
+    assert first['signal'] == 'HOLD'
+    assert len(cortex.unanswered_ids) == 1
+
+    cortex.llm_router.failing = False
+    second = run_cycle(cortex, tracker, 'a')
+
+    assert cortex.llm_router.sent[1] == cortex.llm_router.sent[0]
+    assert second['signal'] == 'BULLISH'
+    assert not cortex.unanswered_ids
+
+
+def test_unanswered_items_leaving_window_are_not_retried(cortex, orchestrator):
+    tracker = SnapshotDeltaTracker(orchestrator)
+    cortex.llm_router.failing = True
+    run_cycle(cortex, tracker, 'a')
+    cortex.llm_router.failing = False
+    run_cycle(cortex, tracker, 'b')
+
+    assert len(cortex.llm_router.sent[1]) == 1
+    assert cortex.llm_router.sent[1] != cortex.llm_router.sent[0]
+    assert not cortex.unanswered_ids
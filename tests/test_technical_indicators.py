@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Pengujian IndicatorEngine: hasil inkremental identik dengan perhitungan penuh dari riwayat.
+
+import numpy as np
+import pytest
+
+from ANALYTICS_CORE.technical_indicators import (
+    CLOSE, IndicatorEngine, atr, bollinger_bands, macd, rsi, sma, to_ohlcv_array,
+)
+from tests.conftest import make_ohlcv
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'PEPE/USDT']
+
+
+def history(bars):
+    return {
+        'BTC/USDT': make_ohlcv(bars, seed=1, base=60000),
+        'ETH/USDT': make_ohlcv(bars, seed=2, base=3000),
+        'PEPE/USDT': make_ohlcv(bars, seed=3, base=0.00001234),
+    }
+
+
+def full_result(ohlcv_by_symbol):
+    engine = IndicatorEngine()
+    engine.ingest(ohlcv_by_symbol)
+    return engine.latest_by_symbol()
+
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for symbol in expected:
+        for name, value in expected[symbol].items():
+            if value is None:
+                assert actual[symbol][name] is None, (symbol, name)
+            else:
+                assert actual[symbol][name] == pytest.approx(value, rel=1e-9, abs=1e-18), (symbol, name)
+
+
+def test_incremental_bars_match_full_recompute():
+    data = history(160)
+    engine = IndicatorEngine()
+    assert engine.ingest({symbol: rows[:100] for symbol, rows in data.items()}) == 'initialized'
+    for end in range(101, 161, 7):
+        assert engine.ingest({symbol: rows[:end] for symbol, rows in data.items()}) == 'incremental'
+    assert engine.ingest(data) == 'incremental'
+    # Data yang sama lagi: bar terakhir diterapkan ulang (bisa masih terbentuk) tanpa mengubah hasil
+    engine.ingest(data)
+    assert_same(engine.latest_by_symbol(), full_result(data))
+
+
+def test_forming_candle_replaces_last_bar():
+    data = history(120)
+    engine = IndicatorEngine()
+    engine.ingest(data)
+    forming = {symbol: rows.copy() for symbol, rows in data.items()}
+    for rows in forming.values():
+        rows[-1, CLOSE] *= 1.03
+        rows[-1, 2] = max(rows[-1, 2], rows[-1, CLOSE])
+    assert engine.ingest(forming) == 'incremental'
+    assert_same(engine.latest_by_symbol(), full_result(forming))
+
+
+def test_unequal_histories_and_warmup():
+    data = history(120)
+    data['ETH/USDT'] = data['ETH/USDT'][-30:]   # kurang dari macd_slow + sinyal dan sma_50
+    engine = IndicatorEngine()
+    engine.ingest({symbol: rows[:-5] for symbol, rows in data.items()})
+    engine.ingest(data)
+    result = engine.latest_by_symbol()
+    assert_same(result, full_result(data))
+    assert result['ETH/USDT']['sma_50'] is None
+    assert result['ETH/USDT']['rsi'] is not None
+    assert result['BTC/USDT']['sma_50'] is not None
+
+
+def test_gap_in_history_triggers_reinitialization():
+    data = history(200)
+    engine = IndicatorEngine()
+    engine.ingest({symbol: rows[:100] for symbol, rows in data.items()})
+    later = {symbol: rows[150:] for symbol, rows in data.items()}
+    assert engine.ingest(later) == 'initialized'
+    assert_same(engine.latest_by_symbol(), full_result(later))
+
+
+def test_engine_matches_vectorized_functions():
+    data = history(150)
+    ohlcv = to_ohlcv_array(data, SYMBOLS)
+    close, high, low = ohlcv[..., CLOSE], ohlcv[..., 2], ohlcv[..., 3]
+    result = full_result(data)
+    expected = {
+        'rsi': rsi(close)[:, -1],
+        'macd': macd(close)[0][:, -1],
+        'macd_signal': macd(close)[1][:, -1],
+        'atr': atr(high, low, close)[:, -1],
+        'sma_20': sma(close, 20)[:, -1],
+        'bb_upper': bollinger_bands(close)[1][:, -1],
+    }
+    for index, symbol in enumerate(SYMBOLS):
+        for name, values in expected.items():
+            assert result[symbol][name] == pytest.approx(values[index], rel=1e-9), (symbol, name)
+
+
+def test_rsi_matches_wilder_reference():
+    close = np.array(make_ohlcv(60, seed=5))[:, CLOSE]
+    gains, losses = np.maximum(np.diff(close), 0), np.maximum(-np.diff(close), 0)
+    avg_gain, avg_loss = gains[0], losses[0]
+    for gain, loss in zip(gains[1:], losses[1:]):
+        avg_gain += (gain - avg_gain) / 14
+        avg_loss += (loss - avg_loss) / 14
+    assert rsi(close)[0, -1] == pytest.approx(100 - 100 / (1 + avg_gain / avg_loss))
+    assert np.isnan(rsi(close)[0, 13]) and not np.isnan(rsi(close)[0, 14])
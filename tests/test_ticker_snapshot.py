@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Pengujian fetch_ticker_snapshot: satu permintaan massal, fallback per simbol, rate limit dan circuit breaker.
+
+from UTILS.ticker_snapshot import fetch_ticker_snapshot
+
+
+class FakeExchange:
+    def __init__(self, bulk=None, fail_bulk=False):
+        self.bulk = bulk or {}
+        self.fail_bulk = fail_bulk
+        self.single_calls = []
+
+    def fetch_tickers(self, symbols=None):
+        if self.fail_bulk:
+            raise RuntimeError("bulk down")
+        return dict(self.bulk)
+
+    def fetch_ticker(self, symbol):
+        self.single_calls.append(symbol)
+        if symbol == 'BAD/USDT':
+            raise RuntimeError("unknown symbol")
+        return {'symbol': symbol, 'last': 1.0}
+
+
+class RecordingBreakers:
+    def __init__(self, allow=True):
+        self.allow = allow
+        self.events = []
+
+    def allow_request(self, name):
+        return self.allow
+
+    def record_success(self, name, latency=None):
+        self.events.append(('success', name))
+
+    def record_failure(self, name, latency=None):
+        self.events.append(('failure', name))
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.hosts = []
+
+    def acquire(self, host):
+        self.hosts.append(host)
+
+
+def test_only_symbols_missing_from_bulk_are_fetched_individually():
+    exchange = FakeExchange(bulk={'BTC/USDT': {'last': 2.0}, 'XRP/USDT': {'last': 0.5}})
+    limiter = RecordingLimiter()
+
+    snapshot = fetch_ticker_snapshot(exchange, ['BTC/USDT', 'ETH/USDT', 'BAD/USDT'],
+                                     rate_limiter=limiter, rate_limit_host='api.binance.com')
+
+    assert set(snapshot) == {'BTC/USDT', 'ETH/USDT'}
+    assert exchange.single_calls == ['ETH/USDT', 'BAD/USDT']
+    assert limiter.hosts == ['api.binance.com'] * 3
+
+
+def test_all_tickers_when_no_symbols_given():
+    exchange = FakeExchange(bulk={'BTC/USDT': {'last': 2.0}, 'XRP/USDT': {'last': 0.5}})
+    assert set(fetch_ticker_snapshot(exchange)) == {'BTC/USDT', 'XRP/USDT'}
+
+
+def test_bulk_result_is_recorded_on_circuit_breaker():
+    breakers = RecordingBreakers()
+    fetch_ticker_snapshot(FakeExchange(fail_bulk=True), ['ETH/USDT'], circuit_breakers=breakers)
+    fetch_ticker_snapshot(FakeExchange(bulk={'ETH/USDT': {}}), ['ETH/USDT'], circuit_breakers=breakers)
+    assert breakers.events == [('failure', 'binance'), ('success', 'binance')]
+
+
+def test_open_circuit_skips_request():
+    exchange = FakeExchange(bulk={'BTC/USDT': {'last': 2.0}})
+    assert fetch_ticker_snapshot(exchange, ['BTC/USDT'], circuit_breakers=RecordingBreakers(allow=False)) == {}
+    assert exchange.single_calls == []